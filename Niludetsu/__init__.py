@@ -25,13 +25,15 @@ from .utils.config_loader import BotState, LoggingState
 from .utils.command_sync import CommandSync
 from .utils.setup_manager import SetupManager
 from .utils.settings import Settings
+from .utils.log_config import LogConfig
 
 # --- Ядро ---
 from .core import (
     TempRoomsManager,
     LevelSystem,
     LoggingState,
-    BaseLogger
+    BaseLogger,
+    LogShipper
 )
 
 # --- Аналитика ---
@@ -78,6 +80,8 @@ from .logging import (
 # --- Модерация ---
 from .moderation import (
     ModPermissions,
+    StaffRoleResolver,
+    CooldownStore,
     has_permission,
     admin_only,
     mod_only,
@@ -99,6 +103,12 @@ from .profile import (
     ProfileImage
 )
 
+# --- Метрики ---
+from .metrics import (
+    MetricsRegistry,
+    MetricsServer
+)
+
 __all__ = [
     # База данных
     "Database",
@@ -117,15 +127,19 @@ __all__ = [
     "SetupManager",
     "LoggingState",
     "Settings",
+    "LogConfig",
     
     # Основные компоненты
     "TempRoomsManager",
     "LevelSystem",
     "LoggingState",
     "BaseLogger",
+    "LogShipper",
     
     # Модерация
     "ModPermissions",
+    "StaffRoleResolver",
+    "CooldownStore",
     "has_permission",
     "admin_only",
     "mod_only",
@@ -175,5 +189,9 @@ __all__ = [
     # Профиль
     "ProfileManager",
     "ProfileData",
-    "ProfileImage"
+    "ProfileImage",
+    
+    # Метрики
+    "MetricsRegistry",
+    "MetricsServer"
 ] 
\ No newline at end of file
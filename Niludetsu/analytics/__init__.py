@@ -3,4 +3,8 @@ from .server import ServerAnalytics
 from .roles import RolesAnalytics
 from .channels import ChannelsAnalytics
 from .messages import MessageAnalytics
-__all__ = ['BotAnalytics', 'ServerAnalytics', 'RolesAnalytics', 'ChannelsAnalytics', 'MessageAnalytics'] 
\ No newline at end of file
+from .rollups import MessageRollups, ActivityWindow
+from .charts import ChartRenderer, CHARTS, PRESETS
+from .chart_cache import ChartCache
+from .aggregates import GuildAggregateTracker, GuildAggregates
+__all__ = ['BotAnalytics', 'ServerAnalytics', 'RolesAnalytics', 'ChannelsAnalytics', 'MessageAnalytics', 'MessageRollups', 'ActivityWindow', 'ChartRenderer', 'CHARTS', 'PRESETS', 'ChartCache', 'GuildAggregateTracker', 'GuildAggregates'] 
\ No newline at end of file
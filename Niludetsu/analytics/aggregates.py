@@ -0,0 +1,167 @@
+"""
+Счетчики участников, ролей и каналов серверов
+"""
+import discord, logging, time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List
+
+log = logging.getLogger(__name__)
+
+@dataclass
+class GuildAggregates:
+    """Готовые счетчики одного сервера"""
+    humans: int = 0
+    bots: int = 0
+    boosters: int = 0
+    statuses: Counter = field(default_factory=Counter)      # discord.Status -> участников
+    join_weekdays: List[int] = field(default_factory=lambda: [0] * 7)  # Присоединения по дням недели (UTC)
+    role_members: Counter = field(default_factory=Counter)  # ID роли -> участников
+    channel_types: Counter = field(default_factory=Counter) # discord.ChannelType -> каналов
+    built_at: float = field(default_factory=time.monotonic)
+
+class GuildAggregateTracker:
+    """Счетчики серверов, которые поддерживаются событиями шлюза
+
+    Полный обход guild.members выполняется один раз при первом запросе
+    сервера, дальше счетчики меняются на приращения из событий входа,
+    выхода, обновления участника, присутствия и изменений каналов и ролей.
+    Команды аналитики читают готовые числа без обхода участников. После
+    нового подключения к шлюзу и не реже раза в MAX_AGE секунд счетчики
+    пересобираются, чтобы пропущенные события не накапливали ошибку.
+    """
+
+    MAX_AGE = 6 * 3600  # Максимальный возраст счетчиков в секундах
+
+    _instance: Optional["GuildAggregateTracker"] = None
+
+    def __init__(self):
+        self._guilds: Dict[int, GuildAggregates] = {}
+        self.builds = 0
+        self.updates = 0
+
+    @classmethod
+    def get(cls) -> "GuildAggregateTracker":
+        """Общий на процесс трекер"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def build(self, guild: discord.Guild) -> GuildAggregates:
+        """Пересчитывает счетчики сервера одним обходом участников"""
+        aggregates = GuildAggregates()
+        for member in guild.members:
+            self._add_member(aggregates, member, 1)
+        for channel in guild.channels:
+            aggregates.channel_types[channel.type] += 1
+
+        self._guilds[guild.id] = aggregates
+        self.builds += 1
+        log.debug(f"Счетчики сервера {guild.id} пересчитаны: {len(guild.members)} участников")
+        return aggregates
+
+    def aggregates(self, guild: discord.Guild) -> GuildAggregates:
+        """Счетчики сервера, при необходимости пересчитанные"""
+        aggregates = self._guilds.get(guild.id)
+        if aggregates is None or time.monotonic() - aggregates.built_at > self.MAX_AGE:
+            aggregates = self.build(guild)
+        return aggregates
+
+    @staticmethod
+    def _add_member(aggregates: GuildAggregates, member: discord.Member, sign: int) -> None:
+        if member.bot:
+            aggregates.bots += sign
+        else:
+            aggregates.humans += sign
+        if member.premium_since is not None:
+            aggregates.boosters += sign
+        aggregates.statuses[member.status] += sign
+        if member.joined_at:
+            aggregates.join_weekdays[member.joined_at.weekday()] += sign
+        for role_id in member._roles:
+            aggregates.role_members[role_id] += sign
+
+    def _tracked(self, guild: Optional[discord.Guild]) -> Optional[GuildAggregates]:
+        # Сервер без счетчиков будет пересчитан целиком при первом запросе
+        if guild is None:
+            return None
+        aggregates = self._guilds.get(guild.id)
+        if aggregates is not None:
+            self.updates += 1
+        return aggregates
+
+    def member_join(self, member: discord.Member) -> None:
+        """Учитывает вход участника"""
+        aggregates = self._tracked(member.guild)
+        if aggregates is not None:
+            self._add_member(aggregates, member, 1)
+
+    def member_remove(self, member: discord.Member) -> None:
+        """Учитывает выход участника"""
+        aggregates = self._tracked(member.guild)
+        if aggregates is not None:
+            self._add_member(aggregates, member, -1)
+
+    def member_update(self, before: discord.Member, after: discord.Member) -> None:
+        """Учитывает выданные и снятые роли и начало или конец буста"""
+        boosted = (before.premium_since is not None) != (after.premium_since is not None)
+        if before._roles == after._roles and not boosted:
+            return
+        aggregates = self._tracked(after.guild)
+        if aggregates is None:
+            return
+        if boosted:
+            aggregates.boosters += 1 if after.premium_since is not None else -1
+        old, new = set(before._roles), set(after._roles)
+        for role_id in new - old:
+            aggregates.role_members[role_id] += 1
+        for role_id in old - new:
+            aggregates.role_members[role_id] -= 1
+
+    def presence_update(self, before: discord.Member, after: discord.Member) -> None:
+        """Учитывает смену статуса"""
+        if before.status == after.status:
+            return
+        aggregates = self._tracked(after.guild)
+        if aggregates is not None:
+            aggregates.statuses[before.status] -= 1
+            aggregates.statuses[after.status] += 1
+
+    def channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        """Учитывает новый канал"""
+        aggregates = self._tracked(channel.guild)
+        if aggregates is not None:
+            aggregates.channel_types[channel.type] += 1
+
+    def channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        """Учитывает удаленный канал"""
+        aggregates = self._tracked(channel.guild)
+        if aggregates is not None:
+            aggregates.channel_types[channel.type] -= 1
+
+    def channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        """Учитывает смену типа канала (например, текстовый в новостной)"""
+        if before.type == after.type:
+            return
+        aggregates = self._tracked(after.guild)
+        if aggregates is not None:
+            aggregates.channel_types[before.type] -= 1
+            aggregates.channel_types[after.type] += 1
+
+    def role_delete(self, role: discord.Role) -> None:
+        """Удаляет счетчик удаленной роли"""
+        aggregates = self._tracked(role.guild)
+        if aggregates is not None:
+            aggregates.role_members.pop(role.id, None)
+
+    def forget(self, guild_id: int) -> None:
+        """Удаляет счетчики сервера"""
+        self._guilds.pop(guild_id, None)
+
+    def reset(self) -> None:
+        """Удаляет все счетчики, например после нового подключения к шлюзу"""
+        self._guilds.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика трекера"""
+        return {"guilds": len(self._guilds), "builds": self.builds, "updates": self.updates}
@@ -1,5 +1,5 @@
-import discord, matplotlib.pyplot as plt, io
-from .base import BaseAnalytics, COLORS
+import discord, io
+from .base import BaseAnalytics, RENDER_SECONDS
 from Niludetsu import Emojis, Embed
 
 class ChannelsAnalytics(BaseAnalytics):
@@ -7,7 +7,8 @@ class ChannelsAnalytics(BaseAnalytics):
         super().__init__()
         self.bot = bot
         
-    async def generate_analytics(self, guild):
+    @RENDER_SECONDS.timed(kind="channels")
+    async def generate_analytics(self, guild, quick=False):
         """Генерирует аналитику каналов"""
         # Собираем статистику по типам каналов
         text_channels = guild.text_channels
@@ -21,8 +22,6 @@ class ChannelsAnalytics(BaseAnalytics):
         private_voice = len([c for c in voice_channels if not c.permissions_for(guild.default_role).view_channel])
         
         # Создаем круговую диаграмму типов каналов
-        fig, ax = plt.subplots(figsize=(10, 5))
-        
         # Собираем только непустые категории
         channel_data = [
             ('Текстовые', len(text_channels)),
@@ -38,36 +37,8 @@ class ChannelsAnalytics(BaseAnalytics):
         # Разделяем данные
         channel_types, sizes = zip(*channel_data) if channel_data else ([], [])
         
-        # Создаем градиент красных оттенков
-        colors = ['#ED4245', '#FF6B6B', '#FF8585', '#FFA3A3', '#FFC1C1'][:len(channel_types)]
-        
-        # Создаем круговую диаграмму
-        wedges, texts, autotexts = ax.pie(
-            sizes, 
-            labels=channel_types, 
-            colors=colors, 
-            autopct='%1.1f%%',
-            pctdistance=0.85,
-            labeldistance=1.1
-        )
-        
-        # Настраиваем шрифты для меток и процентов
-        plt.setp(autotexts, size=9, weight="bold")
-        plt.setp(texts, size=10, weight="bold")
-        
-        for text in texts + autotexts:
-            text.set_fontproperties(self.custom_font)
-            text.set_color(COLORS['text'])
-        
-        ax.set_title('Распределение типов каналов')
-        
-        self.style_plot(fig, ax)
-        
-        # Сохраняем график
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', transparent=True, dpi=300, bbox_inches='tight')
-        buffer.seek(0)
-        plt.close()
+        # Строим диаграмму в пуле процессов
+        buffer = io.BytesIO(await self.render("channel_types", list(channel_types), list(sizes), quick=quick))
         
         # Создаем эмбед
         embed = Embed(
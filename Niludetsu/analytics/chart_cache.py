@@ -0,0 +1,197 @@
+"""
+Кэш построенных графиков
+"""
+import asyncio, hashlib, json, logging, os, time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Sequence
+from ..metrics import metrics
+
+log = logging.getLogger(__name__)
+
+CACHE_LOOKUPS = metrics.counter("chart_cache_lookups", "Обращения к кэшу графиков", ("result",))
+
+class ChartCache:
+    """Кэш PNG графиков по хэшу входных данных
+
+    Ключ - SHA-256 от версии графиков, имени графика, набора настроек
+    качества и данных, поэтому при тех же числах готовые байты
+    возвращаются без обращения к matplotlib. Первый уровень - LRU в
+    памяти с ограничением по объему, второй (необязательный) - файлы в
+    data/cache/charts, которые переживают перезапуск бота. Объем файлов
+    отслеживается при записи, и при превышении DISK_MAX_BYTES в фоне
+    удаляются давно не использованные.
+    """
+
+    # Увеличивается при изменении вида графиков, чтобы старые файлы не использовались
+    VERSION = 1
+    MAX_BYTES = 64 * 1024 * 1024       # Объем кэша в памяти
+    DISK_MAX_BYTES = 256 * 1024 * 1024  # Объем кэша на диске
+    DISK_PRUNE_RATIO = 0.9              # До какой доли лимита очищать диск, чтобы не чистить на каждой записи
+    DISK_PATH = 'data/cache/charts'
+
+    def __init__(self, max_bytes: Optional[int] = None, disk_path: Optional[str] = None):
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self.disk_path = disk_path or self.DISK_PATH
+        self.disk_enabled = False
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._disk_size: Optional[int] = None  # Объем файлов на диске, None - еще не подсчитан
+        self._prune_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def key(cls, chart: str, args: Sequence[Any], preset: str) -> str:
+        """Ключ графика по его имени, настройкам и данным"""
+        payload = json.dumps([cls.VERSION, chart, preset, args], ensure_ascii=False, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.disk_path, f"{key}.png")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Готовый PNG из памяти или с диска"""
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_LOOKUPS.inc(result="memory")
+            return data
+
+        if self.disk_enabled:
+            data = await asyncio.to_thread(self._read, key)
+            if data is not None:
+                self._remember(key, data)
+                self.disk_hits += 1
+                CACHE_LOOKUPS.inc(result="disk")
+                return data
+
+        self.misses += 1
+        CACHE_LOOKUPS.inc(result="miss")
+        return None
+
+    async def put(self, key: str, data: bytes) -> None:
+        """Сохраняет построенный PNG"""
+        self._remember(key, data)
+        if self.disk_enabled:
+            try:
+                await asyncio.to_thread(self._write, key, data)
+            except OSError as e:
+                log.warning(f"Не удалось сохранить график в {self.disk_path}: {e}")
+                return
+            if self._disk_size is not None:
+                self._disk_size += len(data)
+            if self._disk_size is None or self._disk_size > self.DISK_MAX_BYTES:
+                self._schedule_prune()
+
+    def _schedule_prune(self) -> None:
+        if self._prune_task is not None and not self._prune_task.done():
+            return
+        self._prune_task = asyncio.get_running_loop().create_task(self._background_prune())
+
+    async def _background_prune(self) -> None:
+        try:
+            removed = await self.prune_disk(int(self.DISK_MAX_BYTES * self.DISK_PRUNE_RATIO))
+            if removed:
+                log.debug(f"Удалено {removed} старых графиков из {self.disk_path}")
+        except Exception as e:
+            log.warning(f"Не удалось очистить кэш графиков в {self.disk_path}: {e}")
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._file(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+        # Время доступа нужно для вытеснения старых файлов в prune_disk
+        os.utime(path)
+        return data
+
+    def _write(self, key: str, data: bytes) -> None:
+        os.makedirs(self.disk_path, exist_ok=True)
+        path = self._file(key)
+        # Запись через временный файл, чтобы не прочитать недописанный PNG
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'wb') as file:
+            file.write(data)
+        os.replace(temp, path)
+
+    def enable_disk(self, path: Optional[str] = None) -> None:
+        """Включает кэш на диске"""
+        if path:
+            self.disk_path = path
+        self.disk_enabled = True
+
+    async def prune_disk(self, max_bytes: Optional[int] = None) -> int:
+        """Удаляет давно не использованные файлы сверх лимита
+
+        Returns:
+            int: Количество удаленных файлов
+        """
+        if not self.disk_enabled:
+            return 0
+        return await asyncio.to_thread(self._prune_disk, max_bytes or self.DISK_MAX_BYTES)
+
+    def _prune_disk(self, max_bytes: int) -> int:
+        try:
+            names = os.listdir(self.disk_path)
+        except OSError:
+            return 0
+
+        files = []
+        for name in names:
+            path = os.path.join(self.disk_path, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # Временные файлы прерванной записи
+            if name.endswith('.tmp') and stat.st_mtime < time.time() - 3600:
+                os.remove(path)
+                continue
+            if name.endswith('.png'):
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._disk_size = total
+        return removed
+
+    def clear(self) -> None:
+        """Очищает кэш в памяти"""
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика кэша"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "disk_bytes": self._disk_size or 0,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,332 @@
+"""
+Построение графиков аналитики вне цикла событий
+"""
+import asyncio, io, logging, multiprocessing, os, threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Sequence, Tuple, Callable, Any
+from .chart_cache import ChartCache
+
+log = logging.getLogger(__name__)
+
+FONT_PATH = 'data/fonts/TTNormsPro-Bold.ttf'
+
+# Цветовая схема
+COLORS = {
+    'primary': '#ED4245',    # Основной красный цвет Discord
+    'secondary': '#FF6B6B',  # Светло-красный
+    'accent': '#FF4B4B',     # Акцентный красный
+    'background': '#2F3136', # Тёмный фон
+    'text': '#FFFFFF',       # Белый текст
+    'grid': '#40444B'        # Цвет сетки
+}
+
+WEEKDAYS = ['Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Вс']
+
+# Наборы качества: разрешение PNG в точках на дюйм
+PRESETS = {
+    'full': 300,   # Полное качество
+    'quick': 100   # Быстрый просмотр: в 9 раз меньше пикселей
+}
+DEFAULT_PRESET = 'full'
+
+# Шрифт загружается один раз на процесс в _init_worker
+_font = None
+_init_lock = threading.Lock()
+
+def _init_worker() -> None:
+    """Подготавливает процесс: импорт matplotlib, стиль и шрифт
+
+    Выполняется при запуске каждого процесса пула, поэтому первый запрос
+    не тратит время на импорт библиотек и разбор шрифта.
+    """
+    global _font
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.style, matplotlib.font_manager as fm
+    from matplotlib.figure import Figure
+
+    matplotlib.style.use('dark_background')
+    matplotlib.rcParams.update({
+        'font.family': 'sans-serif',
+        'axes.facecolor': COLORS['background'],
+        'figure.facecolor': COLORS['background'],
+        'text.color': COLORS['text'],
+        'axes.labelcolor': COLORS['text'],
+        'xtick.color': COLORS['text'],
+        'ytick.color': COLORS['text'],
+        'grid.color': COLORS['grid']
+    })
+    if os.path.exists(FONT_PATH):
+        _font = fm.FontProperties(fname=FONT_PATH)
+        # Разбор файла шрифта происходит при первом использовании
+        fm.get_font(FONT_PATH)
+    else:
+        log.warning(f"Шрифт {FONT_PATH} не найден, используется шрифт по умолчанию")
+        _font = fm.FontProperties()
+    Figure()
+
+def _figure(**kwargs):
+    from matplotlib.figure import Figure
+    if _font is None:
+        # Без пула процессов подготовка выполняется при первом графике
+        with _init_lock:
+            if _font is None:
+                _init_worker()
+    return Figure(**kwargs)
+
+def _style(fig, ax) -> None:
+    """Применяет единый стиль к графику"""
+    fig.patch.set_facecolor(COLORS['background'])
+    ax.set_facecolor(COLORS['background'])
+
+    # Настройка сетки
+    ax.grid(True, linestyle='--', alpha=0.2, color=COLORS['grid'])
+
+    # Настройка шрифтов
+    for text in ax.get_xticklabels() + ax.get_yticklabels():
+        text.set_fontproperties(_font)
+        text.set_color(COLORS['text'])
+
+    # Настройка заголовков
+    ax.title.set_fontproperties(_font)
+    ax.xaxis.label.set_fontproperties(_font)
+    ax.yaxis.label.set_fontproperties(_font)
+
+    # Настройка цветов
+    for spine in ax.spines.values():
+        spine.set_color(COLORS['grid'])
+
+def _bar_labels(ax, bars, horizontal: bool = False) -> None:
+    """Подписывает значения столбцов"""
+    for bar in bars:
+        if horizontal:
+            width = bar.get_width()
+            ax.text(width, bar.get_y() + bar.get_height()/2, f'{int(width)}',
+                    ha='left', va='center', color=COLORS['text'], fontproperties=_font)
+        else:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
+                    ha='center', va='bottom', color=COLORS['text'], fontproperties=_font)
+
+def _png(fig, dpi: int, **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, **kwargs)
+    return buffer.getvalue()
+
+def render_member_joins(counts: Sequence[int], dpi: int = PRESETS['full']) -> bytes:
+    """Присоединения участников по дням недели"""
+    fig = _figure(figsize=(10, 5))
+    ax = fig.add_subplot()
+
+    bars = ax.bar(WEEKDAYS, counts, color=COLORS['primary'])
+    _bar_labels(ax, bars)
+
+    ax.set_title('Статистика присоединений по дням недели')
+    ax.set_xlabel('День недели')
+    ax.set_ylabel('Количество участников')
+
+    _style(fig, ax)
+    fig.subplots_adjust(left=0.12, right=0.95, top=0.9, bottom=0.1)
+    return _png(fig, dpi)
+
+def render_top_roles(names: Sequence[str], members: Sequence[int], dpi: int = PRESETS['full']) -> bytes:
+    """Топ ролей по количеству участников"""
+    fig = _figure(figsize=(10, 5))
+    ax = fig.add_subplot()
+
+    bars = ax.bar(names, members, color=[COLORS['primary']] * len(names))
+    _bar_labels(ax, bars)
+
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    ax.set_title('Топ-10 ролей по количеству участников')
+    ax.set_xlabel('Роли')
+    ax.set_ylabel('Количество участников')
+
+    _style(fig, ax)
+    return _png(fig, dpi, transparent=True, bbox_inches='tight')
+
+def render_channel_types(labels: Sequence[str], sizes: Sequence[int], dpi: int = PRESETS['full']) -> bytes:
+    """Распределение типов каналов"""
+    fig = _figure(figsize=(10, 5))
+    ax = fig.add_subplot()
+
+    # Градиент красных оттенков
+    colors = ['#ED4245', '#FF6B6B', '#FF8585', '#FFA3A3', '#FFC1C1'][:len(labels)]
+    _, texts, autotexts = ax.pie(
+        sizes,
+        labels=labels,
+        colors=colors,
+        autopct='%1.1f%%',
+        pctdistance=0.85,
+        labeldistance=1.1
+    )
+
+    for text in texts + autotexts:
+        text.set_fontproperties(_font)
+        text.set_color(COLORS['text'])
+    for text in autotexts:
+        text.set_fontsize(9)
+    for text in texts:
+        text.set_fontsize(10)
+
+    ax.set_title('Распределение типов каналов')
+
+    _style(fig, ax)
+    return _png(fig, dpi, transparent=True, bbox_inches='tight')
+
+def render_message_activity(heatmap: Sequence[Sequence[int]], top_users: List[Tuple[str, int]],
+                            periods: Sequence[int], start: float, hourly: Sequence[int],
+                            dpi: int = PRESETS['full']) -> bytes:
+    """Четыре графика аналитики сообщений
+
+    Args:
+        heatmap: Матрица 7x24 день недели x час
+        top_users: [(имя, сообщений)]
+        periods: Сообщений за день, неделю и месяц
+        start: Начало почасового ряда, секунды эпохи UTC
+        hourly: Сообщений в каждый час
+        dpi: Разрешение PNG
+    """
+    fig = _figure(figsize=(15, 12))
+    ax1, ax2, ax3, ax4 = fig.subplots(2, 2).flat
+
+    # График 1: Тепловая карта активности
+    im = ax1.imshow(heatmap, cmap='YlOrRd')
+    ax1.set_title('Тепловая карта активности')
+    ax1.set_xlabel('Час')
+    ax1.set_ylabel('День недели')
+    ax1.set_yticks(range(len(WEEKDAYS)))
+    ax1.set_yticklabels(WEEKDAYS)
+    ax1.set_xticks(range(0, 24, 3))
+    ax1.set_xticklabels([f'{h:02d}:00' for h in range(0, 24, 3)])
+    fig.colorbar(im, ax=ax1)
+
+    # График 2: Топ-10 пользователей
+    bars = ax2.barh([name for name, _ in top_users], [count for _, count in top_users], color=COLORS['secondary'])
+    ax2.set_title('Топ-10 активных участников')
+    ax2.set_xlabel('Количество сообщений')
+    _bar_labels(ax2, bars, horizontal=True)
+
+    # График 3: Статистика по периодам
+    bars = ax3.bar(['За день', 'За неделю', 'За месяц'], periods, color=COLORS['primary'])
+    ax3.set_title('Количество сообщений по периодам')
+    ax3.set_ylabel('Количество сообщений')
+    _bar_labels(ax3, bars)
+
+    # График 4: Тренд активности
+    dates = [datetime.fromtimestamp(start + offset * 3600, timezone.utc) for offset in range(len(hourly))]
+    ax4.plot(dates, hourly, color=COLORS['accent'], linewidth=2)
+    ax4.set_title('Тренд активности')
+    ax4.set_xlabel('Время')
+    ax4.set_ylabel('Сообщений в час')
+    ax4.tick_params(axis='x', labelrotation=45)
+    for label in ax4.get_xticklabels():
+        label.set_horizontalalignment('right')
+
+    for ax in (ax1, ax2, ax3, ax4):
+        _style(fig, ax)
+
+    fig.subplots_adjust(left=0.1, right=0.95, top=0.95, bottom=0.1, hspace=0.3, wspace=0.3)
+    return _png(fig, dpi)
+
+CHARTS: Dict[str, Callable[..., bytes]] = {
+    "member_joins": render_member_joins,
+    "top_roles": render_top_roles,
+    "channel_types": render_channel_types,
+    "message_activity": render_message_activity
+}
+
+def _render(chart: str, args: tuple, dpi: int) -> bytes:
+    return CHARTS[chart](*args, dpi=dpi)
+
+class ChartRenderer:
+    """Пул процессов для построения графиков
+
+    Графики строятся через объектный API Figure без глобального состояния
+    pyplot в отдельных процессах, поэтому тяжелый рендер не блокирует цикл
+    событий и несколько запросов выполняются параллельно. Процессы
+    запускаются заранее и уже содержат matplotlib и загруженный шрифт.
+    При workers=0 графики строятся в потоке текущего процесса.
+    """
+
+    WORKERS = 2
+
+    _instance: Optional["ChartRenderer"] = None
+
+    def __init__(self, workers: Optional[int] = None, cache: Optional[ChartCache] = None):
+        self.workers = self.WORKERS if workers is None else workers
+        self.cache = cache or ChartCache()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.rendered = 0
+        self.restarts = 0
+
+    @classmethod
+    def get(cls) -> "ChartRenderer":
+        """Общий на процесс пул"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def start(self) -> None:
+        """Запускает и прогревает процессы пула"""
+        if self.workers <= 0 or self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+        # Процессы создаются по мере отправки задач, поэтому будим каждый
+        for _ in range(self.workers):
+            self._executor.submit(os.getpid)
+
+    async def render(self, chart: str, *args: Any, preset: str = DEFAULT_PRESET) -> bytes:
+        """Строит график и возвращает PNG
+
+        Если график с теми же данными уже строился, байты берутся из кэша.
+
+        Args:
+            chart (str): Имя графика из CHARTS
+            *args: Данные для графика (должны сериализоваться pickle и json)
+            preset (str): Набор качества из PRESETS
+        """
+        key = self.cache.key(chart, args, preset)
+        data = await self.cache.get(key)
+        if data is not None:
+            return data
+
+        dpi = PRESETS[preset]
+        if self.workers <= 0:
+            data = await asyncio.to_thread(_render, chart, args, dpi)
+        else:
+            self.start()
+            loop = asyncio.get_running_loop()
+            executor = self._executor
+            try:
+                data = await loop.run_in_executor(executor, _render, chart, args, dpi)
+            except BrokenProcessPool:
+                # Процесс пула упал: пересоздаем пул и повторяем один раз.
+                # Параллельные запросы того же пула перезапускают его только один раз
+                if self._executor is executor:
+                    log.error("Пул построения графиков перезапущен после сбоя процесса")
+                    self.restarts += 1
+                    self.close()
+                    self.start()
+                data = await loop.run_in_executor(self._executor, _render, chart, args, dpi)
+        self.rendered += 1
+        await self.cache.put(key, data)
+        return data
+
+    def close(self) -> None:
+        """Останавливает процессы пула"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика пула"""
+        return {"workers": self.workers, "rendered": self.rendered, "restarts": self.restarts, **self.cache.stats()}
@@ -1,18 +1,22 @@
-import discord, matplotlib.pyplot as plt, io
-from .base import BaseAnalytics, COLORS
+import discord, io
+from .base import BaseAnalytics, RENDER_SECONDS
+from .aggregates import GuildAggregateTracker
 from Niludetsu import Emojis, Embed
 
 class RolesAnalytics(BaseAnalytics):
     def __init__(self, bot):
         super().__init__()
         self.bot = bot
+        self.aggregates = GuildAggregateTracker.get()
         
-    async def generate_analytics(self, guild):
+    @RENDER_SECONDS.timed(kind="roles")
+    async def generate_analytics(self, guild, quick=False):
         """Генерирует аналитику ролей"""
-        # Собираем статистику по ролям
+        # Собираем статистику по ролям из готовых счетчиков
+        role_members = self.aggregates.aggregates(guild).role_members
         role_stats = []
         for role in guild.roles[1:]:  # Пропускаем @everyone
-            members_count = len(role.members)
+            members_count = role_members[role.id]
             role_stats.append({
                 'name': role.name,
                 'members': members_count,
@@ -27,39 +31,11 @@ class RolesAnalytics(BaseAnalytics):
         # Сортируем по количеству участников
         role_stats.sort(key=lambda x: x['members'], reverse=True)
         
-        # Создаем график топ-10 ролей
-        fig, ax = plt.subplots(figsize=(10, 5))
-        
+        # Создаем график топ-10 ролей в пуле процессов
         top_roles = role_stats[:10]
         names = [r['name'] for r in top_roles]
         members = [r['members'] for r in top_roles]
-        
-        # Создаем градиент цветов от primary до secondary
-        colors = [COLORS['primary']] * len(names)
-        
-        bars = ax.bar(names, members, color=colors)
-        
-        # Добавляем значения над столбцами
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height)}',
-                   ha='center', va='bottom',
-                   color=COLORS['text'],
-                   fontproperties=self.custom_font)
-        
-        plt.xticks(rotation=45, ha='right')
-        ax.set_title('Топ-10 ролей по количеству участников')
-        ax.set_xlabel('Роли')
-        ax.set_ylabel('Количество участников')
-        
-        self.style_plot(fig, ax)
-        
-        # Сохраняем график
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', transparent=True, dpi=300, bbox_inches='tight')
-        buffer.seek(0)
-        plt.close()
+        buffer = io.BytesIO(await self.render("top_roles", names, members, quick=quick))
         
         # Создаем эмбед
         embed = Embed(
@@ -0,0 +1,322 @@
+"""
+Почасовые сводки активности сообщений
+"""
+import asyncio, discord, logging, time
+import numpy as np
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Tuple, Any
+from ..database.db import Database
+from ..database.tables import Tables
+from ..utils.settings import Settings
+
+log = logging.getLogger(__name__)
+
+# Верхние границы интервалов длины сообщения, последний интервал открыт
+LENGTH_BINS = (0, 10, 50, 100, 200, 500, 1000, 2000)
+LENGTH_LABELS = ("0", "1-10", "11-50", "51-100", "101-200", "201-500", "501-1000", "1001-2000", "2000+")
+
+RollupKey = Tuple[int, int, int, int]   # (сервер, час, канал, автор)
+LengthKey = Tuple[int, int, int]        # (сервер, час, интервал)
+
+def hour_of(moment: datetime) -> int:
+    """Номер часа UTC с начала эпохи"""
+    return int(moment.timestamp()) // 3600
+
+def length_bin(length: int) -> int:
+    """Интервал гистограммы для длины сообщения"""
+    return int(np.searchsorted(LENGTH_BINS, length))
+
+@dataclass
+class ActivityWindow:
+    """Сводка активности сервера за окно в виде массивов NumPy"""
+    start_hour: int
+    hourly: np.ndarray                  # Сообщений в каждый час окна
+    heatmap: np.ndarray                 # 7x24: день недели x час (UTC)
+    lengths: np.ndarray                 # Гистограмма длин по LENGTH_BINS
+    top_users: List[Tuple[int, int]]    # [(ID автора, сообщений)]
+    top_channels: List[Tuple[int, int]] # [(ID канала, сообщений)]
+    periods: Dict[str, int] = field(default_factory=dict)  # Сообщений за 1d/7d/30d
+    total: int = 0
+    chars: int = 0
+    authors: int = 0
+
+    def hours(self) -> List[datetime]:
+        """Время начала каждого часа окна"""
+        return [
+            datetime.fromtimestamp((self.start_hour + offset) * 3600, timezone.utc)
+            for offset in range(len(self.hourly))
+        ]
+
+class MessageRollups:
+    """Накопительные счетчики сообщений по часам, каналам и авторам
+
+    Каждое сообщение увеличивает счетчик (сервер, час, канал, автор) и
+    интервал гистограммы длин в памяти. Накопленные приращения сбрасываются
+    пачкой UPSERT-ов в message_rollups и message_length_rollups, поэтому
+    аналитика читает готовые суммы вместо обхода истории каналов. Данные до
+    первого запуска заполняются один раз через backfill.
+    """
+
+    FLUSH_INTERVAL = 30.0   # Период фонового сброса в секундах
+    RETENTION_DAYS = 90     # Сколько дней хранить сводки
+    TOP_LIMIT = 10
+
+    UPSERT_QUERY = (
+        f"INSERT INTO {Tables.MESSAGE_ROLLUPS} (guild_id, hour, channel_id, user_id, messages, chars) "
+        "VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(guild_id, hour, channel_id, user_id) DO UPDATE SET "
+        "messages = messages + excluded.messages, chars = chars + excluded.chars"
+    )
+    LENGTH_UPSERT_QUERY = (
+        f"INSERT INTO {Tables.MESSAGE_LENGTH_ROLLUPS} (guild_id, hour, bin, count) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(guild_id, hour, bin) DO UPDATE SET count = count + excluded.count"
+    )
+
+    _instance: Optional["MessageRollups"] = None
+
+    def __init__(self, db: Optional[Database] = None, flush_interval: Optional[float] = None):
+        self.db = db or Database()
+        self.flush_interval = flush_interval or self.FLUSH_INTERVAL
+        self._counts: Dict[RollupKey, List[int]] = defaultdict(lambda: [0, 0])
+        self._lengths: Dict[LengthKey, int] = defaultdict(int)
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._backfills: Dict[int, asyncio.Task] = {}
+        self._live_since: Dict[int, int] = {}
+        self._tasks: set = set()
+        self.recorded = 0
+        self.flushes = 0
+
+    @classmethod
+    def get(cls) -> "MessageRollups":
+        """Общий на процесс экземпляр"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def _add(counts: Dict[RollupKey, List[int]], lengths: Dict[LengthKey, int], message: discord.Message) -> None:
+        hour = hour_of(message.created_at)
+        length = len(message.content)
+        entry = counts[(message.guild.id, hour, message.channel.id, message.author.id)]
+        entry[0] += 1
+        entry[1] += length
+        lengths[(message.guild.id, hour, length_bin(length))] += 1
+
+    def record(self, message: discord.Message) -> None:
+        """Учитывает новое сообщение"""
+        if message.guild is None or message.author.bot:
+            return
+        # Первое живое сообщение сервера задает границу заполнения из истории
+        self._mark_live(message.guild.id, int(message.created_at.timestamp()))
+        self._add(self._counts, self._lengths, message)
+        self.recorded += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    def _mark_live(self, guild_id: int, moment: int) -> None:
+        if guild_id in self._live_since:
+            return
+        self._live_since[guild_id] = moment
+        task = asyncio.get_running_loop().create_task(self._save_live_since(guild_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _save_live_since(self, guild_id: int) -> None:
+        try:
+            await self.live_since(guild_id)
+        except Exception as e:
+            log.error(f"Ошибка сохранения начала учета сообщений сервера {guild_id}: {e}")
+
+    async def live_since(self, guild_id: int) -> int:
+        """Момент (секунды эпохи), с которого сообщения сервера учитываются вживую
+
+        Значение из настройки analytics/rollups_live_since имеет приоритет:
+        оно осталось от прошлого запуска, и более поздние сообщения в
+        историю уже не попадут. Иначе сохраняется время первого учтенного
+        сообщения или текущее время.
+        """
+        settings = Settings()
+        stored = await settings.get(guild_id, 'analytics', 'rollups_live_since')
+        if stored is not None:
+            self._live_since[guild_id] = int(stored)
+            return int(stored)
+        moment = self._live_since.setdefault(guild_id, int(time.time()))
+        await settings.set(guild_id, 'analytics', 'rollups_live_since', str(moment))
+        return moment
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"Ошибка при сбросе сводок сообщений: {e}")
+
+    async def _write(self, counts: Dict[RollupKey, List[int]], lengths: Dict[LengthKey, int]) -> None:
+        await self.db.executemany(self.UPSERT_QUERY, [key + tuple(values) for key, values in counts.items()])
+        await self.db.executemany(self.LENGTH_UPSERT_QUERY, [key + (count,) for key, count in lengths.items()])
+
+    async def flush(self) -> None:
+        """Записывает накопленные приращения"""
+        async with self._flush_lock:
+            if not self._counts and not self._lengths:
+                return
+            counts, self._counts = self._counts, defaultdict(lambda: [0, 0])
+            lengths, self._lengths = self._lengths, defaultdict(int)
+            try:
+                await self._write(counts, lengths)
+            except BaseException:
+                # Вернем приращения, чтобы они попали в следующий сброс
+                for key, (messages, chars) in counts.items():
+                    self._counts[key][0] += messages
+                    self._counts[key][1] += chars
+                for key, count in lengths.items():
+                    self._lengths[key] += count
+                raise
+            self.flushes += 1
+
+    async def backfill(self, guild: discord.Guild, days: int = 30) -> int:
+        """Однократно заполняет сводки из истории каналов
+
+        Обходятся сообщения за days дней до момента, с которого сервер
+        учитывается вживую (настройка analytics/rollups_live_since). Все
+        приращения пишутся одной пачкой после обхода, а завершение
+        отмечается настройкой analytics/rollups_backfilled, поэтому
+        прерванное заполнение повторяется без двойного счета.
+
+        Returns:
+            int: Количество учтенных сообщений
+        """
+        settings = Settings()
+        if await settings.get(guild.id, 'analytics', 'rollups_backfilled') == '1':
+            return 0
+
+        # Сообщения с этого момента уже учтены вживую
+        before = datetime.fromtimestamp(await self.live_since(guild.id), timezone.utc)
+        after = before - timedelta(days=days)
+
+        counts: Dict[RollupKey, List[int]] = defaultdict(lambda: [0, 0])
+        lengths: Dict[LengthKey, int] = defaultdict(int)
+        total = 0
+        for channel in guild.text_channels:
+            try:
+                async for message in channel.history(limit=None, after=after, before=before):
+                    if not message.author.bot:
+                        self._add(counts, lengths, message)
+                        total += 1
+            except discord.Forbidden:
+                continue
+
+        await self._write(counts, lengths)
+        await settings.set(guild.id, 'analytics', 'rollups_backfilled', '1')
+        log.info(f"Сводки сообщений сервера {guild.id} заполнены из истории: {total} сообщений")
+        return total
+
+    async def start(self, guild: discord.Guild, days: int = 30) -> None:
+        """Начинает живой учет сервера и запускает заполнение из истории в фоне"""
+        self._mark_live(guild.id, int(time.time()))
+        await self.live_since(guild.id)
+
+        task = self._backfills.get(guild.id)
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(self._run_backfill(guild, days))
+            self._backfills[guild.id] = task
+
+    async def _run_backfill(self, guild: discord.Guild, days: int) -> None:
+        try:
+            await self.backfill(guild, days)
+        except Exception as e:
+            log.error(f"Ошибка заполнения сводок сообщений сервера {guild.id}: {e}")
+
+    def backfilling(self, guild_id: int) -> bool:
+        """Идет ли заполнение из истории для сервера"""
+        task = self._backfills.get(guild_id)
+        return task is not None and not task.done()
+
+    async def window(self, guild_id: int, days: int = 7) -> ActivityWindow:
+        """Сводка активности сервера за последние days дней"""
+        await self.flush()
+        now_hour = hour_of(datetime.now(timezone.utc))
+        start_hour = now_hour - days * 24 + 1
+
+        hourly = np.zeros(days * 24, dtype=np.int64)
+        chars = 0
+        rows = await self.db.fetch_all(
+            f"SELECT hour, SUM(messages) AS messages, SUM(chars) AS chars FROM {Tables.MESSAGE_ROLLUPS} "
+            "WHERE guild_id = ? AND hour >= ? GROUP BY hour",
+            guild_id, start_hour
+        )
+        if rows:
+            hours = np.array([row["hour"] for row in rows], dtype=np.int64) - start_hour
+            values = np.array([row["messages"] for row in rows], dtype=np.int64)
+            inside = (hours >= 0) & (hours < len(hourly))
+            np.add.at(hourly, hours[inside], values[inside])
+            chars = sum(row["chars"] for row in rows)
+
+        # Тепловая карта из почасового ряда: день недели (Пн = 0) и час UTC
+        absolute = np.arange(start_hour, now_hour + 1, dtype=np.int64)
+        heatmap = np.zeros((7, 24), dtype=np.int64)
+        np.add.at(heatmap, ((absolute // 24 + 3) % 7, absolute % 24), hourly)
+
+        lengths = np.zeros(len(LENGTH_LABELS), dtype=np.int64)
+        for row in await self.db.fetch_all(
+            f"SELECT bin, SUM(count) AS count FROM {Tables.MESSAGE_LENGTH_ROLLUPS} "
+            "WHERE guild_id = ? AND hour >= ? GROUP BY bin",
+            guild_id, start_hour
+        ):
+            if 0 <= row["bin"] < len(lengths):
+                lengths[row["bin"]] = row["count"]
+
+        top_users = await self._top("user_id", guild_id, start_hour)
+        top_channels = await self._top("channel_id", guild_id, start_hour)
+        authors = await self.db.fetch_one(
+            f"SELECT COUNT(DISTINCT user_id) AS authors FROM {Tables.MESSAGE_ROLLUPS} WHERE guild_id = ? AND hour >= ?",
+            guild_id, start_hour
+        )
+        periods = await self.db.fetch_one(
+            "SELECT "
+            "COALESCE(SUM(CASE WHEN hour > ? THEN messages END), 0) AS d1, "
+            "COALESCE(SUM(CASE WHEN hour > ? THEN messages END), 0) AS d7, "
+            "COALESCE(SUM(messages), 0) AS d30 "
+            f"FROM {Tables.MESSAGE_ROLLUPS} WHERE guild_id = ? AND hour > ?",
+            now_hour - 24, now_hour - 24 * 7, guild_id, now_hour - 24 * 30
+        )
+
+        return ActivityWindow(
+            start_hour=start_hour,
+            hourly=hourly,
+            heatmap=heatmap,
+            lengths=lengths,
+            top_users=top_users,
+            top_channels=top_channels,
+            periods={"1d": periods["d1"], "7d": periods["d7"], "30d": periods["d30"]},
+            total=int(hourly.sum()),
+            chars=chars,
+            authors=authors["authors"] if authors else 0
+        )
+
+    async def _top(self, column: str, guild_id: int, start_hour: int) -> List[Tuple[int, int]]:
+        rows = await self.db.fetch_all(
+            f"SELECT {column} AS id, SUM(messages) AS messages FROM {Tables.MESSAGE_ROLLUPS} "
+            f"WHERE guild_id = ? AND hour >= ? GROUP BY {column} ORDER BY messages DESC LIMIT ?",
+            guild_id, start_hour, self.TOP_LIMIT
+        )
+        return [(row["id"], row["messages"]) for row in rows]
+
+    async def prune(self, days: Optional[int] = None) -> None:
+        """Удаляет сводки старше срока хранения"""
+        oldest = hour_of(datetime.now(timezone.utc)) - (days or self.RETENTION_DAYS) * 24
+        await self.db.execute(f"DELETE FROM {Tables.MESSAGE_ROLLUPS} WHERE hour < ?", oldest)
+        await self.db.execute(f"DELETE FROM {Tables.MESSAGE_LENGTH_ROLLUPS} WHERE hour < ?", oldest)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика сводок"""
+        return {
+            "pending": len(self._counts),
+            "recorded": self.recorded,
+            "flushes": self.flushes,
+            "backfilling": sum(1 for task in self._backfills.values() if not task.done())
+        }
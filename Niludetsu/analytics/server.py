@@ -1,30 +1,36 @@
-import discord, matplotlib.pyplot as plt, io
-from collections import Counter
-from .base import BaseAnalytics, COLORS
+import discord, io
+from .base import BaseAnalytics, RENDER_SECONDS
+from .aggregates import GuildAggregateTracker
 from Niludetsu import Emojis, Embed
 
 class ServerAnalytics(BaseAnalytics):
     def __init__(self, bot):
         super().__init__()
         self.bot = bot
+        self.aggregates = GuildAggregateTracker.get()
         
-    async def generate_analytics(self, guild):
+    @RENDER_SECONDS.timed(kind="server")
+    async def generate_analytics(self, guild, quick=False):
         """Генерирует аналитику сервера"""
+        # Счетчики поддерживаются событиями шлюза, участники не обходятся
+        aggregates = self.aggregates.aggregates(guild)
+        channel_types = aggregates.channel_types
+        
         # Основная статистика
         total_members = guild.member_count
-        total_humans = len([m for m in guild.members if not m.bot])
-        total_bots = len([m for m in guild.members if m.bot])
+        total_humans = aggregates.humans
+        total_bots = aggregates.bots
         
         # Статистика по статусам
-        statuses = Counter([member.status for member in guild.members])
+        statuses = aggregates.statuses
         
         # Статистика каналов
-        total_channels = len(guild.channels)
-        text_channels = len(guild.text_channels)
-        voice_channels = len(guild.voice_channels)
-        categories = len(guild.categories)
-        forum_channels = len([c for c in guild.channels if isinstance(c, discord.ForumChannel)])
-        stage_channels = len([c for c in guild.channels if isinstance(c, discord.StageChannel)])
+        total_channels = sum(channel_types.values())
+        text_channels = channel_types[discord.ChannelType.text] + channel_types[discord.ChannelType.news]
+        voice_channels = channel_types[discord.ChannelType.voice]
+        categories = channel_types[discord.ChannelType.category]
+        forum_channels = channel_types[discord.ChannelType.forum] + channel_types[discord.ChannelType.media]
+        stage_channels = channel_types[discord.ChannelType.stage_voice]
         
         # Статистика ролей
         roles = len(guild.roles) - 1  # Исключаем @everyone
@@ -38,45 +44,13 @@ class ServerAnalytics(BaseAnalytics):
         # Уровень буста
         boost_level = guild.premium_tier
         boost_count = guild.premium_subscription_count
-        boosters = len(guild.premium_subscribers)
-        
-        # Создаем график активности по дням недели
-        plt.figure(figsize=(10, 5))
-        ax = plt.gca()
-        
-        days = ['Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Вс']
-        member_joins = [0] * 7
-        
-        for member in guild.members:
-            if member.joined_at:
-                day = member.joined_at.weekday()
-                member_joins[day] += 1
-        
-        bars = ax.bar(days, member_joins, color=COLORS['primary'])
-        
-        # Добавляем значения над столбцами
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height)}',
-                   ha='center', va='bottom',
-                   color=COLORS['text'],
-                   fontproperties=self.custom_font)
-        
-        ax.set_title('Статистика присоединений по дням недели')
-        ax.set_xlabel('День недели')
-        ax.set_ylabel('Количество участников')
-        
-        self.style_plot(plt.gcf(), ax)
+        boosters = aggregates.boosters
         
-        # Устанавливаем отступы вручную
-        plt.subplots_adjust(left=0.12, right=0.95, top=0.9, bottom=0.1)
+        # График присоединений по дням недели
+        member_joins = list(aggregates.join_weekdays)
         
-        # Сохраняем график
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', dpi=300)
-        buffer.seek(0)
-        plt.close()
+        # Строим график в пуле процессов
+        buffer = io.BytesIO(await self.render("member_joins", member_joins, quick=quick))
         
         # Создаем эмбед
         embed = Embed(
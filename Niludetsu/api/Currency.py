@@ -1,6 +1,7 @@
 import aiohttp, os
 from typing import Optional, Dict
 from dotenv import load_dotenv
+from ..metrics import http_trace_config
 
 class CurrencyAPI:
     def __init__(self):
@@ -26,7 +27,7 @@ class CurrencyAPI:
 
     async def get_exchange_rate(self, base_currency: str) -> Optional[Dict]:
         """Получение курсов валют через API"""
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=[http_trace_config("currency")]) as session:
             async with session.get(f"{self.api_url}{base_currency}") as response:
                 if response.status == 200:
                     data = await response.json()
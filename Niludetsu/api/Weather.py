@@ -2,6 +2,7 @@ import aiohttp, os
 from typing import Optional, Dict
 from datetime import datetime
 from dotenv import load_dotenv
+from ..metrics import http_trace_config
 
 class WeatherAPI:
     def __init__(self):
@@ -79,7 +80,7 @@ class WeatherAPI:
             'lang': 'ru'
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=[http_trace_config("weather")]) as session:
             async with session.get(self.base_url, params=params) as response:
                 if response.status == 200:
                     return await response.json()
@@ -5,10 +5,27 @@
 from .temp_rooms import TempRoomsManager
 from .level_system import LevelSystem
 from .logger import LoggingState, BaseLogger
+from .log_shipper import LogShipper, LogItem
+from .log_router import LogRouter, WebhookPool
+from .log_journal import LogJournal
+from .log_index import LogIndex
+from .log_coalescer import LogCoalescer
+from .snapshots import SnapshotCache, OverwriteChange, permission_diff, overwrite_changes
 
 __all__ = [
     'TempRoomsManager',
     'LevelSystem',
     'LoggingState',
-    'BaseLogger'
+    'BaseLogger',
+    'LogShipper',
+    'LogItem',
+    'LogRouter',
+    'WebhookPool',
+    'LogJournal',
+    'LogIndex',
+    'LogCoalescer',
+    'SnapshotCache',
+    'OverwriteChange',
+    'permission_diff',
+    'overwrite_changes'
 ] 
\ No newline at end of file
@@ -1,9 +1,15 @@
-import asyncio, random, re, discord
-from typing import Optional, Dict, List, Union
+import asyncio, random, re, discord, logging
+from typing import Optional, Dict, List, Union, Tuple
 from discord.ext import commands, tasks
 from Niludetsu import Database, Embed, Emojis
 
+log = logging.getLogger(__name__)
+
 class LevelSystem:
+    VOICE_XP = 5                # Опыт за один тик в голосовом канале
+    VOICE_INTERVAL = 120        # Период тика в секундах
+    NOTIFY_CONCURRENCY = 8      # Сколько уведомлений и выдач ролей выполняется одновременно
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.db = Database()
@@ -25,6 +31,9 @@ class LevelSystem:
             u"\U000024C2-\U0001F251"
             "]+", flags=re.UNICODE)
         
+        self._notify_semaphore = asyncio.Semaphore(self.NOTIFY_CONCURRENCY)
+        self._dispatch_tasks = set()
+
         # Запускаем проверку голосовых каналов
         self.bot.loop.create_task(self._check_voice_channels_loop())
 
@@ -37,54 +46,100 @@ class LevelSystem:
             int: Количество опыта для следующего уровня
         """
         return 5 * (level ** 2) + 50 * level + 100
+
+    def apply_xp(self, xp: int, level: int) -> Tuple[int, int, List[int]]:
+        """
+        Переводит накопленный опыт в уровни
+        Args:
+            xp (int): Опыт с учетом начисления
+            level (int): Текущий уровень
+        Returns:
+            Tuple[int, int, List[int]]: Остаток опыта, новый уровень и полученные уровни
+        """
+        reached = []
+        next_level_xp = self.calculate_next_level_xp(level)
+        while xp >= next_level_xp:
+            xp -= next_level_xp
+            level += 1
+            reached.append(level)
+            next_level_xp = self.calculate_next_level_xp(level)
+        return xp, level, reached
         
     async def _check_voice_channels_loop(self) -> None:
-        """Бесконечный цикл проверки голосовых каналов"""
+        """Бесконечный цикл проверки голосовых каналов
+        
+        Тики идут по расписанию от момента запуска, поэтому время обработки
+        не сдвигает интервал. Пропущенные тики не догоняются.
+        """
         await self.bot.wait_until_ready()
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         while not self.bot.is_closed():
-            await self._check_voice_channels()
-            await asyncio.sleep(120)
-
-    async def _check_voice_channels(self) -> None:
-        """Проверка пользователей в голосовых каналах и начисление опыта"""
+            try:
+                await self._check_voice_channels()
+            except Exception as e:
+                log.error(f"Ошибка при начислении опыта в голосовых каналах: {e}")
+
+            next_tick += self.VOICE_INTERVAL
+            now = loop.time()
+            if next_tick < now:
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
+
+    def _voice_members(self) -> Dict[str, discord.Member]:
+        """Снимок участников голосовых каналов, которым положен опыт"""
+        members = {}
         for guild in self.bot.guilds:
-            text_channel = guild.get_channel(self.NOTIFICATION_CHANNEL_ID)
-            if not text_channel:
+            if not guild.get_channel(self.NOTIFICATION_CHANNEL_ID):
                 continue
 
             for voice_channel in guild.voice_channels:
                 if voice_channel.category and voice_channel.category.id == self.CATEGORY_ID:
                     for member in voice_channel.members:
-                        if member.bot:
-                            continue
-                        await self._process_voice_xp(member)
+                        if not member.bot:
+                            members.setdefault(str(member.id), member)
+        return members
 
-    async def _process_voice_xp(self, member: discord.Member) -> None:
-        """
-        Обработка опыта за голосовой канал
-        Args:
-            member (discord.Member): Участник для обработки
-        """
-        user_id = str(member.id)
-        user = await self.db.get_row("users", user_id=user_id)
-        if not user:
-            user = await self.db.insert("users", {
-                'user_id': user_id,
-                'balance': 0,
-                'deposit': 0,
-                'xp': 0,
-                'level': 1,
-                'roles': '[]'
-            })
-
-        xp = user.get('xp', 0)
-        level = user.get('level', 1)
+    async def _check_voice_channels(self) -> None:
+        """Проверка пользователей в голосовых каналах и начисление опыта
         
-        # Начисляем опыт за голосовой канал
-        xp += 5
+        Опыт всех участников считается за один проход и записывается одним
+        executemany, уведомления о новых уровнях отправляются в фоне.
+        """
+        members = self._voice_members()
+        if not members:
+            return
 
-        # Проверяем повышение уровня
-        await self._check_level_up(member, user_id, xp, level)
+        # Отсутствующие записи загружаются одним запросом, дальше начисление идет без обращений к базе
+        await self.db.users.get_many(members)
+        level_ups = []
+        for user_id, member in members.items():
+            reached = await self.add_xp(user_id, self.VOICE_XP)
+            if reached:
+                level_ups.append((member, reached))
+
+        await self.db.users.flush()
+
+        if level_ups:
+            task = asyncio.create_task(self._dispatch_level_ups(level_ups))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch_level_ups(self, level_ups: List[Tuple[discord.Member, List[int]]]) -> None:
+        """Отправляет уведомления и выдает роли с ограничением параллельности"""
+        async def announce(member: discord.Member, reached: List[int]) -> None:
+            async with self._notify_semaphore:
+                for level in reached:
+                    await self._level_up_notification(member, level)
+                    await self._give_role_by_level(member, level)
+
+        results = await asyncio.gather(
+            *(announce(member, reached) for member, reached in level_ups),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                log.error(f"Ошибка при обработке нового уровня: {result}")
 
     async def _level_up_notification(self, member: discord.Member, level: int) -> None:
         """
@@ -132,31 +187,25 @@ class LevelSystem:
             if role and role not in member.roles:
                 await member.add_roles(role)
 
-    async def _check_level_up(self, member: discord.Member, user_id: str, xp: int, level: int) -> None:
+    async def add_xp(self, user_id: str, amount: int) -> List[int]:
         """
-        Проверка и обработка повышения уровня
+        Начисляет опыт в кэше пользователей
         Args:
-            member (discord.Member): Участник для проверки
             user_id (str): ID участника
-            xp (int): Текущий опыт
-            level (int): Текущий уровень
+            amount (int): Начисляемый опыт
+        Returns:
+            List[int]: Полученные уровни
         """
-        next_level_xp = self.calculate_next_level_xp(level)
-        while xp >= next_level_xp:
-            xp -= next_level_xp
-            level += 1
-            await self._level_up_notification(member, level)
-            await self._give_role_by_level(member, level)
-            next_level_xp = self.calculate_next_level_xp(level)
+        reached = []
 
-        await self.db.update(
-            "users",
-            where={"user_id": user_id},
-            values={
-                "xp": xp,
-                "level": level
-            }
-        )
+        def gain(user: Dict[str, int]) -> Dict[str, int]:
+            xp, level, new_levels = self.apply_xp(user['xp'] + amount, user['level'])
+            reached.extend(new_levels)
+            return {'xp': xp, 'level': level}
+
+        # Опыт записывается до отправки уведомлений: следующее сообщение уже видит новый уровень
+        await self.db.users.update(user_id, gain)
+        return reached
 
     async def process_message(self, message: discord.Message) -> None:
         """
@@ -172,14 +221,10 @@ class LevelSystem:
         if message.content and not message_without_emoji.strip():
             return
 
-        user_id = str(message.author.id)
-        user = await self.db.ensure_user(user_id)
-
-        xp = user.get('xp', 0)
-        level = user.get('level', 1)
-
         # Начисляем опыт за сообщение
         if len(message.content) >= 7:
             xp_gain = min(len(message.content) // 7, 5)
-            xp += xp_gain
-            await self._check_level_up(message.author, user_id, xp, level) 
\ No newline at end of file
+            reached = await self.add_xp(str(message.author.id), xp_gain)
+            for new_level in reached:
+                await self._level_up_notification(message.author, new_level)
+                await self._give_role_by_level(message.author, new_level)
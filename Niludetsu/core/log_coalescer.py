@@ -0,0 +1,99 @@
+"""
+Объединение частых событий логирования
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+log = logging.getLogger(__name__)
+
+Flush = Callable[[Any, Any, int], Awaitable[None]]
+
+@dataclass
+class PendingEvent:
+    """Накопленные изменения одного объекта"""
+    before: Any
+    after: Any
+    flush: Flush
+    count: int = 1
+
+class LogCoalescer:
+    """Склеивает события одного объекта в пределах окна
+
+    Первое событие по ключу (категория, объект) открывает окно. Пока окно
+    открыто, следующие события только обновляют последнее состояние и
+    счетчик. По истечении окна вызывается flush(первое_до, последнее_после,
+    количество), поэтому десять переключений микрофона дают одну запись.
+    """
+
+    WINDOW = 5.0    # Окно по умолчанию в секундах
+
+    def __init__(self, window: Optional[float] = None):
+        self.window = window if window is not None else self.WINDOW
+        self._pending: Dict[Hashable, PendingEvent] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+        self.received = 0
+        self.emitted = 0
+
+    async def push(self, key: Hashable, before: Any, after: Any, flush: Flush, window: Optional[float] = None) -> None:
+        """Добавляет событие
+
+        Args:
+            key (Hashable): Ключ объекта, например (категория, ID участника)
+            before (Any): Состояние до события
+            after (Any): Состояние после события
+            flush (Flush): Отправляет итоговую запись
+            window (Optional[float]): Окно для этого события, 0 - без объединения
+        """
+        self.received += 1
+        window = self.window if window is None else window
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending.after = after
+            pending.flush = flush
+            pending.count += 1
+            return
+
+        if window <= 0:
+            self.emitted += 1
+            await flush(before, after, 1)
+            return
+
+        self._pending[key] = PendingEvent(before, after, flush)
+        self._timers[key] = asyncio.get_running_loop().call_later(window, self._expire, key)
+
+    def _expire(self, key: Hashable) -> None:
+        task = asyncio.get_running_loop().create_task(self._flush(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, key: Hashable) -> None:
+        self._timers.pop(key, None)
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        self.emitted += 1
+        try:
+            await pending.flush(pending.before, pending.after, pending.count)
+        except Exception as e:
+            log.error(f"Ошибка при отправке объединенного события: {e}")
+
+    async def close(self) -> None:
+        """Сразу отправляет все накопленные события"""
+        for timer in self._timers.values():
+            timer.cancel()
+        await asyncio.gather(*(self._flush(key) for key in list(self._pending)))
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика объединения"""
+        return {
+            "pending": len(self._pending),
+            "received": self.received,
+            "emitted": self.emitted,
+            "window": self.window
+        }
@@ -0,0 +1,203 @@
+"""
+Поисковый индекс событий логирования
+"""
+import asyncio, re, discord, logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple, Union
+from ..database.db import Database
+from ..database.tables import Tables
+
+log = logging.getLogger(__name__)
+
+USER_MENTION = re.compile(r"<@!?(\d+)>")
+OBJECT_MENTION = re.compile(r"<(?:#|@&)(\d+)>")
+CUSTOM_EMOJI = re.compile(r"<a?:\w+:\d+>")
+QUERY_TERM = re.compile(r"\w+", re.UNICODE)
+
+Snowflake = Union[int, str, discord.abc.Snowflake, None]
+
+def _snowflake(value: Snowflake) -> Optional[str]:
+    if value is None:
+        return None
+    return str(getattr(value, "id", value))
+
+@dataclass
+class IndexEntry:
+    """Событие, ожидающее записи в индекс"""
+    guild_id: Optional[str]
+    category: Optional[str]
+    event_type: Optional[str]
+    actor_id: Optional[str]
+    target_id: Optional[str]
+    title: str
+    body: str
+    created_at: str
+
+class LogIndex:
+    """Полнотекстовый индекс событий в таблице log_index
+
+    Заголовок и текст эмбеда попадают в FTS5-таблицу log_index_fts, а
+    сервер, категория, участник, объект и время - в обычные колонки с
+    индексами, поэтому поиск вида "удаления пользователя за неделю"
+    выполняется локально без запросов к истории Discord. Записи копятся
+    в памяти и пишутся пачками одним executemany.
+    """
+
+    FLUSH_SIZE = 50         # Записей в пачке
+    FLUSH_INTERVAL = 2.0    # Максимальная задержка записи в секундах
+    RETENTION_DAYS = 90     # Сколько дней хранить события в индексе
+    PAGE_SIZE = 10
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or Database()
+        self._buffer: List[IndexEntry] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+        self._lock = asyncio.Lock()
+        self.indexed = 0
+        self.searches = 0
+
+    @staticmethod
+    def entry(embed: discord.Embed, guild_id: Snowflake, category: Optional[str], event_type: Optional[str] = None,
+              actor: Snowflake = None, target: Snowflake = None) -> IndexEntry:
+        """Готовит запись индекса из эмбеда
+
+        Если участник не указан, им считается первый упомянутый пользователь,
+        объектом - второй упомянутый пользователь или первый канал/роль.
+        """
+        parts = [embed.description or ""]
+        for field in embed.fields:
+            parts.append(f"{field.name}: {field.value}")
+        body = CUSTOM_EMOJI.sub("", "\n".join(parts)).strip()
+        title = CUSTOM_EMOJI.sub("", embed.title or "").strip()
+
+        actor_id, target_id = _snowflake(actor), _snowflake(target)
+        if actor_id is None or target_id is None:
+            users = [user_id for user_id in USER_MENTION.findall(body) if user_id != actor_id]
+            if actor_id is None and users:
+                actor_id = users.pop(0)
+            if target_id is None:
+                objects = OBJECT_MENTION.findall(body)
+                target_id = users[0] if users else objects[0] if objects else None
+
+        # Время индексации, а не timestamp эмбеда: у удаленного сообщения там время отправки
+        return IndexEntry(
+            _snowflake(guild_id), category, event_type, actor_id, target_id, title, body,
+            discord.utils.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        )
+
+    def add(self, entry: IndexEntry) -> None:
+        """Ставит запись в очередь на индексацию"""
+        self._buffer.append(entry)
+        if len(self._buffer) >= self.FLUSH_SIZE:
+            self._spawn(0)
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._spawn(self.FLUSH_INTERVAL)
+
+    def _spawn(self, delay: float) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._delayed_flush(delay))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _delayed_flush(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            await self.flush()
+        except Exception as e:
+            log.error(f"Ошибка записи в индекс логов: {e}")
+
+    async def flush(self) -> None:
+        """Записывает накопленные события"""
+        async with self._lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            try:
+                await self.db.executemany(
+                    f"INSERT INTO {Tables.LOG_INDEX} "
+                    "(guild_id, category, event_type, actor_id, target_id, title, body, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (e.guild_id, e.category, e.event_type, e.actor_id, e.target_id, e.title, e.body, e.created_at)
+                        for e in batch
+                    ]
+                )
+            except BaseException:
+                # Вернем записи в начало буфера, чтобы они попали в следующий сброс
+                self._buffer[:0] = batch
+                raise
+            self.indexed += len(batch)
+
+    @staticmethod
+    def match_query(text: str) -> Optional[str]:
+        """Превращает пользовательский запрос в выражение FTS5
+
+        Каждое слово ищется по префиксу ("удал" найдет "удалено"), слова
+        объединяются через AND. Операторы FTS5 экранируются.
+        """
+        terms = QUERY_TERM.findall(text or "")
+        if not terms:
+            return None
+        return " ".join(f'"{term}"*' for term in terms)
+
+    async def search(self, guild_id: Snowflake, query: Optional[str] = None, category: Optional[str] = None,
+                     user: Snowflake = None, since: Optional[timedelta] = None,
+                     page: int = 0, page_size: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Ищет события сервера
+
+        Args:
+            guild_id (Snowflake): Сервер
+            query (Optional[str]): Слова для полнотекстового поиска
+            category (Optional[str]): Категория логгера
+            user (Snowflake): Участник или объект события
+            since (Optional[timedelta]): Только события за этот период
+            page (int): Номер страницы с нуля
+            page_size (Optional[int]): Записей на странице
+
+        Returns:
+            Tuple[List[Dict[str, Any]], bool]: Записи страницы и признак следующей страницы
+        """
+        await self.flush()
+        self.searches += 1
+        page_size = page_size or self.PAGE_SIZE
+
+        conditions, params = ["i.guild_id = ?"], [_snowflake(guild_id)]
+        source = f"{Tables.LOG_INDEX} i"
+        match = self.match_query(query)
+        if match:
+            source = f"{Tables.LOG_INDEX}_fts f JOIN {Tables.LOG_INDEX} i ON i.id = f.rowid"
+            conditions.append(f"{Tables.LOG_INDEX}_fts MATCH ?")
+            params.append(match)
+        if category:
+            conditions.append("i.category = ?")
+            params.append(category)
+        if user is not None:
+            conditions.append("(i.actor_id = ? OR i.target_id = ?)")
+            params.extend([_snowflake(user)] * 2)
+        if since is not None:
+            conditions.append("i.created_at >= ?")
+            params.append((datetime.now(timezone.utc) - since).strftime("%Y-%m-%d %H:%M:%S"))
+
+        rows = await self.db.fetch_all(
+            "SELECT i.id, i.category, i.event_type, i.actor_id, i.target_id, i.title, i.body, i.created_at "
+            f"FROM {source} WHERE {' AND '.join(conditions)} "
+            "ORDER BY i.created_at DESC, i.id DESC LIMIT ? OFFSET ?",
+            *params, page_size + 1, page * page_size
+        )
+        return rows[:page_size], len(rows) > page_size
+
+    async def prune(self, days: Optional[int] = None) -> None:
+        """Удаляет события старше срока хранения и уплотняет FTS-индекс"""
+        await self.flush()
+        await self.db.execute(
+            f"DELETE FROM {Tables.LOG_INDEX} WHERE created_at < datetime('now', ?)",
+            f"-{days or self.RETENTION_DAYS} days"
+        )
+        await self.db.execute(f"INSERT INTO {Tables.LOG_INDEX}_fts({Tables.LOG_INDEX}_fts) VALUES ('optimize')")
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика индекса"""
+        return {"buffered": len(self._buffer), "indexed": self.indexed, "searches": self.searches}
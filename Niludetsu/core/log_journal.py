@@ -0,0 +1,120 @@
+"""
+Локальный журнал событий логирования
+"""
+import asyncio, json, discord, logging
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Iterable
+from ..database.db import Database
+from ..database.tables import Tables
+from .log_shipper import LogShipper
+
+log = logging.getLogger(__name__)
+
+class LogJournal:
+    """Журнал событий логирования в таблице log_journal
+
+    Каждое событие сначала дописывается в журнал и только потом ставится в
+    очередь отправки. После отправки запись помечается доставленной, а
+    недоставленные записи (ошибка отправки, перезапуск посреди всплеска)
+    повторно отправляются при запуске. Вложения в журнал не попадают.
+    """
+
+    REPLAY_BATCH = 100      # Записей за один запрос при повторной отправке
+    RETENTION_DAYS = 30     # Сколько дней хранить доставленные записи
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or Database()
+        self._boundary: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self.appended = 0
+        self.delivered = 0
+        self.replayed = 0
+
+    async def _ensure_open(self) -> int:
+        """Запоминает последнюю запись прошлых запусков
+
+        Повторно отправляются только записи до этой границы, новые события
+        текущего запуска уже находятся в очередях.
+        """
+        if self._boundary is None:
+            async with self._lock:
+                if self._boundary is None:
+                    row = await self.db.fetch_one(f"SELECT COALESCE(MAX(id), 0) AS last_id FROM {Tables.LOG_JOURNAL}")
+                    self._boundary = row["last_id"]
+        return self._boundary
+
+    async def append(self, category: Optional[str], priority: int, embed: discord.Embed) -> Optional[int]:
+        """Дописывает событие в журнал
+
+        Returns:
+            Optional[int]: ID записи
+        """
+        await self._ensure_open()
+        rows = await self.db.execute(
+            f"INSERT INTO {Tables.LOG_JOURNAL} (category, priority, payload) VALUES (?, ?, ?) RETURNING id",
+            category, priority, json.dumps(embed.to_dict(), ensure_ascii=False)
+        )
+        self.appended += 1
+        return rows[0][0] if rows else None
+
+    async def mark_delivered(self, ids: Iterable[int]) -> None:
+        """Помечает записи доставленными"""
+        ids = [journal_id for journal_id in ids if journal_id is not None]
+        if not ids:
+            return
+        await self.db.execute(
+            f"UPDATE {Tables.LOG_JOURNAL} SET delivered_at = CURRENT_TIMESTAMP "
+            f"WHERE id IN ({', '.join('?' * len(ids))})",
+            *ids
+        )
+        self.delivered += len(ids)
+
+    async def pending(self, after_id: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Недоставленные записи прошлых запусков по порядку"""
+        boundary = await self._ensure_open()
+        return await self.db.fetch_all(
+            f"SELECT id, category, priority, payload FROM {Tables.LOG_JOURNAL} "
+            "WHERE delivered_at IS NULL AND id > ? AND id <= ? ORDER BY id LIMIT ?",
+            after_id, boundary, limit or self.REPLAY_BATCH
+        )
+
+    async def replay(self, shipper_for: Callable[[Optional[str]], Awaitable[LogShipper]]) -> int:
+        """Повторно ставит в очереди недоставленные записи
+
+        Args:
+            shipper_for (Callable): Возвращает очередь для категории
+
+        Returns:
+            int: Количество поставленных в очередь записей
+        """
+        replayed, last_id = 0, 0
+        while True:
+            rows = await self.pending(last_id)
+            if not rows:
+                break
+            for row in rows:
+                last_id = row["id"]
+                try:
+                    embed = discord.Embed.from_dict(json.loads(row["payload"]))
+                except (TypeError, ValueError) as e:
+                    log.error(f"Поврежденная запись журнала логов {row['id']}: {e}")
+                    await self.mark_delivered([row["id"]])
+                    continue
+                shipper = await shipper_for(row["category"])
+                await shipper.submit(embed, priority=row["priority"], journal_id=row["id"])
+                replayed += 1
+
+        self.replayed += replayed
+        if replayed:
+            log.info(f"Повторно отправлено событий из журнала логов: {replayed}")
+        return replayed
+
+    async def prune(self, days: Optional[int] = None) -> None:
+        """Удаляет доставленные записи старше срока хранения"""
+        await self.db.execute(
+            f"DELETE FROM {Tables.LOG_JOURNAL} WHERE delivered_at IS NOT NULL AND created_at < datetime('now', ?)",
+            f"-{days or self.RETENTION_DAYS} days"
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика журнала"""
+        return {"appended": self.appended, "delivered": self.delivered, "replayed": self.replayed}
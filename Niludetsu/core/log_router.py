@@ -0,0 +1,152 @@
+"""
+Маршрутизация логов по категориям
+"""
+import asyncio, discord, logging
+from typing import Optional, Dict, List, Tuple, Callable, Awaitable
+from ..utils.settings import Settings
+from .log_shipper import LogShipper
+
+log = logging.getLogger(__name__)
+
+class WebhookPool:
+    """Вебхуки бота в одном канале
+
+    Каждая категория получает свой вебхук (у каждого вебхука свой лимит
+    Discord). Если вебхуков в канале уже MAX_WEBHOOKS, категория делит
+    вебхук с наименее загруженной.
+    """
+
+    MAX_WEBHOOKS = 10   # Discord разрешает 15 вебхуков на канал, оставляем запас
+
+    def __init__(self, channel: discord.TextChannel, bot_user: discord.ClientUser):
+        self.channel = channel
+        self.bot_user = bot_user
+        self._webhooks: Optional[List[discord.Webhook]] = None
+        self._assigned: Dict[str, discord.Webhook] = {}
+        self._lock = asyncio.Lock()
+
+    def webhook_name(self, category: Optional[str] = None) -> str:
+        """Имя вебхука категории"""
+        name = f"{self.bot_user.name} Logger"
+        return f"{name} · {category}" if category else name
+
+    async def get(self, category: Optional[str] = None) -> discord.Webhook:
+        """Вебхук для категории, при необходимости создается"""
+        if category in self._assigned:
+            return self._assigned[category]
+
+        async with self._lock:
+            if category in self._assigned:
+                return self._assigned[category]
+
+            if self._webhooks is None:
+                self._webhooks = [
+                    webhook for webhook in await self.channel.webhooks()
+                    if webhook.user and webhook.user.id == self.bot_user.id
+                ]
+
+            name = self.webhook_name(category)
+            webhook = discord.utils.get(self._webhooks, name=name)
+            if webhook is None and len(self._webhooks) < self.MAX_WEBHOOKS:
+                webhook = await self.channel.create_webhook(name=name)
+                self._webhooks.append(webhook)
+            if webhook is None:
+                usage = {w.id: 0 for w in self._webhooks}
+                for assigned in self._assigned.values():
+                    usage[assigned.id] = usage.get(assigned.id, 0) + 1
+                webhook = min(self._webhooks, key=lambda w: usage[w.id])
+
+            self._assigned[category] = webhook
+            return webhook
+
+class LogRouter:
+    """Направляет логи каждой категории в ее канал со своей очередью
+
+    Канал категории берется из настройки logging/channel_<категория>, иначе
+    используется основной канал логов. У каждой категории свой вебхук и
+    своя очередь отправки, поэтому поток правок сообщений не задерживает
+    логи банов или ролей.
+    """
+
+    def __init__(self, bot: discord.Client, fallback: Callable[[], LogShipper],
+                 max_queue: int = 1000, interval: float = 1.0,
+                 on_delivered: Optional[Callable[[List[int]], Awaitable[None]]] = None):
+        """
+        Args:
+            bot (discord.Client): Бот
+            fallback (Callable): Возвращает общую очередь для логов без маршрута
+            max_queue (int): Размер очереди каждой категории
+            interval (float): Начальная пауза между отправками
+            on_delivered (Optional[Callable]): Передается очередям для отметки в журнале
+        """
+        self.bot = bot
+        self.fallback = fallback
+        self.max_queue = max_queue
+        self.interval = interval
+        self.on_delivered = on_delivered
+        self.settings = Settings()
+        self._pools: Dict[int, WebhookPool] = {}
+        self._routes: Dict[str, Tuple[int, LogShipper]] = {}
+        self._lock = asyncio.Lock()
+
+    async def channel_id(self, category: str) -> Optional[int]:
+        """Канал логов категории"""
+        value = (
+            await self.settings.get(None, 'logging', f'channel_{category}')
+            or await self.settings.get(None, 'logging', 'main_channel')
+        )
+        return int(value) if value else None
+
+    async def shipper_for(self, category: Optional[str]) -> LogShipper:
+        """Очередь отправки для категории"""
+        if not category:
+            return self.fallback()
+
+        channel_id = await self.channel_id(category)
+        route = self._routes.get(category)
+        if route is not None and route[0] == channel_id:
+            return route[1]
+        if channel_id is None:
+            return self.fallback()
+
+        async with self._lock:
+            route = self._routes.get(category)
+            if route is not None and route[0] == channel_id:
+                return route[1]
+
+            channel = self.bot.get_channel(channel_id)
+            if not isinstance(channel, discord.TextChannel):
+                return self.fallback()
+
+            pool = self._pools.get(channel_id)
+            if pool is None:
+                pool = self._pools[channel_id] = WebhookPool(channel, self.bot.user)
+            try:
+                target = await pool.get(category)
+            except discord.HTTPException as e:
+                # Без вебхука отправляем напрямую в канал, очередь остается отдельной
+                log.error(f"Не удалось получить вебхук для логов {category}: {e}")
+                target = channel
+
+            shipper = LogShipper(
+                lambda: target,
+                max_queue=self.max_queue,
+                interval=self.interval,
+                name=category,
+                on_delivered=self.on_delivered
+            )
+            self._routes[category] = (channel_id, shipper)
+
+        if route is not None:
+            # Канал категории сменился: старая очередь дописывает свое в фоне
+            asyncio.create_task(route[1].close())
+        return shipper
+
+    async def close(self) -> None:
+        """Отправляет оставшиеся логи всех категорий"""
+        routes, self._routes = self._routes, {}
+        await asyncio.gather(*(shipper.close() for _, shipper in routes.values()))
+
+    def stats(self) -> Dict[str, dict]:
+        """Статистика очередей по категориям"""
+        return {category: shipper.stats() for category, (_, shipper) in self._routes.items()}
@@ -0,0 +1,285 @@
+"""
+Очередь отправки логов в Discord
+"""
+import asyncio, time, discord, logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, List, Callable, Awaitable, Deque, Dict, Any, Union
+
+log = logging.getLogger(__name__)
+
+LogTarget = Union[discord.Webhook, discord.abc.Messageable]
+
+@dataclass
+class LogItem:
+    """Событие в очереди отправки"""
+    embed: discord.Embed
+    priority: int
+    files: List[discord.File] = field(default_factory=list)
+    created_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+    journal_id: Optional[int] = None
+
+class LogShipper:
+    """Фоновая отправка логов пачками
+
+    События копятся в ограниченной очереди, фоновая задача упаковывает до 10
+    эмбедов в один вызов вебхука. Пауза между вызовами подстраивается под
+    ограничения Discord: растет при 429 (по заголовкам X-RateLimit-Reset-After /
+    Retry-After) и при долгих вызовах, когда discord.py сам ждал сброса лимита,
+    и постепенно уменьшается, пока отправка идет без задержек.
+
+    Когда очередь заполнена, события с низким приоритетом отбрасываются
+    (сначала новое низкоприоритетное, иначе самое старое из очереди),
+    а остальные ждут освобождения места.
+    """
+
+    LOW, NORMAL, HIGH = 0, 1, 2
+
+    MAX_EMBEDS = 10         # Эмбедов в одном сообщении
+    MAX_CHARS = 6000        # Суммарный размер эмбедов в одном сообщении
+    MAX_ATTEMPTS = 3        # Попыток отправки при 429 и ошибках сервера
+    SLOW_SEND = 1.0         # Вызов дольше этого значит, что уперлись в лимит
+
+    def __init__(
+        self,
+        get_target: Callable[[], Optional[LogTarget]],
+        max_queue: int = 1000,
+        interval: float = 1.0,
+        min_interval: float = 0.4,
+        max_interval: float = 60.0,
+        name: str = "main",
+        on_delivered: Optional[Callable[[List[int]], Awaitable[None]]] = None
+    ):
+        """
+        Args:
+            get_target (Callable): Возвращает вебхук или канал для отправки
+            max_queue (int): Максимальный размер очереди
+            interval (float): Начальная пауза между вызовами в секундах
+            min_interval (float): Минимальная пауза между вызовами
+            max_interval (float): Максимальная пауза между вызовами
+            name (str): Имя очереди для статистики
+            on_delivered (Optional[Callable]): Получает ID записей журнала, которые больше не нужно отправлять
+        """
+        self.get_target = get_target
+        self.max_queue = max_queue
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.name = name
+        self.on_delivered = on_delivered
+
+        self._queue: Deque[LogItem] = deque()
+        self._cond = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        # Статистика
+        self.sent_events = 0
+        self.sent_messages = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.failed = 0
+        self.retried = 0
+        self.rate_limited = 0
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self.last_sent_at: Optional[float] = None
+
+    def _ensure_started(self) -> None:
+        """Запускает фоновую отправку при первом событии"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _drop_low(self) -> bool:
+        """Удаляет самое старое низкоприоритетное событие из очереди"""
+        for item in self._queue:
+            if item.priority <= self.LOW:
+                self._queue.remove(item)
+                self.dropped += 1
+                return True
+        return False
+
+    async def submit(
+        self,
+        embed: discord.Embed,
+        priority: int = NORMAL,
+        files: Optional[List[discord.File]] = None,
+        journal_id: Optional[int] = None
+    ) -> bool:
+        """Ставит событие в очередь
+
+        Returns:
+            bool: False, если событие было отброшено
+        """
+        if self._closing:
+            self.dropped += 1
+            return False
+
+        async with self._cond:
+            if len(self._queue) >= self.max_queue:
+                if priority <= self.LOW:
+                    self.dropped += 1
+                    return False
+                if not self._drop_low():
+                    self.blocked += 1
+                    await self._cond.wait_for(lambda: len(self._queue) < self.max_queue or self._closing)
+                    if self._closing:
+                        self.dropped += 1
+                        return False
+
+            self._queue.append(LogItem(embed, priority, list(files or []), journal_id=journal_id))
+            self._cond.notify_all()
+
+        self._ensure_started()
+        return True
+
+    def _take_batch(self) -> List[LogItem]:
+        """Забирает из очереди события для одного сообщения"""
+        first = self._queue.popleft()
+        batch, chars = [first], len(first.embed)
+        # Вложения отправляются отдельным сообщением
+        if first.files:
+            return batch
+
+        while self._queue and len(batch) < self.MAX_EMBEDS:
+            item = self._queue[0]
+            if item.files or chars + len(item.embed) > self.MAX_CHARS:
+                break
+            batch.append(self._queue.popleft())
+            chars += len(item.embed)
+        return batch
+
+    async def _run(self) -> None:
+        """Фоновая отправка"""
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: self._queue or self._closing)
+                if not self._queue:
+                    return
+                batch = self._take_batch()
+                self._cond.notify_all()
+
+            await self._send(batch)
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    def _retry_after(error: discord.HTTPException) -> Optional[float]:
+        """Время ожидания из заголовков ответа Discord"""
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        for header in ("X-RateLimit-Reset-After", "Retry-After"):
+            try:
+                return float(headers[header])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return None
+
+    def _slow_down(self, retry_after: Optional[float] = None) -> None:
+        self.interval = min(self.max_interval, max(self.interval * 2, retry_after or 0.0, self.min_interval))
+
+    def _speed_up(self) -> None:
+        self.interval = max(self.min_interval, self.interval * 0.9)
+
+    async def _requeue(self, batch: List[LogItem]) -> None:
+        """Возвращает пачку в начало очереди для повторной отправки"""
+        retry = [item for item in batch if item.attempts < self.MAX_ATTEMPTS]
+        self.failed += len(batch) - len(retry)
+        self.retried += len(retry)
+        for item in retry:
+            for file in item.files:
+                file.reset()
+        async with self._cond:
+            self._queue.extendleft(reversed(retry))
+            self._cond.notify_all()
+
+    async def _send(self, batch: List[LogItem]) -> None:
+        """Отправляет одно сообщение с пачкой эмбедов"""
+        target = self.get_target()
+        if target is None:
+            self.failed += len(batch)
+            return
+
+        for item in batch:
+            item.attempts += 1
+
+        kwargs: Dict[str, Any] = {"embeds": [item.embed for item in batch]}
+        files = [file for item in batch for file in item.files]
+        if files:
+            kwargs["files"] = files
+
+        started = time.monotonic()
+        try:
+            await target.send(**kwargs)
+        except discord.HTTPException as e:
+            if e.status == 429 or e.status >= 500:
+                if e.status == 429:
+                    self.rate_limited += 1
+                self._slow_down(self._retry_after(e))
+                await self._requeue(batch)
+            else:
+                # Повтор не поможет, поэтому запись журнала тоже закрываем
+                self.failed += len(batch)
+                log.error(f"Ошибка Discord API при отправке логов ({self.name}): {e}")
+                await self._delivered(batch)
+            return
+        except Exception as e:
+            self.failed += len(batch)
+            log.error(f"Ошибка при отправке логов ({self.name}): {e}")
+            return
+
+        now = time.monotonic()
+        if now - started > self.SLOW_SEND:
+            self._slow_down()
+        else:
+            self._speed_up()
+
+        self.sent_events += len(batch)
+        self.sent_messages += 1
+        self.last_sent_at = now
+        self.lag_last = now - batch[0].created_at
+        self.lag_max = max(self.lag_max, self.lag_last)
+        await self._delivered(batch)
+
+    async def _delivered(self, batch: List[LogItem]) -> None:
+        """Сообщает журналу об обработанных событиях"""
+        if self.on_delivered is None:
+            return
+        ids = [item.journal_id for item in batch if item.journal_id is not None]
+        if not ids:
+            return
+        try:
+            await self.on_delivered(ids)
+        except Exception as e:
+            log.error(f"Ошибка при отметке доставки логов ({self.name}): {e}")
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Отправляет оставшиеся события и останавливает очередь"""
+        async with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=timeout)
+            except asyncio.TimeoutError:
+                self.failed += len(self._queue)
+                self._queue.clear()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика очереди для мониторинга"""
+        return {
+            "name": self.name,
+            "depth": len(self._queue),
+            "max_queue": self.max_queue,
+            "oldest_age": round(time.monotonic() - self._queue[0].created_at, 3) if self._queue else 0.0,
+            "sent_events": self.sent_events,
+            "sent_messages": self.sent_messages,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "failed": self.failed,
+            "retried": self.retried,
+            "rate_limited": self.rate_limited,
+            "interval": round(self.interval, 3),
+            "lag_last": round(self.lag_last, 3),
+            "lag_max": round(self.lag_max, 3)
+        }
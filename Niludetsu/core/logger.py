@@ -2,22 +2,39 @@
 Система логирования Niludetsu
 """
 import discord
-from typing import Union, Optional, Dict, Any, List
+import logging
+from typing import Union, Optional, Dict, Any, List, Callable, Awaitable
 from datetime import datetime
+from contextvars import ContextVar
 import asyncio
 
 from ..database.db import Database
+from ..utils.settings import Settings
 from ..utils.embed import Embed
+from .log_shipper import LogShipper
+from .log_router import LogRouter
+from .log_journal import LogJournal
+from .log_coalescer import LogCoalescer
+from .log_index import LogIndex
+
+log = logging.getLogger(__name__)
 
 class LoggingState:
     """Глобальное состояние системы логирования"""
     webhook: Optional[discord.Webhook] = None
     log_channel: Optional[discord.TextChannel] = None
     initialized: bool = False
-    last_message_time: Optional[datetime] = None
     initialized_loggers: List[str] = []
     rate_limit_delay: float = 1.0
     initialization_in_progress: bool = False
+    max_queue: int = 1000
+    shipper: Optional[LogShipper] = None
+    router: Optional[LogRouter] = None
+    journal: Optional[LogJournal] = None
+    coalescer: Optional[LogCoalescer] = None
+    index: Optional[LogIndex] = None
+    # ID сервера обрабатываемого события; задачи и таймеры объединения наследуют его
+    event_guild: ContextVar[Optional[int]] = ContextVar("log_event_guild", default=None)
 
     @classmethod
     def initialize(cls, channel: discord.TextChannel) -> None:
@@ -27,11 +44,85 @@ class LoggingState:
         cls.log_channel = channel
         cls.initialized = True
 
+    @classmethod
+    def get_journal(cls) -> LogJournal:
+        """Журнал событий логирования"""
+        if cls.journal is None:
+            cls.journal = LogJournal()
+        return cls.journal
+
+    @classmethod
+    def get_index(cls) -> LogIndex:
+        """Поисковый индекс событий"""
+        if cls.index is None:
+            cls.index = LogIndex()
+        return cls.index
+
+    @classmethod
+    def get_coalescer(cls) -> LogCoalescer:
+        """Объединение частых событий"""
+        if cls.coalescer is None:
+            cls.coalescer = LogCoalescer()
+        return cls.coalescer
+
+    @classmethod
+    def get_shipper(cls) -> LogShipper:
+        """Общая очередь отправки логов"""
+        if cls.shipper is None:
+            cls.shipper = LogShipper(
+                lambda: cls.webhook or cls.log_channel,
+                max_queue=cls.max_queue,
+                interval=cls.rate_limit_delay,
+                on_delivered=cls.get_journal().mark_delivered
+            )
+        return cls.shipper
+
+    @classmethod
+    def get_router(cls, bot) -> LogRouter:
+        """Маршрутизатор логов по категориям"""
+        if cls.router is None:
+            cls.router = LogRouter(
+                bot,
+                cls.get_shipper,
+                max_queue=cls.max_queue,
+                interval=cls.rate_limit_delay,
+                on_delivered=cls.get_journal().mark_delivered
+            )
+        return cls.router
+
+    @classmethod
+    async def close(cls) -> None:
+        """Дописывает накопленные события и останавливает очереди отправки
+
+        Сначала отправляются объединяемые события, потом пишется индекс
+        поиска, и только затем закрываются очереди, которые их доставляют.
+        """
+        if cls.coalescer is not None:
+            await cls.coalescer.close()
+        if cls.index is not None:
+            try:
+                await cls.index.flush()
+            except Exception as e:
+                log.error(f"Ошибка записи в индекс логов при остановке: {e}")
+        if cls.router is not None:
+            await cls.router.close()
+        if cls.shipper is not None:
+            await cls.shipper.close()
+        # Закрытые очереди не переиспользуются: после повторной загрузки создаются новые
+        cls.router = None
+        cls.shipper = None
+
 class BaseLogger:
     """Базовый класс для всех логгеров"""
+    # Приоритет событий логгера при переполнении очереди отправки
+    priority: int = LogShipper.NORMAL
+    # Категория для маршрутизации в канал logging/channel_<категория>
+    category: Optional[str] = None
+
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         self.owner_id = "636570363605680139"
         if not LoggingState.initialized and not LoggingState.initialization_in_progress:
             LoggingState.initialization_in_progress = True
@@ -46,12 +137,10 @@ class BaseLogger:
             if not self.bot.is_ready():
                 await self.bot.wait_until_ready()
 
-            result = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'logging' AND key = 'main_channel'"
-            )
+            channel_id = await self.settings.get(None, 'logging', 'main_channel')
             
-            if not result:
-                print("❌ Канал для логов не настроен в базе данных")
+            if not channel_id:
+                log.error("Канал для логов не настроен в базе данных")
                 try:
                     owner = await self.bot.fetch_user(int(self.owner_id))
                     if owner:
@@ -61,22 +150,26 @@ class BaseLogger:
                 return
                 
             try:
-                channel_id = int(result['value'])
+                channel_id = int(channel_id)
                 channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
                 
                 if not isinstance(channel, discord.TextChannel):
-                    print(f"❌ Канал с ID {channel_id} не является текстовым каналом на сервере")
+                    log.error(f"Канал с ID {channel_id} не является текстовым каналом на сервере")
                     return
 
                 permissions = channel.permissions_for(channel.guild.me)
                 if not permissions.send_messages or not permissions.manage_webhooks:
-                    print(f"❌ Недостаточно прав в канале логов {channel_id}")
+                    log.error(f"Недостаточно прав в канале логов {channel_id}")
                     return
                 
                 LoggingState.initialize(channel)
                 
+                # Вебхуки категорий живут в том же канале, поэтому дубликаты ищем по имени
                 webhooks = await channel.webhooks()
-                bot_webhooks = [w for w in webhooks if w.user and w.user.id == self.bot.user.id]
+                bot_webhooks = [
+                    w for w in webhooks
+                    if w.user and w.user.id == self.bot.user.id and w.name == f"{self.bot.user.name} Logger"
+                ]
                 
                 if bot_webhooks:
                     LoggingState.webhook = bot_webhooks[0]
@@ -90,24 +183,40 @@ class BaseLogger:
                     LoggingState.initialized_loggers.append(logger_name)
 
             except discord.NotFound:
-                print(f"❌ Канал с ID {channel_id} не найден")
+                log.error(f"Канал с ID {channel_id} не найден")
             except discord.Forbidden:
-                print(f"❌ Нет доступа к каналу с ID {channel_id}")
+                log.error(f"Нет доступа к каналу с ID {channel_id}")
             except Exception as e:
-                print(f"❌ Ошибка при настройке канала логов: {e}")
+                log.error(f"Ошибка при настройке канала логов: {e}")
                 
         except Exception as e:
-            print(f"❌ Ошибка при инициализации логов: {e}")
+            log.error(f"Ошибка при инициализации логов: {e}")
         finally:
             LoggingState.initialization_in_progress = False
 
     async def log_event(self, title: str, description: str = "", color: Union[str, int] = 'BLUE', 
                        fields: Optional[List[Dict[str, Any]]] = None, event_type: str = "general", **kwargs) -> None:
-        """Базовый метод для логирования событий"""
+        """Базовый метод для логирования событий
+        
+        Событие ставится в очередь отправки и уходит в канал логов пачкой
+        вместе с соседними. Вложения передаются через file/files, приоритет
+        при переполнении очереди - через priority. Участника и объект
+        события для поиска по логам можно передать через actor и target,
+        сервер - через guild (по умолчанию сервер события из обработчика).
+        """
         try:
             if not LoggingState.initialized or not LoggingState.log_channel:
                 return
             
+            priority = kwargs.pop('priority', self.priority)
+            actor = kwargs.pop('actor', None)
+            target = kwargs.pop('target', None)
+            guild = kwargs.pop('guild', None)
+            files = kwargs.pop('files', None) or []
+            if kwargs.get('file') is not None:
+                files.append(kwargs.pop('file'))
+            kwargs.pop('file', None)
+            
             timestamp = kwargs.pop('timestamp', discord.utils.utcnow())
             embed = Embed(
                 title=title,
@@ -118,27 +227,53 @@ class BaseLogger:
                 **kwargs
             )
 
-            current_time = datetime.utcnow()
-            if LoggingState.last_message_time:
-                time_diff = (current_time - LoggingState.last_message_time).total_seconds()
-                if time_diff < LoggingState.rate_limit_delay:
-                    await asyncio.sleep(LoggingState.rate_limit_delay - time_diff)
-            
+            # Сначала журнал, чтобы событие пережило сбой отправки или перезапуск
+            journal_id = None
             try:
-                if LoggingState.webhook:
-                    await LoggingState.webhook.send(embed=embed)
-                else:
-                    await LoggingState.log_channel.send(embed=embed)
-                
-                LoggingState.last_message_time = datetime.utcnow()
-                
-            except discord.Forbidden:
-                print("❌ Нет прав для отправки сообщений в канал логов")
-            except discord.HTTPException as e:
-                print(f"❌ Ошибка Discord API при отправке лога: {e}")
+                journal_id = await LoggingState.get_journal().append(self.category, priority, embed)
+            except Exception as e:
+                log.error(f"Ошибка записи в журнал логов: {e}")
+            
+            if await self.settings.get(None, 'logging', 'index_enabled') not in ('0', 'false', 'False'):
+                LoggingState.get_index().add(LogIndex.entry(
+                    embed, self._event_guild_id(guild, actor, target),
+                    self.category, event_type, actor, target
+                ))
+            
+            shipper = await LoggingState.get_router(self.bot).shipper_for(self.category)
+            await shipper.submit(embed, priority=priority, files=files, journal_id=journal_id)
             
         except Exception as e:
-            print(f"❌ Ошибка при логировании события: {e}")
+            log.error(f"Ошибка при логировании события: {e}")
+
+    @staticmethod
+    def _event_guild_id(guild: Any, actor: Any, target: Any) -> int:
+        """Сервер, к которому относится событие, для индекса поиска"""
+        if guild is not None:
+            return getattr(guild, 'id', guild)
+        guild_id = LoggingState.event_guild.get()
+        if guild_id is not None:
+            return guild_id
+        for subject in (target, actor):
+            subject_guild = getattr(subject, 'guild', None)
+            if subject_guild is not None:
+                return subject_guild.id
+        return LoggingState.log_channel.guild.id
+
+    async def coalesce(self, subject: Any, before: Any, after: Any,
+                       flush: Callable[[Any, Any, int], Awaitable[None]]) -> None:
+        """Объединяет события одного объекта в одну запись
+        
+        События с одинаковым subject в пределах окна (настройка
+        logging/coalesce_window, секунды) склеиваются: flush получает первое
+        состояние до, последнее состояние после и количество событий.
+        """
+        window = await self.settings.get(None, 'logging', 'coalesce_window')
+        try:
+            window = float(window) if window is not None else None
+        except ValueError:
+            window = None
+        await LoggingState.get_coalescer().push((self.category, subject), before, after, flush, window)
 
     @staticmethod
     def format_diff(before: Any, after: Any) -> str:
@@ -0,0 +1,208 @@
+"""
+Снимки серверов, каналов и ролей для логов аудита
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+import discord
+
+Snapshot = Tuple[Any, ...]
+Changes = Dict[str, Tuple[Any, Any]]
+
+# Бит права -> название флага discord.Permissions
+PERMISSION_NAMES: Dict[int, str] = {bit: name for name, bit in discord.Permissions.VALID_FLAGS.items()}
+
+def _asset(attr: str) -> Callable[[Any], Optional[str]]:
+    def get(obj: Any) -> Optional[str]:
+        asset = getattr(obj, attr, None)
+        return asset.key if asset is not None else None
+    return get
+
+def _ref(attr: str) -> Callable[[Any], Optional[int]]:
+    def get(obj: Any) -> Optional[int]:
+        value = getattr(obj, attr, None)
+        return value.id if value is not None else None
+    return get
+
+def _attr(attr: str) -> Callable[[Any], Any]:
+    return lambda obj: getattr(obj, attr, None)
+
+def _value(attr: str) -> Callable[[Any], Optional[int]]:
+    def get(obj: Any) -> Optional[int]:
+        value = getattr(obj, attr, None)
+        return value.value if value is not None else None
+    return get
+
+def _overwrites(channel: Any) -> Dict[int, Tuple[int, int, int]]:
+    # Сырые переопределения канала: не создаем PermissionOverwrite и не ищем цели
+    return {item.id: (item.allow, item.deny, item.type) for item in getattr(channel, "_overwrites", ())}
+
+# Поля снимков по типам объектов: (название, функция извлечения)
+FIELDS: Dict[str, Tuple[Tuple[str, Callable[[Any], Any]], ...]] = {
+    "role": (
+        ("name", _attr("name")),
+        ("color", _value("color")),
+        ("hoist", _attr("hoist")),
+        ("mentionable", _attr("mentionable")),
+        ("permissions", _value("permissions")),
+        ("icon", _asset("icon")),
+        ("unicode_emoji", _attr("unicode_emoji")),
+    ),
+    "channel": (
+        ("name", _attr("name")),
+        ("category_id", _attr("category_id")),
+        ("topic", _attr("topic")),
+        ("slowmode_delay", _attr("slowmode_delay")),
+        ("nsfw", _attr("nsfw")),
+        ("bitrate", _attr("bitrate")),
+        ("user_limit", _attr("user_limit")),
+        ("rtc_region", _attr("rtc_region")),
+        ("video_quality_mode", _attr("video_quality_mode")),
+        ("default_auto_archive_duration", _attr("default_auto_archive_duration")),
+        ("default_thread_slowmode_delay", _attr("default_thread_slowmode_delay")),
+        ("overwrites", _overwrites),
+    ),
+    "guild": (
+        ("name", _attr("name")),
+        ("description", _attr("description")),
+        ("icon", _asset("icon")),
+        ("banner", _asset("banner")),
+        ("splash", _asset("splash")),
+        ("discovery_splash", _asset("discovery_splash")),
+        ("features", lambda guild: frozenset(guild.features)),
+        ("owner_id", _attr("owner_id")),
+        ("mfa_level", _attr("mfa_level")),
+        ("verification_level", _attr("verification_level")),
+        ("default_notifications", _attr("default_notifications")),
+        ("explicit_content_filter", _attr("explicit_content_filter")),
+        ("afk_channel", _ref("afk_channel")),
+        ("afk_timeout", _attr("afk_timeout")),
+        ("system_channel", _ref("system_channel")),
+        ("rules_channel", _ref("rules_channel")),
+        ("public_updates_channel", _ref("public_updates_channel")),
+        ("vanity_url_code", _attr("vanity_url_code")),
+        ("preferred_locale", _attr("preferred_locale")),
+        ("premium_tier", _attr("premium_tier")),
+        ("premium_progress_bar_enabled", _attr("premium_progress_bar_enabled")),
+        ("widget_enabled", _attr("widget_enabled")),
+    ),
+}
+
+class OverwriteChange(NamedTuple):
+    """Изменение переопределения прав одной цели
+
+    before/after - пары (allow, deny) или None, если переопределения не было.
+    """
+    target_id: int
+    is_member: bool
+    before: Optional[Tuple[int, int]]
+    after: Optional[Tuple[int, int]]
+
+def permission_names(value: int) -> List[str]:
+    """Названия прав, установленных в битовом поле"""
+    names = []
+    while value:
+        bit = value & -value
+        name = PERMISSION_NAMES.get(bit)
+        if name:
+            names.append(name)
+        value ^= bit
+    return names
+
+def permission_diff(before: int, after: int) -> Tuple[List[str], List[str]]:
+    """Добавленные и убранные права по XOR двух битовых полей
+
+    Returns:
+        Tuple[List[str], List[str]]: (добавленные, убранные)
+    """
+    changed = before ^ after
+    return permission_names(changed & after), permission_names(changed & before)
+
+def overwrite_changes(before: Dict[int, Tuple[int, int, int]], after: Dict[int, Tuple[int, int, int]]) -> List[OverwriteChange]:
+    """Изменения переопределений прав между двумя снимками канала"""
+    changes = []
+    for target_id in before.keys() | after.keys():
+        old, new = before.get(target_id), after.get(target_id)
+        if old == new:
+            continue
+        kind = (new or old)[2]
+        changes.append(OverwriteChange(
+            target_id,
+            kind == 1,
+            old[:2] if old else None,
+            new[:2] if new else None
+        ))
+    return changes
+
+class SnapshotCache:
+    """Кэш компактных снимков объектов Discord
+
+    Снимок - кортеж примитивов по списку FIELDS, поэтому сравнение двух
+    состояний выполняется за один проход без повторного обхода атрибутов.
+    Последнее состояние после обновления сохраняется; промахи (снимок не
+    совпал с before события) показывают, как часто кэш расходится с
+    состоянием discord.py.
+    """
+
+    MAX_ENTRIES = 50000
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self._snapshots: "OrderedDict[Hashable, Snapshot]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def take(kind: str, obj: Any) -> Snapshot:
+        """Снимает снимок объекта"""
+        return tuple(get(obj) for _, get in FIELDS[kind])
+
+    def remember(self, kind: str, obj: Any) -> Snapshot:
+        """Сохраняет текущее состояние объекта"""
+        snapshot = self.take(kind, obj)
+        key = (kind, obj.id)
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        if len(self._snapshots) > self.max_entries:
+            self._snapshots.popitem(last=False)
+        return snapshot
+
+    def forget(self, kind: str, obj_id: int) -> None:
+        """Удаляет снимок удаленного объекта"""
+        self._snapshots.pop((kind, obj_id), None)
+
+    def diff(self, kind: str, before: Any, after: Any) -> Changes:
+        """Изменившиеся поля объекта
+
+        Сравниваются снимки переданных before и after: это состояние
+        непосредственно до события. Сохраненный снимок после переподключения
+        без RESUME, вытеснения или изменения без события (например, снятие
+        переопределений при удалении роли) может быть устаревшим, поэтому
+        он только учитывается в статистике.
+
+        Args:
+            kind (str): Тип объекта: "role", "channel" или "guild"
+            before (Any): Объект до изменения
+            after (Any): Объект после изменения
+
+        Returns:
+            Changes: {поле: (старое значение, новое значение)}
+        """
+        cached = self._snapshots.get((kind, after.id))
+        old = self.take(kind, before)
+        new = self.remember(kind, after)
+        if cached == old:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return {
+            name: (old_value, new_value)
+            for (name, _), old_value, new_value in zip(FIELDS[kind], old, new)
+            if old_value != new_value
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика кэша снимков"""
+        return {"entries": len(self._snapshots), "hits": self.hits, "misses": self.misses}
+
+# Общий на процесс кэш снимков
+snapshots = SnapshotCache()
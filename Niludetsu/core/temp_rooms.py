@@ -1,23 +1,21 @@
-import discord, asyncio
+import discord, asyncio, logging
 from discord.ext import commands
 from discord import ui
-from Niludetsu import Embed, Emojis, Database
+from Niludetsu import Embed, Emojis, Database, Settings
+
+log = logging.getLogger(__name__)
 
 class TempRoomsManager:
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         
     async def setup_control_panel(self, guild_id: str):
         """Настраивает панель управления временными каналами"""
         try:
             # Получаем настройки из базы данных
-            settings = await self.db.fetch_all(
-                "SELECT key, value FROM settings WHERE category = 'temp_rooms' AND guild_id = ?",
-                guild_id
-            )
-            
-            settings_dict = {row['key']: row['value'] for row in settings}
+            settings_dict = await self.settings.get_category(guild_id, 'temp_rooms')
             
             channel_id = settings_dict.get('control_channel')
             if not channel_id:
@@ -53,28 +51,19 @@ class TempRoomsManager:
             message = await channel.send(embed=embed, view=TempRoomsView(self))
             
             # Сохраняем ID сообщения в базу данных
-            await self.db.execute(
-                """
-                INSERT OR REPLACE INTO settings (category, key, value, guild_id)
-                VALUES ('temp_rooms', 'control_message', ?, ?)
-                """,
-                (str(message.id), guild_id)
-            )
+            await self.settings.set(guild_id, 'temp_rooms', 'control_message', str(message.id))
             
             return message
             
         except Exception as e:
-            print(f"❌ Ошибка при настройке панели управления: {e}")
+            log.error(f"Ошибка при настройке панели управления: {e}")
             return None
             
     async def create_temp_room(self, member: discord.Member, name: str = None):
         """Создает временный голосовой канал"""
         try:
             # Получаем категорию из базы данных
-            category_id = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'temp_rooms' AND key = 'category' AND guild_id = ?",
-                str(member.guild.id)
-            )
+            category_id = await self.settings.get(member.guild.id, 'temp_rooms', 'category')
             
             if not category_id:
                 raise ValueError("Категория для временных каналов не настроена")
@@ -127,7 +116,7 @@ class TempRoomsManager:
             return channel
             
         except Exception as e:
-            print(f"❌ Ошибка при создании временного канала: {e}")
+            log.error(f"Ошибка при создании временного канала: {e}")
             return None
             
     async def delete_temp_room(self, channel_id: str):
@@ -165,7 +154,7 @@ class TempRoomsManager:
             return True
             
         except Exception as e:
-            print(f"❌ Ошибка при удалении временного канала: {e}")
+            log.error(f"Ошибка при удалении временного канала: {e}")
             return False
             
     async def get_temp_room(self, channel_id: str):
@@ -176,7 +165,7 @@ class TempRoomsManager:
                 channel_id
             )
         except Exception as e:
-            print(f"❌ Ошибка при получении информации о канале: {e}")
+            log.error(f"Ошибка при получении информации о канале: {e}")
             return None
             
 class TempRoomsView(ui.View):
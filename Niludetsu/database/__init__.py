@@ -4,7 +4,11 @@
 выполнение запросов и определение схемы таблиц.
 """
 
-from .db import Database
+from .db import Database, WriteQueue
+from .cache import UserCache
+from .query import QueryBuilder, UnknownColumnError
+from .pool import ConnectionPool, PoolTimeoutError, PoolClosedError
+from .migrations import Migration, Migrator, MIGRATIONS
 from .tables import (
     Tables,
     TableSchema,
@@ -16,9 +20,21 @@ __all__ = [
     # Основные классы
     'Database',
     'Tables',
+    'ConnectionPool',
+    'WriteQueue',
+    'UserCache',
+    'QueryBuilder',
+    'Migrator',
     
     # Вспомогательные классы
     'TableSchema',
     'Column',
-    'Index'
+    'Index',
+    'Migration',
+    'MIGRATIONS',
+    
+    # Исключения
+    'PoolTimeoutError',
+    'PoolClosedError',
+    'UnknownColumnError'
 ] 
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Аудит планов запросов
+
+Собирает SQL-строки из исходников cogs/ и Niludetsu/, выполняет для каждой
+EXPLAIN QUERY PLAN на временной базе со схемой последней версии и сообщает
+о полных сканированиях таблиц и сортировках без индекса. Заодно сверяет
+схему, которую строят миграции, с описанием в tables.py.
+
+Запуск: python -m Niludetsu.database.audit [пути...]
+Код возврата 1, если найдены неожиданные сканирования, запросы, которые не
+удалось выполнить (например, к несуществующей таблице), или расхождения схемы.
+"""
+import ast, os, re, sys, sqlite3, tempfile
+from dataclasses import dataclass, field
+from typing import List, Iterator, Tuple, Optional
+from .migrations import MIGRATIONS, Migrator
+from .tables import Tables
+
+SQL_START = re.compile(r"^\s*(SELECT|UPDATE|DELETE|INSERT|REPLACE|WITH)\b", re.IGNORECASE)
+FILTERED = re.compile(r"\b(WHERE|ORDER\s+BY|GROUP\s+BY|JOIN)\b", re.IGNORECASE)
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+INDEX_NAME = re.compile(r"INDEX IF NOT EXISTS (\w+)")
+
+# Запросы, которым полное сканирование разрешено намеренно (нормализованный текст)
+ALLOWED_SCANS = {
+    # Разовая загрузка кэша пользователей при старте
+    "SELECT user_id, xp, level, messages_count FROM users",
+    # Чтение списка таблиц при миграции
+    "SELECT name FROM sqlite_master WHERE type='table'",
+    # Сверка индексов со схемой в аудите
+    "SELECT name FROM sqlite_master WHERE type='index'",
+}
+
+@dataclass
+class QueryReport:
+    """Результат проверки одного запроса"""
+    path: str
+    line: int
+    query: str
+    plan: List[str] = field(default_factory=list)
+    problems: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+def normalize(query: str) -> str:
+    """Схлопывает пробелы в запросе"""
+    return " ".join(query.split())
+
+def collect_queries(paths: List[str]) -> Iterator[Tuple[str, int, str]]:
+    """Находит строковые литералы с SQL в исходниках
+
+    Учитываются только обычные строки, f-строки с подстановками пропускаются.
+    """
+    for root_path in paths:
+        for root, _, files in os.walk(root_path):
+            for filename in files:
+                if not filename.endswith(".py"):
+                    continue
+                path = os.path.join(root, filename)
+                with open(path, encoding="utf-8") as f:
+                    try:
+                        tree = ast.parse(f.read(), filename=path)
+                    except SyntaxError:
+                        continue
+                fragments = {
+                    id(part) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr)
+                    for part in node.values
+                }
+                for node in ast.walk(tree):
+                    if id(node) in fragments:
+                        continue
+                    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                        if SQL_START.match(node.value) and " " in node.value.strip():
+                            yield path, node.lineno, normalize(node.value)
+
+def build_database() -> sqlite3.Connection:
+    """Создает временную базу и применяет к ней все миграции"""
+    import asyncio, aiosqlite
+
+    path = os.path.join(tempfile.mkdtemp(prefix="niludetsu_audit_"), "audit.db")
+
+    async def migrate():
+        async with aiosqlite.connect(path) as conn:
+            await Migrator(MIGRATIONS).run(conn)
+
+    asyncio.run(migrate())
+    return sqlite3.connect(path)
+
+def explain(conn: sqlite3.Connection, path: str, line: int, query: str) -> QueryReport:
+    """Выполняет EXPLAIN QUERY PLAN и ищет проблемы в плане"""
+    report = QueryReport(path, line, query)
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", [None] * query.count("?")).fetchall()
+    except sqlite3.Error as e:
+        report.error = str(e)
+        return report
+
+    report.plan = [row[3] for row in rows]
+    if query in ALLOWED_SCANS or not FILTERED.search(query):
+        # Запросы без условий и сортировки читают таблицу целиком намеренно
+        return report
+
+    for detail in report.plan:
+        match = FULL_SCAN.match(detail)
+        if match:
+            report.problems.append(f"полное сканирование {match.group(1)}")
+        elif detail.startswith("USE TEMP B-TREE FOR ORDER BY"):
+            report.problems.append("сортировка без индекса")
+    return report
+
+def schema_drift(conn: sqlite3.Connection) -> List[str]:
+    """Таблицы, колонки и индексы из Tables, которые не создает ни одна миграция"""
+    drift = []
+    for table, columns in Tables.COLUMNS.items():
+        present = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not present:
+            drift.append(f"нет таблицы {table}")
+            continue
+        drift.extend(f"нет колонки {table}.{name}" for name in columns if name not in present)
+
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    for table, schema in Tables.SCHEMA.items():
+        for index in schema.get("INDEXES", []):
+            name = INDEX_NAME.search(index).group(1)
+            if name not in indexes:
+                drift.append(f"нет индекса {name} ({table})")
+    return drift
+
+def audit(paths: List[str]) -> Tuple[List[QueryReport], List[str]]:
+    """Проверяет все найденные запросы и схему после миграций"""
+    conn = build_database()
+    try:
+        reports = [explain(conn, path, line, query) for path, line, query in collect_queries(paths)]
+        return reports, schema_drift(conn)
+    finally:
+        conn.close()
+
+def main(argv: List[str]) -> int:
+    paths = argv or ["cogs", "Niludetsu"]
+    reports, drift = audit(paths)
+
+    problems = [r for r in reports if r.problems]
+    errors = [r for r in reports if r.error]
+
+    for report in errors:
+        print(f"⚠️ {report.path}:{report.line}: {report.error}\n    {report.query}")
+    for report in problems:
+        print(f"❌ {report.path}:{report.line}: {', '.join(report.problems)}\n    {report.query}")
+        for detail in report.plan:
+            print(f"      {detail}")
+
+    for problem in drift:
+        print(f"❌ Схема: {problem} - добавьте миграцию")
+
+    print(f"📊 Запросов: {len(reports)}, с проблемами: {len(problems)}, не выполнено: {len(errors)}")
+    return 1 if problems or errors or drift else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,193 @@
+"""
+Схема базы на момент миграции 1
+
+Снимок не меняется вместе с tables.py: новые таблицы, колонки и индексы
+добавляются следующими миграциями явным DDL.
+"""
+from typing import Dict, List, Tuple
+
+# Таблица -> [(колонка, определение для CREATE TABLE)]
+TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "users": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("user_id", "TEXT NOT NULL"),
+        ("name", "TEXT"),
+        ("balance", "INTEGER DEFAULT 0"),
+        ("xp", "INTEGER DEFAULT 0"),
+        ("level", "INTEGER DEFAULT 1"),
+        ("messages_count", "INTEGER DEFAULT 0"),
+        ("roles", "TEXT DEFAULT '[]'"),
+        ("deposit", "INTEGER DEFAULT 0"),
+        ("reputation", "INTEGER DEFAULT 0"),
+        ("voice_time", "INTEGER DEFAULT 0"),
+        ("voice_joins", "INTEGER DEFAULT 0"),
+        ("last_voice_join", "TEXT"),
+        ("last_daily", "TEXT"),
+        ("last_work", "TEXT"),
+        ("last_rob", "TEXT"),
+        ("spouse", "TEXT"),
+        ("country", "TEXT"),
+        ("bio", "TEXT"),
+        ("birthday", "TEXT"),
+    ],
+    "moderation": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("user_id", "TEXT NOT NULL"),
+        ("guild_id", "TEXT NOT NULL"),
+        ("moderator_id", "TEXT NOT NULL"),
+        ("type", "TEXT NOT NULL"),
+        ("reason", "TEXT"),
+        ("expires_at", "DATETIME"),
+        ("active", "BOOLEAN DEFAULT TRUE"),
+    ],
+    "temp_rooms": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("channel_id", "TEXT NOT NULL"),
+        ("guild_id", "TEXT NOT NULL"),
+        ("owner_id", "TEXT NOT NULL"),
+        ("name", "TEXT NOT NULL"),
+        ("settings", "TEXT DEFAULT '{}'"),
+        ("channel_type", "INTEGER DEFAULT 2"),
+        ("trusted_users", "TEXT DEFAULT '[]'"),
+        ("banned_users", "TEXT DEFAULT '[]'"),
+        ("user_limit", "INTEGER DEFAULT 0"),
+        ("is_locked", "BOOLEAN DEFAULT FALSE"),
+        ("thread_id", "TEXT"),
+        ("region", "TEXT"),
+    ],
+    "settings": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("guild_id", "TEXT NOT NULL"),
+        ("category", "TEXT NOT NULL"),
+        ("key", "TEXT NOT NULL"),
+        ("value", "TEXT NOT NULL"),
+    ],
+    "cooldowns": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("user_id", "TEXT NOT NULL"),
+        ("guild_id", "TEXT NOT NULL"),
+        ("command", "TEXT NOT NULL"),
+        ("expires_at", "DATETIME NOT NULL"),
+    ],
+    "afk": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("user_id", "TEXT NOT NULL"),
+        ("guild_id", "TEXT NOT NULL"),
+        ("reason", "TEXT"),
+        ("timestamp", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+    ],
+    "giveaways": [
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("giveaway_id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("channel_id", "TEXT NOT NULL"),
+        ("message_id", "TEXT NOT NULL"),
+        ("guild_id", "TEXT NOT NULL"),
+        ("host_id", "TEXT NOT NULL"),
+        ("prize", "TEXT NOT NULL"),
+        ("winners_count", "INTEGER DEFAULT 1"),
+        ("end_time", "TEXT NOT NULL"),
+        ("is_ended", "INTEGER DEFAULT 0"),
+        ("participants", "TEXT DEFAULT '[]'"),
+    ],
+    "invite_cache": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("guild_id", "TEXT NOT NULL"),
+        ("invite_code", "TEXT NOT NULL"),
+        ("uses", "INTEGER DEFAULT 0"),
+        ("inviter_id", "TEXT"),
+    ],
+    "games": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("channel_id", "TEXT NOT NULL"),
+        ("game_type", "TEXT NOT NULL"),
+        ("last_value", "TEXT"),
+        ("used_values", "TEXT"),
+        ("forum_id", "TEXT"),
+        ("thread_id", "TEXT"),
+    ],
+    "words": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("word", "TEXT NOT NULL"),
+        ("language", "TEXT NOT NULL"),
+        ("part_of_speech", "TEXT"),
+    ],
+    "global_bans": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("banned_user_id", "TEXT NOT NULL"),
+        ("owner_id", "TEXT NOT NULL"),
+    ],
+    "bump_reminders": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("bot_id", "TEXT NOT NULL"),
+        ("bot_name", "TEXT NOT NULL"),
+        ("next_bump", "TEXT NOT NULL"),
+    ],
+    "tickets": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("channel_id", "TEXT NOT NULL"),
+        ("user_id", "TEXT NOT NULL"),
+        ("guild_id", "TEXT NOT NULL"),
+        ("reason", "TEXT"),
+        ("status", "TEXT DEFAULT 'open'"),
+        ("closed_by", "TEXT"),
+        ("closed_at", "DATETIME"),
+        ("close_reason", "TEXT"),
+    ],
+    "shop_roles": [
+        ("id", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+        ("created_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP"),
+        ("role_id", "TEXT NOT NULL"),
+        ("price", "INTEGER NOT NULL"),
+        ("description", "TEXT"),
+        ("purchases", "INTEGER DEFAULT 0"),
+    ],
+}
+
+INDEXES: List[str] = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_id ON users(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_mod_user ON moderation(user_id, guild_id, type)",
+    "CREATE INDEX IF NOT EXISTS idx_mod_active ON moderation(active)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_temp_channel ON temp_rooms(channel_id)",
+    "CREATE INDEX IF NOT EXISTS idx_temp_owner ON temp_rooms(owner_id, guild_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_settings ON settings(guild_id, category, key)",
+    "CREATE INDEX IF NOT EXISTS idx_cooldowns_key ON cooldowns(user_id, guild_id, command)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_afk_user ON afk(user_id, guild_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_giveaways_message ON giveaways(message_id)",
+    "CREATE INDEX IF NOT EXISTS idx_giveaways_active ON giveaways(is_ended, end_time)",
+    "CREATE INDEX IF NOT EXISTS idx_invite_cache_guild ON invite_cache(guild_id, invite_code)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_games_channel ON games(channel_id)",
+    "CREATE INDEX IF NOT EXISTS idx_games_forum ON games(game_type, forum_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_words_word ON words(word, language, part_of_speech)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_global_bans_user ON global_bans(banned_user_id, owner_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_bump_reminders_bot ON bump_reminders(bot_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_user ON tickets(user_id, guild_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_channel ON tickets(channel_id, guild_id, status)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_shop_roles_role ON shop_roles(role_id)",
+    "CREATE INDEX IF NOT EXISTS idx_shop_roles_price ON shop_roles(price)",
+]
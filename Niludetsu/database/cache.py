@@ -0,0 +1,243 @@
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Set, Iterable, Callable, TYPE_CHECKING
+
+log = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from .db import Database
+
+class UserCache:
+    """Кэш статистики пользователей с отложенной записью
+
+    Значения xp, level и messages_count хранятся в памяти и изменяются без
+    обращения к базе. Изменённые записи помечаются как грязные и сбрасываются
+    пачкой через executemany раз в flush_interval секунд и при закрытии.
+    Пока кэш активен, он считается источником истины для этих полей.
+    """
+
+    FIELDS = ("xp", "level", "messages_count")
+    LOAD_CHUNK = 500  # Не больше параметров в одном IN (...), чем позволяет SQLite
+    DEFAULTS = {"xp": 0, "level": 1, "messages_count": 0}
+
+    UPSERT_QUERY = (
+        "INSERT INTO users (user_id, xp, level, messages_count) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(user_id) DO UPDATE SET "
+        "xp = excluded.xp, level = excluded.level, messages_count = excluded.messages_count"
+    )
+
+    def __init__(self, db: "Database", flush_interval: float = 5.0):
+        """
+        Args:
+            db (Database): База данных для загрузки и сброса записей
+            flush_interval (float): Период фонового сброса в секундах
+        """
+        self.db = db
+        self.flush_interval = flush_interval
+        self._rows: Dict[str, Dict[str, int]] = {}
+        self._dirty: Set[str] = set()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+    def _ensure_started(self) -> None:
+        """Запускает фоновый сброс при первом изменении"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Периодически сбрасывает грязные записи"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"Ошибка при сбросе кэша пользователей: {e}")
+
+    @classmethod
+    def _normalize(cls, row: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """Приводит строку из базы к значениям кэша"""
+        row = row or {}
+        return {field: row.get(field) if row.get(field) is not None else default
+                for field, default in cls.DEFAULTS.items()}
+
+    async def load(self) -> int:
+        """Загружает статистику всех пользователей одним запросом
+
+        Returns:
+            int: Количество загруженных записей
+        """
+        rows = await self.db.fetch_all("SELECT user_id, xp, level, messages_count FROM users")
+        for row in rows:
+            self._rows.setdefault(str(row["user_id"]), self._normalize(row))
+        return len(rows)
+
+    async def _load_one(self, user_id: str) -> Dict[str, int]:
+        """Загружает одну запись, объединяя параллельные промахи"""
+        if user_id in self._loading:
+            return await asyncio.shield(self._loading[user_id])
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[user_id] = future
+        try:
+            row = await self.db.fetch_one(
+                "SELECT xp, level, messages_count FROM users WHERE user_id = ?", user_id
+            )
+            values = self._rows.setdefault(user_id, self._normalize(row))
+            if row is None:
+                # Новый пользователь будет создан при сбросе
+                self._dirty.add(user_id)
+            future.set_result(values)
+            return values
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._loading[user_id]
+
+    async def _entry(self, user_id: Any) -> Dict[str, int]:
+        """Возвращает изменяемую запись кэша"""
+        user_id = str(user_id)
+        values = self._rows.get(user_id)
+        if values is not None:
+            self.hits += 1
+            return values
+        self.misses += 1
+        return await self._load_one(user_id)
+
+    async def get(self, user_id: Any) -> Dict[str, int]:
+        """Получить статистику пользователя"""
+        return dict(await self._entry(user_id))
+
+    async def get_many(self, user_ids: Iterable[Any]) -> Dict[str, Dict[str, int]]:
+        """Получить статистику нескольких пользователей
+
+        Отсутствующие в кэше записи загружаются пачками через IN (...),
+        а не отдельным запросом на каждого пользователя.
+        """
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        missing = [user_id for user_id in user_ids if user_id not in self._rows]
+        self.hits += len(user_ids) - len(missing)
+        self.misses += len(missing)
+
+        for start in range(0, len(missing), self.LOAD_CHUNK):
+            chunk = missing[start:start + self.LOAD_CHUNK]
+            rows = await self.db.fetch_all(
+                f"SELECT user_id, xp, level, messages_count FROM users "
+                f"WHERE user_id IN ({', '.join('?' * len(chunk))})",
+                *chunk
+            )
+            found = {str(row["user_id"]): row for row in rows}
+            for user_id in chunk:
+                self._rows.setdefault(user_id, self._normalize(found.get(user_id)))
+                if user_id not in found:
+                    # Новый пользователь будет создан при сбросе
+                    self._dirty.add(user_id)
+
+        return {user_id: dict(self._rows[user_id]) for user_id in user_ids}
+
+    def peek(self, user_id: Any) -> Optional[Dict[str, int]]:
+        """Статистика пользователя, если она уже есть в кэше"""
+        values = self._rows.get(str(user_id))
+        return dict(values) if values is not None else None
+
+    async def set(self, user_id: Any, **values: int) -> Dict[str, int]:
+        """Установить значения полей"""
+        entry = await self._entry(user_id)
+        for field, value in values.items():
+            if field not in self.FIELDS:
+                raise KeyError(f"Поле {field} не хранится в кэше пользователей")
+            entry[field] = value
+        self._dirty.add(str(user_id))
+        self._ensure_started()
+        return dict(entry)
+
+    async def set_many(self, values: Dict[Any, Dict[str, int]]) -> None:
+        """Установить значения полей для нескольких пользователей"""
+        for fields in values.values():
+            for field in fields:
+                if field not in self.FIELDS:
+                    raise KeyError(f"Поле {field} не хранится в кэше пользователей")
+        await self.get_many(values)
+        for user_id, fields in values.items():
+            self._rows[str(user_id)].update(fields)
+            self._dirty.add(str(user_id))
+        self._ensure_started()
+
+    async def increment(self, user_id: Any, **deltas: int) -> Dict[str, int]:
+        """Увеличить значения полей на указанные величины"""
+        entry = await self._entry(user_id)
+        for field, delta in deltas.items():
+            if field not in self.FIELDS:
+                raise KeyError(f"Поле {field} не хранится в кэше пользователей")
+            entry[field] += delta
+        self._dirty.add(str(user_id))
+        self._ensure_started()
+        return dict(entry)
+
+    async def update(self, user_id: Any, func: Callable[[Dict[str, int]], Dict[str, int]]) -> Dict[str, int]:
+        """Изменить запись функцией от ее текущих значений
+
+        Между чтением и записью нет ожиданий, поэтому параллельные
+        начисления не перезаписывают друг друга.
+
+        Args:
+            user_id (Any): ID пользователя
+            func (Callable): Получает копию записи и возвращает новые значения полей
+        """
+        entry = await self._entry(user_id)
+        values = func(dict(entry))
+        for field in values:
+            if field not in self.FIELDS:
+                raise KeyError(f"Поле {field} не хранится в кэше пользователей")
+        entry.update(values)
+        self._dirty.add(str(user_id))
+        self._ensure_started()
+        return dict(entry)
+
+    async def flush(self) -> int:
+        """Сбрасывает грязные записи в базу
+
+        Returns:
+            int: Количество записанных строк
+        """
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            dirty, self._dirty = self._dirty, set()
+            params = [
+                (user_id, self._rows[user_id]["xp"], self._rows[user_id]["level"], self._rows[user_id]["messages_count"])
+                for user_id in dirty
+            ]
+            try:
+                await self.db.executemany(self.UPSERT_QUERY, params)
+            except BaseException:
+                # Вернём записи, чтобы они попали в следующий сброс
+                self._dirty |= dirty
+                raise
+            self.flushes += 1
+            return len(params)
+
+    async def close(self) -> None:
+        """Останавливает фоновый сброс и записывает оставшиеся изменения"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика кэша"""
+        return {
+            "size": len(self._rows),
+            "dirty": len(self._dirty),
+            "hits": self.hits,
+            "misses": self.misses,
+            "flushes": self.flushes
+        }
@@ -1,74 +1,311 @@
-import os, aiosqlite, asyncio
-from typing import Optional, Dict, Any, List, Union
+import os, re, time, aiosqlite, asyncio, logging
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Tuple, Union
 from datetime import datetime
+from ..metrics import metrics
 from .tables import Tables
+from .pool import ConnectionPool
+from .cache import UserCache
+from .query import QueryBuilder, UnknownColumnError
+from .migrations import Migrator, MIGRATIONS
+
+log = logging.getLogger(__name__)
+
+class WriteQueue:
+    """Единственный писатель с групповой фиксацией транзакций
+    
+    Запросы на запись попадают в очередь, фоновая задача выполняет их пачками
+    в одной транзакции и фиксирует один раз. Каждый запрос выполняется внутри
+    SAVEPOINT, поэтому ошибка одного запроса не откатывает остальные.
+    """
+    
+    def __init__(self, pool: ConnectionPool, max_batch: int = 100, flush_interval: float = 0.01, max_queue: int = 10000):
+        """
+        Args:
+            pool (ConnectionPool): Пул, из которого берется соединение для записи
+            max_batch (int): Максимум запросов в одной транзакции
+            flush_interval (float): Сколько секунд ждать добора пачки после первого запроса
+            max_queue (int): Размер очереди, при заполнении вызывающие ждут
+        """
+        self.pool = pool
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.batches_total = 0
+        self.statements_total = 0
+        
+    def _ensure_started(self) -> None:
+        """Запускает фоновую задачу писателя при первом обращении"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            
+    async def submit(self, query: Optional[str], params: Union[tuple, List[tuple]], many: bool = False) -> List[tuple]:
+        """Ставит запрос в очередь и ждёт его фиксации
+        
+        Args:
+            query (str): SQL запрос или None для атомарного набора запросов
+            params: Параметры запроса, список наборов параметров при many=True
+                или список пар (запрос, параметры) при query=None
+            many (bool): Выполнить запрос через executemany
+        
+        Returns:
+            List[tuple]: Строки, возвращённые запросом (например, RETURNING)
+        """
+        if self._closing:
+            raise RuntimeError("Очередь записи закрыта")
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, params, future, many))
+        return await future
+        
+    async def _collect(self) -> list:
+        """Собирает пачку: ждёт первый запрос, затем добирает до max_batch или flush_interval"""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.flush_interval
+        while len(batch) < self.max_batch and batch[-1] is not None:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+        
+    async def _run(self) -> None:
+        """Основной цикл писателя"""
+        while True:
+            batch = await self._collect()
+            stop = batch[-1] is None
+            items = [item for item in batch if item is not None]
+            if items:
+                await self._flush(items)
+            if stop:
+                return
+                
+    async def _flush(self, items: list) -> None:
+        """Выполняет пачку запросов в одной транзакции"""
+        results = []
+        try:
+            async with self.pool.connection() as conn:
+                await conn.execute("BEGIN IMMEDIATE")
+                for query, params, future, many in items:
+                    await conn.execute("SAVEPOINT write_item")
+                    try:
+                        if query is None:
+                            # Несколько запросов, которые фиксируются или откатываются вместе
+                            for statement, statement_params in params:
+                                await conn.execute(statement, statement_params)
+                            rows = []
+                        elif many:
+                            await conn.executemany(query, params)
+                            rows = []
+                        else:
+                            cursor = await conn.execute(query, params)
+                            rows = await cursor.fetchall()
+                        await conn.execute("RELEASE write_item")
+                        results.append((future, rows, None))
+                    except Exception as e:
+                        await conn.execute("ROLLBACK TO write_item")
+                        await conn.execute("RELEASE write_item")
+                        results.append((future, None, e))
+                await conn.commit()
+        except Exception as e:
+            log.error(f"Ошибка групповой фиксации: {e}")
+            for _, _, future, _ in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+            
+        self.batches_total += 1
+        self.statements_total += len(items)
+        for future, rows, error in results:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(rows)
+                
+    async def close(self) -> None:
+        """Дописывает очередь и останавливает писателя"""
+        self._closing = True
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        
+    def stats(self) -> Dict[str, Any]:
+        """Статистика очереди записи"""
+        return {
+            "queued": self._queue.qsize(),
+            "batches_total": self.batches_total,
+            "statements_total": self.statements_total,
+            "avg_batch": round(self.statements_total / self.batches_total, 2) if self.batches_total else 0.0
+        }
+
+QUERY_SECONDS = metrics.histogram("db_query_seconds", "Длительность запросов к базе данных", ("op", "statement"))
+QUERY_ERRORS = metrics.counter("db_query_errors", "Запросы к базе данных, завершившиеся ошибкой", ("op", "statement"))
+
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def statement_label(query: str) -> str:
+    """Метка запроса для метрик: команда и первая таблица, например "select:users" """
+    words = query.split(None, 1)
+    command = words[0].lower() if words else "?"
+    table = _TABLE_RE.search(query)
+    return f"{command}:{table.group(1)}" if table else command
 
 class Database:
     _initialized = False
     _init_lock = asyncio.Lock()
+    _pools: Dict[str, ConnectionPool] = {}
+    _writers: Dict[str, WriteQueue] = {}
+    _user_caches: Dict[str, UserCache] = {}
+    _queries: Dict[str, QueryBuilder] = {}
+    
+    # Параметры общего пула соединений
+    POOL_MIN_SIZE = 1
+    POOL_MAX_SIZE = 5
+    POOL_ACQUIRE_TIMEOUT = 10.0
+    
+    # Параметры групповой фиксации записи
+    WRITE_BATCH_SIZE = 100
+    WRITE_FLUSH_INTERVAL = 0.01
+    
+    # Запросы, которые только читают и не идут через очередь записи
+    READ_PREFIXES = ("SELECT", "PRAGMA", "EXPLAIN")
+    # WITH может предварять и запись, поэтому CTE читает, только если в нем нет изменяющих операторов
+    WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
     
     def __init__(self, db_path: str = "data/database.db"):
         """Инициализация базы данных"""
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self._pool = []
-        self._pool_lock = asyncio.Lock()
-        self._max_connections = 5  # Уменьшаем количество соединений
         
-    async def _create_connection(self) -> aiosqlite.Connection:
-        """Создает новое соединение с базой данных"""
-        conn = await aiosqlite.connect(self.db_path)
-        conn.row_factory = aiosqlite.Row
-        return conn
+    @property
+    def pool(self) -> ConnectionPool:
+        """Общий пул соединений для этого файла базы данных
+        
+        Все экземпляры Database с одинаковым путём используют один пул.
+        Если пул закрыт или создан в другом цикле событий, создаётся новый.
+        """
+        key = os.path.abspath(self.db_path)
+        pool = Database._pools.get(key)
+        loop = asyncio.get_running_loop()
+        if pool is None or pool.closed or (pool.loop is not None and pool.loop is not loop):
+            pool = ConnectionPool(
+                self.db_path,
+                min_size=self.POOL_MIN_SIZE,
+                max_size=self.POOL_MAX_SIZE,
+                acquire_timeout=self.POOL_ACQUIRE_TIMEOUT
+            )
+            Database._pools[key] = pool
+        return pool
+        
+    @property
+    def writer(self) -> WriteQueue:
+        """Общая очередь записи для этого файла базы данных"""
+        key = os.path.abspath(self.db_path)
+        pool = self.pool
+        writer = Database._writers.get(key)
+        if writer is None or writer.pool is not pool:
+            writer = WriteQueue(
+                pool,
+                max_batch=self.WRITE_BATCH_SIZE,
+                flush_interval=self.WRITE_FLUSH_INTERVAL
+            )
+            Database._writers[key] = writer
+        return writer
         
     async def acquire(self) -> aiosqlite.Connection:
         """Получает соединение из пула"""
-        async with self._pool_lock:
-            if not self._pool:
-                return await self._create_connection()
-            return self._pool.pop()
+        return await self.pool.acquire()
             
     async def release(self, conn: aiosqlite.Connection):
         """Возвращает соединение в пул"""
-        if len(self._pool) < self._max_connections:
-            self._pool.append(conn)
-        else:
-            await conn.close()
+        await self.pool.release(conn)
+        
+    @property
+    def queries(self) -> QueryBuilder:
+        """Общий кэш построенных запросов для этого файла базы данных"""
+        key = os.path.abspath(self.db_path)
+        builder = Database._queries.get(key)
+        if builder is None:
+            builder = Database._queries[key] = QueryBuilder()
+        return builder
+        
+    @property
+    def users(self) -> UserCache:
+        """Общий кэш статистики пользователей (xp, level, messages_count)"""
+        key = os.path.abspath(self.db_path)
+        cache = Database._user_caches.get(key)
+        if cache is None:
+            cache = UserCache(self)
+            Database._user_caches[key] = cache
+        return cache
+        
+    def pool_stats(self) -> Dict[str, Any]:
+        """Статистика пула соединений (ожидание, занятые соединения и т.д.)"""
+        key = os.path.abspath(self.db_path)
+        pool = Database._pools.get(key)
+        writer = Database._writers.get(key)
+        stats = pool.stats() if pool else {}
+        cache = Database._user_caches.get(key)
+        if writer:
+            stats["writer"] = writer.stats()
+        if cache:
+            stats["user_cache"] = cache.stats()
+        if key in Database._queries:
+            stats["queries"] = Database._queries[key].stats()
+        return stats
     
     async def init(self):
-        """Инициализация базы данных"""
+        """Инициализация базы данных: одна проверка версии схемы и недостающие миграции"""
         # Используем блокировку для предотвращения повторной инициализации
         async with Database._init_lock:
             if Database._initialized:
                 return
                 
-            conn = await self._create_connection()
+            await self.pool.open()
+            conn = await self.acquire()
             try:
-                # Получаем существующие таблицы
-                cursor = await conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                existing = {row[0] for row in await cursor.fetchall()}
-                
-                # Создаем/обновляем таблицы
-                for table_name, schema in Tables.SCHEMA.items():
-                    if table_name not in existing:
-                        # Создаем таблицу
-                        columns = [f"{col} {type_}" for col, type_ in schema.items() if col != "INDEXES"]
-                        await conn.execute(f"CREATE TABLE {table_name} ({', '.join(columns)})")
-                        
-                        # Создаем индексы
-                        if "INDEXES" in schema:
-                            for index in schema["INDEXES"]:
-                                await conn.execute(index)
-                                
-                await conn.commit()
+                await Migrator(MIGRATIONS).run(conn)
                 Database._initialized = True
                 
             finally:
-                await conn.close()
+                await self.release(conn)
+    
+    @staticmethod
+    @contextmanager
+    def _observe(op: str, query: str):
+        """Замеряет запрос для метрик db_query_seconds и db_query_errors"""
+        statement = statement_label(query)
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            QUERY_ERRORS.inc(op=op, statement=statement)
+            raise
+        finally:
+            QUERY_SECONDS.observe(time.perf_counter() - started, op=op, statement=statement)
     
     async def execute(self, query: str, *args) -> Optional[List[tuple]]:
         """Выполняет SQL запрос
         
+        Запросы на изменение данных проходят через общую очередь записи
+        и фиксируются пачками, чтение выполняется сразу на соединении из пула.
+        
         Args:
             query (str): SQL запрос
             *args: Параметры запроса
@@ -79,53 +316,110 @@ class Database:
         if not self._initialized:
             await self.init()
         
-        conn = await self._create_connection()
+        params = tuple(args[0]) if args and isinstance(args[0], (tuple, list)) else args
         try:
-            if args and isinstance(args[0], (tuple, list)):
-                cursor = await conn.execute(query, args[0])
-            else:
-                cursor = await conn.execute(query, args)
-            await conn.commit()
-            result = await cursor.fetchall()
-            return result
+            with self._observe("execute", query):
+                if not self._is_read(query):
+                    return await self.writer.submit(query, params)
+                    
+                conn = await self.acquire()
+                try:
+                    cursor = await conn.execute(query, params)
+                    return await cursor.fetchall()
+                finally:
+                    await self.release(conn)
         except Exception as e:
-            print(f"❌ Ошибка выполнения запроса: {e}")
+            log.error(f"Ошибка выполнения запроса: {e}")
+            raise e
+    
+    @classmethod
+    def _is_read(cls, query: str) -> bool:
+        """Запрос только читает данные и может выполняться мимо очереди записи"""
+        head = query.lstrip().upper()
+        if head.startswith("WITH"):
+            return cls.WRITE_KEYWORDS.search(query) is None
+        return head.startswith(cls.READ_PREFIXES)
+    
+    async def executemany(self, query: str, params: List[tuple]) -> None:
+        """Выполняет запрос на запись для набора параметров одной операцией
+        
+        Args:
+            query (str): SQL запрос
+            params (List[tuple]): Список наборов параметров
+        """
+        if not params:
+            return
+        if not self._initialized:
+            await self.init()
+        try:
+            with self._observe("executemany", query):
+                await self.writer.submit(query, [tuple(p) for p in params], many=True)
+        except Exception as e:
+            log.error(f"Ошибка выполнения запроса: {e}")
+            raise e
+    
+    async def execute_batch(self, statements: List[Tuple[str, tuple]]) -> None:
+        """Выполняет несколько запросов на запись в одной транзакции
+        
+        Запросы фиксируются вместе: при ошибке любого из них не применяется ни один.
+        
+        Args:
+            statements (List[Tuple[str, tuple]]): Пары (SQL запрос, параметры)
+        """
+        if not statements:
+            return
+        if not self._initialized:
+            await self.init()
+        try:
+            with self._observe("execute_batch", statements[0][0]):
+                await self.writer.submit(None, [(query, tuple(params)) for query, params in statements])
+        except Exception as e:
+            log.error(f"Ошибка выполнения запроса: {e}")
             raise e
-        finally:
-            await conn.close()
     
     async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
         """Получает одну запись"""
-        conn = await self.acquire()
-        try:
-            cursor = await conn.execute(query, args)
-            if row := await cursor.fetchone():
-                return dict(row)
-            return None
-        finally:
-            await self.release(conn)
+        with self._observe("fetch_one", query):
+            conn = await self.acquire()
+            try:
+                cursor = await conn.execute(query, args)
+                if row := await cursor.fetchone():
+                    return dict(row)
+                return None
+            finally:
+                await self.release(conn)
     
     async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
         """Получает все записи"""
-        conn = await self.acquire()
+        with self._observe("fetch_all", query):
+            conn = await self.acquire()
+            try:
+                cursor = await conn.execute(query, args)
+                return [dict(row) for row in await cursor.fetchall()]
+            finally:
+                await self.release(conn)
+    
+    async def _build(self, op: str, table: str, *shape) -> str:
+        """Возвращает закэшированный SQL для вспомогательного метода
+        
+        При первом обращении к таблице загружает её колонки для белого списка.
+        """
         try:
-            cursor = await conn.execute(query, args)
-            return [dict(row) for row in await cursor.fetchall()]
-        finally:
-            await self.release(conn)
+            return self.queries.build(op, table, *shape)
+        except UnknownColumnError:
+            # Колонки могли появиться после ALTER TABLE, перечитываем схему таблицы
+            rows = await self.fetch_all(f"PRAGMA table_info({QueryBuilder.check_identifier(table)})")
+            self.queries.set_columns(table, (row["name"] for row in rows))
+            return self.queries.build(op, table, *shape)
     
     async def get_row(self, table: str, **where) -> Optional[Dict[str, Any]]:
         """Получает запись по условиям"""
-        conditions = " AND ".join(f"{k} = ?" for k in where)
-        query = f"SELECT * FROM {table}"
-        query += f" WHERE {conditions}" if where else ""
+        query = await self._build("select", table, tuple(where))
         return await self.fetch_one(query, *where.values())
     
     async def get_rows(self, table: str, **where) -> List[Dict[str, Any]]:
         """Получает все записи по условиям"""
-        conditions = " AND ".join(f"{k} = ?" for k in where)
-        query = f"SELECT * FROM {table}"
-        query += f" WHERE {conditions}" if where else ""
+        query = await self._build("select", table, tuple(where))
         return await self.fetch_all(query, *where.values())
     
     async def update(self, table: str, where: Dict[str, Any], values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -133,29 +427,64 @@ class Database:
         if not values:
             return await self.get_row(table, **where)
             
-        set_clause = ", ".join(f"{k} = ?" for k in values)
-        where_clause = " AND ".join(f"{k} = ?" for k in where)
-        query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
-        
-        await self.execute(query, *values.values(), *where.values())
-        return await self.get_row(table, **where)
+        query = await self._build("update_returning", table, tuple(values), tuple(where))
+        rows = await self.execute(query, *values.values(), *where.values())
+        return dict(rows[0]) if rows else None
     
     async def insert(self, table: str, values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Вставляет запись"""
-        columns = ", ".join(values.keys())
-        placeholders = ", ".join("?" * len(values))
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-        
-        await self.execute(query, *values.values())
-        return await self.get_row(table, **values)
+        query = await self._build("insert_returning", table, tuple(values))
+        rows = await self.execute(query, *values.values())
+        return dict(rows[0]) if rows else None
     
     async def delete(self, table: str, **where) -> bool:
         """Удаляет записи по условиям"""
-        conditions = " AND ".join(f"{k} = ?" for k in where)
-        query = f"DELETE FROM {table} WHERE {conditions}"
+        query = await self._build("delete", table, tuple(where))
         await self.execute(query, *where.values())
         return True
 
+    async def increment(self, table: str, where: Dict[str, Any], minimum: Optional[Dict[str, int]] = None, values: Optional[Dict[str, Any]] = None, **deltas: int) -> Optional[Dict[str, Any]]:
+        """Атомарно изменяет числовые колонки одним запросом
+        
+        Args:
+            table (str): Таблица
+            where (Dict[str, Any]): Условия выбора записи
+            minimum (Optional[Dict[str, int]]): Не применять изменение, если колонка станет меньше значения
+            values (Optional[Dict[str, Any]]): Колонки, которые устанавливаются тем же запросом
+            **deltas: Колонки и величины, на которые их нужно изменить
+            
+        Returns:
+            Optional[Dict[str, Any]]: Запись после изменения или None, если запись не найдена
+            или нарушено ограничение minimum
+        """
+        values = values or {}
+        if not deltas and not values:
+            return await self.get_row(table, **where)
+        minimum = minimum or {}
+        
+        query = await self._build("increment", table, tuple(deltas), tuple(values), tuple(where), tuple(minimum))
+        guard_args = [arg for k, value in minimum.items() for arg in (deltas.get(k, 0), value)]
+        rows = await self.execute(query, *deltas.values(), *values.values(), *where.values(), *guard_args)
+        return dict(rows[0]) if rows else None
+    
+    async def upsert(self, table: str, values: Dict[str, Any], conflict_keys: List[str], update: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Вставляет запись или обновляет существующую одним запросом
+        
+        Args:
+            table (str): Таблица
+            values (Dict[str, Any]): Значения колонок
+            conflict_keys (List[str]): Колонки уникального индекса, по которым определяется конфликт
+            update (Optional[List[str]]): Колонки, обновляемые при конфликте; по умолчанию все, кроме ключей
+            
+        Returns:
+            Dict[str, Any]: Запись после вставки или обновления
+        """
+        if update is None:
+            update = [k for k in values if k not in conflict_keys]
+        query = await self._build("upsert", table, tuple(values), tuple(conflict_keys), tuple(update))
+        rows = await self.execute(query, *values.values())
+        return dict(rows[0])
+
     async def ensure_user(self, user_id: Union[str, int]) -> Dict[str, Any]:
         """
         Получает данные пользователя или создает новую запись, если пользователь не существует
@@ -168,14 +497,15 @@ class Database:
         """
         user_data = await self.get_row("users", user_id=str(user_id))
         if not user_data:
-            user_data = await self.insert("users", {
+            # Параллельный вызов мог уже создать запись, поэтому не перезаписываем её
+            user_data = await self.upsert("users", {
                 'user_id': str(user_id),
                 'balance': 0,
                 'deposit': 0,
                 'xp': 0,
                 'level': 1,
                 'roles': '[]'
-            })
+            }, conflict_keys=['user_id'], update=[])
         return user_data
 
     async def connect(self) -> None:
@@ -183,9 +513,13 @@ class Database:
         await self.init()
         
     async def close(self):
-        """Закрывает все соединения в пуле"""
-        if self._pool:
-            async with self._pool_lock:
-                for conn in self._pool:
-                    await conn.close()
-                self._pool = []
\ No newline at end of file
+        """Сбрасывает кэши, дописывает очередь записи и плавно закрывает общий пул соединений"""
+        cache = Database._user_caches.pop(os.path.abspath(self.db_path), None)
+        if cache:
+            await cache.close()
+        writer = Database._writers.pop(os.path.abspath(self.db_path), None)
+        if writer:
+            await writer.close()
+        pool = Database._pools.pop(os.path.abspath(self.db_path), None)
+        if pool:
+            await pool.close()
@@ -0,0 +1,202 @@
+import aiosqlite
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Callable, Awaitable
+from . import baseline
+
+log = logging.getLogger(__name__)
+
+@dataclass
+class Migration:
+    """Описание миграции схемы"""
+    version: int
+    description: str
+    statements: List[str] = field(default_factory=list)
+    upgrade: Optional[Callable[[aiosqlite.Connection], Awaitable[None]]] = None
+
+    async def apply(self, conn: aiosqlite.Connection) -> None:
+        """Применяет миграцию на соединении (транзакцией управляет Migrator)"""
+        if self.upgrade is not None:
+            await self.upgrade(conn)
+        for statement in self.statements:
+            await conn.execute(statement)
+
+def _alter_definition(definition: str) -> Optional[str]:
+    """Определение колонки для ALTER TABLE ADD COLUMN
+
+    SQLite не допускает там PRIMARY KEY, непостоянные значения по умолчанию
+    и NOT NULL без значения по умолчанию, поэтому такие ограничения опускаются.
+    """
+    if "PRIMARY KEY" in definition:
+        return None
+    definition = definition.replace(" DEFAULT CURRENT_TIMESTAMP", "")
+    if "DEFAULT" not in definition:
+        definition = definition.replace(" NOT NULL", "")
+    return definition
+
+async def create_baseline(conn: aiosqlite.Connection) -> None:
+    """Приводит базу к снимку baseline: создает таблицы, добавляет колонки и индексы
+
+    Базы, созданные до появления миграций, могли не иметь части таблиц и
+    колонок, поэтому недостающее добавляется, а существующее не трогается.
+    """
+    cursor = await conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    existing = {row[0] for row in await cursor.fetchall()}
+
+    for table_name, columns in baseline.TABLES.items():
+        if table_name not in existing:
+            definitions = ", ".join(f"{name} {definition}" for name, definition in columns)
+            await conn.execute(f"CREATE TABLE {table_name} ({definitions})")
+            continue
+
+        cursor = await conn.execute(f"PRAGMA table_info({table_name})")
+        present = {row[1] for row in await cursor.fetchall()}
+        for name, definition in columns:
+            alter = _alter_definition(definition)
+            if name not in present and alter is not None:
+                await conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {name} {alter}")
+
+    for index in baseline.INDEXES:
+        await conn.execute(index)
+
+async def normalize_birthdays(conn: aiosqlite.Connection) -> None:
+    """Дополняет дни рождения ведущими нулями (1.1.2000 -> 01.01.2000)"""
+    cursor = await conn.execute(
+        "SELECT rowid, birthday FROM users WHERE birthday IS NOT NULL AND length(birthday) < 10"
+    )
+    updates = []
+    for rowid, birthday in await cursor.fetchall():
+        try:
+            day, month, year = map(int, birthday.split('.'))
+        except ValueError:
+            continue
+        updates.append((f"{day:02d}.{month:02d}.{year}", rowid))
+    if updates:
+        await conn.executemany("UPDATE users SET birthday = ? WHERE rowid = ?", updates)
+
+class Migrator:
+    """Применяет пронумерованные миграции и хранит версию схемы в schema_version"""
+
+    VERSION_TABLE = "schema_version"
+
+    def __init__(self, migrations: List[Migration]):
+        versions = [m.version for m in migrations]
+        if versions != sorted(set(versions)):
+            raise ValueError("Версии миграций должны быть уникальны и идти по возрастанию")
+        self.migrations = migrations
+
+    @property
+    def latest(self) -> int:
+        """Последняя известная версия схемы"""
+        return self.migrations[-1].version if self.migrations else 0
+
+    async def current_version(self, conn: aiosqlite.Connection) -> int:
+        """Текущая версия схемы базы"""
+        await conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.VERSION_TABLE} ("
+            "version INTEGER PRIMARY KEY, "
+            "description TEXT NOT NULL, "
+            "applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        )
+        cursor = await conn.execute(f"SELECT COALESCE(MAX(version), 0) FROM {self.VERSION_TABLE}")
+        return (await cursor.fetchone())[0]
+
+    async def run(self, conn: aiosqlite.Connection) -> int:
+        """Применяет все недостающие миграции, каждую в своей транзакции
+
+        Returns:
+            int: Версия схемы после применения
+        """
+        current = await self.current_version(conn)
+        if current >= self.latest:
+            return current
+
+        for migration in self.migrations:
+            if migration.version <= current:
+                continue
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                await migration.apply(conn)
+                await conn.execute(
+                    f"INSERT INTO {self.VERSION_TABLE} (version, description) VALUES (?, ?)",
+                    (migration.version, migration.description)
+                )
+                await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                log.error(f"Ошибка миграции {migration.version} ({migration.description}): {e}")
+                raise
+            log.info(f"Применена миграция {migration.version}: {migration.description}")
+            current = migration.version
+
+        return current
+
+# Новые миграции добавляются в конец списка со следующим номером. DDL каждой
+# миграции записан явно и не зависит от tables.py: после изменения Tables
+# нужна новая миграция с теми же таблицами, колонками и индексами
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Базовая схема: таблицы когов, недостающие колонки и индексы", upgrade=create_baseline),
+    Migration(
+        2,
+        "Индексы лидербордов, дней рождения, настроек и предупреждений",
+        statements=[
+            "DROP INDEX IF EXISTS idx_mod_user",
+            "CREATE INDEX IF NOT EXISTS idx_users_level ON users(level, xp)",
+            "CREATE INDEX IF NOT EXISTS idx_users_wealth ON users((balance + deposit))",
+            "CREATE INDEX IF NOT EXISTS idx_users_reputation ON users(reputation)",
+            "CREATE INDEX IF NOT EXISTS idx_users_birthday ON users(substr(birthday, 1, 5)) WHERE birthday IS NOT NULL",
+            "CREATE INDEX IF NOT EXISTS idx_mod_user_active ON moderation(user_id, guild_id, type, active, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_settings_key ON settings(category, key)",
+        ]
+    ),
+    Migration(
+        3,
+        "Журнал событий логирования",
+        statements=[
+            "CREATE TABLE IF NOT EXISTS log_journal ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP, "
+            "category TEXT, priority INTEGER DEFAULT 1, payload TEXT NOT NULL, delivered_at DATETIME)",
+            "CREATE INDEX IF NOT EXISTS idx_log_journal_pending ON log_journal(id) WHERE delivered_at IS NULL",
+            "CREATE INDEX IF NOT EXISTS idx_log_journal_category ON log_journal(category, created_at)",
+        ]
+    ),
+    Migration(
+        4,
+        "Полнотекстовый индекс событий логирования",
+        statements=[
+            "CREATE TABLE IF NOT EXISTS log_index ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP, "
+            "guild_id TEXT, category TEXT, event_type TEXT, actor_id TEXT, target_id TEXT, title TEXT, body TEXT)",
+            "CREATE INDEX IF NOT EXISTS idx_log_index_guild ON log_index(guild_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_log_index_category ON log_index(guild_id, category, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_log_index_actor ON log_index(guild_id, actor_id, created_at) "
+            "WHERE actor_id IS NOT NULL",
+            "CREATE INDEX IF NOT EXISTS idx_log_index_target ON log_index(guild_id, target_id, created_at) "
+            "WHERE target_id IS NOT NULL",
+            "CREATE VIRTUAL TABLE IF NOT EXISTS log_index_fts USING fts5("
+            "title, body, content='log_index', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+            "CREATE TRIGGER IF NOT EXISTS log_index_ai AFTER INSERT ON log_index BEGIN "
+            "INSERT INTO log_index_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+            "CREATE TRIGGER IF NOT EXISTS log_index_ad AFTER DELETE ON log_index BEGIN "
+            "INSERT INTO log_index_fts(log_index_fts, rowid, title, body) "
+            "VALUES ('delete', old.id, old.title, old.body); END",
+        ]
+    ),
+    Migration(
+        5,
+        "Почасовые сводки сообщений для аналитики",
+        statements=[
+            "CREATE TABLE IF NOT EXISTS message_rollups ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER NOT NULL, hour INTEGER NOT NULL, "
+            "channel_id INTEGER NOT NULL, user_id INTEGER NOT NULL, messages INTEGER DEFAULT 0, chars INTEGER DEFAULT 0)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_message_rollups_key "
+            "ON message_rollups(guild_id, hour, channel_id, user_id)",
+            "CREATE TABLE IF NOT EXISTS message_length_rollups ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER NOT NULL, hour INTEGER NOT NULL, "
+            "bin INTEGER NOT NULL, count INTEGER DEFAULT 0)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_message_length_rollups_key "
+            "ON message_length_rollups(guild_id, hour, bin)",
+        ]
+    ),
+    Migration(6, "Дни рождения в формате ДД.ММ.ГГГГ с ведущими нулями", upgrade=normalize_birthdays),
+]
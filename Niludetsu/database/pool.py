@@ -0,0 +1,272 @@
+import asyncio, time, aiosqlite
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Deque, AsyncIterator
+
+class PoolTimeoutError(asyncio.TimeoutError):
+    """Не удалось получить соединение из пула за отведённое время"""
+
+class PoolClosedError(RuntimeError):
+    """Пул соединений закрыт"""
+
+class ConnectionPool:
+    """Ограниченный пул соединений SQLite
+
+    Соединения создаются лениво до max_size, PRAGMA выставляются один раз
+    при создании соединения. Простаивающие соединения проверяются перед выдачей.
+    """
+
+    PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,   # 256 МБ
+        "cache_size": -16000,     # ~16 МБ на соединение
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON"
+    }
+
+    def __init__(
+        self,
+        db_path: str,
+        min_size: int = 1,
+        max_size: int = 5,
+        acquire_timeout: float = 10.0,
+        health_check_interval: float = 30.0,
+        pragmas: Optional[Dict[str, Any]] = None,
+        cached_statements: int = 256
+    ):
+        """Инициализация пула
+
+        Args:
+            db_path (str): Путь к файлу базы данных
+            min_size (int): Минимальное количество открытых соединений
+            max_size (int): Максимальное количество открытых соединений
+            acquire_timeout (float): Время ожидания свободного соединения в секундах
+            health_check_interval (float): Через сколько секунд простоя соединение проверяется перед выдачей
+            pragmas (Optional[Dict[str, Any]]): Дополнительные/переопределённые PRAGMA
+            cached_statements (int): Размер кэша скомпилированных запросов sqlite3 на соединение
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Некорректные размеры пула")
+
+        self.db_path = db_path
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.pragmas = {**self.PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+
+        self._idle: Deque[tuple] = deque()  # (соединение, время возврата)
+        self._in_use: set = set()
+        self._size = 0
+        self._cond = asyncio.Condition()
+        self._closing = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Статистика
+        self._waiting = 0
+        self._acquired_total = 0
+        self._timeouts_total = 0
+        self._health_failures = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    @property
+    def closed(self) -> bool:
+        """Закрыт ли пул"""
+        return self._closing
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Цикл событий, к которому привязан пул"""
+        return self._loop
+
+    async def _create_connection(self) -> aiosqlite.Connection:
+        """Создает новое соединение и выставляет PRAGMA"""
+        conn = await aiosqlite.connect(self.db_path, cached_statements=self.cached_statements)
+        conn.row_factory = aiosqlite.Row
+        try:
+            for name, value in self.pragmas.items():
+                await conn.execute(f"PRAGMA {name} = {value}")
+        except Exception:
+            await conn.close()
+            raise
+        return conn
+
+    async def _is_healthy(self, conn: aiosqlite.Connection) -> bool:
+        """Проверяет, что соединение живо"""
+        try:
+            await conn.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    async def _discard(self, conn: aiosqlite.Connection) -> None:
+        """Закрывает соединение и уменьшает размер пула"""
+        try:
+            await conn.close()
+        except Exception:
+            pass
+        async with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    async def open(self) -> None:
+        """Открывает минимальное количество соединений"""
+        self._loop = asyncio.get_running_loop()
+        while self._size < self.min_size:
+            async with self._cond:
+                if self._size >= self.min_size:
+                    break
+                self._size += 1
+            try:
+                conn = await self._create_connection()
+            except Exception:
+                async with self._cond:
+                    self._size -= 1
+                raise
+            async with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    async def acquire(self, timeout: Optional[float] = None) -> aiosqlite.Connection:
+        """Получает соединение из пула
+
+        Args:
+            timeout (Optional[float]): Время ожидания, по умолчанию acquire_timeout
+
+        Returns:
+            aiosqlite.Connection: Соединение
+
+        Raises:
+            PoolTimeoutError: Если свободное соединение не появилось вовремя
+            PoolClosedError: Если пул закрыт
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+
+        while True:
+            async with self._cond:
+                self._waiting += 1
+                try:
+                    await asyncio.wait_for(
+                        self._cond.wait_for(
+                            lambda: self._closing or self._idle or self._size < self.max_size
+                        ),
+                        timeout=max(timeout - (time.monotonic() - started), 0)
+                    )
+                except asyncio.TimeoutError:
+                    self._timeouts_total += 1
+                    raise PoolTimeoutError(
+                        f"Не удалось получить соединение за {timeout} сек. "
+                        f"(занято {len(self._in_use)}/{self.max_size})"
+                    ) from None
+                finally:
+                    self._waiting -= 1
+
+                if self._closing:
+                    raise PoolClosedError("Пул соединений закрыт")
+
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    fresh = False
+                else:
+                    self._size += 1
+                    conn, released_at, fresh = None, None, True
+
+            if fresh:
+                try:
+                    conn = await self._create_connection()
+                except Exception:
+                    async with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif time.monotonic() - released_at >= self.health_check_interval:
+                if not await self._is_healthy(conn):
+                    self._health_failures += 1
+                    await self._discard(conn)
+                    continue
+
+            waited = time.monotonic() - started
+            self._acquired_total += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+            self._in_use.add(conn)
+            return conn
+
+    async def release(self, conn: aiosqlite.Connection) -> None:
+        """Возвращает соединение в пул"""
+        self._in_use.discard(conn)
+
+        # Незавершённая транзакция не должна утечь к следующему пользователю
+        if conn.in_transaction:
+            try:
+                await conn.rollback()
+            except Exception:
+                await self._discard(conn)
+                return
+
+        if self._closing:
+            await self._discard(conn)
+            return
+
+        async with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @asynccontextmanager
+    async def connection(self, timeout: Optional[float] = None) -> AsyncIterator[aiosqlite.Connection]:
+        """Контекстный менеджер для получения соединения"""
+        conn = await self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            await self.release(conn)
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Плавно закрывает пул: ждёт возврата занятых соединений и закрывает все
+
+        Args:
+            timeout (float): Сколько ждать возврата занятых соединений
+        """
+        async with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+
+        try:
+            async with self._cond:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: not self._in_use),
+                    timeout=timeout
+                )
+        except asyncio.TimeoutError:
+            pass
+
+        while self._idle:
+            conn, _ = self._idle.popleft()
+            await self._discard(conn)
+
+        for conn in list(self._in_use):
+            self._in_use.discard(conn)
+            await self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика пула для мониторинга"""
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": len(self._in_use),
+            "waiting": self._waiting,
+            "max_size": self.max_size,
+            "acquired_total": self._acquired_total,
+            "timeouts_total": self._timeouts_total,
+            "health_failures": self._health_failures,
+            "wait_time_total": round(self._wait_time_total, 6),
+            "wait_time_avg": round(self._wait_time_total / self._acquired_total, 6) if self._acquired_total else 0.0,
+            "wait_time_max": round(self._wait_time_max, 6)
+        }
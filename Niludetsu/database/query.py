@@ -0,0 +1,122 @@
+import re
+from typing import Dict, Tuple, FrozenSet, Iterable
+from .tables import Tables
+
+class UnknownColumnError(ValueError):
+    """Таблица или колонка отсутствует в схеме"""
+
+class QueryBuilder:
+    """Построитель SQL для вспомогательных методов Database
+
+    Готовый текст запроса кэшируется по ключу (операция, таблица, набор колонок),
+    поэтому повторные вызовы не собирают строку заново. Имена таблиц и колонок
+    проверяются по Tables.SCHEMA и фактической схеме базы при первом построении.
+    """
+
+    IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+    def __init__(self):
+        self._cache: Dict[tuple, str] = {}
+        self._columns: Dict[str, FrozenSet[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def check_identifier(cls, name: str) -> str:
+        """Проверяет, что имя таблицы или колонки безопасно подставлять в SQL"""
+        if not isinstance(name, str) or not cls.IDENTIFIER.match(name):
+            raise ValueError(f"Недопустимое имя в SQL: {name!r}")
+        return name
+
+    @staticmethod
+    def schema_columns(table: str) -> FrozenSet[str]:
+        """Колонки таблицы из Tables.SCHEMA"""
+        schema = Tables.SCHEMA.get(table, {})
+        return frozenset(col for col in schema if col != "INDEXES")
+
+    def set_columns(self, table: str, columns: Iterable[str]) -> None:
+        """Запоминает разрешённые колонки таблицы и сбрасывает её запросы"""
+        self._columns[table] = self.schema_columns(table) | frozenset(columns)
+        self._cache = {key: sql for key, sql in self._cache.items() if key[1] != table}
+
+    def _validate(self, table: str, columns: Iterable[str]) -> None:
+        """Проверяет таблицу и колонки по белому списку"""
+        self.check_identifier(table)
+        allowed = self._columns.get(table)
+        if not allowed:
+            raise UnknownColumnError(f"Неизвестная таблица: {table}")
+        for column in columns:
+            if column not in allowed:
+                self.check_identifier(column)
+                raise UnknownColumnError(f"Неизвестная колонка {table}.{column}")
+
+    def build(self, op: str, table: str, *shape: Tuple[str, ...]) -> str:
+        """Возвращает SQL для операции, собирая его только при первом обращении
+
+        Args:
+            op (str): Операция (select, insert, update, delete, increment, upsert,
+                insert_returning, update_returning)
+            table (str): Таблица
+            *shape: Кортежи имён колонок, порядок которых задаёт порядок параметров
+
+        Raises:
+            UnknownColumnError: Если таблица или колонка не из схемы
+            ValueError: Если имя недопустимо
+        """
+        key = (op, table, shape)
+        sql = self._cache.get(key)
+        if sql is not None:
+            self.hits += 1
+            return sql
+
+        self.misses += 1
+        self._validate(table, (column for group in shape for column in group))
+        sql = getattr(self, f"_build_{op}")(table, *shape)
+        self._cache[key] = sql
+        return sql
+
+    @staticmethod
+    def _where(where: Tuple[str, ...]) -> str:
+        return " AND ".join(f"{k} = ?" for k in where)
+
+    def _build_select(self, table: str, where: Tuple[str, ...]) -> str:
+        query = f"SELECT * FROM {table}"
+        return query + (f" WHERE {self._where(where)}" if where else "")
+
+    def _build_update(self, table: str, values: Tuple[str, ...], where: Tuple[str, ...]) -> str:
+        set_clause = ", ".join(f"{k} = ?" for k in values)
+        return f"UPDATE {table} SET {set_clause} WHERE {self._where(where)}"
+
+    def _build_insert(self, table: str, values: Tuple[str, ...]) -> str:
+        placeholders = ", ".join("?" * len(values))
+        return f"INSERT INTO {table} ({', '.join(values)}) VALUES ({placeholders})"
+
+    def _build_update_returning(self, table: str, values: Tuple[str, ...], where: Tuple[str, ...]) -> str:
+        return f"{self._build_update(table, values, where)} RETURNING *"
+
+    def _build_insert_returning(self, table: str, values: Tuple[str, ...]) -> str:
+        return f"{self._build_insert(table, values)} RETURNING *"
+
+    def _build_delete(self, table: str, where: Tuple[str, ...]) -> str:
+        return f"DELETE FROM {table} WHERE {self._where(where)}"
+
+    def _build_increment(self, table: str, deltas: Tuple[str, ...], values: Tuple[str, ...],
+                         where: Tuple[str, ...], minimum: Tuple[str, ...]) -> str:
+        set_clause = ", ".join(
+            [f"{k} = COALESCE({k}, 0) + ?" for k in deltas] + [f"{k} = ?" for k in values]
+        )
+        guard_clause = "".join(f" AND COALESCE({k}, 0) + ? >= ?" for k in minimum)
+        return f"UPDATE {table} SET {set_clause} WHERE {self._where(where)}{guard_clause} RETURNING *"
+
+    def _build_upsert(self, table: str, values: Tuple[str, ...], conflict_keys: Tuple[str, ...],
+                      update: Tuple[str, ...]) -> str:
+        # Пустое обновление ключа нужно, чтобы RETURNING вернул существующую запись
+        update_clause = ", ".join(f"{k} = excluded.{k}" for k in (update or conflict_keys[:1]))
+        return (
+            f"{self._build_insert(table, values)} "
+            f"ON CONFLICT({', '.join(conflict_keys)}) DO UPDATE SET {update_clause} RETURNING *"
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика кэша запросов"""
+        return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
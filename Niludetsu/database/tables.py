@@ -23,13 +23,15 @@ class Column:
 class Index:
     """Описание индекса таблицы"""
     name: str
-    columns: List[str]
+    columns: List[str]  # Колонки или выражения, например "(balance + deposit)"
     unique: bool = False
+    where: str = None   # Условие частичного индекса
     
     def __str__(self) -> str:
         """Преобразует описание индекса в SQL"""
         unique = "UNIQUE " if self.unique else ""
-        return f"CREATE {unique}INDEX IF NOT EXISTS {self.name} ON {{table}}({', '.join(self.columns)})"
+        where = f" WHERE {self.where}" if self.where else ""
+        return f"CREATE {unique}INDEX IF NOT EXISTS {self.name} ON {{table}}({', '.join(self.columns)}){where}"
 
 class TableSchema:
     """Базовый класс для схемы таблицы"""
@@ -39,38 +41,75 @@ class TableSchema:
     created_at = Column("DATETIME", default="CURRENT_TIMESTAMP", description="Дата создания")
     updated_at = Column("DATETIME", default="CURRENT_TIMESTAMP", description="Дата обновления")
 
-def get_schema(cls) -> Dict:
-    """Получает схему всех таблиц"""
-    schema = {}
+def table_name(table_class: type, attr_name: str) -> str:
+    """Имя таблицы в базе: атрибут TABLE или имя класса в нижнем регистре"""
+    return getattr(table_class, 'TABLE', None) or attr_name.lower()
+
+def get_columns(cls) -> Dict[str, Dict[str, Column]]:
+    """Получает описания колонок всех таблиц"""
+    tables = {}
     
-    for table_name, table_class in cls.__dict__.items():
+    for attr_name, table_class in cls.__dict__.items():
         if isinstance(table_class, type) and issubclass(table_class, TableSchema) and table_class != TableSchema:
             columns = {}
             
-            # Добавляем колонки из базового класса
+            # Добавляем колонки из базового класса (таблица может их отключить, присвоив None)
             for name, col in TableSchema.__dict__.items():
-                if isinstance(col, Column):
-                    columns[name] = str(col)
+                if isinstance(col, Column) and isinstance(getattr(table_class, name), Column):
+                    columns[name] = col
             
             # Добавляем колонки из текущего класса
             for name, col in table_class.__dict__.items():
                 if isinstance(col, Column):
-                    columns[name] = str(col)
+                    columns[name] = col
+                    
+            tables[table_name(table_class, attr_name)] = columns
+            
+    return tables
+
+def get_schema(cls) -> Dict:
+    """Получает схему всех таблиц"""
+    schema = {}
+    
+    for attr_name, table_class in cls.__dict__.items():
+        if isinstance(table_class, type) and issubclass(table_class, TableSchema) and table_class != TableSchema:
+            name = table_name(table_class, attr_name)
+            columns = {col_name: str(col) for col_name, col in cls.COLUMNS[name].items()}
             
             # Добавляем индексы
             if hasattr(table_class, 'INDEXES'):
                 columns['INDEXES'] = [
-                    str(idx).format(table=table_name.lower())
+                    str(idx).format(table=name)
                     for idx in table_class.INDEXES
                 ]
             
-            schema[table_name.lower()] = columns
+            schema[name] = columns
             
     return schema
 
 class Tables:
     """Схемы таблиц базы данных"""
     
+    # Имена таблиц
+    USERS = "users"
+    MODERATION = "moderation"
+    TEMP_ROOMS = "temp_rooms"
+    SETTINGS = "settings"
+    COOLDOWNS = "cooldowns"
+    AFK = "afk"
+    GIVEAWAYS = "giveaways"
+    INVITE_CACHE = "invite_cache"
+    GAMES = "games"
+    WORDS = "words"
+    GLOBAL_BANS = "global_bans"
+    BUMP_REMINDERS = "bump_reminders"
+    TICKETS = "tickets"
+    SHOP_ROLES = "shop_roles"
+    LOG_JOURNAL = "log_journal"
+    LOG_INDEX = "log_index"
+    MESSAGE_ROLLUPS = "message_rollups"
+    MESSAGE_LENGTH_ROLLUPS = "message_length_rollups"
+    
     class Users(TableSchema):
         """Таблица пользователей"""
         user_id = Column("TEXT", required=True, description="ID пользователя")
@@ -78,10 +117,29 @@ class Tables:
         balance = Column("INTEGER", default="0", description="Баланс")
         xp = Column("INTEGER", default="0", description="Опыт")
         level = Column("INTEGER", default="1", description="Уровень")
+        messages_count = Column("INTEGER", default="0", description="Количество сообщений")
         roles = Column("TEXT", default="'[]'", description="Роли")
+        deposit = Column("INTEGER", default="0", description="Деньги в банке")
+        reputation = Column("INTEGER", default="0", description="Репутация")
+        voice_time = Column("INTEGER", default="0", description="Время в голосовых каналах (сек)")
+        voice_joins = Column("INTEGER", default="0", description="Количество входов в голосовые каналы")
+        last_voice_join = Column("TEXT", description="Время последнего входа в голосовой канал")
+        last_daily = Column("TEXT", description="Время получения ежедневной награды")
+        last_work = Column("TEXT", description="Время последней работы")
+        last_rob = Column("TEXT", description="Время последнего ограбления")
+        spouse = Column("TEXT", description="ID супруга")
+        country = Column("TEXT", description="Страна")
+        bio = Column("TEXT", description="О себе")
+        birthday = Column("TEXT", description="День рождения (ДД.ММ.ГГГГ)")
         
         INDEXES = [
-            Index("idx_users_id", ["user_id"], unique=True)
+            Index("idx_users_id", ["user_id"], unique=True),
+            # Лидерборды
+            Index("idx_users_level", ["level", "xp"]),
+            Index("idx_users_wealth", ["(balance + deposit)"]),
+            Index("idx_users_reputation", ["reputation"]),
+            # Поиск именинников по "ДД.ММ"
+            Index("idx_users_birthday", ["substr(birthday, 1, 5)"], where="birthday IS NOT NULL")
         ]
     
     class Moderation(TableSchema):
@@ -95,17 +153,26 @@ class Tables:
         active = Column("BOOLEAN", default="TRUE", description="Активно")
         
         INDEXES = [
-            Index("idx_mod_user", ["user_id", "guild_id", "type"]),
+            Index("idx_mod_user_active", ["user_id", "guild_id", "type", "active", "created_at"]),
             Index("idx_mod_active", ["active"])
         ]
     
     class TempRooms(TableSchema):
         """Таблица временных комнат"""
+        TABLE = "temp_rooms"
+        
         channel_id = Column("TEXT", required=True, description="ID канала")
         guild_id = Column("TEXT", required=True, description="ID сервера")
         owner_id = Column("TEXT", required=True, description="ID владельца")
         name = Column("TEXT", required=True, description="Название")
         settings = Column("TEXT", default="'{}'", description="Настройки в JSON")
+        channel_type = Column("INTEGER", default="2", description="Тип канала")
+        trusted_users = Column("TEXT", default="'[]'", description="Доверенные пользователи в JSON")
+        banned_users = Column("TEXT", default="'[]'", description="Заблокированные пользователи в JSON")
+        user_limit = Column("INTEGER", default="0", description="Лимит участников")
+        is_locked = Column("BOOLEAN", default="FALSE", description="Закрыт")
+        thread_id = Column("TEXT", description="ID ветки управления")
+        region = Column("TEXT", description="Регион голосового сервера")
         
         INDEXES = [
             Index("idx_temp_channel", ["channel_id"], unique=True),
@@ -120,8 +187,209 @@ class Tables:
         value = Column("TEXT", required=True, description="Значение")
         
         INDEXES = [
-            Index("idx_settings", ["guild_id", "category", "key"], unique=True)
+            Index("idx_settings", ["guild_id", "category", "key"], unique=True),
+            # Глобальные настройки читаются без guild_id
+            Index("idx_settings_key", ["category", "key"])
+        ]
+
+    class Cooldowns(TableSchema):
+        """Таблица кулдаунов команд"""
+        user_id = Column("TEXT", required=True, description="ID пользователя")
+        guild_id = Column("TEXT", required=True, description="ID сервера")
+        command = Column("TEXT", required=True, description="Команда")
+        expires_at = Column("DATETIME", required=True, description="Дата окончания")
+        
+        INDEXES = [
+            Index("idx_cooldowns_key", ["user_id", "guild_id", "command"])
+        ]
+    
+    class Afk(TableSchema):
+        """Таблица AFK статусов"""
+        user_id = Column("TEXT", required=True, description="ID пользователя")
+        guild_id = Column("TEXT", required=True, description="ID сервера")
+        reason = Column("TEXT", description="Причина")
+        timestamp = Column("DATETIME", default="CURRENT_TIMESTAMP", description="Время установки")
+        
+        INDEXES = [
+            Index("idx_afk_user", ["user_id", "guild_id"], unique=True)
+        ]
+    
+    class Giveaways(TableSchema):
+        """Таблица розыгрышей"""
+        id = None
+        giveaway_id = Column("INTEGER PRIMARY KEY AUTOINCREMENT")
+        channel_id = Column("TEXT", required=True, description="ID канала")
+        message_id = Column("TEXT", required=True, description="ID сообщения")
+        guild_id = Column("TEXT", required=True, description="ID сервера")
+        host_id = Column("TEXT", required=True, description="ID организатора")
+        prize = Column("TEXT", required=True, description="Приз")
+        winners_count = Column("INTEGER", default="1", description="Количество победителей")
+        end_time = Column("TEXT", required=True, description="Время окончания")
+        is_ended = Column("INTEGER", default="0", description="Завершен")
+        participants = Column("TEXT", default="'[]'", description="Участники")
+        
+        INDEXES = [
+            Index("idx_giveaways_message", ["message_id"], unique=True),
+            Index("idx_giveaways_active", ["is_ended", "end_time"])
+        ]
+    
+    class InviteCache(TableSchema):
+        """Таблица кэша приглашений"""
+        TABLE = "invite_cache"
+        
+        guild_id = Column("TEXT", required=True, description="ID сервера")
+        invite_code = Column("TEXT", required=True, description="Код приглашения")
+        uses = Column("INTEGER", default="0", description="Использований")
+        inviter_id = Column("TEXT", description="ID создателя")
+        
+        INDEXES = [
+            Index("idx_invite_cache_guild", ["guild_id", "invite_code"])
+        ]
+    
+    class Games(TableSchema):
+        """Таблица состояний игр в каналах (счет, слова)"""
+        channel_id = Column("TEXT", required=True, description="ID канала")
+        game_type = Column("TEXT", required=True, description="Тип игры")
+        last_value = Column("TEXT", description="Последнее значение")
+        used_values = Column("TEXT", description="Использованные значения в JSON")
+        forum_id = Column("TEXT", description="ID форума")
+        thread_id = Column("TEXT", description="ID ветки")
+        
+        INDEXES = [
+            Index("idx_games_channel", ["channel_id"], unique=True),
+            Index("idx_games_forum", ["game_type", "forum_id"])
+        ]
+    
+    class Words(TableSchema):
+        """Словарь для игры в слова"""
+        word = Column("TEXT", required=True, description="Слово")
+        language = Column("TEXT", required=True, description="Язык")
+        part_of_speech = Column("TEXT", description="Часть речи")
+        
+        INDEXES = [
+            Index("idx_words_word", ["word", "language", "part_of_speech"], unique=True)
+        ]
+    
+    class GlobalBans(TableSchema):
+        """Таблица глобальных банов во временных комнатах"""
+        TABLE = "global_bans"
+        
+        banned_user_id = Column("TEXT", required=True, description="ID заблокированного")
+        owner_id = Column("TEXT", required=True, description="ID владельца комнат")
+        
+        INDEXES = [
+            Index("idx_global_bans_user", ["banned_user_id", "owner_id"], unique=True)
+        ]
+    
+    class BumpReminders(TableSchema):
+        """Таблица напоминаний о бампах"""
+        TABLE = "bump_reminders"
+        
+        bot_id = Column("TEXT", required=True, description="ID бота мониторинга")
+        bot_name = Column("TEXT", required=True, description="Название бота")
+        next_bump = Column("TEXT", required=True, description="Время следующего бампа")
+        
+        INDEXES = [
+            Index("idx_bump_reminders_bot", ["bot_id"], unique=True)
+        ]
+    
+    class Tickets(TableSchema):
+        """Таблица тикетов"""
+        channel_id = Column("TEXT", required=True, description="ID канала")
+        user_id = Column("TEXT", required=True, description="ID автора")
+        guild_id = Column("TEXT", required=True, description="ID сервера")
+        reason = Column("TEXT", description="Причина")
+        status = Column("TEXT", default="'open'", description="Статус")
+        closed_by = Column("TEXT", description="ID закрывшего")
+        closed_at = Column("DATETIME", description="Дата закрытия")
+        close_reason = Column("TEXT", description="Причина закрытия")
+        
+        INDEXES = [
+            Index("idx_tickets_user", ["user_id", "guild_id", "status"]),
+            Index("idx_tickets_channel", ["channel_id", "guild_id", "status"])
+        ]
+    
+    class ShopRoles(TableSchema):
+        """Таблица ролей магазина"""
+        TABLE = "shop_roles"
+        
+        role_id = Column("TEXT", required=True, description="ID роли")
+        price = Column("INTEGER", required=True, description="Цена")
+        description = Column("TEXT", description="Описание")
+        purchases = Column("INTEGER", default="0", description="Количество покупок")
+        
+        INDEXES = [
+            Index("idx_shop_roles_role", ["role_id"], unique=True),
+            Index("idx_shop_roles_price", ["price"])
+        ]
+
+    class LogJournal(TableSchema):
+        """Журнал событий логирования до отправки в Discord"""
+        TABLE = "log_journal"
+        updated_at = None
+        
+        category = Column("TEXT", description="Категория логгера")
+        priority = Column("INTEGER", default="1", description="Приоритет")
+        payload = Column("TEXT", required=True, description="Эмбед в JSON")
+        delivered_at = Column("DATETIME", description="Дата доставки")
+        
+        INDEXES = [
+            Index("idx_log_journal_pending", ["id"], where="delivered_at IS NULL"),
+            Index("idx_log_journal_category", ["category", "created_at"])
+        ]
+
+    class LogIndex(TableSchema):
+        """Поисковый индекс отправленных событий логирования"""
+        TABLE = "log_index"
+        updated_at = None
+        
+        guild_id = Column("TEXT", description="ID сервера")
+        category = Column("TEXT", description="Категория логгера")
+        event_type = Column("TEXT", description="Тип события")
+        actor_id = Column("TEXT", description="ID того, кто выполнил действие")
+        target_id = Column("TEXT", description="ID объекта действия")
+        title = Column("TEXT", description="Заголовок события")
+        body = Column("TEXT", description="Текст события для полнотекстового поиска")
+        
+        INDEXES = [
+            Index("idx_log_index_guild", ["guild_id", "created_at"]),
+            Index("idx_log_index_category", ["guild_id", "category", "created_at"]),
+            Index("idx_log_index_actor", ["guild_id", "actor_id", "created_at"], where="actor_id IS NOT NULL"),
+            Index("idx_log_index_target", ["guild_id", "target_id", "created_at"], where="target_id IS NOT NULL")
+        ]
+
+    class MessageRollups(TableSchema):
+        """Сообщения по часам, каналам и авторам для аналитики"""
+        TABLE = "message_rollups"
+        created_at = None
+        updated_at = None
+        
+        guild_id = Column("INTEGER", required=True, description="ID сервера")
+        hour = Column("INTEGER", required=True, description="Час в UTC: секунды эпохи // 3600")
+        channel_id = Column("INTEGER", required=True, description="ID канала")
+        user_id = Column("INTEGER", required=True, description="ID автора")
+        messages = Column("INTEGER", default="0", description="Количество сообщений")
+        chars = Column("INTEGER", default="0", description="Суммарная длина сообщений")
+        
+        INDEXES = [
+            Index("idx_message_rollups_key", ["guild_id", "hour", "channel_id", "user_id"], unique=True)
+        ]
+
+    class MessageLengthRollups(TableSchema):
+        """Гистограмма длин сообщений по часам"""
+        TABLE = "message_length_rollups"
+        created_at = None
+        updated_at = None
+        
+        guild_id = Column("INTEGER", required=True, description="ID сервера")
+        hour = Column("INTEGER", required=True, description="Час в UTC: секунды эпохи // 3600")
+        bin = Column("INTEGER", required=True, description="Номер интервала длины")
+        count = Column("INTEGER", default="0", description="Количество сообщений")
+        
+        INDEXES = [
+            Index("idx_message_length_rollups_key", ["guild_id", "hour", "bin"], unique=True)
         ]
 
 # Генерируем схему после определения всех классов
+Tables.COLUMNS = get_columns(Tables)
 Tables.SCHEMA = get_schema(Tables)
\ No newline at end of file
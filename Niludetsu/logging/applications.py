@@ -3,6 +3,7 @@ import discord
 
 class ApplicationLogger(BaseLogger):
     """Логгер для событий, связанных с приложениями Discord."""
+    category = "applications"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
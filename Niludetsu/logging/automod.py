@@ -4,6 +4,7 @@ from typing import List, Dict, Any
 
 class AutoModLogger(BaseLogger):
     """Логгер для событий AutoMod Discord."""
+    category = "automod"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -1,4 +1,5 @@
 from Niludetsu import BaseLogger, Emojis, LoggingState
+from Niludetsu.core.snapshots import snapshots, permission_names, permission_diff, overwrite_changes
 import discord
 from typing import Optional, List, Dict, Union
 from discord.channel import TextChannel, VoiceChannel, CategoryChannel, ForumChannel
@@ -6,6 +7,7 @@ from datetime import datetime
 
 class ChannelLogger(BaseLogger):
     """Логгер для каналов Discord."""
+    category = "channels"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -18,48 +20,42 @@ class ChannelLogger(BaseLogger):
         await self.initialize_logs()
         self.log_channel = LoggingState.log_channel
     
-    def _get_permission_changes(self, before: Dict[discord.Role, discord.PermissionOverwrite],
-                              after: Dict[discord.Role, discord.PermissionOverwrite]) -> List[str]:
-        """Получает список изменений прав"""
+    def _get_permission_changes(self, before: Dict[int, tuple], after: Dict[int, tuple]) -> List[str]:
+        """Получает список изменений прав по снимкам переопределений канала"""
         changes = []
         
-        # Получаем все уникальные роли
-        all_roles = set(before.keys()) | set(after.keys())
-        
-        for role in all_roles:
-            before_perms = before.get(role)
-            after_perms = after.get(role)
+        for change in overwrite_changes(before, after):
+            mention = f"<@{change.target_id}>" if change.is_member else f"<@&{change.target_id}>"
             
-            if not before_perms and after_perms:
+            if change.before is None:
                 # Добавлены новые права
-                allowed = [perm[0] for perm in after_perms if perm[1] is True]
-                denied = [perm[0] for perm in after_perms if perm[1] is False]
-                
+                allowed, denied = change.after
                 if allowed:
-                    changes.append(f"✅ {role.mention}: Разрешено: {', '.join(allowed)}")
+                    changes.append(f"✅ {mention}: Разрешено: {', '.join(permission_names(allowed))}")
                 if denied:
-                    changes.append(f"❌ {role.mention}: Запрещено: {', '.join(denied)}")
+                    changes.append(f"❌ {mention}: Запрещено: {', '.join(permission_names(denied))}")
                     
-            elif before_perms and not after_perms:
+            elif change.after is None:
                 # Удалены права
-                changes.append(f"🗑️ {role.mention}: Права удалены")
+                changes.append(f"🗑️ {mention}: Права удалены")
                 
-            elif before_perms and after_perms:
-                # Изменены существующие права
+            else:
+                # Изменены существующие права: XOR показывает только затронутые биты
+                (old_allow, old_deny), (new_allow, new_deny) = change.before, change.after
                 changed_perms = []
-                for perm, value in after_perms:
-                    before_value = dict(before_perms).get(perm)
-                    if before_value != value:
-                        status = "✅" if value else "❌"
-                        changed_perms.append(f"{status} {perm}")
+                for perm in permission_names((old_allow ^ new_allow) | (old_deny ^ new_deny)):
+                    bit = discord.Permissions.VALID_FLAGS[perm]
+                    status = "✅" if new_allow & bit else "❌" if new_deny & bit else "➖"
+                    changed_perms.append(f"{status} {perm}")
                         
                 if changed_perms:
-                    changes.append(f"📝 {role.mention}: {', '.join(changed_perms)}")
+                    changes.append(f"📝 {mention}: {', '.join(changed_perms)}")
         
         return changes
     
     async def log_guild_channel_create(self, channel: discord.abc.GuildChannel):
         """Логирование создания канала"""
+        snapshots.remember("channel", channel)
         channel_type = {
             discord.TextChannel: "текстовый канал",
             discord.VoiceChannel: "голосовой канал",
@@ -92,6 +88,7 @@ class ChannelLogger(BaseLogger):
         
     async def log_guild_channel_delete(self, channel: discord.abc.GuildChannel):
         """Логирование удаления канала"""
+        snapshots.forget("channel", channel.id)
         channel_type = {
             discord.TextChannel: "текстовый канал",
             discord.VoiceChannel: "голосовой канал",
@@ -124,31 +121,40 @@ class ChannelLogger(BaseLogger):
             {"name": f"{Emojis.DOT} ID", "value": str(after.id), "inline": True}
         ]
         
-        # Проверяем изменение названия
-        if before.name != after.name:
-            changes.append(f"Название: {before.name} ➜ {after.name}")
+        diff = snapshots.diff("channel", before, after)
+        
+        if "name" in diff:
+            changes.append(f"Название: {diff['name'][0]} ➜ {diff['name'][1]}")
             
-        # Проверяем изменение категории
-        if before.category != after.category:
-            old_category = before.category.name if before.category else "Нет"
-            new_category = after.category.name if after.category else "Нет"
-            changes.append(f"Категория: {old_category} ➜ {new_category}")
+        if "category_id" in diff:
+            old_id, new_id = diff["category_id"]
+            old_category = after.guild.get_channel(old_id) if old_id else None
+            new_category = after.guild.get_channel(new_id) if new_id else None
+            changes.append(f"Категория: {old_category.name if old_category else 'Нет'} ➜ {new_category.name if new_category else 'Нет'}")
             
-        # Проверяем изменения для текстового канала
-        if isinstance(after, discord.TextChannel):
-            if before.topic != after.topic:
-                changes.append(f"Описание: {before.topic or 'Нет'} ➜ {after.topic or 'Нет'}")
-            if before.slowmode_delay != after.slowmode_delay:
-                changes.append(f"Медленный режим: {before.slowmode_delay} сек. ➜ {after.slowmode_delay} сек.")
-            if before.nsfw != after.nsfw:
-                changes.append(f"NSFW: {'Да' if before.nsfw else 'Нет'} ➜ {'Да' if after.nsfw else 'Нет'}")
+        if "topic" in diff:
+            old_topic, new_topic = diff["topic"]
+            changes.append(f"Описание: {old_topic or 'Нет'} ➜ {new_topic or 'Нет'}")
+        if "slowmode_delay" in diff:
+            changes.append(f"Медленный режим: {diff['slowmode_delay'][0]} сек. ➜ {diff['slowmode_delay'][1]} сек.")
+        if "nsfw" in diff:
+            old_nsfw, new_nsfw = diff["nsfw"]
+            changes.append(f"NSFW: {'Да' if old_nsfw else 'Нет'} ➜ {'Да' if new_nsfw else 'Нет'}")
+        if "bitrate" in diff:
+            changes.append(f"Битрейт: {(diff['bitrate'][0] or 0) // 1000}kbps ➜ {(diff['bitrate'][1] or 0) // 1000}kbps")
+        if "user_limit" in diff:
+            changes.append(f"Лимит пользователей: {diff['user_limit'][0] or 'Без лимита'} ➜ {diff['user_limit'][1] or 'Без лимита'}")
+        if "rtc_region" in diff:
+            changes.append(f"Регион: {diff['rtc_region'][0] or 'Авто'} ➜ {diff['rtc_region'][1] or 'Авто'}")
                 
         # Проверяем изменения прав доступа
-        permission_changes = self._get_permission_changes(before.overwrites, after.overwrites)
+        permission_changes = []
+        if "overwrites" in diff:
+            permission_changes = self._get_permission_changes(*diff["overwrites"])
         if permission_changes:
             fields.append({
                 "name": f"{Emojis.DOT} Изменения прав",
-                "value": "\n".join(permission_changes),
+                "value": "\n".join(permission_changes)[:1024],
                 "inline": False
             })
             
@@ -159,6 +165,7 @@ class ChannelLogger(BaseLogger):
                 "inline": False
             })
             
+        if changes or permission_changes:
             await self.log_event(
                 title=f"{Emojis.INFO} Канал изменен",
                 description=f"Изменены настройки канала {after.mention}",
@@ -200,10 +207,8 @@ class ChannelLogger(BaseLogger):
         
     async def log_guild_channel_permissions_update(self, channel: discord.abc.GuildChannel, target: Union[discord.Role, discord.Member], before: discord.Permissions, after: discord.Permissions):
         """Логирование изменения прав доступа"""
-        changes = []
-        for perm, value in after:
-            if getattr(before, perm) != value:
-                changes.append(f"{perm}: {'✅' if value else '❌'}")
+        added, removed = permission_diff(before.value, after.value)
+        changes = [f"{perm}: ✅" for perm in added] + [f"{perm}: ❌" for perm in removed]
                 
         if changes:
             fields = [
@@ -4,6 +4,7 @@ from typing import Optional, List
 
 class EmojiLogger(BaseLogger):
     """Логгер для событий, связанных с эмодзи Discord."""
+    category = "emojis"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -5,6 +5,7 @@ from datetime import datetime
 
 class EntitlementLogger(BaseLogger):
     """Логгер для событий подписок (entitlements) Discord."""
+    category = "entitlements"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
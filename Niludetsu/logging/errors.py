@@ -1,4 +1,4 @@
-from Niludetsu import BaseLogger, Emojis, LoggingState
+from Niludetsu import BaseLogger, Emojis, LoggingState, LogShipper
 import discord
 from discord.ext import commands
 from typing import Optional, Union
@@ -6,6 +6,8 @@ import traceback
 
 class ErrorLogger(BaseLogger):
     """Логгер для обработки и логирования ошибок."""
+    category = "errors"
+    priority = LogShipper.HIGH
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -5,6 +5,7 @@ from discord import ScheduledEvent
 
 class EventLogger(BaseLogger):
     """Логгер для событий Discord."""
+    category = "events"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -4,6 +4,7 @@ from typing import Optional
 
 class InviteLogger(BaseLogger):
     """Логгер для приглашений Discord."""
+    category = "invites"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -1,11 +1,81 @@
-from Niludetsu import BaseLogger, Emojis, LoggingState
-import discord, tempfile, os
-from typing import Optional, List, Union
+from Niludetsu import BaseLogger, Emojis, LoggingState, LogShipper, Settings
+import discord, asyncio, gzip, io
+from typing import Optional, List, Union, Iterable, Iterator
 from discord.ext import commands
 from datetime import datetime
 
+class MessageArchive:
+    """Текстовый архив сообщений в памяти
+    
+    Строки по одной пишутся в BytesIO (при compress - через gzip). Когда
+    часть доходит до лимита загрузки, начинается новая часть.
+    """
+    
+    GZIP_MARGIN = 64 * 1024  # Запас под данные, которые gzip еще держит в своем буфере
+    
+    def __init__(self, name: str, limit: int, compress: bool = False):
+        self.name = name
+        self.limit = limit
+        self.compress = compress
+        self.parts: List[io.BytesIO] = []
+        self._open()
+        
+    def _open(self) -> None:
+        self._buffer = io.BytesIO()
+        self._stream = gzip.GzipFile(fileobj=self._buffer, mode='wb') if self.compress else self._buffer
+        self._written = 0
+        
+    def _close(self) -> None:
+        if self.compress:
+            # Закрывает только gzip-поток, BytesIO остается открытым
+            self._stream.close()
+        self._buffer.seek(0)
+        self.parts.append(self._buffer)
+        
+    def write(self, line: str) -> None:
+        """Дописывает строку в архив"""
+        data = (line + "\n").encode('utf-8')
+        margin = self.GZIP_MARGIN if self.compress else 0
+        if self._written and self._buffer.tell() + len(data) + margin > self.limit:
+            self._close()
+            self._open()
+        self._stream.write(data)
+        self._written += len(data)
+        
+    def files(self) -> List[discord.File]:
+        """Завершает архив и возвращает вложения по частям"""
+        self._close()
+        suffix = ".txt.gz" if self.compress else ".txt"
+        if len(self.parts) == 1:
+            return [discord.File(self.parts[0], filename=f"{self.name}{suffix}")]
+        return [
+            discord.File(part, filename=f"{self.name}_part{number}{suffix}")
+            for number, part in enumerate(self.parts, start=1)
+        ]
+
+def iter_message_lines(messages: Iterable[discord.Message]) -> Iterator[str]:
+    """Строки архива для удаленных сообщений"""
+    for msg in messages:
+        author = msg.author.name if msg.author else "Неизвестно"
+        timestamp = msg.created_at.strftime("%Y-%m-%d %H:%M:%S")
+        yield f"[{timestamp}] {author}: {msg.content}"
+        for attachment in msg.attachments:
+            yield f"[Вложение] {attachment.filename}: {attachment.url}"
+        yield "-" * 50
+
+def build_message_archive(messages: Iterable[discord.Message], name: str, limit: int, compress: bool = False) -> List[discord.File]:
+    """Собирает архив удаленных сообщений"""
+    archive = MessageArchive(name, limit, compress)
+    for line in iter_message_lines(messages):
+        archive.write(line)
+    return archive.files()
+
 class MessageLogger(BaseLogger):
     """Логгер для сообщений Discord."""
+    category = "messages"
+    # Удаления и правки нужны модерации, поэтому не вытесняются первыми
+    priority = LogShipper.NORMAL
+    ARCHIVE_THREAD_THRESHOLD = 500  # С какого размера пачки архив собирается в отдельном потоке
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -41,7 +111,9 @@ class MessageLogger(BaseLogger):
             description=f"Удалено сообщение в канале {message.channel.mention}",
             color='RED',
             fields=fields,
-            timestamp=message.created_at
+            timestamp=message.created_at,
+            actor=message.author,
+            target=message.channel
         )
         
     async def log_message_bulk_delete(self, messages: List[discord.Message], channel: discord.TextChannel):
@@ -51,51 +123,54 @@ class MessageLogger(BaseLogger):
             {"name": f"{Emojis.DOT} Количество", "value": str(len(messages)), "inline": True}
         ]
         
-        # Создаем текстовый файл с удаленными сообщениями
-        content = []
-        file_content = []
-        
+        preview = []
         for msg in messages[:10]:  # Показываем только первые 10 сообщений в эмбеде
             author = msg.author.name if msg.author else "Неизвестно"
-            content.append(f"**{author}**: {msg.content[:100]}...")
-            
-        for msg in messages:  # Все сообщения записываем в файл
-            author = msg.author.name if msg.author else "Неизвестно"
-            timestamp = msg.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            file_content.append(f"[{timestamp}] {author}: {msg.content}")
-            if msg.attachments:
-                for attachment in msg.attachments:
-                    file_content.append(f"[Вложение] {attachment.filename}: {attachment.url}")
-            file_content.append("-" * 50)
+            preview.append(f"**{author}**: {msg.content[:100]}...")
             
-        if content:
-            fields.append({"name": f"{Emojis.DOT} Последние сообщения", "value": "\n".join(content), "inline": False})
+        if preview:
+            fields.append({"name": f"{Emojis.DOT} Последние сообщения", "value": "\n".join(preview), "inline": False})
             
         if len(messages) > 10:
             fields.append({"name": f"{Emojis.DOT} Примечание", "value": "Показаны только последние 10 сообщений. Полный список в прикрепленном файле.", "inline": False})
-                    
-        temp_file = tempfile.NamedTemporaryFile(delete=False, mode='w', encoding='utf-8', suffix='.txt')
-        temp_file.write("\n".join(file_content))
-        temp_file.close()
         
-        file = discord.File(temp_file.name, filename=f"deleted_messages_{channel.name}_{len(messages)}.txt")
+        # Все сообщения пишутся в архив в памяти, большие пачки форматируются в потоке
+        name = f"deleted_messages_{channel.name}_{len(messages)}"
+        limit = (LoggingState.log_channel or channel).guild.filesize_limit
+        compress = await Settings().get(None, 'logging', 'archive_gzip') in ('1', 'true', 'True')
+        if len(messages) > self.ARCHIVE_THREAD_THRESHOLD:
+            files = await asyncio.to_thread(build_message_archive, messages, name, limit, compress)
+        else:
+            files = build_message_archive(messages, name, limit, compress)
         
         await self.log_event(
             title=f"{Emojis.ERROR} Массовое удаление сообщений",
             description=f"Удалено {len(messages)} сообщений в канале {channel.mention}",
             color='RED',
             fields=fields,
-            file=file
+            file=files[0],
+            target=channel
         )
         
-        # Удаляем временный файл
-        os.unlink(temp_file.name)
+        # Остальные части архива отдельными сообщениями, чтобы не превысить лимит загрузки
+        for number, file in enumerate(files[1:], start=2):
+            await self.log_event(
+                title=f"{Emojis.ERROR} Массовое удаление сообщений ({number}/{len(files)})",
+                description=f"Продолжение архива удаленных сообщений в канале {channel.mention}",
+                color='RED',
+                file=file
+            )
         
     async def log_message_edit(self, before: discord.Message, after: discord.Message):
         """Логирование изменения сообщения"""
         if before.author.bot or before.content == after.content:
             return
-            
+        
+        # Серия правок одного сообщения уходит одной записью
+        await self.coalesce(before.id, before, after, self._log_message_changes)
+        
+    async def _log_message_changes(self, before: discord.Message, after: discord.Message, count: int):
+        """Запись разницы между первой и последней версией сообщения"""
         fields = [
             {"name": f"{Emojis.DOT} Автор", "value": f"{before.author.mention} (`{before.author.name}`)", "inline": True},
             {"name": f"{Emojis.DOT} Канал", "value": before.channel.mention, "inline": True},
@@ -103,13 +178,19 @@ class MessageLogger(BaseLogger):
             {"name": f"{Emojis.DOT} До", "value": before.content[:1024] if before.content else "*пусто*", "inline": False},
             {"name": f"{Emojis.DOT} После", "value": after.content[:1024] if after.content else "*пусто*", "inline": False}
         ]
+        if count > 1:
+            fields.insert(3, {"name": f"{Emojis.DOT} Правок", "value": str(count), "inline": True})
         
         await self.log_event(
             title=f"{Emojis.INFO} Сообщение изменено",
             description=f"Изменено сообщение в канале {before.channel.mention}",
             color='BLUE',
             fields=fields,
-            timestamp=after.edited_at or datetime.now()
+            timestamp=after.edited_at or datetime.now(),
+            actor=before.author,
+            target=before.channel,
+            # Склеенная серия правок - шум, ее можно вытеснить при переполнении очереди
+            priority=LogShipper.LOW if count > 1 else self.priority
         )
         
     async def log_message_publish(self, message: discord.Message):
@@ -131,7 +212,9 @@ class MessageLogger(BaseLogger):
             title=f"{Emojis.SUCCESS} Сообщение опубликовано",
             description=f"Опубликовано сообщение из канала {message.channel.mention}",
             color='GREEN',
-            fields=fields
+            fields=fields,
+            actor=message.author,
+            target=message.channel
         )
         
     async def log_message_command(self, ctx: Union[commands.Context, discord.Interaction], command_name: str):
@@ -155,7 +238,9 @@ class MessageLogger(BaseLogger):
             title=f"{Emojis.INFO} Использована команда",
             description=f"Пользователь использовал команду в канале {channel.mention}",
             color='BLUE',
-            fields=fields
+            fields=fields,
+            actor=user,
+            target=channel
         )
 
     async def log_bulk_message_delete(self, messages: List[discord.Message]):
@@ -4,6 +4,7 @@ from typing import Optional, List, Dict, Any
 
 class PollLogger(BaseLogger):
     """Логгер для опросов Discord."""
+    category = "polls"
         
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
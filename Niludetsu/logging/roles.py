@@ -1,10 +1,12 @@
 from Niludetsu import BaseLogger, Emojis, LoggingState
+from Niludetsu.core.snapshots import snapshots, permission_diff
 import discord
 from typing import Optional, List
 from discord.utils import format_dt
 
 class RoleLogger(BaseLogger):
     """Логгер для ролей Discord."""
+    category = "roles"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -119,16 +121,9 @@ class RoleLogger(BaseLogger):
         
     async def log_role_permissions_update(self, before: discord.Role, after: discord.Role):
         """Логирование изменения прав роли"""
-        # Получаем разницу в правах
-        added_perms = []
-        removed_perms = []
-        
-        for perm, value in after.permissions:
-            if getattr(before.permissions, perm) != value:
-                if value:
-                    added_perms.append(perm.replace('_', ' ').title())
-                else:
-                    removed_perms.append(perm.replace('_', ' ').title())
+        added, removed = permission_diff(before.permissions.value, after.permissions.value)
+        added_perms = [perm.replace('_', ' ').title() for perm in added]
+        removed_perms = [perm.replace('_', ' ').title() for perm in removed]
                     
         fields = [
             {"name": f"{Emojis.DOT} Роль", "value": after.mention, "inline": False}
@@ -166,15 +161,30 @@ class RoleLogger(BaseLogger):
         
     async def log_role_update(self, before: discord.Role, after: discord.Role):
         """Общий метод для логирования изменений роли"""
-        if before.name != after.name:
+        changes = snapshots.diff("role", before, after)
+        if "name" in changes:
             await self.log_role_name_update(before, after)
-        if before.color != after.color:
+        if "color" in changes:
             await self.log_role_color_update(before, after)
-        if before.hoist != after.hoist:
+        if "hoist" in changes:
             await self.log_role_hoist_update(before, after)
-        if before.mentionable != after.mentionable:
+        if "mentionable" in changes:
             await self.log_role_mentionable_update(before, after)
-        if before.permissions != after.permissions:
+        if "permissions" in changes:
             await self.log_role_permissions_update(before, after)
-        if before.icon != after.icon:
-            await self.log_role_icon_update(before, after) 
\ No newline at end of file
+        if "icon" in changes or "unicode_emoji" in changes:
+            await self.log_role_icon_update(before, after)
+
+    async def log_guild_role_create(self, role: discord.Role):
+        """Обработчик события on_guild_role_create"""
+        snapshots.remember("role", role)
+        await self.log_role_create(role)
+
+    async def log_guild_role_delete(self, role: discord.Role):
+        """Обработчик события on_guild_role_delete"""
+        snapshots.forget("role", role.id)
+        await self.log_role_delete(role)
+
+    async def log_guild_role_update(self, before: discord.Role, after: discord.Role):
+        """Обработчик события on_guild_role_update"""
+        await self.log_role_update(before, after)
@@ -1,10 +1,12 @@
 from Niludetsu import BaseLogger, Emojis, LoggingState
+from Niludetsu.core.snapshots import snapshots
 import discord
 from typing import Optional, List, Dict, Any
 from discord.utils import format_dt
 
 class ServerLogger(BaseLogger):
     """Логгер для сервера Discord."""
+    category = "server"
         
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -496,38 +498,89 @@ class ServerLogger(BaseLogger):
         
     async def log_guild_update(self, before: discord.Guild, after: discord.Guild):
         """Логирование всех изменений сервера"""
-        if before.name != after.name:
-            await self.log_server_name_update(before.name, after.name)
+        changes = snapshots.diff("guild", before, after)
+        if not changes:
+            return
             
-        if before.description != after.description:
-            await self.log_server_description_update(before.description, after.description)
+        if "name" in changes:
+            await self.log_server_name_update(*changes["name"])
             
-        if before.icon != after.icon:
+        if "description" in changes:
+            await self.log_server_description_update(*changes["description"])
+            
+        if "icon" in changes:
             await self.log_server_icon_update(
                 before.icon.url if before.icon else None,
                 after.icon.url if after.icon else None
             )
             
-        if before.banner != after.banner:
+        if "banner" in changes:
             await self.log_server_banner_update(
                 before.banner.url if before.banner else None,
                 after.banner.url if after.banner else None
             )
             
-        if before.features != after.features:
-            await self.log_server_features_update(before.features, after.features)
+        if "splash" in changes:
+            await self.log_server_splash_update(
+                before.splash.url if before.splash else None,
+                after.splash.url if after.splash else None
+            )
+            
+        if "discovery_splash" in changes:
+            await self.log_server_discovery_splash_update(
+                before.discovery_splash.url if before.discovery_splash else None,
+                after.discovery_splash.url if after.discovery_splash else None
+            )
+            
+        if "features" in changes:
+            old_features, new_features = changes["features"]
+            await self.log_server_features_update(list(old_features), list(new_features))
+            if ("PARTNERED" in old_features) != ("PARTNERED" in new_features):
+                await self.log_partnered_update("PARTNERED" in new_features)
+            if ("VERIFIED" in old_features) != ("VERIFIED" in new_features):
+                await self.log_verified_update("VERIFIED" in new_features)
+            
+        if "owner_id" in changes and before.owner and after.owner:
+            await self.log_server_owner_update(before.owner, after.owner)
             
-        if before.mfa_level != after.mfa_level:
-            await self.log_mfa_level_update(before.mfa_level, after.mfa_level)
+        if "mfa_level" in changes:
+            await self.log_mfa_level_update(*changes["mfa_level"])
             
-        if before.default_notifications != after.default_notifications:
-            await self.log_message_notifications_update(before.default_notifications, after.default_notifications)
+        if "verification_level" in changes:
+            await self.log_verification_level_update(*changes["verification_level"])
             
-        if before.explicit_content_filter != after.explicit_content_filter:
-            await self.log_server_content_filter_update(before.explicit_content_filter, after.explicit_content_filter)
+        if "default_notifications" in changes:
+            await self.log_message_notifications_update(*changes["default_notifications"])
             
-        if before.afk_channel != after.afk_channel:
+        if "explicit_content_filter" in changes:
+            await self.log_server_content_filter_update(*changes["explicit_content_filter"])
+            
+        if "afk_channel" in changes:
             await self.log_afk_channel_update(before.afk_channel, after.afk_channel)
             
-        if before.afk_timeout != after.afk_timeout:
-            await self.log_afk_timeout_update(before.afk_timeout, after.afk_timeout) 
\ No newline at end of file
+        if "afk_timeout" in changes:
+            await self.log_afk_timeout_update(*changes["afk_timeout"])
+            
+        if "system_channel" in changes:
+            await self.log_system_channel_update(before.system_channel, after.system_channel)
+            
+        if "rules_channel" in changes:
+            await self.log_rules_channel_update(before.rules_channel, after.rules_channel)
+            
+        if "public_updates_channel" in changes:
+            await self.log_public_updates_channel_update(before.public_updates_channel, after.public_updates_channel)
+            
+        if "vanity_url_code" in changes:
+            await self.log_vanity_url_update(*changes["vanity_url_code"])
+            
+        if "preferred_locale" in changes:
+            await self.log_preferred_locale_update(*(str(locale) for locale in changes["preferred_locale"]))
+            
+        if "premium_tier" in changes:
+            await self.log_boost_level_update(*changes["premium_tier"])
+            
+        if "premium_progress_bar_enabled" in changes:
+            await self.log_boost_progress_bar_update(after.premium_progress_bar_enabled)
+            
+        if "widget_enabled" in changes:
+            await self.log_widget_update(after.widget_enabled) 
\ No newline at end of file
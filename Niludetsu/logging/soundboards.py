@@ -14,6 +14,7 @@ class SoundboardSound:
 
 class SoundboardLogger(BaseLogger):
     """Логгер для звуков Soundboard Discord."""
+    category = "soundboards"
         
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
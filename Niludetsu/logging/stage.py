@@ -5,6 +5,7 @@ from discord.utils import format_dt
 
 class StageLogger(BaseLogger):
     """Логгер для стейдж-каналов Discord."""
+    category = "stage"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -4,6 +4,7 @@ from typing import Optional
 
 class StickerLogger(BaseLogger):
     """Логгер для стикеров Discord."""
+    category = "stickers"
         
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -4,6 +4,7 @@ from typing import Optional
 
 class ThreadLogger(BaseLogger):
     """Логгер для тредов Discord."""
+    category = "threads"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -5,6 +5,7 @@ from datetime import datetime
 
 class UserLogger(BaseLogger):
     """Логгер для пользователей Discord."""
+    category = "users"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -141,6 +142,11 @@ class UserLogger(BaseLogger):
         if before.status != after.status or before.activities != after.activities:
             return
 
+        # Серия изменений одного участника уходит одной записью
+        await self.coalesce((after.guild.id, after.id), before, after, self._log_member_changes)
+
+    async def _log_member_changes(self, before, after, count: int):
+        """Запись разницы между первым и последним состоянием участника"""
         changes = []
 
         # Проверяем изменение никнейма
@@ -168,15 +174,18 @@ class UserLogger(BaseLogger):
                 changes.append("**Таймаут снят**")
 
         # Если есть изменения, отправляем лог
-        if changes:
+        if changes or count > 1:
+            fields = [
+                {"name": "Пользователь", "value": after.mention, "inline": True},
+                {"name": "ID", "value": str(after.id), "inline": True}
+            ]
+            if count > 1:
+                fields.append({"name": "Событий", "value": str(count), "inline": True})
             await self.log_event(
                 title="👤 Обновление участника",
-                description="\n".join(changes),
+                description="\n".join(changes) or "Итоговых изменений нет",
                 color="BLUE",
-                fields=[
-                    {"name": "Пользователь", "value": after.mention, "inline": True},
-                    {"name": "ID", "value": str(after.id), "inline": True}
-                ],
+                fields=fields,
                 thumbnail_url=after.display_avatar.url
             ) 
 
@@ -1,11 +1,15 @@
-from Niludetsu import BaseLogger, Emojis, LoggingState
+from Niludetsu import BaseLogger, Emojis, LoggingState, LogShipper
 import discord
+import logging
 from typing import Optional
-import traceback
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
 class VoiceLogger(BaseLogger):
     """Логгер для голосовых каналов Discord."""
+    category = "voice"
+    priority = LogShipper.LOW
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -20,8 +24,7 @@ class VoiceLogger(BaseLogger):
             self.log_channel = LoggingState.log_channel
             self._ready = True
         except Exception as e:
-            print(f"❌ Ошибка инициализации логов: {e}")
-            traceback.print_exc()
+            log.exception(f"Ошибка инициализации логов: {e}")
     
     async def log_voice_channel_full(self, channel: discord.VoiceChannel):
         """Логирование заполнения голосового канала"""
@@ -43,7 +46,7 @@ class VoiceLogger(BaseLogger):
                 fields=fields
             )
         except Exception as e:
-            print(f"❌ Ошибка логирования заполнения канала: {e}")
+            log.error(f"Ошибка логирования заполнения канала: {e}")
     
     async def log_voice_user_join(self, member: discord.Member, channel: discord.VoiceChannel):
         """Логирование присоединения пользователя к голосовому каналу"""
@@ -66,7 +69,7 @@ class VoiceLogger(BaseLogger):
                 thumbnail_url=member.display_avatar.url
             )
         except Exception as e:
-            print(f"❌ Ошибка логирования входа в канал: {e}")
+            log.error(f"Ошибка логирования входа в канал: {e}")
     
     async def log_voice_user_leave(self, member: discord.Member, channel: discord.VoiceChannel):
         """Логирование выхода пользователя из голосового канала"""
@@ -89,12 +92,24 @@ class VoiceLogger(BaseLogger):
                 thumbnail_url=member.display_avatar.url
             )
         except Exception as e:
-            print(f"❌ Ошибка логирования выхода из канала: {e}")
+            log.error(f"Ошибка логирования выхода из канала: {e}")
 
     async def log_voice_status_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
         """Логирование изменений голосового состояния"""
         if not self._ready or not self.log_channel:
             return
+        
+        # Частые переключения одного участника уходят одной записью
+        await self.coalesce(
+            (member.guild.id, member.id), before, after,
+            lambda first, last, count: self._log_voice_status(member, first, last, count)
+        )
+    
+    async def _log_voice_status(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState, count: int):
+        """Запись изменений голосового состояния"""
+        if count > 1:
+            await self._log_voice_summary(member, before, after, count)
+            return
             
         try:
             # Подключение к каналу
@@ -175,5 +190,36 @@ class VoiceLogger(BaseLogger):
                     thumbnail_url=member.display_avatar.url
                 )
         except Exception as e:
-            print(f"❌ Ошибка при логировании голосового события: {e}")
-            traceback.print_exc() 
\ No newline at end of file
+            log.exception(f"Ошибка при логировании голосового события: {e}")
+    
+    async def _log_voice_summary(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState, count: int):
+        """Итог нескольких изменений голосового состояния"""
+        def channel(state: discord.VoiceState) -> str:
+            return state.channel.mention if state.channel else "Нет"
+        
+        def enabled(disabled: bool) -> str:
+            return "выключен" if disabled else "включен"
+        
+        changes = []
+        if before.channel != after.channel:
+            changes.append(f"**Канал:** {channel(before)} ➜ {channel(after)}")
+        if before.self_mute != after.self_mute:
+            changes.append(f"**Микрофон:** {enabled(before.self_mute)} ➜ {enabled(after.self_mute)}")
+        if before.self_deaf != after.self_deaf:
+            changes.append(f"**Звук:** {enabled(before.self_deaf)} ➜ {enabled(after.self_deaf)}")
+        
+        try:
+            await self.log_event(
+                title=f"{Emojis.INFO} Изменения голосового состояния",
+                description="\n".join(changes) or "Итоговых изменений нет",
+                color='YELLOW',
+                fields=[
+                    {"name": f"{Emojis.DOT} Пользователь", "value": member.mention, "inline": True},
+                    {"name": f"{Emojis.DOT} ID пользователя", "value": str(member.id), "inline": True},
+                    {"name": f"{Emojis.DOT} Канал", "value": channel(after), "inline": True},
+                    {"name": f"{Emojis.DOT} Событий", "value": str(count), "inline": True}
+                ],
+                thumbnail_url=member.display_avatar.url
+            )
+        except Exception as e:
+            log.error(f"Ошибка при логировании голосового события: {e}")
@@ -1,9 +1,13 @@
 from Niludetsu import BaseLogger, Emojis, LoggingState
 import discord
+import logging
 from typing import Optional
 
+log = logging.getLogger(__name__)
+
 class WebhookLogger(BaseLogger):
     """Логгер для вебхуков Discord."""
+    category = "webhooks"
     
     def __init__(self, bot: discord.Client):
         super().__init__(bot)
@@ -45,7 +49,7 @@ class WebhookLogger(BaseLogger):
             )
             
         except Exception as e:
-            print(f"Ошибка при логировании обновления вебхуков: {e}")
+            log.error(f"Ошибка при логировании обновления вебхуков: {e}")
     
     async def log_webhook_create(self, webhook: discord.Webhook, creator: Optional[discord.Member] = None):
         """Логирование создания вебхука"""
@@ -160,4 +164,4 @@ class WebhookLogger(BaseLogger):
             )
                     
         except Exception as e:
-            print(f"Ошибка при логировании обновления вебхуков: {e}") 
\ No newline at end of file
+            log.error(f"Ошибка при логировании обновления вебхуков: {e}") 
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Метрики Niludetsu
+Счетчики, гистограммы и датчики в памяти процесса с экспортом
+в текстовом формате Prometheus.
+"""
+
+from .registry import (
+    MetricsRegistry,
+    Metric,
+    Counter,
+    Gauge,
+    Histogram,
+    DEFAULT_BUCKETS,
+    metrics
+)
+from .exporter import MetricsServer, http_trace_config
+
+__all__ = [
+    'MetricsRegistry',
+    'Metric',
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'DEFAULT_BUCKETS',
+    'metrics',
+    'MetricsServer',
+    'http_trace_config'
+]
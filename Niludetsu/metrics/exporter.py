@@ -0,0 +1,78 @@
+"""
+Экспорт метрик и трассировка HTTP-запросов
+"""
+import time, aiohttp
+from aiohttp import web
+from typing import Optional
+from .registry import MetricsRegistry, metrics
+
+class MetricsServer:
+    """HTTP-эндпоинт /metrics в текстовом формате Prometheus
+
+    По умолчанию слушает только локальный адрес, наружу метрики не отдаются.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry or metrics
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
+
+    async def start(self) -> None:
+        """Запускает сервер"""
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except Exception:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+
+    async def close(self) -> None:
+        """Останавливает сервер"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+def http_trace_config(client: str, registry: Optional[MetricsRegistry] = None) -> aiohttp.TraceConfig:
+    """Трассировка запросов aiohttp в метрики
+
+    Передается в aiohttp.ClientSession(trace_configs=[...]) и записывает
+    длительность и статус каждого запроса клиента.
+
+    Args:
+        client (str): Имя клиента для метки, например "weather"
+    """
+    registry = registry or metrics
+    duration = registry.histogram(
+        "http_request_seconds", "Длительность исходящих HTTP-запросов", ("client", "method", "status")
+    )
+    failures = registry.counter(
+        "http_request_errors", "Исходящие HTTP-запросы, завершившиеся исключением", ("client", "method")
+    )
+
+    async def on_start(session, context, params):
+        context.started = time.perf_counter()
+
+    async def on_end(session, context, params):
+        duration.observe(
+            time.perf_counter() - context.started,
+            client=client, method=params.method, status=params.response.status
+        )
+
+    async def on_exception(session, context, params):
+        failures.inc(client=client, method=params.method)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_start)
+    trace_config.on_request_end.append(on_end)
+    trace_config.on_request_exception.append(on_exception)
+    return trace_config
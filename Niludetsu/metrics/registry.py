@@ -0,0 +1,265 @@
+"""
+Реестр метрик в памяти процесса
+"""
+import math, time, threading, functools, inspect, logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# Границы гистограмм по умолчанию в секундах: от 1 мс до 10 с
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """Базовый класс метрики с метками"""
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str = "", labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"Метрика {self.name} ожидает метки {self.labels}, получено {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _label_text(self, values: LabelValues, extra: Optional[Dict[str, str]] = None) -> str:
+        pairs = list(zip(self.labels, values)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """Отсчеты метрики в виде (суффикс имени, метки, значение)"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Строки метрики в текстовом формате Prometheus"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+class Counter(Metric):
+    """Счетчик, который только растет"""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str = "", labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Увеличивает счетчик"""
+        if amount < 0:
+            raise ValueError("Счетчик не может уменьшаться")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield "_total", self._label_text(key), value
+
+class Gauge(Metric):
+    """Значение, которое может расти и уменьшаться
+
+    Вместо ручной установки можно задать функцию через set_function: она
+    вызывается при каждом сборе и возвращает число или словарь
+    {кортеж значений меток: число}.
+    """
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str = "", labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Union[float, Dict[LabelValues, float]]]] = None
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], Union[float, Dict[LabelValues, float]]]) -> None:
+        """Вычислять значение при сборе"""
+        self._function = function
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        if self._function is not None:
+            try:
+                result = self._function()
+            except Exception as e:
+                log.error(f"Ошибка при вычислении метрики {self.name}: {e}")
+                return
+            values = result if isinstance(result, dict) else {(): result}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for key, value in values.items():
+            yield "", self._label_text(tuple(str(v) for v in key)), float(value)
+
+class Histogram(Metric):
+    """Распределение значений по корзинам (обычно длительности в секундах)"""
+
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str = "", labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: Dict[LabelValues, List[float]] = {}  # метки -> [счетчики корзин..., сумма, количество]
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Добавляет наблюдение"""
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[index] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Замеряет длительность блока, работает и внутри корутин"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, **labels: Any) -> Callable:
+        """Декоратор, замеряющий длительность функции или корутины"""
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.time(**labels):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self) -> Dict[LabelValues, Dict[str, float]]:
+        """Количество, сумма, среднее и p95 по каждому набору меток"""
+        with self._lock:
+            values = {key: list(data) for key, data in self._values.items()}
+        result = {}
+        for key, data in values.items():
+            count, total = data[-1], data[-2]
+            p95, seen = self.buckets[-1], 0.0
+            for index, bound in enumerate(self.buckets):
+                seen += data[index]
+                if seen >= count * 0.95:
+                    p95 = bound
+                    break
+            result[key] = {"count": count, "sum": total, "avg": total / count if count else 0.0, "p95": p95}
+        return result
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            values = {key: list(data) for key, data in self._values.items()}
+        for key, data in values.items():
+            cumulative = 0.0
+            for index, bound in enumerate(self.buckets):
+                cumulative += data[index]
+                yield "_bucket", self._label_text(key, {"le": _format_value(bound)}), cumulative
+            yield "_sum", self._label_text(key), data[-2]
+            yield "_count", self._label_text(key), data[-1]
+
+class MetricsRegistry:
+    """Реестр метрик процесса
+
+    Метрики создаются при первом обращении по имени, повторный вызов
+    возвращает уже зарегистрированную метрику того же типа.
+    """
+
+    def __init__(self, prefix: str = "niludetsu_"):
+        self.prefix = prefix
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, documentation: str, labels: Sequence[str], **kwargs) -> Any:
+        name = self.prefix + name
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labels, **kwargs)
+        if not isinstance(metric, cls) or metric.labels != tuple(labels):
+            raise ValueError(f"Метрика {name} уже зарегистрирована с другим типом или метками")
+        return metric
+
+    def counter(self, name: str, documentation: str = "", labels: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labels)
+
+    def gauge(self, name: str, documentation: str = "", labels: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labels)
+
+    def histogram(self, name: str, documentation: str = "", labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, documentation, labels, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(self.prefix + name)
+
+    def all(self) -> List[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus"""
+        lines = []
+        for metric in sorted(self.all(), key=lambda m: m.name):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def hot_paths(self, limit: int = 10) -> List[Tuple[str, LabelValues, Dict[str, float]]]:
+        """Самые затратные по суммарному времени наборы меток всех гистограмм"""
+        rows = [
+            (metric.name, key, data)
+            for metric in self.all() if isinstance(metric, Histogram)
+            for key, data in metric.summary().items()
+        ]
+        rows.sort(key=lambda row: row[2]["sum"], reverse=True)
+        return rows[:limit]
+
+# Общий на процесс реестр
+metrics = MetricsRegistry()
@@ -5,6 +5,10 @@
 
 from .permissions import (
     ModPermissions,
+    StaffRoleResolver,
+    CooldownStore,
+    staff_roles,
+    cooldowns,
     has_permission,
     cooldown,
     admin_only,
@@ -15,6 +19,8 @@ from .permissions import (
 __all__ = [
     # Основной класс
     'ModPermissions',
+    'StaffRoleResolver',
+    'staff_roles',
     
     # Декораторы проверки прав
     'has_permission',
@@ -23,5 +29,7 @@ __all__ = [
     'helper_only',
     
     # Управление кулдаунами
-    'cooldown'
+    'cooldown',
+    'CooldownStore',
+    'cooldowns'
 ] 
\ No newline at end of file
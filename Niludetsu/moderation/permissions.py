@@ -1,34 +1,212 @@
 """
 Модуль для проверки прав доступа к модераторским командам
 """
-import discord
+import discord, asyncio, time, logging
 from discord import app_commands
 from functools import wraps
-from typing import Callable, Any, Optional, List, Union
+from typing import Callable, Any, Optional, List, Union, Dict, FrozenSet, Tuple
 from datetime import datetime, timedelta
 from ..database.db import Database
 from ..database.tables import Tables
+from ..utils.settings import Settings
+
+log = logging.getLogger(__name__)
+
+class StaffRoleResolver:
+    """Кэш ID ролей персонала по серверам
+
+    Роли читаются из настроек категории "roles" (ключи вида "staff.<роль>")
+    и хранятся как множества ID. Кэш сервера сбрасывается, когда меняется
+    снимок Settings.
+    """
+
+    def __init__(self):
+        self.settings = Settings()
+        self._roles: Dict[str, Dict[str, FrozenSet[int]]] = {}
+        self._version = None
+
+    async def get(self, guild_id: Union[str, int]) -> Dict[str, FrozenSet[int]]:
+        """Роли персонала сервера в виде {роль: множество ID}"""
+        guild_id = str(guild_id)
+        if self._version != Settings.version():
+            self._roles.clear()
+            self._version = Settings.version()
+
+        roles = self._roles.get(guild_id)
+        if roles is None:
+            roles = {}
+            for key, value in (await self.settings.get_category(guild_id, "roles")).items():
+                if not key.startswith("staff."):
+                    continue
+                role_ids = frozenset(int(role_id) for role_id in str(value).split(",") if role_id.strip().isdigit())
+                if role_ids:
+                    roles[key.split(".")[1]] = role_ids
+            # Версия могла смениться, пока ждали загрузку настроек
+            self._version = Settings.version()
+            self._roles[guild_id] = roles
+        return roles
+
+    async def role_ids(self, guild_id: Union[str, int], *role_names: str) -> FrozenSet[int]:
+        """Объединение ID ролей с указанными названиями"""
+        roles = await self.get(guild_id)
+        return frozenset().union(*(roles.get(name, frozenset()) for name in role_names))
+
+    async def has_any(self, member: discord.Member, *role_names: str) -> bool:
+        """Есть ли у участника хотя бы одна из ролей персонала"""
+        required = await self.role_ids(member.guild.id, *role_names)
+        return bool(required) and any(role.id in required for role in member.roles)
+
+class CooldownStore:
+    """Кулдауны команд в памяти по схеме token bucket
+
+    Ведро на ключ (сервер, пользователь, команда) вмещает capacity токенов и
+    пополняется на один токен за period секунд. При capacity=1 это обычный
+    кулдаун. Активные кулдауны можно периодически сохранять в таблицу
+    cooldowns, чтобы они переживали перезапуск.
+    """
+
+    PERSIST_INTERVAL = 60.0
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or Database()
+        self._buckets: Dict[Tuple[str, str, str], Tuple[float, float, float, int]] = {}  # ключ -> (токены, время, period, capacity)
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self.allowed = 0
+        self.limited = 0
+
+    @staticmethod
+    def _key(user_id: Union[str, int], guild_id: Union[str, int], command: str) -> Tuple[str, str, str]:
+        return str(guild_id), str(user_id), command
+
+    @staticmethod
+    def _refill(bucket: Tuple[float, float, float, int], now: float) -> float:
+        tokens, updated_at, period, capacity = bucket
+        return min(capacity, tokens + (now - updated_at) / period)
+
+    def consume(
+        self,
+        user_id: Union[str, int],
+        guild_id: Union[str, int],
+        command: str,
+        period: float,
+        capacity: int = 1
+    ) -> Tuple[bool, Optional[int]]:
+        """Пытается списать токен
+
+        Returns:
+            tuple[bool, Optional[int]]: (можно_использовать, оставшееся_время)
+        """
+        key = self._key(user_id, guild_id, command)
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        tokens = self._refill(bucket, now) if bucket else float(capacity)
+
+        if tokens < 1:
+            self.limited += 1
+            remaining = (1 - tokens) * period
+            return False, max(1, int(remaining + 0.999))
+
+        self._buckets[key] = (tokens - 1, now, period, capacity)
+        self._dirty = True
+        self.allowed += 1
+        return True, None
+
+    def reset(self, user_id: Union[str, int], guild_id: Union[str, int], command: str) -> None:
+        """Сбрасывает кулдаун"""
+        if self._buckets.pop(self._key(user_id, guild_id, command), None):
+            self._dirty = True
+
+    def _prune(self, now: float) -> None:
+        """Удаляет полностью восстановившиеся ведра"""
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if self._refill(bucket, now) < bucket[3]
+        }
+
+    async def load(self) -> None:
+        """Восстанавливает активные кулдауны из таблицы cooldowns"""
+        rows = await self.db.fetch_all(
+            f"SELECT user_id, guild_id, command, expires_at FROM {Tables.COOLDOWNS}"
+        )
+        now, wall_now = time.monotonic(), datetime.utcnow()
+        for row in rows:
+            remaining = (datetime.fromisoformat(row["expires_at"]) - wall_now).total_seconds()
+            if remaining > 0:
+                # Период неизвестен, поэтому ведро восстанавливается ровно к expires_at
+                self._buckets[self._key(row["user_id"], row["guild_id"], row["command"])] = (0.0, now, remaining, 1)
+
+    async def persist(self) -> None:
+        """Сохраняет активные кулдауны в таблицу cooldowns"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        now, wall_now = time.monotonic(), datetime.utcnow()
+        self._prune(now)
+
+        # Таблица заменяется целиком одной транзакцией, чтобы не потерять кулдауны между запросами
+        statements = [(f"DELETE FROM {Tables.COOLDOWNS}", ())]
+        for (guild_id, user_id, command), bucket in self._buckets.items():
+            until_token = max(0.0, 1 - self._refill(bucket, now)) * bucket[2]
+            statements.append((
+                f"INSERT INTO {Tables.COOLDOWNS} (user_id, guild_id, command, expires_at) VALUES (?, ?, ?, ?)",
+                (user_id, guild_id, command, (wall_now + timedelta(seconds=until_token)).isoformat())
+            ))
+
+        try:
+            await self.db.execute_batch(statements)
+        except BaseException:
+            self._dirty = True
+            raise
+
+    async def _persist_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.persist()
+            except Exception as e:
+                log.error(f"Ошибка при сохранении кулдаунов: {e}")
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """Запускает периодическое сохранение"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._persist_loop(interval or self.PERSIST_INTERVAL)
+            )
+
+    async def close(self) -> None:
+        """Останавливает сохранение и записывает текущее состояние"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.persist()
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика кулдаунов"""
+        return {"buckets": len(self._buckets), "allowed": self.allowed, "limited": self.limited}
+
+# Общие на процесс экземпляры для декораторов
+staff_roles = StaffRoleResolver()
+cooldowns = CooldownStore()
 
 class ModPermissions:
     """Класс для работы с правами модерации"""
-    
+
     def __init__(self, db: Database):
         self.db = db
-        
+
     async def _get_staff_roles(self, guild_id: str) -> dict:
-        """Получение ролей персонала из базы данных"""
-        roles = {}
-        async for role in await self.db.get_rows(Tables.SETTINGS, category="roles", guild_id=guild_id):
-            if role["key"].startswith("staff."):
-                role_name = role["key"].split(".")[1]
-                roles[role_name] = {"id": role["value"]}
-        return roles
-        
+        """Получение ролей персонала из кэша настроек"""
+        return {
+            name: {"id": ",".join(str(role_id) for role_id in sorted(role_ids))}
+            for name, role_ids in (await staff_roles.get(guild_id)).items()
+        }
+
     @staticmethod
     def _has_any_role(member_roles: List[int], required_roles: List[int]) -> bool:
         """Проверка наличия хотя бы одной роли из списка"""
         return any(role_id in member_roles for role_id in required_roles)
-        
+
     async def check_cooldown(
         self,
         user_id: Union[str, int],
@@ -38,130 +216,77 @@ class ModPermissions:
     ) -> tuple[bool, Optional[int]]:
         """
         Проверка кулдауна команды
-        
+
         Args:
             user_id: ID пользователя
             guild_id: ID сервера
             command: Название команды
             cooldown_seconds: Время кулдауна в секундах
-            
+
         Returns:
             tuple[bool, Optional[int]]: (можно_использовать, оставшееся_время)
         """
-        current_time = datetime.utcnow()
-        
-        # Проверяем существующий кулдаун
-        cooldown = await self.db.get_row(
-            Tables.COOLDOWNS,
-            user_id=str(user_id),
-            guild_id=str(guild_id),
-            command=command
-        )
-        
-        if cooldown:
-            expires_at = datetime.fromisoformat(cooldown["expires_at"])
-            if current_time < expires_at:
-                remaining = int((expires_at - current_time).total_seconds())
-                return False, remaining
-                
-            # Удаляем истекший кулдаун
-            await self.db.execute(
-                f"DELETE FROM {Tables.COOLDOWNS} WHERE id = ?",
-                (cooldown["id"],)
-            )
-        
-        # Создаем новый кулдаун
-        expires_at = current_time + timedelta(seconds=cooldown_seconds)
-        await self.db.insert(
-            Tables.COOLDOWNS,
-            {
-                "user_id": str(user_id),
-                "guild_id": str(guild_id),
-                "command": command,
-                "expires_at": expires_at.isoformat()
-            }
-        )
-        return True, None
+        return cooldowns.consume(user_id, guild_id, command, cooldown_seconds)
 
 def has_permission(*required_roles: str) -> Callable[[discord.Interaction], Any]:
     """
     Декоратор для проверки прав доступа к командам
-    
+
     Args:
         *required_roles: Список требуемых ролей ('admin', 'moderator', 'helper')
     """
     async def predicate(interaction: discord.Interaction) -> bool:
-        db = Database()  # В реальном коде нужно передавать существующий экземпляр
-        await db.init()
-        
-        mod_perms = ModPermissions(db)
-        staff_roles = await mod_perms._get_staff_roles(str(interaction.guild_id))
-        required_role_ids = []
-        
-        for role_name in required_roles:
-            if role_name in staff_roles:
-                role_id = int(staff_roles[role_name]["id"])
-                required_role_ids.append(role_id)
-        
+        required_role_ids = await staff_roles.role_ids(interaction.guild_id, *required_roles)
+
         if not required_role_ids:
             return False
-            
-        member_role_ids = [role.id for role in interaction.user.roles]
-        has_permission = mod_perms._has_any_role(member_role_ids, required_role_ids)
-        
+
+        has_permission = any(role.id in required_role_ids for role in interaction.user.roles)
+
         if not has_permission:
             await interaction.response.send_message(
                 "❌ У вас недостаточно прав для использования этой команды.",
                 ephemeral=True
             )
             return False
-            
+
         return True
-        
+
     return app_commands.check(predicate)
 
 def cooldown(seconds: int = 3):
     """
     Декоратор для установки кулдауна на команду
-    
+
     Args:
         seconds: Время кулдауна в секундах
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
-        async def wrapper(interaction: discord.Interaction, *args, **kwargs):
-            db = Database()  # В реальном коде нужно передавать существующий экземпляр
-            await db.init()
-            
-            mod_perms = ModPermissions(db)
-            
-            # Проверяем, есть ли у пользователя роли, освобождающие от кулдауна
-            staff_roles = await mod_perms._get_staff_roles(str(interaction.guild_id))
-            user_roles = [role.id for role in interaction.user.roles]
-            
-            admin_role = staff_roles.get("admin", {}).get("id")
-            mod_role = staff_roles.get("moderator", {}).get("id")
-            
-            if admin_role and mod_role:
-                if mod_perms._has_any_role(user_roles, [int(admin_role), int(mod_role)]):
-                    return await func(interaction, *args, **kwargs)
-            
+        async def wrapper(*args, **kwargs):
+            # Команда может быть методом кога, поэтому interaction ищется среди аргументов
+            interaction = next(arg for arg in args if isinstance(arg, discord.Interaction))
+
+            # Администраторы и модераторы не ограничены кулдауном
+            if await staff_roles.has_any(interaction.user, "admin", "moderator"):
+                return await func(*args, **kwargs)
+
             # Проверяем кулдаун
-            can_use, remaining = await mod_perms.check_cooldown(
+            can_use, remaining = cooldowns.consume(
                 interaction.user.id,
                 interaction.guild_id,
                 interaction.command.name,
                 seconds
             )
-            
+
             if not can_use:
                 await interaction.response.send_message(
                     f"⏳ Подождите еще {remaining} секунд перед использованием этой команды.",
                     ephemeral=True
                 )
                 return False
-            
-            return await func(interaction, *args, **kwargs)
+
+            return await func(*args, **kwargs)
         return wrapper
     return decorator
 
@@ -176,4 +301,4 @@ def mod_only() -> Callable[[discord.Interaction], Any]:
 
 def helper_only() -> Callable[[discord.Interaction], Any]:
     """Декоратор для команд, требующих права помощника или выше"""
-    return has_permission("admin", "moderator", "helper") 
\ No newline at end of file
+    return has_permission("admin", "moderator", "helper")
@@ -3,12 +3,14 @@
 Предоставляет базовые классы и функции для воспроизведения музыки.
 """
 
-import discord, wavelink, asyncio, os
+import discord, wavelink, asyncio, os, logging
 from discord.ext import commands
 from Niludetsu import Embed
 from typing import Optional, Union
 from dotenv import load_dotenv
 
+log = logging.getLogger(__name__)
+
 class Song:
     """Класс, представляющий песню"""
     def __init__(self, track: wavelink.Playable, requester: discord.Member = None):
@@ -242,7 +244,7 @@ class Music:
         """
         try:
             search_query = query
-            print(f"Searching for track: {query}")  # Добавляем логирование
+            log.debug("Searching for track: %s", query)
             
             # Если это прямая ссылка на YouTube
             if 'youtube.com/' in query or 'youtu.be/' in query:
@@ -258,51 +260,51 @@ class Music:
                     search_query = f"https://youtube.com/watch?v={video_id}"
                 
                 tracks = await wavelink.Playable.search(search_query, source="ytsearch")
-                print(f"YouTube search results: {len(tracks) if tracks else 0} tracks")
+                log.debug("YouTube search results: %d tracks", len(tracks) if tracks else 0)
             
             # Если это Spotify ссылка
             elif 'spotify.com/' in query:
                 tracks = await wavelink.Playable.search(query, source="spsearch")
-                print(f"Spotify search results: {len(tracks) if tracks else 0} tracks")
+                log.debug("Spotify search results: %d tracks", len(tracks) if tracks else 0)
             
             # Если это SoundCloud ссылка
             elif 'soundcloud.com/' in query:
                 tracks = await wavelink.Playable.search(query, source="scsearch")
-                print(f"SoundCloud search results: {len(tracks) if tracks else 0} tracks")
+                log.debug("SoundCloud search results: %d tracks", len(tracks) if tracks else 0)
             
             else:
                 # Пробуем разные источники последовательно
-                print("Trying multiple sources...")
+                log.debug("Trying multiple sources...")
                 tracks = await wavelink.Playable.search(query, source="ytsearch")
                 if not tracks:
-                    print("YouTube search failed, trying SoundCloud...")
+                    log.debug("YouTube search failed, trying SoundCloud...")
                     tracks = await wavelink.Playable.search(query, source="scsearch")
                 if not tracks:
-                    print("SoundCloud search failed, trying YouTube Music...")
+                    log.debug("SoundCloud search failed, trying YouTube Music...")
                     tracks = await wavelink.Playable.search(query, source="ytmsearch")
 
             if not tracks:
-                print("No tracks found in any source")
+                log.warning("No tracks found in any source")
                 return None
 
             track = tracks[0]
-            print(f"Selected track: {track.title} (URI: {track.uri})")
+            log.debug("Selected track: %s (URI: %s)", track.title, track.uri)
             
             # Расширенная проверка доступности трека
             if not track.uri or getattr(track, 'is_failed', False):
-                print(f"Track validation failed - URI: {track.uri}, is_failed: {getattr(track, 'is_failed', False)}")
+                log.warning("Track validation failed - URI: %s, is_failed: %s", track.uri, getattr(track, 'is_failed', False))
                 # Пробуем следующий трек из результатов
                 if len(tracks) > 1:
                     for alt_track in tracks[1:]:
                         if alt_track.uri and not getattr(alt_track, 'is_failed', False):
-                            print(f"Using alternative track: {alt_track.title}")
+                            log.debug("Using alternative track: %s", alt_track.title)
                             return alt_track
                 return None
 
             return track
             
         except Exception as e:
-            print(f"Error in search_track: {str(e)}")
+            log.error(f"Error in search_track: {str(e)}")
             return None
 
     async def play_song(self, interaction: discord.Interaction, query: str):
@@ -311,12 +313,12 @@ class Music:
             # Сразу откладываем ответ
             await interaction.response.defer()
             
-            print(f"Attempting to play song with query: {query}")
+            log.debug("Attempting to play song with query: %s", query)
             
             # Проверяем подключение к голосовому каналу
             player = await self.ensure_voice(interaction)
             if not player:
-                print("Failed to get player")
+                log.error("Failed to get player")
                 await interaction.followup.send(
                     embed=Embed(
                         description="❌ Не удалось подключиться к голосовому каналу!",
@@ -328,7 +330,7 @@ class Music:
 
             # Проверяем подключение к Lavalink
             if not self._node_connected:
-                print("Lavalink node not connected")
+                log.warning("Lavalink node not connected")
                 await interaction.followup.send(
                     embed=Embed(
                         description="❌ Сервер музыки недоступен. Попробуйте позже.",
@@ -339,10 +341,10 @@ class Music:
                 return
 
             # Поиск трека
-            print("Searching for track...")
+            log.debug("Searching for track...")
             track = await self.search_track(query)
             if not track:
-                print("No track found")
+                log.warning("No track found")
                 await interaction.followup.send(
                     embed=Embed(
                         description="❌ По вашему запросу ничего не найдено или контент недоступен!",
@@ -352,20 +354,20 @@ class Music:
                 )
                 return
 
-            print(f"Track found: {track.title}")
+            log.debug("Track found: %s", track.title)
             song = Song(track, interaction.user)
 
             # Получаем состояние голосового канала
             state = self.get_voice_state(interaction.guild)
             if not state:
-                print("Failed to get voice state")
+                log.error("Failed to get voice state")
                 return
 
             # Начинаем воспроизведение
             try:
                 if player.playing:
                     # Добавляем в очередь
-                    print("Adding track to queue")
+                    log.debug("Adding track to queue")
                     await player.queue.put_wait(track)
                     await interaction.followup.send(
                         embed=Embed(
@@ -376,7 +378,7 @@ class Music:
                     )
                 else:
                     # Воспроизводим сразу
-                    print("Playing track immediately")
+                    log.debug("Playing track immediately")
                     await player.play(track)
                     state.current = song  # Устанавливаем текущий трек в состоянии
                     self.set_current_song(interaction.guild_id, song)  # И в глобальном хранилище
@@ -388,7 +390,7 @@ class Music:
                         )
                     )
             except Exception as e:
-                print(f"Error during playback: {str(e)}")
+                log.error(f"Error during playback: {str(e)}")
                 await interaction.followup.send(
                     embed=Embed(
                         description=f"❌ Ошибка при воспроизведении:\n```{str(e)}```",
@@ -401,7 +403,7 @@ class Music:
             self.set_text_channel(interaction.guild_id, interaction.channel)
             
         except Exception as e:
-            print(f"General error in play_song: {str(e)}")
+            log.error(f"General error in play_song: {str(e)}")
             try:
                 await interaction.followup.send(
                     embed=Embed(
@@ -514,13 +516,10 @@ class Music:
             )
             
         # Логируем ошибку для отладки
-        print(f"Track Exception - Guild: {guild_id}")
-        print(f"Track: {payload.track.title}")
-        print(f"Error Type: {type(payload.exception) if hasattr(payload, 'exception') else 'Unknown'}")
-        if hasattr(payload, 'error'):
-            print(f"Error: {payload.error}")
-        if hasattr(payload, 'exception'):
-            print(f"Exception: {payload.exception}")
+        log.error(
+            "Track Exception - Guild: %s, Track: %s, Error: %s, Exception: %r",
+            guild_id, payload.track.title, getattr(payload, 'error', None), getattr(payload, 'exception', None)
+        )
 
     async def on_wavelink_track_stuck(self, payload: wavelink.TrackStuckEventPayload):
         """Обработчик зависания трека"""
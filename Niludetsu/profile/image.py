@@ -1,9 +1,15 @@
-import os, aiohttp
+import os, logging
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
 from easy_pil import Editor, Font
 from typing import Tuple
 from .models import ProfileData
+from ..metrics import metrics
+from ..utils.image_fetcher import ImageFetcher
+
+log = logging.getLogger(__name__)
+
+RENDER_SECONDS = metrics.histogram("render_seconds", "Длительность построения изображений", ("kind",))
 
 class ProfileImage:
     def __init__(self):
@@ -14,7 +20,7 @@ class ProfileImage:
         # Проверяем наличие шрифтов
         if not os.path.exists(self.font_path_emoji):
             self.font_path_emoji = None
-            print("Шрифт эмодзи не найден, будут использованы текстовые символы")
+            log.warning("Шрифт эмодзи не найден, будут использованы текстовые символы")
 
     def get_emoji_font(self) -> ImageFont.FreeTypeFont:
         """Получить шрифт для эмодзи с проверкой"""
@@ -22,7 +28,7 @@ class ProfileImage:
             try:
                 return ImageFont.truetype(self.font_path_emoji, size=109)  # Фиксированный размер для NotoColorEmoji
             except Exception as e:
-                print(f"Ошибка загрузки шрифта эмодзи: {e}")
+                log.error(f"Ошибка загрузки шрифта эмодзи: {e}")
                 self.font_path_emoji = None
         return None
 
@@ -30,14 +36,9 @@ class ProfileImage:
         """Получить ширину текста"""
         return font.getsize(text)[0]
 
-    async def load_image_async(self, url: str) -> Image:
-        """Загрузить изображение по URL"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise Exception(f"Failed to fetch image: {response.status}")
-                data = await response.read()
-                return Image.open(BytesIO(data))
+    async def load_image_async(self, url: str, size: Tuple[int, int] = None) -> Image:
+        """Загрузить изображение по URL через общий кэш изображений"""
+        return await ImageFetcher.get().image(url, size)
 
     def rounded_rectangle(self, draw: ImageDraw, x1: int, y1: int, x2: int, y2: int, 
                          radius: int, fill=None, outline=None) -> None:
@@ -85,8 +86,9 @@ class ProfileImage:
             icon = icon.resize((size, size), Image.Resampling.LANCZOS)
             background.paste(icon, (x, y))
         except Exception as e:
-            print(f"Ошибка загрузки иконки: {e}")
+            log.error(f"Ошибка загрузки иконки: {e}")
 
+    @RENDER_SECONDS.timed(kind="profile")
     async def create_profile_image(self, profile_data: ProfileData, 
                                  user_name: str, avatar_url: str) -> BytesIO:
         """Создать изображение профиля"""
@@ -102,7 +104,7 @@ class ProfileImage:
         self.create_card(ImageDraw.Draw(background.image), 20, 300, 960, 130)
 
         # Загружаем и добавляем аватар
-        profile_image = await self.load_image_async(avatar_url)
+        profile_image = await self.load_image_async(avatar_url, (120, 120))
         profile_image = Editor(profile_image).resize((120, 120)).circle_image()
         
         # Создаем обводку для аватара
@@ -28,6 +28,9 @@ class ProfileManager:
                 'birthday': None
             })
 
+        # Актуальные xp, level и messages_count могут быть еще не сброшены из кэша
+        user_data = {**user_data, **(self.db.users.peek(user_id) or {})}
+
         return ProfileData(
             user_id=user_id,
             name=user_data.get('name'),
@@ -70,9 +73,10 @@ class ProfileManager:
         today = datetime.now()
         today_str = today.strftime("%d.%m")
         
-        # Получаем всех пользователей с днем рождения
+        # Получаем пользователей, у которых день и месяц совпадают с сегодняшними
         users = await self.db.fetch_all(
-            "SELECT * FROM users WHERE birthday IS NOT NULL"
+            "SELECT * FROM users WHERE birthday IS NOT NULL AND substr(birthday, 1, 5) = ?",
+            today_str
         )
         
         birthday_users = []
@@ -9,6 +9,8 @@ from .config_loader import BotState, LoggingState
 from .command_sync import CommandSync
 from .setup_manager import SetupManager
 from .settings import Settings
+from .log_config import LogConfig
+from .image_fetcher import ImageFetcher, ImageFetchError, ImageTooLarge
 
 __all__ = [
     # Основные утилиты
@@ -22,5 +24,11 @@ __all__ = [
     'CommandSync',
     'SetupManager',
     'LoggingState',
-    'Settings'
+    'Settings',
+    'LogConfig',
+    
+    # Загрузка изображений
+    'ImageFetcher',
+    'ImageFetchError',
+    'ImageTooLarge'
 ] 
\ No newline at end of file
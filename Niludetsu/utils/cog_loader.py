@@ -1,5 +1,8 @@
+import logging
 from collections import defaultdict
 
+log = logging.getLogger(__name__)
+
 class CogLoader:
     _loaded_cogs = defaultdict(lambda: {'success': [], 'failed': []})
     
@@ -29,14 +32,15 @@ class CogLoader:
     @classmethod
     def print_loaded_cogs(cls):
         """Выводит информацию о загруженных когах в красивом формате"""
-        print("\n=== Загруженные расширения ===")
+        lines = ["=== Загруженные расширения ==="]
         for category, status in cls._loaded_cogs.items():
             if not status['success'] and not status['failed']:
                 continue
                 
-            print(f"\n📁 {category.upper()}:")
+            lines.append(f"📁 {category.upper()}:")
             if status['success']:
-                print(f"  ├─ ✅ {', '.join(sorted(status['success']))}")
+                lines.append(f"  ├─ ✅ {', '.join(sorted(status['success']))}")
             if status['failed']:
-                print(f"  ├─ ❌ {', '.join(sorted(status['failed']))}")
-        print("\n============================\n")
\ No newline at end of file
+                lines.append(f"  ├─ ❌ {', '.join(sorted(status['failed']))}")
+        lines.append("============================")
+        log.info("\n".join(lines))
\ No newline at end of file
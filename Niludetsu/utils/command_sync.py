@@ -1,7 +1,9 @@
-import yaml, hashlib, discord
+import yaml, hashlib, discord, logging
 from typing import Dict, List, Any
 from discord.ext import commands
 
+log = logging.getLogger(__name__)
+
 class CommandSync:
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -66,12 +68,12 @@ class CommandSync:
 
             # Синхронизируем измененные команды
             if commands_to_sync or removed_commands:
-                print(f"🔄 Синхронизация измененных команд: {commands_to_sync}")
+                log.info(f"Синхронизация измененных команд: {commands_to_sync}")
                 await self.bot.tree.sync()
                 self.save_command_hashes(self.command_hashes)
-                print(f"✅ Синхронизация завершена. Изменено: {len(commands_to_sync)} | Удалено: {len(removed_commands)}")
+                log.info(f"Синхронизация завершена. Изменено: {len(commands_to_sync)} | Удалено: {len(removed_commands)}")
             else:
-                print("✅ Все команды актуальны, синхронизация не требуется.")
+                log.info("Все команды актуальны, синхронизация не требуется.")
 
         except Exception as e:
-            print(f"❌ Ошибка при синхронизации команд: {e}") 
\ No newline at end of file
+            log.error(f"Ошибка при синхронизации команд: {e}") 
\ No newline at end of file
@@ -1,6 +1,9 @@
 import discord
+import logging
 from typing import Optional
 
+log = logging.getLogger(__name__)
+
 class BotState:
     _initialized_systems = set()
     
@@ -35,4 +38,4 @@ class LoggingState:
         """Инициализация состояния логирования"""
         cls.log_channel = channel
         cls.initialized = True
-        print(f"✅ LoggingState инициализирован с каналом {channel.name}")
\ No newline at end of file
+        log.info(f"LoggingState инициализирован с каналом {channel.name}")
\ No newline at end of file
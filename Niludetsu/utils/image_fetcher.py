@@ -0,0 +1,214 @@
+"""
+Загрузка аватаров и изображений по ссылкам
+"""
+import asyncio, aiohttp, logging
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional, Dict, Tuple, Union, Any
+from PIL import Image
+from ..metrics import metrics, http_trace_config
+
+log = logging.getLogger(__name__)
+
+IMAGE_LOOKUPS = metrics.counter("image_fetch_lookups", "Обращения к кэшу загруженных изображений", ("result",))
+
+class ImageFetchError(Exception):
+    """Изображение не удалось загрузить или разобрать"""
+
+class ImageTooLarge(ImageFetchError):
+    """Размер изображения превышает лимит загрузки"""
+
+class _LRU:
+    """LRU с ограничением по суммарному весу записей"""
+
+    def __init__(self, max_weight: int):
+        self.max_weight = max_weight
+        self.weight = 0
+        self._items: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        self._items.move_to_end(key)
+        return item[0]
+
+    def put(self, key: Any, value: Any, weight: int) -> None:
+        if weight > self.max_weight:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.weight -= old[1]
+        self._items[key] = (value, weight)
+        self.weight += weight
+        while self.weight > self.max_weight:
+            _, (_, evicted) = self._items.popitem(last=False)
+            self.weight -= evicted
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+class ImageFetcher:
+    """Общий сервис загрузки изображений
+
+    Все запросы идут через одну ClientSession с пулом соединений.
+    Скачанные байты и декодированные изображения хранятся в LRU-кэшах по
+    ссылке: у ассетов Discord хэш содержимого входит в путь, поэтому новая
+    аватарка получает новую ссылку, а популярные аватары не скачиваются с
+    CDN повторно. Одновременные запросы одной ссылки объединяются в одну
+    загрузку, а размер ответа ограничен MAX_DOWNLOAD_BYTES.
+    """
+
+    MAX_DOWNLOAD_BYTES = 8 * 1024 * 1024    # Лимит размера одного изображения
+    BYTES_CACHE_SIZE = 32 * 1024 * 1024     # Объем кэша скачанных файлов
+    IMAGE_CACHE_SIZE = 128 * 1024 * 1024    # Объем кэша декодированных изображений (в пикселях * каналы)
+    CONNECTIONS = 20
+    TIMEOUT = 15.0
+    CHUNK_SIZE = 64 * 1024
+
+    _instance: Optional["ImageFetcher"] = None
+
+    def __init__(self, max_download_bytes: Optional[int] = None):
+        self.max_download_bytes = max_download_bytes or self.MAX_DOWNLOAD_BYTES
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._bytes = _LRU(self.BYTES_CACHE_SIZE)
+        self._images = _LRU(self.IMAGE_CACHE_SIZE)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.downloads = 0
+        self.coalesced = 0
+
+    @classmethod
+    def get(cls) -> "ImageFetcher":
+        """Общий на процесс сервис"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Сессия привязана к циклу событий, поэтому создается при первом запросе
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.CONNECTIONS),
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+                trace_configs=[http_trace_config("images")]
+            )
+        return self._session
+
+    async def fetch(self, url: Union[str, Any]) -> bytes:
+        """Скачивает файл по ссылке или берет его из кэша
+
+        Args:
+            url (Union[str, Any]): Ссылка или discord.Asset
+
+        Raises:
+            ImageFetchError: Ответ не 200 или ошибка соединения
+            ImageTooLarge: Файл больше лимита загрузки
+        """
+        url = str(url)
+        data = self._bytes.get(url)
+        if data is not None:
+            IMAGE_LOOKUPS.inc(result="bytes")
+            return data
+
+        task = self._inflight.get(url)
+        if task is not None:
+            self.coalesced += 1
+            IMAGE_LOOKUPS.inc(result="coalesced")
+        else:
+            IMAGE_LOOKUPS.inc(result="miss")
+            # Загрузка идет отдельной задачей: отмена одного запроса не прерывает остальные
+            task = asyncio.get_running_loop().create_task(self._download(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda done: self._finish(url, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, url: str, task: asyncio.Task) -> None:
+        self._inflight.pop(url, None)
+        if not task.cancelled() and task.exception() is None:
+            data = task.result()
+            self._bytes.put(url, data, len(data))
+
+    async def _download(self, url: str) -> bytes:
+        try:
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    raise ImageFetchError(f"Не удалось загрузить изображение: HTTP {response.status}")
+                if response.content_length and response.content_length > self.max_download_bytes:
+                    raise ImageTooLarge(f"Изображение больше {self.max_download_bytes // 1048576}MB")
+
+                # Content-Length может отсутствовать, поэтому лимит проверяется и при чтении
+                buffer = bytearray()
+                async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                    buffer.extend(chunk)
+                    if len(buffer) > self.max_download_bytes:
+                        raise ImageTooLarge(f"Изображение больше {self.max_download_bytes // 1048576}MB")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise ImageFetchError(f"Ошибка загрузки изображения: {e}") from e
+
+        self.downloads += 1
+        return bytes(buffer)
+
+    async def image(self, url: Union[str, Any], size: Optional[Tuple[int, int]] = None, mode: str = "RGBA") -> Image.Image:
+        """Загружает и декодирует изображение
+
+        Декодирование и уменьшение выполняются в потоке. Возвращается
+        копия из кэша, поэтому ее можно изменять.
+
+        Args:
+            url (Union[str, Any]): Ссылка или discord.Asset
+            size (Optional[Tuple[int, int]]): Вписать изображение в этот размер (thumbnail)
+            mode (str): Режим изображения PIL
+
+        Raises:
+            ImageFetchError: Файл не удалось загрузить или разобрать
+        """
+        key = (str(url), size, mode)
+        image = self._images.get(key)
+        if image is None:
+            data = await self.fetch(url)
+            image = await asyncio.to_thread(self._decode, data, size, mode)
+            self._images.put(key, image, image.width * image.height * len(image.getbands()))
+        else:
+            IMAGE_LOOKUPS.inc(result="image")
+        return image.copy()
+
+    @staticmethod
+    def _decode(data: bytes, size: Optional[Tuple[int, int]], mode: str) -> Image.Image:
+        try:
+            image = Image.open(BytesIO(data))
+            # draft ускоряет уменьшение JPEG при декодировании
+            if size:
+                image.draft(None, size)
+            image = image.convert(mode)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise ImageFetchError(f"Не удалось разобрать изображение: {e}") from e
+        if size:
+            image.thumbnail(size, Image.Resampling.LANCZOS)
+        return image
+
+    async def close(self) -> None:
+        """Закрывает HTTP-сессию"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def clear(self) -> None:
+        """Очищает кэши"""
+        self._bytes.clear()
+        self._images.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика сервиса"""
+        return {
+            "downloads": self.downloads,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "cached_files": len(self._bytes),
+            "cached_bytes": self._bytes.weight,
+            "cached_images": len(self._images),
+            "cached_pixels": self._images.weight
+        }
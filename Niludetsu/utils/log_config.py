@@ -0,0 +1,119 @@
+"""
+Настройка журналирования процесса
+"""
+import atexit, json, logging, queue, sys
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+from .settings import Settings
+
+# Атрибуты LogRecord, которые не считаются дополнительными полями
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись: время, уровень, логгер, сообщение и поля из extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler, который не форматирует запись в вызывающем потоке
+
+    Стандартный prepare() прогоняет запись через форматтер до постановки в
+    очередь, то есть на цикле событий. Здесь подставляются только аргументы
+    сообщения, а форматирование, трассировки и вывод выполняет поток
+    QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class LogConfig:
+    """Общая настройка logging для бота
+
+    Все логгеры пишут в очередь, а поток QueueListener форматирует записи и
+    выводит их в stdout, поэтому запись лога не блокирует цикл событий.
+    Уровни и формат читаются из настроек категории "diagnostics":
+    "format" (text или json), "level" (общий уровень) и "level.<логгер>"
+    (уровень отдельного модуля, например "level.Niludetsu.music").
+    """
+
+    _listener: Optional[QueueListener] = None
+    _handler: Optional[logging.Handler] = None
+    _levels: Dict[str, int] = {}
+
+    @classmethod
+    def setup(cls, level: int = logging.INFO, json_output: bool = False) -> None:
+        """Подключает очередь к корневому логгеру, повторный вызов меняет только формат"""
+        if cls._listener is None:
+            cls._handler = logging.StreamHandler(sys.stdout)
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            cls._listener = QueueListener(log_queue, cls._handler, respect_handler_level=True)
+            cls._listener.start()
+            atexit.register(cls.shutdown)
+
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(DeferredQueueHandler(log_queue))
+            root.setLevel(level)
+
+        cls._handler.setFormatter(JsonFormatter() if json_output else logging.Formatter(TEXT_FORMAT))
+
+    @classmethod
+    def apply(cls, values: Dict[str, str]) -> None:
+        """Применяет настройки категории diagnostics
+
+        Args:
+            values (Dict[str, str]): Настройки в виде {ключ: значение}
+        """
+        cls.setup(json_output=str(values.get("format", "text")).lower() == "json")
+
+        if "level" in values:
+            cls._set_level(logging.getLogger(), values["level"])
+
+        # Модули, убранные из настроек или с неверным уровнем, наследуют уровень родителя
+        for name in cls._levels:
+            logging.getLogger(name).setLevel(logging.NOTSET)
+        cls._levels = {}
+        for key, value in values.items():
+            if key.startswith("level.") and cls._set_level(logging.getLogger(key[len("level."):]), value):
+                cls._levels[key[len("level."):]] = logging.getLogger(key[len("level."):]).level
+
+    @staticmethod
+    def _set_level(logger: logging.Logger, value: str) -> bool:
+        level = logging.getLevelName(str(value).upper())
+        if not isinstance(level, int):
+            logging.getLogger(__name__).warning("Неизвестный уровень логирования %r для %s", value, logger.name)
+            return False
+        logger.setLevel(level)
+        return True
+
+    @classmethod
+    async def load(cls) -> None:
+        """Читает уровни и формат из таблицы настроек"""
+        cls.apply(await Settings().get_category(None, "diagnostics"))
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Дописывает очередь и останавливает поток вывода"""
+        if cls._listener is not None:
+            cls._listener.stop()
+            cls._listener = None
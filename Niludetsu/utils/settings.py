@@ -1,37 +1,123 @@
 """
 Управление настройками бота
 """
-from typing import Optional, Any, Dict
+import asyncio, time
+from typing import Optional, Any, Dict, Tuple
 from ..database import Database
 
 class Settings:
-    """Класс для работы с настройками бота"""
-    
+    """Класс для работы с настройками бота
+
+    Настройки кэшируются на весь процесс: таблица settings читается целиком
+    при первом обращении (или явном load()), дальше чтения идут из памяти.
+    set/delete обновляют кэш сразу после записи. Если задан TTL, снимок
+    перечитывается, когда он устарел (например, если базу правит другой процесс).
+
+    guild_id=None в методах чтения означает поиск без учета сервера, как в
+    запросах вида "WHERE category = ? AND key = ?".
+    """
+
+    TTL: Optional[float] = None  # Время жизни снимка в секундах, None - без ограничения
+
+    _values: Dict[Tuple[str, str, str], str] = {}  # (guild_id, category, key) -> value
+    _by_key: Dict[Tuple[str, str], str] = {}  # (category, key) -> value для чтения с guild_id=None
+    _loaded_at: Optional[float] = None
+    _version = 0  # Растет при каждом изменении снимка, по нему сбрасываются производные кэши
+    _load_lock: Optional[asyncio.Lock] = None
+    _hits = 0
+    _loads = 0
+
     def __init__(self):
         self.db = Database()
-        
-    async def get(self, guild_id: str, category: str, key: str) -> Optional[str]:
+
+    @classmethod
+    def _expired(cls) -> bool:
+        """Нужно ли перечитать снимок настроек"""
+        if cls._loaded_at is None:
+            return True
+        return cls.TTL is not None and time.monotonic() - cls._loaded_at > cls.TTL
+
+    async def load(self) -> None:
+        """Загружает все настройки одним запросом"""
+        rows = await self.db.fetch_all("SELECT guild_id, category, key, value FROM settings")
+        Settings._values = {
+            (str(row['guild_id']) if row['guild_id'] is not None else None, row['category'], row['key']): row['value']
+            for row in rows
+        }
+        Settings._loaded_at = time.monotonic()
+        Settings._loads += 1
+        Settings._reindex()
+
+    async def _ensure_loaded(self) -> None:
+        """Загружает снимок, если его нет или он устарел"""
+        if not self._expired():
+            return
+        if Settings._load_lock is None:
+            Settings._load_lock = asyncio.Lock()
+        async with Settings._load_lock:
+            # Пока ждали блокировку, снимок мог загрузить другой вызов
+            if self._expired():
+                await self.load()
+
+    @classmethod
+    def _reindex(cls) -> None:
+        """Пересобирает индекс чтения без сервера после изменения снимка"""
+        by_key = {}
+        for (_, category, key), value in cls._values.items():
+            # Как и раньше, при совпадении на нескольких серверах берется первая запись
+            by_key.setdefault((category, key), value)
+        cls._by_key = by_key
+        cls._version += 1
+
+    @classmethod
+    def version(cls) -> int:
+        """Номер текущего состояния кэша"""
+        return cls._version
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Сбрасывает кэш, следующее чтение перечитает таблицу"""
+        cls._loaded_at = None
+
+    @staticmethod
+    def _matches(entry: Tuple[str, str, str], guild_id: Optional[str], category: str) -> bool:
+        return entry[1] == category and (guild_id is None or entry[0] == guild_id)
+
+    async def get(self, guild_id: Optional[str], category: str, key: str, default: Any = None) -> Optional[str]:
         """Получить значение настройки"""
-        result = await self.db.get_row(
-            'settings',
-            guild_id=str(guild_id),
-            category=category,
-            key=key
-        )
-        return result['value'] if result else None
-        
+        await self._ensure_loaded()
+        Settings._hits += 1
+        if guild_id is not None:
+            return Settings._values.get((str(guild_id), category, key), default)
+        return Settings._by_key.get((category, key), default)
+
+    async def get_category(self, guild_id: Optional[str], category: str) -> Dict[str, str]:
+        """Получить все настройки категории в виде {ключ: значение}"""
+        await self._ensure_loaded()
+        Settings._hits += 1
+        guild_id = str(guild_id) if guild_id is not None else None
+        return {
+            entry[2]: value
+            for entry, value in Settings._values.items()
+            if self._matches(entry, guild_id, category)
+        }
+
     async def set(self, guild_id: str, category: str, key: str, value: str) -> None:
         """Установить значение настройки"""
-        await self.db.insert(
+        await self.db.upsert(
             'settings',
             {
                 'guild_id': str(guild_id),
                 'category': category,
                 'key': key,
                 'value': str(value)
-            }
+            },
+            conflict_keys=['guild_id', 'category', 'key'],
+            update=['value']
         )
-        
+        Settings._values[(str(guild_id), category, key)] = str(value)
+        Settings._reindex()
+
     async def delete(self, guild_id: str, category: str, key: str) -> None:
         """Удалить настройку"""
         await self.db.delete(
@@ -40,17 +126,32 @@ class Settings:
             category=category,
             key=key
         )
-        
-    async def get_all(self, guild_id: str, category: Optional[str] = None) -> Dict[str, Any]:
+        Settings._values.pop((str(guild_id), category, key), None)
+        Settings._reindex()
+
+    async def get_all(self, guild_id: Optional[str], category: Optional[str] = None) -> Dict[str, Any]:
         """Получить все настройки для сервера"""
-        conditions = {'guild_id': str(guild_id)}
-        if category:
-            conditions['category'] = category
-            
+        await self._ensure_loaded()
+        Settings._hits += 1
+        guild_id = str(guild_id) if guild_id is not None else None
+
         settings = {}
-        async for row in await self.db.get_rows('settings', **conditions):
-            if row['category'] not in settings:
-                settings[row['category']] = {}
-            settings[row['category']][row['key']] = row['value']
-            
-        return settings 
\ No newline at end of file
+        for (entry_guild, entry_category, entry_key), value in Settings._values.items():
+            if guild_id is not None and entry_guild != guild_id:
+                continue
+            if category and entry_category != category:
+                continue
+            settings.setdefault(entry_category, {})[entry_key] = value
+
+        return settings
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Статистика кэша настроек"""
+        return {
+            "entries": len(cls._values),
+            "hits": cls._hits,
+            "loads": cls._loads,
+            "version": cls._version,
+            "age": round(time.monotonic() - cls._loaded_at, 3) if cls._loaded_at is not None else None
+        }
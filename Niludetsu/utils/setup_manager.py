@@ -1,9 +1,12 @@
 import discord
+import logging
 from discord.ext import commands
 import yaml
 from typing import Optional, Dict, Any, List
 from .embed import Embed
 
+log = logging.getLogger(__name__)
+
 class SetupView(discord.ui.View):
     """View для меню настроек"""
     
@@ -67,7 +70,7 @@ class RulesButton(discord.ui.Button):
             # Игнорируем ошибку истекшего взаимодействия
             pass
         except Exception as e:
-            print(f"Ошибка при обработке кнопки правил: {e}")
+            log.error(f"Ошибка при обработке кнопки правил: {e}")
 
 class CommandsButton(discord.ui.Button):
     def __init__(self):
@@ -96,7 +99,7 @@ class CommandsButton(discord.ui.Button):
             # Игнорируем ошибку истекшего взаимодействия
             pass
         except Exception as e:
-            print(f"Ошибка при обработке кнопки команд: {e}")
+            log.error(f"Ошибка при обработке кнопки команд: {e}")
 
 class PartnershipButton(discord.ui.Button):
     def __init__(self):
@@ -127,7 +130,7 @@ class PartnershipButton(discord.ui.Button):
             # Игнорируем ошибку истекшего взаимодействия
             pass
         except Exception as e:
-            print(f"Ошибка при обработке кнопки партнерства: {e}")
+            log.error(f"Ошибка при обработке кнопки партнерства: {e}")
 
 class ColorRoleButton(discord.ui.Button):
     def __init__(self):
@@ -179,7 +182,7 @@ class ColorRoleButton(discord.ui.Button):
                 ephemeral=True
             )
         except Exception as e:
-            print(f"Ошибка при обработке кнопки выбора цвета: {e}")
+            log.error(f"Ошибка при обработке кнопки выбора цвета: {e}")
             await interaction.response.send_message(
                 "Произошла ошибка при отображении цветов. Пожалуйста, обратитесь к администрации.",
                 ephemeral=True
@@ -279,7 +282,7 @@ class ColorButton(discord.ui.Button):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
         except Exception as e:
-            print(f"Ошибка при выдаче цветной роли: {e}")
+            log.error(f"Ошибка при выдаче цветной роли: {e}")
             await interaction.response.send_message(
                 "Произошла ошибка при выдаче роли. Пожалуйста, обратитесь к администрации.",
                 ephemeral=True
@@ -324,7 +327,7 @@ class GenderRoleButton(discord.ui.Button):
                 ephemeral=True
             )
         except Exception as e:
-            print(f"Ошибка при отображении выбора пола: {e}")
+            log.error(f"Ошибка при отображении выбора пола: {e}")
             await interaction.response.send_message(
                 "Произошла ошибка при отображении ролей. Пожалуйста, обратитесь к администрации.",
                 ephemeral=True
@@ -403,7 +406,7 @@ class GenderButton(discord.ui.Button):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             
         except Exception as e:
-            print(f"Ошибка при выдаче гендерной роли: {e}")
+            log.error(f"Ошибка при выдаче гендерной роли: {e}")
             await interaction.response.send_message(
                 "Произошла ошибка при выдаче роли. Пожалуйста, обратитесь к администрации.",
                 ephemeral=True
@@ -431,7 +434,7 @@ class SetupManager:
             with open("data/config.yaml", "w", encoding="utf-8") as f:
                 yaml.dump(self.config, f, indent=4, allow_unicode=True)
         except Exception as e:
-            print(f"Ошибка при сохранении конфига: {e}")
+            log.error(f"Ошибка при сохранении конфига: {e}")
             
     async def get_setup_message(self) -> Optional[discord.Message]:
         """Получает сообщение с меню настроек"""
@@ -511,7 +514,7 @@ class SetupManager:
                     # Сохраняем ID роли в конфиг
                     role_data["id"] = str(role.id)
                     self.save_config()
-                    print(f"Создана цветная роль: {role_name} (ID: {role.id})")
+                    log.info(f"Создана цветная роль: {role_name} (ID: {role.id})")
                 else:
                     # Обновляем название и цвет существующей роли если они отличаются
                     if role.name != role_name or role.color.value != role_color:
@@ -520,10 +523,10 @@ class SetupManager:
                             color=discord.Color(role_color),
                             reason="Обновление цветной роли"
                         )
-                        print(f"Обновлена роль {role_name} (ID: {role.id})")
+                        log.info(f"Обновлена роль {role_name} (ID: {role.id})")
                         
         except Exception as e:
-            print(f"Ошибка при инициализации цветных ролей: {e}")
+            log.error(f"Ошибка при инициализации цветных ролей: {e}")
     
     async def initialize(self) -> None:
         """Инициализирует меню настроек"""
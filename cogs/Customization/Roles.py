@@ -1,25 +1,27 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
 from Niludetsu.database.db import Database
+from Niludetsu.utils.settings import Settings
+
+log = logging.getLogger(__name__)
 
 class Roles(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         
     async def get_roles_from_db(self, category: str) -> list:
         """Получение ролей из базы данных"""
         try:
-            roles = await self.db.fetch_all(
-                "SELECT value FROM settings WHERE category = ? AND key = ?",
-                'roles', category
-            )
-            return roles[0]['value'].split(',') if roles else []
+            roles = await self.settings.get(None, 'roles', category)
+            return roles.split(',') if roles else []
         except Exception as e:
-            print(f"❌ Ошибка при получении ролей: {e}")
+            log.error(f"Ошибка при получении ролей: {e}")
             return []
 
     @app_commands.command(name="colors", description="Выбрать цветную роль")
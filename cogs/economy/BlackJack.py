@@ -71,11 +71,15 @@ class BlackJack(commands.Cog):
             )
             return
 
-        await self.db.update(
-            "users",
-            where={"user_id": user_id},
-            values={"balance": user_data['balance'] - bet}
-        )
+        if await self.db.increment("users", {"user_id": user_id}, minimum={"balance": 0}, balance=-bet) is None:
+            await interaction.response.send_message(
+                embed=Embed(
+                    description="У вас недостаточно средств для такой ставки!",
+                    color="RED"
+                ),
+                ephemeral=True
+            )
+            return
 
         deck = self.create_deck()
         player_hand = [deck.pop(), deck.pop()]
@@ -192,13 +196,7 @@ class BlackJack(commands.Cog):
             winnings = 0
 
         if winnings > 0:
-            user_id = str(interaction.user.id)
-            user_data = await self.db.get_row("users", user_id=user_id)
-            await self.db.update(
-                "users",
-                where={"user_id": user_id},
-                values={"balance": user_data['balance'] + winnings}
-            )
+            await self.db.increment("users", {"user_id": str(interaction.user.id)}, balance=winnings)
 
         if winnings > 0:
             description += f"\n💰 **Выигрыш:** {winnings:,} {Emojis.MONEY}"
@@ -104,11 +104,16 @@ class Casino(commands.Cog):
             return
 
         bet_type = view.value
-        await self.db.update(
-            "users",
-            where={"user_id": user_id},
-            values={"balance": user_data['balance'] - bet}
-        )
+        # Баланс мог измениться, пока игрок выбирал ставку
+        if await self.db.increment("users", {"user_id": user_id}, minimum={"balance": 0}, balance=-bet) is None:
+            await interaction.edit_original_response(
+                embed=Embed(
+                    description="❌ У вас недостаточно средств для такой ставки!",
+                    color="RED"
+                ),
+                view=None
+            )
+            return
 
         # Начальное сообщение
         embed=Embed(
@@ -171,12 +176,7 @@ class Casino(commands.Cog):
             winnings = bet * 2
 
         if winnings > 0:
-            user_data = await self.db.get_row("users", user_id=user_id)
-            await self.db.update(
-                "users",
-                where={"user_id": user_id},
-                values={"balance": user_data['balance'] + winnings}
-            )
+            await self.db.increment("users", {"user_id": user_id}, balance=winnings)
             result_text = f"🎉 **Поздравляем! Вы выиграли!**"
             color = "GREEN"
         else:
@@ -42,13 +42,11 @@ class Daily(commands.Cog):
         reward = random.randint(100, 1000)
 
         # Обновляем данные пользователя
-        await self.db.update(
+        user_data = await self.db.increment(
             "users",
-            where={"user_id": user_id},
-            values={
-                "balance": user_data.get('balance', 0) + reward,
-                "last_daily": datetime.utcnow().isoformat()
-            }
+            {"user_id": user_id},
+            values={"last_daily": datetime.utcnow().isoformat()},
+            balance=reward
         )
 
         # Отправляем сообщение об успешном получении награды
@@ -56,7 +54,7 @@ class Daily(commands.Cog):
             embed=Embed(
                 title="🎁 Ежедневная награда",
                 description=f"💰 Вы получили: **{reward:,}** {Emojis.MONEY}\n"
-                          f"💳 Баланс: **{user_data['balance'] + reward:,}** {Emojis.MONEY}",
+                          f"💳 Баланс: **{user_data['balance']:,}** {Emojis.MONEY}",
                 color="GREEN"
             )
         )
@@ -42,17 +42,24 @@ class Deposit(commands.Cog):
             return
 
         # Выполняем перевод в банк
-        new_balance = user_data.get('balance', 0) - amount
-        new_deposit = user_data.get('deposit', 0) + amount
-        
-        await self.db.update(
+        user_data = await self.db.increment(
             "users",
-            where={"user_id": user_id},
-            values={
-                "balance": new_balance,
-                "deposit": new_deposit
-            }
+            {"user_id": user_id},
+            minimum={"balance": 0},
+            balance=-amount,
+            deposit=amount
         )
+        if user_data is None:
+            await interaction.response.send_message(
+                embed=Embed(
+                    description="У вас недостаточно средств.",
+                    color="RED"
+                ),
+                ephemeral=True
+            )
+            return
+        new_balance = user_data['balance']
+        new_deposit = user_data['deposit']
 
         # Отправляем сообщение об успешном внесении
         await interaction.response.send_message(
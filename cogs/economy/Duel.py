@@ -143,17 +143,23 @@ class Duel(commands.Cog):
             )
             return
 
-        # Снимаем ставки с обоих игроков
-        await self.db.update(
-            "users",
-            where={"user_id": challenger_id},
-            values={"balance": challenger_data['balance'] - bet}
-        )
-        await self.db.update(
-            "users",
-            where={"user_id": opponent_id},
-            values={"balance": opponent_data['balance'] - bet}
-        )
+        # Снимаем ставки с обоих игроков, балансы могли измениться во время вызова
+        challenger_paid = await self.db.increment("users", {"user_id": challenger_id}, minimum={"balance": 0}, balance=-bet)
+        opponent_paid = await self.db.increment("users", {"user_id": opponent_id}, minimum={"balance": 0}, balance=-bet)
+        if challenger_paid is None or opponent_paid is None:
+            # Возвращаем уже снятую ставку
+            if challenger_paid is not None:
+                await self.db.increment("users", {"user_id": challenger_id}, balance=bet)
+            if opponent_paid is not None:
+                await self.db.increment("users", {"user_id": opponent_id}, balance=bet)
+            await interaction.edit_original_response(
+                embed=Embed(
+                    description="❌ У одного из участников недостаточно средств для дуэли!",
+                    color="RED"
+                ),
+                view=None
+            )
+            return
 
         # Начинаем дуэль
         challenger_hp = 100
@@ -234,16 +240,8 @@ class Duel(commands.Cog):
             result_text = "🤝 **Ничья!** Оба игрока пали в бою!"
             color = "YELLOW"
             # Возвращаем ставки обоим игрокам
-            await self.db.update(
-                "users",
-                where={"user_id": challenger_id},
-                values={"balance": challenger_data['balance']}
-            )
-            await self.db.update(
-                "users",
-                where={"user_id": opponent_id},
-                values={"balance": opponent_data['balance']}
-            )
+            await self.db.increment("users", {"user_id": challenger_id}, balance=bet)
+            await self.db.increment("users", {"user_id": opponent_id}, balance=bet)
         elif challenger_hp <= 0:
             winner = member
             winner_id = opponent_id
@@ -256,12 +254,7 @@ class Duel(commands.Cog):
             color = "GREEN"
 
         if challenger_hp > 0 or opponent_hp > 0:  # Если не ничья
-            winner_data = await self.db.get_row("users", user_id=winner_id)
-            await self.db.update(
-                "users",
-                where={"user_id": winner_id},
-                values={"balance": winner_data['balance'] + bet * 2}
-            )
+            await self.db.increment("users", {"user_id": winner_id}, balance=bet * 2)
 
         final_embed=Embed(
             title="⚔️ Дуэль окончена!",
@@ -64,25 +64,28 @@ class Pay(commands.Cog):
             )
             return
 
-        # Получаем данные получателя
-        receiver_id = str(user.id)
-        receiver_data = await self.db.ensure_user(receiver_id)
-
-        # Выполняем перевод
-        new_sender_balance = sender_data.get('balance', 0) - amount
-        new_receiver_balance = receiver_data.get('balance', 0) + amount
-
-        # Сохраняем изменения
-        await self.db.update(
+        # Списываем у отправителя атомарно, баланс не может уйти в минус
+        sender_data = await self.db.increment(
             "users",
-            where={"user_id": sender_id},
-            values={"balance": new_sender_balance}
-        )
-        await self.db.update(
-            "users",
-            where={"user_id": receiver_id},
-            values={"balance": new_receiver_balance}
+            {"user_id": sender_id},
+            minimum={"balance": 0},
+            balance=-amount
         )
+        if sender_data is None:
+            await interaction.response.send_message(
+                embed=Embed(
+                    description="У вас недостаточно средств.",
+                    color="RED"
+                ),
+                ephemeral=True
+            )
+            return
+        new_sender_balance = sender_data['balance']
+
+        # Зачисляем получателю
+        receiver_id = str(user.id)
+        await self.db.ensure_user(receiver_id)
+        await self.db.increment("users", {"user_id": receiver_id}, balance=amount)
 
         # Отправляем сообщение об успешном переводе
         await interaction.response.send_message(
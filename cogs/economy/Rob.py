@@ -76,26 +76,31 @@ class Rob(commands.Cog):
             max_steal = int(victim_data['balance'] * self.max_rob_percent)
             stolen = random.randint(1, max(1, max_steal))
 
-            # Обновляем балансы
-            new_robber_balance = robber_data.get('balance', 0) + stolen
-            new_victim_balance = victim_data.get('balance', 0) - stolen
-
-            # Обновляем время последнего ограбления и баланс грабителя
-            await self.db.update(
+            # Списываем у жертвы, баланс которой мог измениться с момента проверки
+            victim_data = await self.db.increment(
                 "users",
-                where={"user_id": robber_id},
-                values={
-                    "balance": new_robber_balance,
-                    "last_rob": datetime.utcnow().isoformat()
-                }
+                {"user_id": victim_id},
+                minimum={"balance": 0},
+                balance=-stolen
             )
+            if victim_data is None:
+                await interaction.response.send_message(
+                    embed=Embed(
+                        description=f"У {user.mention} уже нечего красть.",
+                        color="RED"
+                    ),
+                    ephemeral=True
+                )
+                return
 
-            # Обновляем баланс жертвы
-            await self.db.update(
+            # Обновляем время последнего ограбления и баланс грабителя
+            robber_data = await self.db.increment(
                 "users",
-                where={"user_id": victim_id},
-                values={"balance": new_victim_balance}
+                {"user_id": robber_id},
+                values={"last_rob": datetime.utcnow().isoformat()},
+                balance=stolen
             )
+            new_robber_balance = robber_data['balance']
 
             await interaction.response.send_message(
                 embed=Embed(
@@ -108,16 +113,23 @@ class Rob(commands.Cog):
         else:
             # Неудачное ограбление
             fine = random.randint(100, 1000)
-            new_robber_balance = max(0, robber_data.get('balance', 0) - fine)
+            last_rob = datetime.utcnow().isoformat()
             
-            await self.db.update(
+            # Штраф не может увести баланс в минус
+            updated = await self.db.increment(
                 "users",
-                where={"user_id": robber_id},
-                values={
-                    "balance": new_robber_balance,
-                    "last_rob": datetime.utcnow().isoformat()
-                }
+                {"user_id": robber_id},
+                minimum={"balance": 0},
+                values={"last_rob": last_rob},
+                balance=-min(fine, robber_data.get('balance', 0))
             )
+            if updated is None:
+                updated = await self.db.update(
+                    "users",
+                    where={"user_id": robber_id},
+                    values={"last_rob": last_rob}
+                )
+            new_robber_balance = updated['balance']
 
             await interaction.response.send_message(
                 embed=Embed(
@@ -65,20 +65,28 @@ class RoleSelect(discord.ui.Select):
                 return
                 
             # Снимаем деньги только с баланса
-            new_balance = user_data['balance'] - role_data['price']
-            await self.view.db.update("users", 
-                where={"user_id": str(btn_interaction.user.id)},
-                values={"balance": new_balance}
+            user_data = await self.view.db.increment(
+                "users",
+                {"user_id": str(btn_interaction.user.id)},
+                minimum={"balance": 0},
+                balance=-role_data['price']
             )
+            if user_data is None:
+                await btn_interaction.response.send_message(
+                    embed=Embed(
+                        description="❌ У вас недостаточно средств в балансе!",
+                        color="RED"
+                    ),
+                    ephemeral=True
+                )
+                return
+            new_balance = user_data['balance']
             
             # Выдаем роль
             await btn_interaction.user.add_roles(role)
             
             # Обновляем количество покупок
-            await self.view.db.update("shop_roles",
-                where={"role_id": role_id},
-                values={"purchases": role_data['purchases'] + 1}
-            )
+            await self.view.db.increment("shop_roles", {"role_id": role_id}, purchases=1)
             
             await btn_interaction.response.send_message(
                 embed=Embed(
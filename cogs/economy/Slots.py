@@ -93,11 +93,16 @@ class Slots(commands.Cog):
             return
 
         # Снимаем ставку
-        await self.db.update(
-            "users",
-            where={"user_id": user_id},
-            values={"balance": user_data['balance'] - bet}
-        )
+        if await self.db.increment("users", {"user_id": user_id}, minimum={"balance": 0}, balance=-bet) is None:
+            embed=Embed(
+                description="❌ У вас недостаточно средств!",
+                color="RED"
+            )
+            if message:
+                await message.edit(embed=embed, view=None)
+            else:
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            return
 
         initial_embed=Embed(
             title="🎰 Слот-машина",
@@ -128,13 +133,8 @@ class Slots(commands.Cog):
         description = [f"🎲 **Результат:** [ {slots_display} ]\n"]
 
         if winnings > 0:
-            user_data = await self.db.get_row("users", user_id=user_id)
-            new_balance = user_data['balance'] + winnings
-            await self.db.update(
-                "users",
-                where={"user_id": user_id},
-                values={"balance": new_balance}
-            )
+            user_data = await self.db.increment("users", {"user_id": user_id}, balance=winnings)
+            new_balance = user_data['balance']
             
             description.extend([
                 f"🎉 **Поздравляем! Вы выиграли!**",
@@ -42,17 +42,24 @@ class Withdraw(commands.Cog):
             return
 
         # Выполняем снятие из банка
-        new_deposit = user_data.get('deposit', 0) - amount
-        new_balance = user_data.get('balance', 0) + amount
-        
-        await self.db.update(
+        user_data = await self.db.increment(
             "users",
-            where={"user_id": user_id},
-            values={
-                "deposit": new_deposit,
-                "balance": new_balance
-            }
+            {"user_id": user_id},
+            minimum={"deposit": 0},
+            deposit=-amount,
+            balance=amount
         )
+        if user_data is None:
+            await interaction.response.send_message(
+                embed=Embed(
+                    description="У вас недостаточно средств в банке.",
+                    color="RED"
+                ),
+                ephemeral=True
+            )
+            return
+        new_deposit = user_data['deposit']
+        new_balance = user_data['balance']
 
         # Отправляем сообщение об успешном снятии
         await interaction.response.send_message(
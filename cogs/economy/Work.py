@@ -68,17 +68,17 @@ class Work(commands.Cog):
 
         # Обновляем данные пользователя
         new_balance = user_data.get('balance', 0) + total_reward
-        new_xp = user_data.get('xp', 0) + random.randint(10, 20)
         
         await self.db.update(
             "users",
             where={"user_id": user_id},
             values={
                 "balance": new_balance,
-                "xp": new_xp,
                 "last_work": datetime.utcnow().isoformat()
             }
         )
+        # Опыт хранится в кэше пользователей
+        await self.db.users.increment(user_id, xp=random.randint(10, 20))
 
         # Формируем сообщение
         description = [
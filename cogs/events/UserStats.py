@@ -1,10 +1,12 @@
 import discord
+import logging
 from discord.ext import commands, tasks
 from Niludetsu.database import Database
 from datetime import datetime, timedelta
-import traceback
 import asyncio
 
+log = logging.getLogger(__name__)
+
 class UserStats(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -17,25 +19,18 @@ class UserStats(commands.Cog):
         """Асинхронная инициализация"""
         await self.db.init()
 
-    def cog_unload(self):
+    async def cog_unload(self):
         self.update_voice_time.cancel()
+        # Записываем накопленную статистику сообщений
+        await self.db.users.flush()
 
     @commands.Cog.listener()
     async def on_message(self, message):
         if message.author.bot:
             return
 
-        # Увеличиваем счетчик сообщений
-        user_id = str(message.author.id)
-        user_data = await self.db.get_row("users", user_id=user_id)
-        
-        if user_data:
-            messages_count = user_data.get('messages_count', 0) + 1
-            await self.db.update(
-                "users",
-                where={"user_id": user_id},
-                values={"messages_count": messages_count}
-            )
+        # Увеличиваем счетчик сообщений в кэше, в базу он попадет пачкой
+        await self.db.users.increment(message.author.id, messages_count=1)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
@@ -47,26 +42,17 @@ class UserStats(commands.Cog):
             user_id = str(member.id)
             now = datetime.utcnow()
             
-            # Получаем или создаем запись пользователя
-            user_data = await self.db.get_row("users", user_id=user_id)
-            if not user_data:
-                user_data = await self.db.insert("users", {
-                    "user_id": user_id,
-                    "voice_time": 0,
-                    "voice_joins": 0,
-                    "last_voice_join": None,
-                    "messages_count": 0
-                })
+            # Получаем или создаем запись пользователя; сброс кэша статистики
+            # мог создать ее параллельно, поэтому без обычного INSERT
+            user_data = await self.db.ensure_user(user_id)
 
             # Если пользователь присоединился к голосовому каналу
             if not before.channel and after.channel:
-                await self.db.update(
+                await self.db.increment(
                     "users",
-                    where={"user_id": user_id},
-                    values={
-                        "last_voice_join": now.isoformat(),
-                        "voice_joins": (user_data.get("voice_joins", 0) or 0) + 1
-                    }
+                    {"user_id": user_id},
+                    values={"last_voice_join": now.isoformat()},
+                    voice_joins=1
                 )
 
             # Если пользователь покинул голосовой канал
@@ -77,20 +63,17 @@ class UserStats(commands.Cog):
                         if isinstance(last_join, str):
                             last_join = datetime.fromisoformat(last_join)
                         duration = int((now - last_join).total_seconds())
-                        await self.db.update(
+                        await self.db.increment(
                             "users",
-                            where={"user_id": user_id},
-                            values={
-                                "voice_time": (user_data.get("voice_time", 0) or 0) + duration,
-                                "last_voice_join": None
-                            }
+                            {"user_id": user_id},
+                            values={"last_voice_join": None},
+                            voice_time=duration
                         )
                     except (ValueError, TypeError) as e:
-                        print(f"Ошибка при обработке времени: {e}")
+                        log.error(f"Ошибка при обработке времени: {e}")
 
         except Exception as e:
-            print(f"❌ Ошибка при обработке голосовой статистики: {e}")
-            traceback.print_exc()
+            log.exception(f"Ошибка при обработке голосовой статистики: {e}")
 
     @tasks.loop(minutes=5.0)
     async def update_voice_time(self):
@@ -104,20 +87,13 @@ class UserStats(commands.Cog):
                     continue
                     
                 duration = int((current_time - join_time).total_seconds())
-                user_data = await self.db.get_row("users", user_id=user_id)
-                
-                if user_data:
-                    await self.db.update(
-                        "users",
-                        where={"user_id": user_id},
-                        values={"voice_time": user_data.get('voice_time', 0) + duration}
-                    )
+                await self.db.increment("users", {"user_id": user_id}, voice_time=duration)
                     
                 # Обновляем время входа
                 self.voice_states[user_id] = current_time
                 
             except Exception as e:
-                print(f"Error updating voice time for {user_id}: {e}")
+                log.error(f"Error updating voice time for {user_id}: {e}")
 
     @update_voice_time.before_loop
     async def before_update_voice_time(self):
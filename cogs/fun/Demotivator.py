@@ -3,7 +3,7 @@ from discord.ext import commands
 from Niludetsu.utils.embed import Embed
 from PIL import Image, ImageDraw, ImageFont
 import io
-import aiohttp
+from Niludetsu.utils.image_fetcher import ImageFetcher, ImageFetchError
 import os
 
 class Demotivator(commands.Cog):
@@ -12,11 +12,10 @@ class Demotivator(commands.Cog):
         self.font_path = "data/fonts/Times New Roman.ttf"
 
     async def download_image(self, url):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return await response.read()
-                return None
+        try:
+            return await ImageFetcher.get().fetch(url)
+        except ImageFetchError:
+            return None
 
     def create_demotivator(self, image_bytes, top_text, bottom_text=None):
         img = Image.open(io.BytesIO(image_bytes))
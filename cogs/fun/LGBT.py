@@ -4,18 +4,17 @@ import random
 from Niludetsu.utils.embed import Embed
 from PIL import Image, ImageDraw
 import io
-import aiohttp
+from Niludetsu.utils.image_fetcher import ImageFetcher, ImageFetchError
 
 class LGBT(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
     async def download_avatar(self, url):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(str(url)) as response:
-                if response.status == 200:
-                    return await response.read()
-                return None
+        try:
+            return await ImageFetcher.get().fetch(url)
+        except ImageFetchError:
+            return None
 
     def create_rainbow_overlay(self, size):
         overlay = Image.new('RGBA', size)
@@ -1,35 +1,13 @@
-import discord, psutil, platform, typing, io, time
+import discord, psutil, platform, typing, io, time, logging
 from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timedelta
 from collections import Counter
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 from Niludetsu import BotAnalytics, ServerAnalytics, RolesAnalytics, ChannelsAnalytics, MessageAnalytics, Embed, Emojis
+from Niludetsu.analytics import MessageRollups, ChartRenderer, GuildAggregateTracker
+from Niludetsu.utils.settings import Settings
 
-# Добавляем кастомный шрифт
-plt.rcParams['font.family'] = 'sans-serif'
-custom_font = fm.FontProperties(fname='data/fonts/TTNormsPro-Bold.ttf')
-
-# Настройка стиля для всех графиков
-plt.style.use('dark_background')
-plt.rcParams['axes.facecolor'] = '#2F3136'
-plt.rcParams['figure.facecolor'] = '#2F3136'
-plt.rcParams['text.color'] = '#FFFFFF'
-plt.rcParams['axes.labelcolor'] = '#FFFFFF'
-plt.rcParams['xtick.color'] = '#FFFFFF'
-plt.rcParams['ytick.color'] = '#FFFFFF'
-plt.rcParams['grid.color'] = '#40444B'
-
-# Цветовая схема
-COLORS = {
-    'primary': '#ED4245',    # Основной красный цвет Discord
-    'secondary': '#FF6B6B',  # Светло-красный
-    'accent': '#FF4B4B',     # Акцентный красный
-    'background': '#2F3136', # Тёмный фон
-    'text': '#FFFFFF',       # Белый текст
-    'grid': '#40444B'        # Цвет сетки
-}
+log = logging.getLogger(__name__)
 
 class FakeInteraction:
     """Класс для эмуляции discord.Interaction при использовании префикс-команд"""
@@ -56,6 +34,87 @@ class Analytics(commands.Cog):
         self.roles_analytics = RolesAnalytics(bot)
         self.channels_analytics = ChannelsAnalytics(bot)
         self.message_analytics = MessageAnalytics(bot)
+        self.rollups = MessageRollups.get()
+        self.aggregates = GuildAggregateTracker.get()
+        
+    async def cog_load(self):
+        # Процессы построения графиков запускаются заранее, чтобы первая команда не ждала импорт matplotlib
+        renderer = ChartRenderer.get()
+        renderer.workers = int(await Settings().get(None, "analytics", "render_workers", renderer.WORKERS))
+        renderer.start()
+        # Кэш графиков на диске переживает перезапуск бота
+        if str(await Settings().get(None, "analytics", "chart_disk_cache", "0")).lower() in ("1", "true"):
+            renderer.cache.enable_disk()
+            await renderer.cache.prune_disk()
+        self.bot.loop.create_task(self._start_rollups())
+        
+    async def cog_unload(self):
+        await self.rollups.flush()
+        ChartRenderer.get().close()
+        
+    async def _start_rollups(self):
+        """Запускает учет сообщений и однократное заполнение сводок из истории"""
+        await self.bot.wait_until_ready()
+        try:
+            await self.rollups.prune()
+            for guild in self.bot.guilds:
+                await self.rollups.start(guild)
+        except Exception as e:
+            log.error(f"Ошибка запуска сводок сообщений: {e}")
+        
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        self.rollups.record(message)
+
+    # Счетчики участников, ролей и каналов для аналитики
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # После нового подключения события за время разрыва потеряны, счетчики пересчитываются
+        self.aggregates.reset()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.aggregates.member_join(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.aggregates.member_remove(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        self.aggregates.member_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        self.aggregates.presence_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.aggregates.channel_create(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.aggregates.channel_delete(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self.aggregates.channel_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.aggregates.role_delete(role)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        # Новый сервер сразу получает границу живого учета и заполнение из истории
+        try:
+            await self.rollups.start(guild)
+        except Exception as e:
+            log.error(f"Ошибка запуска сводок сообщений сервера {guild.id}: {e}")
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.aggregates.forget(guild.id)
         
     def get_bot_uptime(self):
         """Получить время работы бота"""
@@ -77,33 +136,6 @@ class Analytics(commands.Cog):
             "os": f"{platform.system()} {platform.release()}"
         }
         
-    def style_plot(self, fig, ax):
-        """Применяет единый стиль к графику"""
-        fig.patch.set_facecolor(COLORS['background'])
-        ax.set_facecolor(COLORS['background'])
-        
-        # Настройка сетки
-        ax.grid(True, linestyle='--', alpha=0.2, color=COLORS['grid'])
-        
-        # Настройка шрифтов
-        for text in ax.get_xticklabels() + ax.get_yticklabels():
-            text.set_fontproperties(custom_font)
-            text.set_color(COLORS['text'])
-        
-        # Настройка заголовков
-        ax.title.set_fontproperties(custom_font)
-        ax.xaxis.label.set_fontproperties(custom_font)
-        ax.yaxis.label.set_fontproperties(custom_font)
-        
-        # Настройка цветов
-        ax.spines['bottom'].set_color(COLORS['grid'])
-        ax.spines['top'].set_color(COLORS['grid'])
-        ax.spines['left'].set_color(COLORS['grid'])
-        ax.spines['right'].set_color(COLORS['grid'])
-        
-        # Настройка отступов
-        fig.tight_layout()
-        
     analytics_group = app_commands.Group(name="analytics", description="Аналитика сервера и бота")
     
     # Команда с префиксом для server_analytics
@@ -113,11 +145,12 @@ class Analytics(commands.Cog):
         await self._show_server_analytics(ctx)
 
     @analytics_group.command(name="server", description="Показать подробную аналитику сервера")
-    async def server_slash(self, interaction: discord.Interaction):
+    @app_commands.describe(quick="Быстрый просмотр: график в низком разрешении")
+    async def server_slash(self, interaction: discord.Interaction, quick: bool = False):
         """Показывает подробную аналитику сервера (слэш-команда)"""
-        await self._show_server_analytics(interaction)
+        await self._show_server_analytics(interaction, quick)
 
-    async def _show_server_analytics(self, ctx):
+    async def _show_server_analytics(self, ctx, quick: bool = False):
         """Общая логика для показа аналитики сервера"""
         is_interaction = isinstance(ctx, discord.Interaction)
         if is_interaction:
@@ -126,7 +159,7 @@ class Analytics(commands.Cog):
             await ctx.defer()
 
         guild = ctx.guild if not is_interaction else ctx.guild
-        embed, file = await self.server_analytics.generate_analytics(guild)
+        embed, file = await self.server_analytics.generate_analytics(guild, quick)
         
         if is_interaction:
             await ctx.followup.send(embed=embed, file=file)
@@ -166,11 +199,12 @@ class Analytics(commands.Cog):
         await self._show_roles_analytics(ctx)
 
     @analytics_group.command(name="roles", description="Показать аналитику ролей")
-    async def roles_slash(self, interaction: discord.Interaction):
+    @app_commands.describe(quick="Быстрый просмотр: график в низком разрешении")
+    async def roles_slash(self, interaction: discord.Interaction, quick: bool = False):
         """Показывает аналитику ролей сервера (слэш-команда)"""
-        await self._show_roles_analytics(interaction)
+        await self._show_roles_analytics(interaction, quick)
 
-    async def _show_roles_analytics(self, ctx):
+    async def _show_roles_analytics(self, ctx, quick: bool = False):
         """Общая логика для показа аналитики ролей"""
         is_interaction = isinstance(ctx, discord.Interaction)
         if is_interaction:
@@ -179,7 +213,7 @@ class Analytics(commands.Cog):
             await ctx.defer()
 
         guild = ctx.guild if not is_interaction else ctx.guild
-        embed, file = await self.roles_analytics.generate_analytics(guild)
+        embed, file = await self.roles_analytics.generate_analytics(guild, quick)
         
         if is_interaction:
             await ctx.followup.send(embed=embed, file=file)
@@ -193,11 +227,12 @@ class Analytics(commands.Cog):
         await self._show_channels_analytics(ctx)
 
     @analytics_group.command(name="channels", description="Показать аналитику каналов")
-    async def channels_slash(self, interaction: discord.Interaction):
+    @app_commands.describe(quick="Быстрый просмотр: график в низком разрешении")
+    async def channels_slash(self, interaction: discord.Interaction, quick: bool = False):
         """Показывает аналитику каналов сервера (слэш-команда)"""
-        await self._show_channels_analytics(interaction)
+        await self._show_channels_analytics(interaction, quick)
 
-    async def _show_channels_analytics(self, ctx):
+    async def _show_channels_analytics(self, ctx, quick: bool = False):
         """Общая логика для показа аналитики каналов"""
         is_interaction = isinstance(ctx, discord.Interaction)
         if is_interaction:
@@ -206,7 +241,7 @@ class Analytics(commands.Cog):
             await ctx.defer()
 
         guild = ctx.guild if not is_interaction else ctx.guild
-        embed, file = await self.channels_analytics.generate_analytics(guild)
+        embed, file = await self.channels_analytics.generate_analytics(guild, quick)
         
         if is_interaction:
             await ctx.followup.send(embed=embed, file=file)
@@ -220,11 +255,17 @@ class Analytics(commands.Cog):
         await self._show_message_analytics(ctx)
 
     @analytics_group.command(name="messages", description="Показать аналитику сообщений")
-    async def messages_slash(self, interaction: discord.Interaction):
+    @app_commands.describe(days="Период анализа", quick="Быстрый просмотр: график в низком разрешении")
+    @app_commands.choices(days=[
+        app_commands.Choice(name="1 день", value=1),
+        app_commands.Choice(name="7 дней", value=7),
+        app_commands.Choice(name="30 дней", value=30)
+    ])
+    async def messages_slash(self, interaction: discord.Interaction, days: int = 7, quick: bool = False):
         """Показывает аналитику сообщений сервера (слэш-команда)"""
-        await self._show_message_analytics(interaction)
+        await self._show_message_analytics(interaction, days, quick)
 
-    async def _show_message_analytics(self, ctx):
+    async def _show_message_analytics(self, ctx, days: int = 7, quick: bool = False):
         """Общая логика для показа аналитики сообщений"""
         is_interaction = isinstance(ctx, discord.Interaction)
         if is_interaction:
@@ -233,7 +274,7 @@ class Analytics(commands.Cog):
             await ctx.defer()
 
         guild = ctx.guild if not is_interaction else ctx.guild
-        embed, file = await self.message_analytics.generate_analytics(guild)
+        embed, file = await self.message_analytics.generate_analytics(guild, days, quick)
         
         if is_interaction:
             await ctx.followup.send(embed=embed, file=file)
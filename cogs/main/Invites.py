@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timedelta, timezone
@@ -7,6 +8,8 @@ from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
 from Niludetsu.database.db import Database
 
+log = logging.getLogger(__name__)
+
 class AccountType:
     NORMAL = "Обычный"
     NEW = "Новый"
@@ -94,7 +97,7 @@ class InviteTracker:
                 row['invite_code']: row['uses'] for row in results
             }
         except Exception as e:
-            print(f"❌ Ошибка при загрузке кеша инвайтов: {e}")
+            log.error(f"Ошибка при загрузке кеша инвайтов: {e}")
             
     async def save_invite_cache(self, guild_id: str, invites: dict):
         """Сохранение кеша инвайтов в базу данных"""
@@ -115,7 +118,7 @@ class InviteTracker:
                     guild_id, invite_code, uses
                 )
         except Exception as e:
-            print(f"❌ Ошибка при сохранении кеша инвайтов: {e}")
+            log.error(f"Ошибка при сохранении кеша инвайтов: {e}")
             
     async def cache_invites(self, guild: discord.Guild):
         """Кэширование текущих приглашений сервера"""
@@ -137,7 +140,7 @@ class InviteTracker:
             await self.save_invite_cache(str(guild.id), current_invites)
             
         except Exception as e:
-            print(f"❌ Ошибка при кэшировании инвайтов: {e}")
+            log.error(f"Ошибка при кэшировании инвайтов: {e}")
             
     async def get_used_invite(self, guild: discord.Guild) -> Tuple[str, discord.Member]:
         """Определяет использованное приглашение"""
@@ -183,7 +186,7 @@ class InviteTracker:
             await self.cache_invites(guild)
             
         except Exception as e:
-            print(f"❌ Ошибка при определении использованного приглашения: {e}")
+            log.error(f"Ошибка при определении использованного приглашения: {e}")
             
         return None, None
             
@@ -334,7 +337,7 @@ class InviteTracker:
                 await channel.send(embed=embed)
                 
         except Exception as e:
-            print(f"❌ Ошибка при логировании входа: {e}")
+            log.error(f"Ошибка при логировании входа: {e}")
             
     async def on_member_remove(self, member: discord.Member):
         """Обработка выхода участника"""
@@ -349,7 +352,7 @@ class InviteTracker:
                 await channel.send(embed=embed)
                 
         except Exception as e:
-            print(f"❌ Ошибка при логировании выхода: {e}")
+            log.error(f"Ошибка при логировании выхода: {e}")
 
 class InvitesCog(commands.Cog):
     def __init__(self, bot):
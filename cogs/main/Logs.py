@@ -2,17 +2,22 @@
 Команды для управления системой логирования
 """
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from typing import Optional
+from typing import Optional, Dict, List, Tuple, Callable
+from datetime import datetime, timedelta, timezone
 import asyncio
 import inspect
+import logging
+import time
+import traceback
 
 from Niludetsu import (
     Embed,
     Emojis,
     admin_only,
     Database,
+    Settings,
     Tables,
     ChannelLogger,
     EmojiLogger,
@@ -35,6 +40,77 @@ from Niludetsu import (
     EntitlementLogger,
     LoggingState
 )
+from Niludetsu.core import LogIndex
+from Niludetsu.metrics import metrics
+
+log = logging.getLogger(__name__)
+
+DISPATCH_SECONDS = metrics.histogram("log_dispatch_seconds", "Длительность обработки событий логгерами", ("event",))
+DISPATCH_ERRORS = metrics.counter("log_dispatch_errors", "Ошибки логгеров при обработке событий", ("event", "logger"))
+
+SEARCH_PERIODS = {
+    "1h": ("за час", timedelta(hours=1)),
+    "24h": ("за сутки", timedelta(days=1)),
+    "7d": ("за неделю", timedelta(days=7)),
+    "30d": ("за месяц", timedelta(days=30))
+}
+
+class LogSearchView(discord.ui.View):
+    """Постраничный вывод результатов поиска по логам"""
+
+    def __init__(self, index: LogIndex, interaction: discord.Interaction, filters: Dict):
+        super().__init__(timeout=180)
+        self.index = index
+        self.original_interaction = interaction
+        self.filters = filters
+        self.page = 0
+        self.has_next = False
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.original_interaction.user.id
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        try:
+            await self.original_interaction.edit_original_response(view=self)
+        except discord.HTTPException:
+            pass
+
+    async def build(self) -> Embed:
+        """Загружает текущую страницу и собирает эмбед"""
+        started = time.perf_counter()
+        rows, self.has_next = await self.index.search(self.original_interaction.guild_id, page=self.page, **self.filters)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = not self.has_next
+
+        embed = Embed(
+            title=f"{Emojis.SEARCH} Поиск по логам",
+            description=None if rows else "Ничего не найдено",
+            color="BLUE"
+        )
+        for row in rows:
+            created = datetime.strptime(row["created_at"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+            body = row["body"] or "-"
+            embed.add_field(
+                name=f"{row['title'] or 'Событие'} · {row['category'] or 'general'}"[:256],
+                value=f"{discord.utils.format_dt(created, 'R')}\n{body[:300]}{'…' if len(body) > 300 else ''}",
+                inline=False
+            )
+        embed.set_footer(text=f"Страница {self.page + 1} · {elapsed:.1f} мс")
+        return embed
+
+    @discord.ui.button(emoji=Emojis.ARROW_LEFT, style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await interaction.response.edit_message(embed=await self.build(), view=self)
+
+    @discord.ui.button(emoji=Emojis.ARROW_RIGHT, style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=await self.build(), view=self)
 
 class Logs(commands.Cog):
     LOGGER_CLASSES = {
@@ -62,109 +138,152 @@ class Logs(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         self.loggers = {}
         self._event_handlers = {}
+        self._dispatch_stats: Dict[str, Dict[str, float]] = {}
         asyncio.create_task(self._initialize())
 
-    def _create_event_handler(self, event_name: str):
-        """Создает обработчик события для всех логгеров"""
+    def _build_dispatch_table(self) -> Dict[str, List[Tuple[str, Callable, Optional[int]]]]:
+        """Собирает таблицу обработчиков: событие -> [(логгер, метод, число аргументов)]
+        
+        Сигнатуры разбираются один раз при инициализации. Для методов с *args
+        число аргументов не проверяется (None).
+        """
+        table: Dict[str, List[Tuple[str, Callable, Optional[int]]]] = {}
+        for logger_name, logger in self.loggers.items():
+            for method_name in dir(logger):
+                if not method_name.startswith('log_') or method_name == 'log_event':
+                    continue
+                method = getattr(logger, method_name)
+                if not callable(method):
+                    continue
+                params = inspect.signature(method).parameters.values()
+                if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in params):
+                    arity = None
+                else:
+                    arity = sum(
+                        1 for p in params
+                        if p.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+                    )
+                table.setdefault(f"on_{method_name[4:]}", []).append((logger_name, method, arity))
+        return table
+
+    @staticmethod
+    def _event_guild_id(args: tuple) -> Optional[int]:
+        """Находит ID сервера в аргументах события"""
+        if not args:
+            return None
+        first = args[0]
+        if isinstance(first, discord.Guild):
+            return first.id
+        guild = getattr(first, 'guild', None)
+        if guild:
+            return guild.id
+        guild_id = getattr(first, 'guild_id', None)
+        if guild_id:
+            return guild_id
+        # Второй аргумент для событий типа voice_state_update
+        if len(args) > 1:
+            guild = getattr(args[1], 'guild', None)
+            if guild:
+                return guild.id
+        return None
+
+    def _create_event_handler(self, event_name: str, targets: List[Tuple[str, Callable, Optional[int]]]):
+        """Создает обработчик события для логгеров из таблицы"""
+        skip_bots = event_name.startswith('on_message')
+        stats = self._dispatch_stats.setdefault(
+            event_name, {"calls": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0}
+        )
+
         async def handler(*args, **kwargs):
-            if not LoggingState.initialized or not self.loggers:
-                print(f"❌ Логирование не инициализировано для {event_name}")
+            if not LoggingState.initialized:
                 return
 
+            started = time.perf_counter()
+            stats["calls"] += 1
             try:
-                print(f"🔄 Обработка события {event_name}")
-                print(f"📝 Аргументы события: {args}")
-                
                 # Пропускаем сообщения от ботов
-                if event_name.startswith('on_message') and hasattr(args[0], 'author'):
-                    if args[0].author.bot:
-                        print(f"❌ Пропуск сообщения бота в {event_name}")
-                        return
-                elif event_name.startswith('on_message_edit') and hasattr(args[0], 'author'):
-                    if args[0].author.bot:
-                        print(f"❌ Пропуск редактирования сообщения бота в {event_name}")
+                if skip_bots and args:
+                    author = getattr(args[0], 'author', None)
+                    if author is not None and author.bot:
                         return
 
                 # Проверяем, что событие произошло на сервере
-                guild_id = None
-                if len(args) > 0:
-                    if hasattr(args[0], 'guild') and args[0].guild:
-                        guild_id = args[0].guild.id
-                    elif hasattr(args[0], 'guild_id'):
-                        guild_id = args[0].guild_id
-                    # Проверяем второй аргумент для событий типа voice_state_update
-                    elif len(args) > 1 and hasattr(args[1], 'guild'):
-                        guild_id = args[1].guild.id
-                
+                guild_id = self._event_guild_id(args)
                 if not guild_id:
-                    print(f"❌ Не найден guild_id для {event_name}")
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug("Не найден guild_id для %s", event_name)
                     return
+                # Логгеры индексируют событие под этим сервером
+                LoggingState.event_guild.set(guild_id)
 
-                # Получаем имя метода логирования из имени события
-                log_method_name = f"log_{event_name[3:]}"
-                print(f"🔍 Ищем метод {log_method_name}")
-
-                # Проходим по всем логгерам
-                for logger_name, logger in self.loggers.items():
+                for logger_name, method, arity in targets:
+                    if arity is not None and arity != len(args):
+                        if log.isEnabledFor(logging.DEBUG):
+                            log.debug(
+                                "Несоответствие параметров для %s.%s: ожидается %s, получено %s",
+                                logger_name, method.__name__, arity, len(args)
+                            )
+                        continue
                     try:
-                        if hasattr(logger, log_method_name):
-                            print(f"✅ Найден метод {log_method_name} в логгере {logger_name}")
-                            log_method = getattr(logger, log_method_name)
-                            
-                            # Проверяем количество параметров метода
-                            params = inspect.signature(log_method).parameters
-                            print(f"📊 Метод {log_method_name} ожидает {len(params)} параметров, получено {len(args)}")
-                            
-                            # Проверяем соответствие параметров
-                            if len(params) == len(args):
-                                print(f"🚀 Вызываем {log_method.__name__} с {len(args)} аргументами")
-                                await log_method(*args)
-                            else:
-                                print(f"❌ Несоответствие параметров для {log_method_name}: ожидается {len(params)}, получено {len(args)}")
-                                print(f"📝 Параметры метода: {list(params.keys())}")
-                                print(f"📝 Полученные аргументы: {args}")
+                        await method(*args)
                     except Exception as e:
-                        print(f"❌ Ошибка в логгере {logger_name} при обработке {event_name}: {e}")
-                        import traceback
-                        print(f"Traceback: {traceback.format_exc()}")
+                        stats["errors"] += 1
+                        DISPATCH_ERRORS.inc(event=event_name, logger=logger_name)
+                        log.error(f"Ошибка в логгере {logger_name} при обработке {event_name}: {e}")
+                        if log.isEnabledFor(logging.DEBUG):
+                            log.debug("Traceback: %s", traceback.format_exc())
 
             except Exception as e:
-                print(f"❌ Общая ошибка при обработке {event_name}: {e}")
-                import traceback
-                print(f"Traceback: {traceback.format_exc()}")
+                stats["errors"] += 1
+                log.error(f"Общая ошибка при обработке {event_name}: {e}")
+            finally:
+                elapsed = time.perf_counter() - started
+                DISPATCH_SECONDS.observe(elapsed, event=event_name)
+                stats["total_time"] += elapsed
+                if elapsed > stats["max_time"]:
+                    stats["max_time"] = elapsed
 
         return handler
 
+    def dispatch_stats(self) -> Dict[str, Dict[str, float]]:
+        """Статистика обработки событий: вызовы, ошибки и задержки"""
+        return {
+            event_name: {
+                **stats,
+                "avg_time": stats["total_time"] / stats["calls"] if stats["calls"] else 0.0
+            }
+            for event_name, stats in self._dispatch_stats.items()
+        }
+
     async def _initialize(self):
         """Асинхронная инициализация"""
         try:
             await self.bot.wait_until_ready()
             await self.db.init()
             
-            print("🔄 Инициализация системы логирования...")
+            log.info("Инициализация системы логирования...")
             
             # Загружаем канал логов из базы данных
-            result = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'logging' AND key = 'main_channel'"
-            )
+            channel_id = await self.settings.get(None, 'logging', 'main_channel')
             
-            if not result:
-                print("❌ Канал для логов не настроен в базе данных")
+            if not channel_id:
+                log.error("Канал для логов не настроен в базе данных")
                 return
                 
-            channel_id = int(result['value'])
+            channel_id = int(channel_id)
             channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
             
             if not isinstance(channel, discord.TextChannel):
-                print(f"❌ Канал {channel_id} не является текстовым")
+                log.error(f"Канал {channel_id} не является текстовым")
                 return
                 
             # Проверяем права
             permissions = channel.permissions_for(channel.guild.me)
             if not permissions.send_messages or not permissions.manage_webhooks:
-                print(f"❌ Недостаточно прав в канале логов {channel_id}")
+                log.error(f"Недостаточно прав в канале логов {channel_id}")
                 return
                 
             # Инициализируем состояние логирования
@@ -172,44 +291,46 @@ class Logs(commands.Cog):
             
             # Создаем или получаем вебхук
             webhooks = await channel.webhooks()
-            bot_webhook = discord.utils.get(webhooks, user=self.bot.user)
+            bot_webhook = discord.utils.get(webhooks, user=self.bot.user, name=f"{self.bot.user.name} Logger")
             
             if not bot_webhook:
                 try:
                     LoggingState.webhook = await channel.create_webhook(name=f"{self.bot.user.name} Logger")
-                    print("✅ Создан новый вебхук для логов")
+                    log.info("Создан новый вебхук для логов")
                 except discord.Forbidden:
-                    print("❌ Не удалось создать вебхук для логов")
+                    log.error("Не удалось создать вебхук для логов")
                     return
             else:
                 LoggingState.webhook = bot_webhook
-                print("✅ Найден существующий вебхук для логов")
+                log.info("Найден существующий вебхук для логов")
 
             # Инициализируем логгеры
-            print("\n🔄 Инициализация логгеров...")
+            log.info("Инициализация логгеров...")
             for name, logger_class in self.LOGGER_CLASSES.items():
                 self.loggers[name] = logger_class(self.bot)
-                print(f"✅ Загружен логгер: {name}")
+                log.info(f"Загружен логгер: {name}")
 
-            # Автоматически регистрируем обработчики событий
-            print("\n🔄 Регистрация обработчиков событий...")
+            # Собираем таблицу обработчиков и регистрируем по одному слушателю на событие
+            log.info("Регистрация обработчиков событий...")
             registered_events = []
-            for logger in self.loggers.values():
-                for method_name in dir(logger):
-                    if method_name.startswith('log_'):
-                        event_name = f"on_{method_name[4:]}"
-                        if event_name not in self._event_handlers:
-                            handler = self._create_event_handler(event_name)
-                            self._event_handlers[event_name] = handler
-                            self.bot.add_listener(handler, event_name)
-                            registered_events.append(event_name)
+            for event_name, targets in self._build_dispatch_table().items():
+                if event_name not in self._event_handlers:
+                    handler = self._create_event_handler(event_name, targets)
+                    self._event_handlers[event_name] = handler
+                    self.bot.add_listener(handler, event_name)
+                    registered_events.append(event_name)
             
             if registered_events:
-                print(f"\n✅ Всего зарегистрировано {len(registered_events)} обработчиков.")
+                log.info(f"Всего зарегистрировано {len(registered_events)} обработчиков.")
             else:
-                print("\n❌ Не найдено методов для регистрации обработчиков!")
+                log.error("Не найдено методов для регистрации обработчиков!")
             
-            print(f"\n✅ Система логирования инициализирована в канале {channel.name}")
+            log.info(f"Система логирования инициализирована в канале {channel.name}")
+            
+            # Досылаем события, не доставленные до прошлого перезапуска
+            asyncio.create_task(self._replay_journal())
+            if not self.maintain_index.is_running():
+                self.maintain_index.start()
             
             # Отправляем тестовое сообщение
             try:
@@ -222,20 +343,45 @@ class Logs(commands.Cog):
                     await LoggingState.webhook.send(embed=test_embed)
                 else:
                     await channel.send(embed=test_embed)
-                print("✅ Отправлено тестовое сообщение")
+                log.info("Отправлено тестовое сообщение")
             except Exception as e:
-                print(f"❌ Ошибка при отправке тестового сообщения: {e}")
+                log.error(f"Ошибка при отправке тестового сообщения: {e}")
                 
         except Exception as e:
-            print(f"❌ Ошибка при инициализации логов: {e}")
+            log.error(f"Ошибка при инициализации логов: {e}")
+
+    async def _replay_journal(self):
+        """Повторная отправка недоставленных событий из журнала"""
+        try:
+            journal = LoggingState.get_journal()
+            await journal.prune()
+            await journal.replay(LoggingState.get_router(self.bot).shipper_for)
+        except Exception as e:
+            log.error(f"Ошибка при повторной отправке журнала логов: {e}")
+
+    async def cog_unload(self):
+        self.maintain_index.cancel()
+        # Объединяемые события и индекс дописываются до остановки очередей отправки
+        await LoggingState.close()
 
-    @app_commands.command(name="logs", description="Настройка системы логирования")
+    @tasks.loop(hours=24)
+    async def maintain_index(self):
+        """Удаление старых событий из индекса поиска и уплотнение FTS"""
+        try:
+            days = await self.settings.get(None, 'logging', 'index_retention_days')
+            await LoggingState.get_index().prune(int(days) if days else None)
+        except Exception as e:
+            log.error(f"Ошибка обслуживания индекса логов: {e}")
+
+    logs_group = app_commands.Group(name="logs", description="Система логирования")
+
+    @logs_group.command(name="setup", description="Настройка системы логирования")
     @app_commands.describe(
         channel="Канал для отправки логов",
         category="Категория логов для настройки"
     )
     @admin_only()
-    async def logs(
+    async def logs_setup(
         self,
         interaction: discord.Interaction,
         channel: discord.TextChannel,
@@ -256,15 +402,7 @@ class Logs(commands.Cog):
                 )
 
             # Сохраняем настройки в базу данных
-            await self.db.insert(
-                'settings',
-                {
-                    'guild_id': str(interaction.guild_id),
-                    'category': 'logging',
-                    'key': 'main_channel',
-                    'value': str(channel.id)
-                }
-            )
+            await self.settings.set(interaction.guild_id, 'logging', 'main_channel', channel.id)
             
             if category:
                 if category not in self.loggers:
@@ -277,19 +415,11 @@ class Logs(commands.Cog):
                         ephemeral=True
                     )
                     
-                await self.db.insert(
-                    'settings',
-                    {
-                        'guild_id': str(interaction.guild_id),
-                        'category': 'logging',
-                        'key': f'channel_{category}',
-                        'value': str(channel.id)
-                    }
-                )
+                await self.settings.set(interaction.guild_id, 'logging', f'channel_{category}', channel.id)
 
             # Создаем вебхук для логов если его нет
             webhooks = await channel.webhooks()
-            bot_webhook = discord.utils.get(webhooks, user=self.bot.user)
+            bot_webhook = discord.utils.get(webhooks, user=self.bot.user, name=f"{self.bot.user.name} Logger")
             
             if not bot_webhook:
                 try:
@@ -325,7 +455,7 @@ class Logs(commands.Cog):
             await channel.send(embed=test_embed)
             
         except Exception as e:
-            print(f"❌ Ошибка при настройке логов: {e}")
+            log.error(f"Ошибка при настройке логов: {e}")
             await interaction.response.send_message(
                 embed=Embed(
                     title=f"{Emojis.ERROR} Ошибка",
@@ -335,5 +465,62 @@ class Logs(commands.Cog):
                 ephemeral=True
             )
 
+    @logs_group.command(name="search", description="Поиск по событиям логов")
+    @app_commands.describe(
+        query="Слова для поиска в заголовке и тексте события",
+        user="Участник, совершивший действие или затронутый им",
+        category="Категория логов",
+        period="За какой период искать"
+    )
+    @app_commands.choices(period=[
+        app_commands.Choice(name=name, value=key) for key, (name, _) in SEARCH_PERIODS.items()
+    ])
+    @admin_only()
+    async def logs_search(
+        self,
+        interaction: discord.Interaction,
+        query: Optional[str] = None,
+        user: Optional[discord.User] = None,
+        category: Optional[str] = None,
+        period: Optional[str] = None
+    ):
+        """Поиск событий в локальном индексе логов"""
+        if category and category not in self.LOGGER_CLASSES:
+            return await interaction.response.send_message(
+                embed=Embed(
+                    title=f"{Emojis.ERROR} Ошибка",
+                    description=f"Неизвестная категория логов: `{category}`\nДоступные категории: {', '.join(f'`{c}`' for c in self.LOGGER_CLASSES)}",
+                    color="RED"
+                ),
+                ephemeral=True
+            )
+
+        view = LogSearchView(LoggingState.get_index(), interaction, {
+            "query": query,
+            "user": user,
+            "category": category,
+            "since": SEARCH_PERIODS[period][1] if period else None
+        })
+        try:
+            embed = await view.build()
+        except Exception as e:
+            log.error(f"Ошибка поиска по логам: {e}")
+            return await interaction.response.send_message(
+                embed=Embed(
+                    title=f"{Emojis.ERROR} Ошибка",
+                    description="Не удалось выполнить поиск. Проверьте запрос.",
+                    color="RED"
+                ),
+                ephemeral=True
+            )
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
+    @logs_search.autocomplete("category")
+    async def category_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in self.LOGGER_CLASSES if current.lower() in name
+        ][:25]
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Logs(bot)) 
\ No newline at end of file
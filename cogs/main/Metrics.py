@@ -0,0 +1,111 @@
+"""
+Метрики бота: эндпоинт Prometheus и команда /metrics
+"""
+import discord, io, logging
+from discord.ext import commands
+from discord import app_commands
+from Niludetsu import Embed, Emojis, admin_only, Database, Settings, LoggingState
+from Niludetsu.moderation import cooldowns
+from Niludetsu.metrics import metrics, MetricsServer, Counter
+
+log = logging.getLogger(__name__)
+
+class Metrics(commands.Cog):
+    DEFAULT_PORT = 9108
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.server = None
+
+    async def cog_load(self):
+        self._register_gauges()
+
+        settings = Settings()
+        if await settings.get(None, 'metrics', 'enabled') in ('0', 'false', 'False'):
+            return
+        host = await settings.get(None, 'metrics', 'host', '127.0.0.1')
+        port = int(await settings.get(None, 'metrics', 'port', self.DEFAULT_PORT))
+        self.server = MetricsServer(metrics, host=host, port=port)
+        try:
+            await self.server.start()
+            log.info(f"Метрики доступны на http://{host}:{port}/metrics")
+        except OSError as e:
+            self.server = None
+            log.error(f"Не удалось запустить сервер метрик на порту {port}: {e}")
+
+    async def cog_unload(self):
+        if self.server:
+            await self.server.close()
+
+    def _register_gauges(self):
+        """Датчики, которые считываются из статистики подсистем при каждом сборе"""
+        db = Database()
+
+        def log_queues(key):
+            def collect():
+                queues = {}
+                if LoggingState.shipper:
+                    queues[("main",)] = LoggingState.shipper.stats()[key]
+                if LoggingState.router:
+                    for category, stats in LoggingState.router.stats().items():
+                        queues[(category,)] = stats[key]
+                return queues
+            return collect
+
+        metrics.gauge("log_queue_depth", "Событий в очередях отправки логов", ("queue",)).set_function(log_queues("depth"))
+        metrics.gauge("log_queue_lag_seconds", "Задержка последней отправки логов", ("queue",)).set_function(log_queues("lag_last"))
+        metrics.gauge("log_queue_dropped", "Отброшено событий логов с запуска", ("queue",)).set_function(log_queues("dropped"))
+        metrics.gauge("db_pool_in_use", "Занятые соединения пула базы данных").set_function(
+            lambda: db.pool_stats().get("in_use", 0)
+        )
+        metrics.gauge("db_pool_waiting", "Ожидающие соединения запросы").set_function(
+            lambda: db.pool_stats().get("waiting", 0)
+        )
+        metrics.gauge("db_write_queue", "Запросов в очереди записи").set_function(
+            lambda: db.pool_stats().get("writer", {}).get("queued", 0)
+        )
+        metrics.gauge("settings_entries", "Настроек в кэше").set_function(lambda: Settings.stats()["entries"])
+        metrics.gauge("cooldown_buckets", "Активных кулдаунов").set_function(lambda: cooldowns.stats()["buckets"])
+        metrics.gauge("gateway_latency_seconds", "Задержка соединения с Discord").set_function(
+            lambda: self.bot.latency if self.bot.latency == self.bot.latency else 0.0
+        )
+        metrics.gauge("guilds", "Серверов у бота").set_function(lambda: len(self.bot.guilds))
+
+    @app_commands.command(name="metrics", description="Показать метрики производительности бота")
+    @admin_only()
+    async def metrics_command(self, interaction: discord.Interaction):
+        embed = Embed(
+            title=f"{Emojis.INFO} Метрики бота",
+            description="Самые затратные операции по суммарному времени",
+            color="BLUE"
+        )
+
+        hot_paths = []
+        for name, labels, data in metrics.hot_paths(10):
+            label = ", ".join(labels) or "-"
+            hot_paths.append(
+                f"`{name.removeprefix(metrics.prefix)}` {label}: "
+                f"{int(data['count'])} шт., {data['sum']:.2f} с, ср. {data['avg'] * 1000:.1f} мс, p95 ≤ {data['p95']:g} с"
+            )
+        embed.add_field(
+            name=f"{Emojis.DOT} Горячие пути",
+            value="\n".join(hot_paths)[:1024] or "Данных пока нет",
+            inline=False
+        )
+
+        errors = []
+        for metric in metrics.all():
+            if isinstance(metric, Counter) and metric.name.endswith("errors"):
+                total = sum(value for _, _, value in metric.samples())
+                if total:
+                    errors.append(f"`{metric.name.removeprefix(metrics.prefix)}`: {int(total)}")
+        embed.add_field(name=f"{Emojis.DOT} Ошибки", value="\n".join(errors)[:1024] or "Нет", inline=False)
+
+        if self.server:
+            embed.set_footer(text=f"Prometheus: http://{self.server.host}:{self.server.port}/metrics")
+
+        file = discord.File(io.BytesIO(metrics.render().encode("utf-8")), filename="metrics.txt")
+        await interaction.response.send_message(embed=embed, file=file, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Metrics(bot))
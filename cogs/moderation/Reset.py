@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 import yaml
@@ -11,6 +12,8 @@ from Niludetsu import (
     Database
 )
 
+log = logging.getLogger(__name__)
+
 class Reset(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -69,10 +72,10 @@ class Reset(commands.Cog):
         # Сброс мутов
         if mutes:
             try:
-                # Удаляем все активные муты из базы данных
+                # Деактивируем все активные муты в базе данных
                 await self.db.execute(
-                    "DELETE FROM mutes WHERE user_id = ? AND guild_id = ?",
-                    (member.id, interaction.guild_id)
+                    "UPDATE moderation SET active = FALSE WHERE user_id = ? AND guild_id = ? AND type = 'mute' AND active = TRUE",
+                    (str(member.id), str(interaction.guild_id))
                 )
                 # Снимаем роль мута, если она есть
                 mute_role_id = self.config['roles'].get('muted')
@@ -82,20 +85,20 @@ class Reset(commands.Cog):
                         await member.remove_roles(mute_role, reason=f"Сброс мутов от {interaction.user}: {reason if reason else 'Причина не указана'}")
                 success_actions.append("муты")
             except Exception as e:
-                print(f"Ошибка при сбросе мутов: {e}")
+                log.error(f"Ошибка при сбросе мутов: {e}")
                 failed_actions.append("муты")
 
         # Сброс предупреждений
         if warns:
             try:
-                # Удаляем все предупреждения из базы данных
+                # Деактивируем все предупреждения в базе данных
                 await self.db.execute(
-                    "DELETE FROM warns WHERE user_id = ? AND guild_id = ?",
-                    (member.id, interaction.guild_id)
+                    "UPDATE moderation SET active = FALSE WHERE user_id = ? AND guild_id = ? AND type = 'warn' AND active = TRUE",
+                    (str(member.id), str(interaction.guild_id))
                 )
                 success_actions.append("предупреждения")
             except Exception as e:
-                print(f"Ошибка при сбросе предупреждений: {e}")
+                log.error(f"Ошибка при сбросе предупреждений: {e}")
                 failed_actions.append("предупреждения")
 
         # Создаем эмбед с результатами
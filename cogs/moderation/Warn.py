@@ -45,7 +45,7 @@ class Warn(commands.Cog):
 
     async def get_user_active_warnings(self, user_id: int, guild_id: int) -> int:
         result = await self.db.execute(
-            "SELECT COUNT(*) FROM warnings WHERE user_id = ? AND guild_id = ? AND active = TRUE",
+            "SELECT COUNT(*) FROM moderation WHERE user_id = ? AND guild_id = ? AND type = 'warn' AND active = TRUE",
             (str(user_id), str(guild_id))
         )
         return result[0][0] if result else 0
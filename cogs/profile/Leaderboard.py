@@ -95,6 +95,8 @@ class Leaderboard(commands.Cog):
         await interaction.response.defer()
 
         if category == "level":
+            # Сбрасываем накопленный в кэше опыт перед чтением
+            await self.db.users.flush()
             result = await self.db.fetch_all(
                 "SELECT user_id, level, xp FROM users ORDER BY level DESC, xp DESC"
             )
@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 from typing import Optional, List, Dict, Any
@@ -13,6 +14,8 @@ from io import BytesIO
 import os
 from discord.ext import tasks
 
+log = logging.getLogger(__name__)
+
 class SellRoleButton(discord.ui.Button):
     def __init__(self, role_id: int, role_name: str, price: int):
         super().__init__(
@@ -264,7 +267,7 @@ class Profile(commands.GroupCog, group_name="profile"):
                         pass  # Пользователь запретил личные сообщения
                         
         except Exception as e:
-            print(f"Ошибка при проверке дней рождения: {e}")
+            log.error(f"Ошибка при проверке дней рождения: {e}")
 
     @tasks.loop(hours=24)
     async def birthday_check(self):
@@ -279,7 +282,6 @@ class Profile(commands.GroupCog, group_name="profile"):
     async def cog_unload(self) -> None:
         """Очистка при выгрузке кога"""
         self.birthday_check.cancel()
-        await self.db.close()
 
     @app_commands.command(name="view", description="Показать профиль пользователя")
     @app_commands.describe(user="Пользователь, чей профиль показать")
@@ -358,6 +360,8 @@ class Profile(commands.GroupCog, group_name="profile"):
                 day, month, year = map(int, birthday.split('.'))
                 if not (1 <= day <= 31 and 1 <= month <= 12 and 1900 <= year <= 2024):
                     raise ValueError
+                # Храним с ведущими нулями: поиск именинников сравнивает первые 5 символов с "ДД.ММ"
+                birthday = f"{day:02d}.{month:02d}.{year}"
             except ValueError:
                 await interaction.response.send_message(
                     embed=Embed(
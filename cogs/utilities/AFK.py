@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 from Niludetsu.utils.embed import Embed
@@ -6,7 +7,8 @@ from Niludetsu.utils.constants import Emojis
 from Niludetsu.database import Database
 from datetime import datetime
 import asyncio
-import traceback
+
+log = logging.getLogger(__name__)
 
 class AFK(commands.Cog):
     def __init__(self, bot):
@@ -142,8 +144,7 @@ class AFK(commands.Cog):
                 )
                 
         except Exception as e:
-            print(f"❌ Ошибка при обработке AFK: {e}")
-            traceback.print_exc()
+            log.exception(f"Ошибка при обработке AFK: {e}")
 
 async def setup(bot):
     await bot.add_cog(AFK(bot)) 
\ No newline at end of file
@@ -1,16 +1,23 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
+import asyncio
 import io
 import zipfile
 from typing import Optional
 from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
+from Niludetsu.utils.image_fetcher import ImageFetcher, ImageFetchError
 
 class Emoji(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.fetcher = ImageFetcher.get()
+
+    async def download_emojis(self, emojis):
+        """Скачать эмодзи параллельно, для неудачных загрузок возвращается None"""
+        results = await asyncio.gather(*(self.fetcher.fetch(e.url) for e in emojis), return_exceptions=True)
+        return [None if isinstance(result, Exception) else result for result in results]
 
     emoji_group = app_commands.Group(name="emoji", description="Управление эмодзи")
 
@@ -23,15 +30,12 @@ class Emoji(commands.Cog):
         if not emoji:  # Если эмодзи не указано, загружаем все
             # Создаем ZIP архив со всеми эмодзи
             zip_buffer = io.BytesIO()
+            images = await self.download_emojis(interaction.guild.emojis)
             with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                async with aiohttp.ClientSession() as session:
-                    for guild_emoji in interaction.guild.emojis:
-                        emoji_url = guild_emoji.url
-                        async with session.get(str(emoji_url)) as response:
-                            if response.status == 200:
-                                image_data = await response.read()
-                                extension = '.gif' if guild_emoji.animated else '.png'
-                                zip_file.writestr(f"{guild_emoji.name}{extension}", image_data)
+                for guild_emoji, image_data in zip(interaction.guild.emojis, images):
+                    if image_data is not None:
+                        extension = '.gif' if guild_emoji.animated else '.png'
+                        zip_file.writestr(f"{guild_emoji.name}{extension}", image_data)
 
             zip_buffer.seek(0)
             file = discord.File(zip_buffer, filename=f"all_emojis.zip")
@@ -54,22 +58,20 @@ class Emoji(commands.Cog):
                 raise ValueError("Эмодзи не найдено")
 
             # Скачиваем одно эмодзи
-            async with aiohttp.ClientSession() as session:
-                async with session.get(str(emoji_obj.url)) as response:
-                    if response.status == 200:
-                        image_data = await response.read()
-                        extension = '.gif' if emoji_obj.animated else '.png'
-                        file = discord.File(io.BytesIO(image_data), filename=f"{emoji_obj.name}{extension}")
-                        
-                        embed=Embed(
-                            title="📥 Скачивание эмодзи",
-                            description=f"{Emojis.DOT} **Статус:** Успешно\n"
-                                      f"{Emojis.DOT} **Имя:** `{emoji_obj.name}`\n"
-                                      f"{Emojis.DOT} **Формат:** `{extension[1:]}`"
-                        )
-                        await interaction.followup.send(embed=embed, file=file)
-                    else:
-                        raise ValueError("Не удалось скачать эмодзи")
+            try:
+                image_data = await self.fetcher.fetch(emoji_obj.url)
+            except ImageFetchError:
+                raise ValueError("Не удалось скачать эмодзи")
+            extension = '.gif' if emoji_obj.animated else '.png'
+            file = discord.File(io.BytesIO(image_data), filename=f"{emoji_obj.name}{extension}")
+            
+            embed=Embed(
+                title="📥 Скачивание эмодзи",
+                description=f"{Emojis.DOT} **Статус:** Успешно\n"
+                          f"{Emojis.DOT} **Имя:** `{emoji_obj.name}`\n"
+                          f"{Emojis.DOT} **Формат:** `{extension[1:]}`"
+            )
+            await interaction.followup.send(embed=embed, file=file)
 
         except (ValueError, AttributeError) as e:
             embed=Embed(
@@ -90,26 +92,28 @@ class Emoji(commands.Cog):
         failed_downloads = []
         zip_buffer = io.BytesIO()
 
+        found = []
+        for emoji in emoji_list:
+            try:
+                emoji_id = int(emoji.split(':')[-1].rstrip('>'))
+                emoji_obj = discord.utils.get(interaction.guild.emojis, id=emoji_id)
+                
+                if emoji_obj:
+                    found.append(emoji_obj)
+                else:
+                    failed_downloads.append(emoji)
+            except (ValueError, AttributeError):
+                failed_downloads.append(emoji)
+
+        images = await self.download_emojis(found)
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            async with aiohttp.ClientSession() as session:
-                for emoji in emoji_list:
-                    try:
-                        emoji_id = int(emoji.split(':')[-1].rstrip('>'))
-                        emoji_obj = discord.utils.get(interaction.guild.emojis, id=emoji_id)
-                        
-                        if emoji_obj:
-                            async with session.get(str(emoji_obj.url)) as response:
-                                if response.status == 200:
-                                    image_data = await response.read()
-                                    extension = '.gif' if emoji_obj.animated else '.png'
-                                    zip_file.writestr(f"{emoji_obj.name}{extension}", image_data)
-                                    successful_downloads.append(emoji_obj.name)
-                                else:
-                                    failed_downloads.append(emoji_obj.name)
-                        else:
-                            failed_downloads.append(emoji)
-                    except (ValueError, AttributeError):
-                        failed_downloads.append(emoji)
+            for emoji_obj, image_data in zip(found, images):
+                if image_data is not None:
+                    extension = '.gif' if emoji_obj.animated else '.png'
+                    zip_file.writestr(f"{emoji_obj.name}{extension}", image_data)
+                    successful_downloads.append(emoji_obj.name)
+                else:
+                    failed_downloads.append(emoji_obj.name)
 
         if successful_downloads:
             zip_buffer.seek(0)
@@ -143,15 +147,12 @@ class Emoji(commands.Cog):
         await interaction.response.defer()
 
         zip_buffer = io.BytesIO()
+        images = await self.download_emojis(interaction.guild.emojis)
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            async with aiohttp.ClientSession() as session:
-                for guild_emoji in interaction.guild.emojis:
-                    emoji_url = guild_emoji.url
-                    async with session.get(str(emoji_url)) as response:
-                        if response.status == 200:
-                            image_data = await response.read()
-                            extension = '.gif' if guild_emoji.animated else '.png'
-                            zip_file.writestr(f"{guild_emoji.name}{extension}", image_data)
+            for guild_emoji, image_data in zip(interaction.guild.emojis, images):
+                if image_data is not None:
+                    extension = '.gif' if guild_emoji.animated else '.png'
+                    zip_file.writestr(f"{guild_emoji.name}{extension}", image_data)
 
         zip_buffer.seek(0)
         file = discord.File(zip_buffer, filename=f"all_emojis.zip")
@@ -204,11 +205,10 @@ class Emoji(commands.Cog):
                 raise ValueError("Ссылка должна быть с cdn.discordapp.com")
             
             # Скачиваем эмодзи
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        raise ValueError("Не удалось скачать эмодзи")
-                    image_data = await response.read()
+            try:
+                image_data = await self.fetcher.fetch(url)
+            except ImageFetchError:
+                raise ValueError("Не удалось скачать эмодзи")
             
             # Определяем, анимированное ли эмодзи
             is_animated = url.endswith('.gif')
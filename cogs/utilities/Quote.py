@@ -2,9 +2,9 @@ import discord
 from discord.ext import commands
 from PIL import Image, ImageDraw, ImageFont
 import io
-import aiohttp
 from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
+from Niludetsu.utils.image_fetcher import ImageFetcher, ImageFetchError
 import textwrap
 import os
 
@@ -15,28 +15,23 @@ class Quote(commands.Cog):
 
     async def download_avatar(self, avatar_url):
         """Завантаження та обробка аватарки"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(str(avatar_url)) as response:
-                if response.status == 200:
-                    avatar_data = io.BytesIO(await response.read())
-                    avatar = Image.open(avatar_data)
-                    
-                    # Конвертуємо в RGBA якщо потрібно
-                    if avatar.mode != 'RGBA':
-                        avatar = avatar.convert('RGBA')
-                    
-                    # Створюємо маску для круглої аватарки
-                    mask = Image.new('L', avatar.size, 0)
-                    draw = ImageDraw.Draw(mask)
-                    draw.ellipse((0, 0) + avatar.size, fill=255)
-                    
-                    # Застосовуємо маску
-                    output = Image.new('RGBA', avatar.size, (0, 0, 0, 0))
-                    output.paste(avatar, (0, 0))
-                    output.putalpha(mask)
-                    
-                    return output
-        return None
+        try:
+            # Аватар все одно зменшується до 64px, тому декодуємо одразу мініатюру
+            avatar = await ImageFetcher.get().image(avatar_url, (128, 128))
+        except ImageFetchError:
+            return None
+        
+        # Створюємо маску для круглої аватарки
+        mask = Image.new('L', avatar.size, 0)
+        draw = ImageDraw.Draw(mask)
+        draw.ellipse((0, 0) + avatar.size, fill=255)
+        
+        # Застосовуємо маску
+        output = Image.new('RGBA', avatar.size, (0, 0, 0, 0))
+        output.paste(avatar, (0, 0))
+        output.putalpha(mask)
+        
+        return output
 
     def create_quote_image(self, text, author_name, avatar):
         """Створення зображення з цитатою"""
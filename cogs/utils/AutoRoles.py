@@ -1,19 +1,24 @@
 import discord
+import logging
 from discord.ext import commands
 from typing import List, Optional
 from Niludetsu.database.db import Database
+from Niludetsu.utils.settings import Settings
+
+log = logging.getLogger(__name__)
 
 class AutoRoles(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         
     async def get_role(self, guild: discord.Guild, role_id: str) -> Optional[discord.Role]:
         """Получение роли по ID"""
         try:
             return guild.get_role(int(role_id))
         except (ValueError, TypeError):
-            print(f"❌ Неверный ID роли: {role_id}")
+            log.error(f"Неверный ID роли: {role_id}")
             return None
         
     async def add_roles(self, member: discord.Member, role_ids: List[str]):
@@ -28,9 +33,9 @@ class AutoRoles(commands.Cog):
             try:
                 await member.add_roles(*roles_to_add, reason="Автоматическая выдача ролей")
             except discord.Forbidden:
-                print(f"❌ Недостаточно прав для выдачи ролей пользователю {member}")
+                log.error(f"Недостаточно прав для выдачи ролей пользователю {member}")
             except Exception as e:
-                print(f"❌ Ошибка при выдаче ролей: {e}")
+                log.error(f"Ошибка при выдаче ролей: {e}")
                 
     async def remove_role(self, member: discord.Member, role_id: str):
         """Удаление роли у пользователя по ID"""
@@ -39,9 +44,9 @@ class AutoRoles(commands.Cog):
             try:
                 await member.remove_roles(role, reason="Автоматическое удаление роли")
             except discord.Forbidden:
-                print(f"❌ Недостаточно прав для удаления роли у пользователя {member}")
+                log.error(f"Недостаточно прав для удаления роли у пользователя {member}")
             except Exception as e:
-                print(f"❌ Ошибка при удалении роли: {e}")
+                log.error(f"Ошибка при удалении роли: {e}")
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
@@ -49,25 +54,21 @@ class AutoRoles(commands.Cog):
         try:
             # Получаем значения из базы данных
             # Получаем роль бота
-            bot_role = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'autoroles' AND key = 'bot_role'"
-            )
+            bot_role = await self.settings.get(None, 'autoroles', 'bot_role')
             
             # Получаем роли при входе
-            join_roles = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'autoroles' AND key = 'join_roles'"
-            )
+            join_roles = await self.settings.get(None, 'autoroles', 'join_roles')
             
             if member.bot and bot_role:
-                await self.add_roles(member, [bot_role['value']])
+                await self.add_roles(member, [bot_role])
                 return
                 
             if join_roles:
-                roles_list = join_roles['value'].split(',') if isinstance(join_roles['value'], str) else [join_roles['value']]
+                roles_list = join_roles.split(',')
                 await self.add_roles(member, roles_list)
                 
         except Exception as e:
-            print(f"❌ Ошибка при выдаче ролей новому участнику: {e}")
+            log.error(f"Ошибка при выдаче ролей новому участнику: {e}")
 
 async def setup(bot):
     await bot.add_cog(AutoRoles(bot)) 
\ No newline at end of file
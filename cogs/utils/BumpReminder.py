@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord.ext import commands
 from discord.ext import tasks
 import datetime
@@ -6,14 +7,18 @@ import re
 import pytz
 from typing import Optional
 from Niludetsu.database.db import Database
+from Niludetsu.utils.settings import Settings
 from Niludetsu.utils.constants import Emojis
 from discord import Embed
 import asyncio
 
+log = logging.getLogger(__name__)
+
 class BumpReminder(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         self.check_bumps.start()
         self.timezone = pytz.timezone('Europe/Moscow')
         self.bump_role = None
@@ -44,57 +49,39 @@ class BumpReminder(commands.Cog):
                 "SELECT bot_id, next_bump FROM bump_reminders"
             )
             
-            print(f"📝 Найдено записей в базе: {len(bump_times)}")
+            log.debug(f"Найдено записей в базе: {len(bump_times)}")
             
             for record in bump_times:
                 try:
                     bot_id = int(record['bot_id'])
                     next_bump = datetime.datetime.fromisoformat(record['next_bump'])
                     self.last_number[bot_id] = next_bump
-                    print(f"✅ Успешно загружено время для бота {bot_id}: {next_bump}")
+                    log.info(f"Успешно загружено время для бота {bot_id}: {next_bump}")
                     
                 except Exception as e:
-                    print(f"❌ Ошибка при обработке записи бампа для бота {record.get('bot_id', 'Unknown')}: {str(e)}")
+                    log.error(f"Ошибка при обработке записи бампа для бота {record.get('bot_id', 'Unknown')}: {str(e)}")
                     continue
                     
         except Exception as e:
-            print(f"❌ Ошибка при загрузке чисел: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"Ошибка при загрузке чисел: {e}")
 
     async def _initialize(self):
         """Асинхронная инициализация"""
         try:
             await self.bot.wait_until_ready()  # Ждем пока бот будет готов
+            # Таблица bump_reminders создается миграциями схемы
             await self.db.init()
             
-            # Удаляем старую таблицу и создаем новую с правильной структурой
-            await self.db.execute("DROP TABLE IF EXISTS bump_reminders")
-            await self.db.execute("""
-                CREATE TABLE bump_reminders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bot_id TEXT UNIQUE NOT NULL,
-                    bot_name TEXT NOT NULL,
-                    next_bump TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            print("✅ Таблица bump_reminders успешно создана")
-            
             # Загружаем ID роли для пинга
-            result = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'bump_reminder' AND key = 'role'"
-            )
-            if result and result['value']:
-                self.bump_role = int(result['value'])
+            result = await self.settings.get(None, 'bump_reminder', 'role')
+            if result:
+                self.bump_role = int(result)
                 
             await self.load_numbers()
             self.ready = True
             
         except Exception as e:
-            print(f"❌ Ошибка при инициализации: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"Ошибка при инициализации: {e}")
         
     def cog_unload(self):
         """Остановка задач при выгрузке кога"""
@@ -120,7 +107,7 @@ class BumpReminder(commands.Cog):
                 return datetime.datetime.fromtimestamp(timestamp, self.timezone)
             return None
         except Exception as e:
-            print(f"❌ Ошибка при парсинге временной метки: {e}")
+            log.error(f"Ошибка при парсинге временной метки: {e}")
             return None
             
     def extract_time_from_text(self, text: str, bot_id: int) -> Optional[datetime.datetime]:
@@ -180,8 +167,8 @@ class BumpReminder(commands.Cog):
             return None
 
         except Exception as e:
-            print(f"❌ Ошибка при извлечении времени для бота {bot_id}: {e}")
-            print(f"Текст сообщения: {text}")
+            log.error(f"Ошибка при извлечении времени для бота {bot_id}: {e}")
+            log.debug(f"Текст сообщения: {text}")
             return None
             
     async def update_bump_time(self, bot_id: str, next_bump: Optional[datetime.datetime], bot_name: str):
@@ -204,24 +191,20 @@ class BumpReminder(commands.Cog):
                     bot_id
                 )
         except Exception as e:
-            print(f"❌ Ошибка при обновлении времени бампа: {e}")
+            log.error(f"Ошибка при обновлении времени бампа: {e}")
             
     async def process_message_with_delay(self, message: discord.Message):
         """Обработка сообщения с задержкой для корректного отображения эмбедов"""
         try:
             # Получаем настройки из базы данных
-            result_channel = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'bump_reminder' AND key = 'channel'"
-            )
-            result_bots = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'bump_reminder' AND key = 'allowed_bots'"
-            )
+            result_channel = await self.settings.get(None, 'bump_reminder', 'channel')
+            result_bots = await self.settings.get(None, 'bump_reminder', 'allowed_bots')
             
             if not result_channel or not result_bots:
                 return
                 
-            channel_id = int(result_channel['value'])
-            bot_ids_str = result_bots['value'].strip('[]').replace(' ', '')
+            channel_id = int(result_channel)
+            bot_ids_str = result_bots.strip('[]').replace(' ', '')
             allowed_bots = [int(bot_id.strip()) for bot_id in bot_ids_str.split(',') if bot_id.strip()]
             
             if message.author.id not in allowed_bots:
@@ -236,19 +219,19 @@ class BumpReminder(commands.Cog):
             if message.embeds:
                 for embed in message.embeds:
                     if embed.description:
-                        print(f"📝 Проверяем эмбед от бота {bot_name}: {embed.description}")
+                        log.debug(f"Проверяем эмбед от бота {bot_name}: {embed.description}")
                         next_bump = self.extract_time_from_text(embed.description, message.author.id)
                         if next_bump:
                             break
             
             # Если время не найдено в эмбедах, проверяем контент сообщения
             if not next_bump and message.content:
-                print(f"📝 Проверяем контент от бота {bot_name}: {message.content}")
+                log.debug(f"Проверяем контент от бота {bot_name}: {message.content}")
                 next_bump = self.extract_time_from_text(message.content, message.author.id)
                 
             # Обновляем время в базе данных
             if next_bump:
-                print(f"✅ Найдено время бампа для бота {bot_name} ({message.author.id}): {next_bump}")
+                log.info(f"Найдено время бампа для бота {bot_name} ({message.author.id}): {next_bump}")
                 await self.db.execute(
                     """
                     INSERT INTO bump_reminders (bot_id, bot_name, next_bump)
@@ -275,12 +258,10 @@ class BumpReminder(commands.Cog):
                     )
                     await channel.send(embed=embed)
             else:
-                print(f"❌ Не удалось найти время бампа в сообщении от бота {bot_name}")
+                log.error(f"Не удалось найти время бампа в сообщении от бота {bot_name}")
                     
         except Exception as e:
-            print(f"❌ Ошибка при обработке сообщения: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"Ошибка при обработке сообщения: {e}")
             
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -308,14 +289,12 @@ class BumpReminder(commands.Cog):
                     bot_name = record['bot_name']
                     
                     if next_bump <= current_time:
-                        result_channel = await self.db.fetch_one(
-                            "SELECT value FROM settings WHERE category = 'bump_reminder' AND key = 'channel'"
-                        )
+                        result_channel = await self.settings.get(None, 'bump_reminder', 'channel')
                         
                         if not result_channel:
                             continue
                             
-                        channel = self.bot.get_channel(int(result_channel['value']))
+                        channel = self.bot.get_channel(int(result_channel))
                         if not channel:
                             continue
                         
@@ -336,11 +315,11 @@ class BumpReminder(commands.Cog):
                         )
                         
                 except Exception as e:
-                    print(f"❌ Ошибка при проверке бампа: {e}")
+                    log.error(f"Ошибка при проверке бампа: {e}")
                     continue
                 
         except Exception as e:
-            print(f"❌ Ошибка в check_bumps: {e}")
+            log.error(f"Ошибка в check_bumps: {e}")
             
     @commands.command(
         name="checkbump",
@@ -381,7 +360,7 @@ class BumpReminder(commands.Cog):
                         )
                         
                 except Exception as e:
-                    print(f"❌ Ошибка при обработке записи бампа: {e}")
+                    log.error(f"Ошибка при обработке записи бампа: {e}")
                     continue
                     
             if not bumps_info:
@@ -404,9 +383,7 @@ class BumpReminder(commands.Cog):
             await ctx.send(embed=embed)
             
         except Exception as e:
-            print(f"❌ Ошибка при выполнении команды check_bump: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"Ошибка при выполнении команды check_bump: {e}")
 
 async def setup(bot):
     await bot.add_cog(BumpReminder(bot)) 
\ No newline at end of file
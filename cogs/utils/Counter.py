@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 import re
@@ -10,6 +11,8 @@ from Niludetsu import (
 import asyncio
 from Niludetsu.database.db import Database
 
+log = logging.getLogger(__name__)
+
 class Counter(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -47,7 +50,7 @@ class Counter(commands.Cog):
             # Сначала пытаемся получить форум-канал
             forum = self.bot.get_channel(self.forum_channel_id)
             if not forum:
-                print(f"❌ Форум-канал не найден: {self.forum_channel_id}")
+                log.error(f"Форум-канал не найден: {self.forum_channel_id}")
                 return
 
             # Пытаемся получить существующую ветку
@@ -82,11 +85,11 @@ class Counter(commands.Cog):
             )
             
             self.last_number[thread.thread.id] = 0
-            print(f"✅ Создана новая ветка счетчика: {thread.thread.id}")
+            log.info(f"Создана новая ветка счетчика: {thread.thread.id}")
             return thread
 
         except Exception as e:
-            print(f"❌ Ошибка при проверке/создании ветки счетчика: {e}")
+            log.error(f"Ошибка при проверке/создании ветки счетчика: {e}")
             return None
 
     async def load_numbers(self):
@@ -132,7 +135,7 @@ class Counter(commands.Cog):
                 )
                 await channel.send(embed=embed)
         except Exception as e:
-            print(f"❌ Ошибка при обновлении эмбеда: {e}")
+            log.error(f"Ошибка при обновлении эмбеда: {e}")
 
     async def save_number(self, channel_id: int, number: int, user_id: int):
         """Сохранение числа в базу данных"""
@@ -301,7 +304,7 @@ class Counter(commands.Cog):
                     pass
                 return
         except Exception as e:
-            print(f"❌ Ошибка в обработке сообщения счетчика: {e}")
+            log.error(f"Ошибка в обработке сообщения счетчика: {e}")
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -313,7 +316,7 @@ class Counter(commands.Cog):
         if self.counter_thread_id:
             channel = self.bot.get_channel(self.counter_thread_id)
             if not channel:
-                print(f"❌ Ветка счетчика не найдена: {self.counter_thread_id}")
+                log.error(f"Ветка счетчика не найдена: {self.counter_thread_id}")
                 # Удаляем из базы данных
                 await self.db.execute(
                     "DELETE FROM games WHERE channel_id = ? AND game_type = 'counter'",
@@ -1,10 +1,14 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 from discord.ui import Modal, TextInput, View, Button, Select
 from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
 from Niludetsu.database.db import Database
+from Niludetsu.utils.settings import Settings
+
+log = logging.getLogger(__name__)
 
 class PositionSelect(Select):
     def __init__(self):
@@ -242,20 +246,19 @@ class Forms(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         bot.loop.create_task(self.setup_form_view())
 
     async def setup_form_view(self):
         """Настройка панели заявок"""
         try:
             # Получаем канал для заявок
-            result = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'forms' AND key = 'channel'"
-            )
+            result = await self.settings.get(None, 'forms', 'channel')
             
             if not result:
                 return
                 
-            channel_id = result['value']    
+            channel_id = result    
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
                 return
@@ -275,18 +278,12 @@ class Forms(commands.Cog):
             message = await channel.send(embed=embed, view=ApplicationButton())
             
             # Сохраняем ID сообщения
-            await self.db.execute(
-                """
-                INSERT OR REPLACE INTO settings (category, key, value)
-                VALUES ('forms', 'message', ?)
-                """,
-                str(message.id)
-            )
+            await self.settings.set(channel.guild.id, 'forms', 'message', message.id)
             
             return message
             
         except Exception as e:
-            print(f"❌ Ошибка при настройке панели заявок: {e}")
+            log.error(f"Ошибка при настройке панели заявок: {e}")
             return None
 
     @app_commands.command(name="form", description="Управление панелью заявок")
@@ -345,15 +342,8 @@ class Forms(commands.Cog):
         await message.edit(embed=embed, view=ApplicationButton())
         
         # Сохраняем настройки в базу данных
-        await self.db.execute(
-            """
-            INSERT INTO settings (category, key, value) 
-            VALUES (?, ?, ?), (?, ?, ?)
-            ON CONFLICT (category, key) DO UPDATE SET value = excluded.value
-            """,
-            'forms', 'channel', str(applications_channel_id),
-            'forms', 'message', str(message_id)
-        )
+        await self.settings.set(interaction.guild_id, 'forms', 'channel', applications_channel_id)
+        await self.settings.set(interaction.guild_id, 'forms', 'message', message_id)
 
         await interaction.response.send_message(
             f"✅ Панель подачи заявок успешно создана!\n"
@@ -365,14 +355,7 @@ class Forms(commands.Cog):
         channel = await commands.TextChannelConverter().convert(interaction, applications_channel)
         
         # Сохраняем канал в базу данных
-        await self.db.execute(
-            """
-            INSERT INTO settings (category, key, value) 
-            VALUES (?, ?, ?)
-            ON CONFLICT (category, key) DO UPDATE SET value = ?
-            """,
-            'forms', 'channel', str(channel.id), str(channel.id)
-        )
+        await self.settings.set(interaction.guild_id, 'forms', 'channel', channel.id)
             
         embed = Embed(
             title="✅ Канал для заявок установлен",
@@ -384,15 +367,13 @@ class Forms(commands.Cog):
         """Обработка отправки формы"""
         try:
             # Получаем канал для заявок
-            result = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'forms' AND key = 'channel'"
-            )
+            result = await self.settings.get(None, 'forms', 'channel')
             
             if not result:
                 await interaction.response.send_message("❌ Канал для заявок не настроен!")
                 return
                 
-            channel_id = result['value']
+            channel_id = result
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
                 await interaction.response.send_message("❌ Канал для заявок не найден!")
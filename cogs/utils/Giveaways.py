@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord import app_commands
 from discord.ext import commands, tasks
 from datetime import datetime, timedelta
@@ -9,6 +10,8 @@ from Niludetsu.utils.constants import Emojis
 from Niludetsu.database import Database
 import asyncio
 
+log = logging.getLogger(__name__)
+
 class Giveaways(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -114,7 +117,7 @@ class Giveaways(commands.Cog):
                         pass
 
         except Exception as e:
-            print(f"Ошибка при обработке реакции: {e}")
+            log.error(f"Ошибка при обработке реакции: {e}")
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
@@ -184,11 +187,11 @@ class Giveaways(commands.Cog):
                         if message:
                             await self.end_giveaway(message)
                 except Exception as e:
-                    print(f"Ошибка при завершении розыгрыша: {e}")
+                    log.error(f"Ошибка при завершении розыгрыша: {e}")
                     continue
                     
         except Exception as e:
-            print(f"Ошибка в check_giveaways: {e}")
+            log.error(f"Ошибка в check_giveaways: {e}")
 
     async def end_giveaway(self, message: discord.Message):
         """Завершает розыгрыш и выбирает победителей"""
@@ -273,7 +276,7 @@ class Giveaways(commands.Cog):
             )
                 
         except Exception as e:
-            print(f"Ошибка при завершении розыгрыша: {e}")
+            log.error(f"Ошибка при завершении розыгрыша: {e}")
 
     async def create_giveaway(
         self,
@@ -1,10 +1,14 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 from discord.ui import Modal, TextInput, View, Button
 from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
 from Niludetsu.database.db import Database
+from Niludetsu.utils.settings import Settings
+
+log = logging.getLogger(__name__)
 
 class ReasonModal(Modal):
     def __init__(self, title: str, callback):
@@ -177,20 +181,19 @@ class Ideas(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         bot.loop.create_task(self.setup_ideas_view())
 
     async def setup_ideas_view(self):
         """Настройка панели идей"""
         try:
             # Получаем канал для идей
-            result = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'ideas' AND key = 'channel'"
-            )
+            result = await self.settings.get(None, 'ideas', 'channel')
             
             if not result:
                 return
                 
-            channel_id = result['value']
+            channel_id = result
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
                 return
@@ -210,27 +213,19 @@ class Ideas(commands.Cog):
             message = await channel.send(embed=embed, view=IdeaButton())
             
             # Сохраняем ID сообщения
-            await self.db.execute(
-                """
-                INSERT OR REPLACE INTO settings (category, key, value)
-                VALUES ('ideas', 'message', ?)
-                """,
-                str(message.id)
-            )
+            await self.settings.set(channel.guild.id, 'ideas', 'message', message.id)
             
             return message
             
         except Exception as e:
-            print(f"❌ Ошибка при настройке панели идей: {e}")
+            log.error(f"Ошибка при настройке панели идей: {e}")
             return None
 
     async def handle_idea_submit(self, interaction: discord.Interaction, title: str, description: str):
         """Обработка отправки идеи"""
         try:
             # Получаем канал для идей
-            channel_id = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'ideas' AND key = 'channel'"
-            )
+            channel_id = await self.settings.get(None, 'ideas', 'channel')
             
             if not channel_id:
                 return await interaction.response.send_message(
@@ -337,15 +332,8 @@ class Ideas(commands.Cog):
         await message.edit(embed=embed, view=IdeaButton())
         
         # Сохраняем настройки в базу данных
-        await self.db.execute(
-            """
-            INSERT INTO settings (category, key, value) 
-            VALUES (?, ?, ?), (?, ?, ?)
-            ON CONFLICT (category, key) DO UPDATE SET value = excluded.value
-            """,
-            'ideas', 'channel', str(ideas_channel_id),
-            'ideas', 'message', str(message_id)
-        )
+        await self.settings.set(interaction.guild_id, 'ideas', 'channel', ideas_channel_id)
+        await self.settings.set(interaction.guild_id, 'ideas', 'message', message_id)
 
         await interaction.response.send_message(
             f"✅ Панель идей успешно создана!\n"
@@ -357,14 +345,7 @@ class Ideas(commands.Cog):
         channel = await commands.TextChannelConverter().convert(interaction, ideas_channel)
         
         # Сохраняем канал в базу данных
-        await self.db.execute(
-            """
-            INSERT INTO settings (category, key, value) 
-            VALUES (?, ?, ?)
-            ON CONFLICT (category, key) DO UPDATE SET value = ?
-            """,
-            'ideas', 'channel', str(channel.id), str(channel.id)
-        )
+        await self.settings.set(interaction.guild_id, 'ideas', 'channel', channel.id)
             
         embed = Embed(
             title="✅ Канал для идей установлен",
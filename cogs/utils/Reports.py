@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 from discord.ui import Modal, TextInput, View, Button
@@ -6,6 +7,9 @@ from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
 import asyncio
 from Niludetsu.database.db import Database
+from Niludetsu.utils.settings import Settings
+
+log = logging.getLogger(__name__)
 
 class ReasonModal(Modal):
     def __init__(self, title: str, callback):
@@ -197,20 +201,19 @@ class Reports(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         bot.loop.create_task(self.setup_reports_view())
 
     async def setup_reports_view(self):
         """Настройка панели жалоб"""
         try:
             # Получаем канал для жалоб
-            result = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'reports' AND key = 'channel'"
-            )
+            result = await self.settings.get(None, 'reports', 'channel')
             
             if not result:
                 return
                 
-            channel_id = result['value']
+            channel_id = result
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
                 return
@@ -230,26 +233,18 @@ class Reports(commands.Cog):
             message = await channel.send(embed=embed, view=ReportButton())
             
             # Сохраняем ID сообщения
-            await self.db.execute(
-                """
-                INSERT OR REPLACE INTO settings (category, key, value)
-                VALUES ('reports', 'message', ?)
-                """,
-                str(message.id)
-            )
+            await self.settings.set(channel.guild.id, 'reports', 'message', message.id)
             
             return message
             
         except Exception as e:
-            print(f"❌ Ошибка при настройке панели жалоб: {e}")
+            log.error(f"Ошибка при настройке панели жалоб: {e}")
             return None
 
     async def handle_report_submit(self, interaction: discord.Interaction, user: str, reason: str, proof: str = None, additional: str = None):
         """Обработка отправки жалобы"""
         try:
-            result = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'reports' AND key = 'channel'"
-            )
+            result = await self.settings.get(None, 'reports', 'channel')
                 
             if not result:
                 await interaction.response.send_message(
@@ -262,7 +257,7 @@ class Reports(commands.Cog):
                 )
                 return
 
-            channel_id = result['value']
+            channel_id = result
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
                 await interaction.response.send_message("❌ Канал для жалоб не найден!")
@@ -415,15 +410,8 @@ class Reports(commands.Cog):
         await message.edit(embed=embed, view=ReportButton())
         
         # Сохраняем настройки в базу данных
-        await self.db.execute(
-            """
-            INSERT INTO settings (category, key, value) 
-            VALUES (?, ?, ?), (?, ?, ?)
-            ON CONFLICT (category, key) DO UPDATE SET value = excluded.value
-            """,
-            'reports', 'channel', str(reports_channel_id),
-            'reports', 'message', str(message_id)
-        )
+        await self.settings.set(interaction.guild_id, 'reports', 'channel', reports_channel_id)
+        await self.settings.set(interaction.guild_id, 'reports', 'message', message_id)
 
         await interaction.response.send_message(
             f"✅ Панель жалоб успешно создана!\n"
@@ -435,14 +423,7 @@ class Reports(commands.Cog):
         channel = await commands.TextChannelConverter().convert(interaction, reports_channel)
         
         # Сохраняем канал в базу данных
-        await self.db.execute(
-            """
-            INSERT INTO settings (category, key, value) 
-            VALUES (?, ?, ?)
-            ON CONFLICT (category, key) DO UPDATE SET value = ?
-            """,
-            'reports', 'channel', str(channel.id), str(channel.id)
-        )
+        await self.settings.set(interaction.guild_id, 'reports', 'channel', channel.id)
             
         embed = Embed(
             title="✅ Канал для жалоб установлен",
@@ -1,9 +1,12 @@
 import discord
+import logging
 from discord.ext import commands
 from Niludetsu.database import Database
 from Niludetsu.utils.embed import Embed
 import asyncio
 
+log = logging.getLogger(__name__)
+
 POSITIVE_TRIGGERS = ['плюс', 'согл', 'спс', 'спасибо', 'сяп', 'сенкс', 'thanks', 'thx', '👍', '❤️']
 NEGATIVE_TRIGGERS = ['минус', 'не согл', 'нет', 'неа', '👎'] 
 
@@ -15,19 +18,8 @@ class Reputation(commands.Cog):
         
     async def _initialize(self):
         """Асинхронная инициализация"""
+        # Колонка reputation создается миграциями схемы
         await self.db.init()
-        await self.initialize_reputation_column()
-        
-    async def initialize_reputation_column(self):
-        """Инициализация колонки репутации"""
-        # Проверяем наличие колонки reputation
-        result = await self.db.fetch_all("PRAGMA table_info(users)")
-        if not result:
-            return
-            
-        columns = [row['name'] for row in result]
-        if 'reputation' not in columns:
-            await self.db.execute('ALTER TABLE users ADD COLUMN reputation INTEGER DEFAULT 0')
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -118,7 +110,7 @@ class Reputation(commands.Cog):
             await message.channel.send(embed=embed)
 
         except Exception as e:
-            print(f"Error in reputation system: {e}")
+            log.error(f"Error in reputation system: {e}")
 
 async def setup(bot):
     await bot.add_cog(Reputation(bot))
\ No newline at end of file
@@ -1,18 +1,22 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import ui
 import asyncio
 from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
 from Niludetsu.database.db import Database
+from Niludetsu.utils.settings import Settings
 from Niludetsu.logging.voice import VoiceLogger
-import traceback
 from typing import Optional, Dict, Any
 
+log = logging.getLogger(__name__)
+
 class VoiceChannelManager:
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
     
     async def add_channel(self, channel_id: str, user_id: str, guild_id: str, name: str):
         """Добавляет временный канал в базу данных"""
@@ -29,8 +33,7 @@ class VoiceChannelManager:
             room = await self.get_temp_room(channel_id)
             
         except Exception as e:
-            print(f"❌ Ошибка при добавлении канала в базу данных: {e}")
-            traceback.print_exc()
+            log.exception(f"Ошибка при добавлении канала в базу данных: {e}")
     
     async def delete_temp_room(self, channel_id: str):
         """Удаляет канал из базы данных"""
@@ -40,8 +43,7 @@ class VoiceChannelManager:
                 channel_id
             )
         except Exception as e:
-            print(f"❌ Ошибка при удалении канала: {e}")
-            traceback.print_exc()
+            log.exception(f"Ошибка при удалении канала: {e}")
     
     async def get_temp_room(self, channel_id: str) -> Optional[Dict[str, Any]]:
         """Получает данные временного канала"""
@@ -52,7 +54,7 @@ class VoiceChannelManager:
             )
             return result
         except Exception as e:
-            print(f"❌ Ошибка при получении данных канала: {e}")
+            log.error(f"Ошибка при получении данных канала: {e}")
             return None
 
     async def update_temp_room(self, channel_id: str, **kwargs):
@@ -72,7 +74,7 @@ class VoiceChannelManager:
             """
             await self.db.execute(query, values)
         except Exception as e:
-            print(f"❌ Ошибка при обновлении данных канала: {e}")
+            log.error(f"Ошибка при обновлении данных канала: {e}")
 
     async def is_globally_banned(self, user_id: str, owner_id: str) -> bool:
         """Проверяет, находится ли пользователь в глобальном бане"""
@@ -83,7 +85,7 @@ class VoiceChannelManager:
             )
             return bool(result)
         except Exception as e:
-            print(f"❌ Ошибка при проверке глобального бана: {e}")
+            log.error(f"Ошибка при проверке глобального бана: {e}")
             return False
 
     async def is_banned(self, channel_id: str, user_id: str) -> bool:
@@ -95,7 +97,7 @@ class VoiceChannelManager:
                 return user_id in banned_users
             return False
         except Exception as e:
-            print(f"❌ Ошибка при проверке бана: {e}")
+            log.error(f"Ошибка при проверке бана: {e}")
             return False
 
     async def is_trusted(self, channel_id: str, user_id: str) -> bool:
@@ -107,7 +109,7 @@ class VoiceChannelManager:
                 return user_id in trusted_users
             return False
         except Exception as e:
-            print(f"❌ Ошибка при проверке доверенного пользователя: {e}")
+            log.error(f"Ошибка при проверке доверенного пользователя: {e}")
             return False
 
 class VoiceChannelView(ui.View):
@@ -269,7 +271,7 @@ class VoiceChannelView(ui.View):
                 await self._delete_channel(interaction, channel)
 
         except Exception as e:
-            traceback.print_exc()
+            log.exception("Ошибка при обработке действия с временным каналом")
             await interaction.response.send_message(
                 embed=Embed(
                     title=f"{Emojis.ERROR} Ошибка",
@@ -922,14 +924,11 @@ class VoiceChannelView(ui.View):
         async def modal_callback(modal_interaction: discord.Interaction):
             try:
                 name = name_input.value
-                config = await self.manager.db.fetch(
-                    "SELECT value FROM settings WHERE category = 'temp_rooms' AND key = 'control_channel'"
-                )
+                control_channel_id = await self.manager.settings.get(None, 'temp_rooms', 'control_channel')
                 
-                if not config:
+                if not control_channel_id:
                     raise ValueError("Канал управления не настроен")
 
-                control_channel_id = config[0]['value']
                 control_channel = self.bot.get_channel(int(control_channel_id))
                 
                 if not control_channel:
@@ -1046,18 +1045,14 @@ class VoiceChannelCog(commands.Cog):
         """Настройка системы временных каналов"""
         try:
             # Получаем настройки из базы данных
-            settings = await self.manager.db.fetch_all(
-                "SELECT key, value FROM settings WHERE category = 'temp_rooms'"
-            )
-            
-            settings_dict = {row['key']: row['value'] for row in settings}
+            settings_dict = await self.manager.settings.get_category(None, 'temp_rooms')
             
             voice_channel_id = settings_dict.get('voice')
             message_channel_id = settings_dict.get('channel')
             message_id = settings_dict.get('message')
             
             if not all([voice_channel_id, message_channel_id, message_id]):
-                print("❌ Не все настройки временных комнат найдены в базе данных")
+                log.error("Не все настройки временных комнат найдены в базе данных")
                 return
             
             # Делаем несколько попыток получить каналы
@@ -1075,10 +1070,10 @@ class VoiceChannelCog(commands.Cog):
                 await asyncio.sleep(2)
             
             if not voice_channel:
-                print(f"⚠️ Предупреждение: Канал для создания временных каналов не найден: {voice_channel_id}")
+                log.warning(f"Предупреждение: Канал для создания временных каналов не найден: {voice_channel_id}")
             
             if not message_channel:
-                print(f"❌ Канал для сообщения управления не найден: {message_channel_id}")
+                log.error(f"Канал для сообщения управления не найден: {message_channel_id}")
                 return
 
             if message_channel:
@@ -1111,22 +1106,18 @@ class VoiceChannelCog(commands.Cog):
                         await message.edit(embed=embed, view=self.create_panel_view())
                         return
                 except discord.NotFound:
-                    print(f"❌ Сообщение управления не найдено: {message_id}")
+                    log.error(f"Сообщение управления не найдено: {message_id}")
                 except Exception as e:
-                    print(f"❌ Ошибка при обновлении сообщения управления: {e}")
+                    log.error(f"Ошибка при обновлении сообщения управления: {e}")
             
         except Exception as e:
-            print(f"❌ Ошибка при настройке временных каналов: {e}")
-            traceback.print_exc()
+            log.exception(f"Ошибка при настройке временных каналов: {e}")
             
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
         """Обработчик изменения голосового состояния"""
         try:
-            result = await self.manager.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'temp_rooms' AND key = 'voice'"
-            )
-            voice_channel_id = result['value'] if result else None
+            voice_channel_id = await self.manager.settings.get(None, 'temp_rooms', 'voice')
             
             if not voice_channel_id:
                 return
@@ -1148,7 +1139,7 @@ class VoiceChannelCog(commands.Cog):
                             if thread:
                                 await thread.remove_user(member)
                         except Exception as e:
-                            traceback.print_exc()
+                            log.exception("Ошибка при удалении участника из ветки канала")
 
                     # Если канал пустой, удаляем его и связанный тред
                     if len(before.channel.members) == 0:
@@ -1158,7 +1149,7 @@ class VoiceChannelCog(commands.Cog):
                                 if thread:
                                     await thread.delete()
                             except Exception as e:
-                                traceback.print_exc()
+                                log.exception("Ошибка при удалении ветки канала")
                             
                         await before.channel.delete()
                         await self.manager.delete_temp_room(str(before.channel.id))
@@ -1223,18 +1214,15 @@ class VoiceChannelCog(commands.Cog):
                             if thread:
                                 await thread.add_user(member)
                         except Exception as e:
-                            traceback.print_exc()
+                            log.exception("Ошибка при добавлении участника в ветку канала")
                             
         except Exception as e:
-            traceback.print_exc()
+            log.exception("Ошибка при обработке голосового состояния")
 
     async def create_temp_channel(self, member: discord.Member) -> Optional[discord.VoiceChannel]:
         """Создает временный голосовой канал"""
         try:
-            result = await self.manager.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'temp_rooms' AND key = 'category'"
-            )
-            category_id = result['value'] if result else None
+            category_id = await self.manager.settings.get(None, 'temp_rooms', 'category')
             
             if not category_id:
                 return None
@@ -1285,7 +1273,7 @@ class VoiceChannelCog(commands.Cog):
             return new_channel
                 
         except Exception as e:
-            traceback.print_exc()
+            log.exception("Ошибка при создании временного канала")
             return None
 
 async def setup(bot):
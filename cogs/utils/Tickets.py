@@ -1,13 +1,17 @@
 import discord
+import logging
 from discord.ext import commands
 from discord import app_commands
 from discord.ui import Modal, TextInput, View, Button
 from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
 from Niludetsu.database.db import Database
+from Niludetsu.utils.settings import Settings
 import asyncio
 from typing import Optional
 
+log = logging.getLogger(__name__)
+
 class ReasonModal(Modal):
     def __init__(self, title: str, callback):
         super().__init__(title=title)
@@ -66,6 +70,7 @@ class Tickets(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.settings = Settings()
         asyncio.create_task(self._initialize())
         
     async def _initialize(self):
@@ -78,11 +83,7 @@ class Tickets(commands.Cog):
         """Настройка панели тикетов"""
         try:
             # Получаем настройки из базы данных
-            settings = await self.db.fetch_all(
-                "SELECT key, value FROM settings WHERE category = 'tickets'"
-            )
-            
-            settings_dict = {row['key']: row['value'] for row in settings}
+            settings_dict = await self.settings.get_category(None, 'tickets')
 
             channel_id = settings_dict.get('panel_channel')
             message_id = settings_dict.get('panel_message')
@@ -113,23 +114,17 @@ class Tickets(commands.Cog):
                     await message.edit(embed=embed, view=TicketButton())
                     return
                 except Exception as e:
-                    print(f"Error editing message: {e}")
+                    log.error(f"Error editing message: {e}")
                     pass
                     
             # Создаем новое сообщение
             message = await channel.send(embed=embed, view=TicketButton())
             
             # Сохраняем ID сообщения
-            await self.db.execute(
-                """
-                INSERT OR REPLACE INTO settings (category, key, value)
-                VALUES ('tickets', 'panel_message', ?)
-                """,
-                str(message.id)
-            )
+            await self.settings.set(channel.guild.id, 'tickets', 'panel_message', message.id)
             
         except Exception as e:
-            print(f"❌ Ошибка при настройке панели тикетов: {e}")
+            log.error(f"Ошибка при настройке панели тикетов: {e}")
             
     async def handle_ticket_create(self, interaction: discord.Interaction, reason: str):
         """Обработка создания тикета"""
@@ -156,9 +151,7 @@ class Tickets(commands.Cog):
                     )
 
             # Получаем категорию для тикетов
-            category_id = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'tickets' AND key = 'category'"
-            )
+            category_id = await self.settings.get(None, 'tickets', 'category')
             
             if not category_id:
                 return await interaction.response.send_message(
@@ -170,7 +163,7 @@ class Tickets(commands.Cog):
                     ephemeral=True
                 )
                 
-            category = interaction.guild.get_channel(int(category_id['value']))
+            category = interaction.guild.get_channel(int(category_id))
             if not category:
                 return await interaction.response.send_message(
                     embed=Embed(
@@ -194,12 +187,10 @@ class Tickets(commands.Cog):
             }
             
             # Добавляем права для модераторов
-            mod_role_id = await self.db.fetch_one(
-                "SELECT value FROM settings WHERE category = 'tickets' AND key = 'mod_role'"
-            )
+            mod_role_id = await self.settings.get(None, 'tickets', 'mod_role')
             
             if mod_role_id:
-                mod_role = interaction.guild.get_role(int(mod_role_id['value']))
+                mod_role = interaction.guild.get_role(int(mod_role_id))
                 if mod_role:
                     overwrites[mod_role] = discord.PermissionOverwrite(
                         read_messages=True,
@@ -255,7 +246,7 @@ class Tickets(commands.Cog):
             )
             
         except Exception as e:
-            print(f"❌ Ошибка при создании тикета: {e}")
+            log.error(f"Ошибка при создании тикета: {e}")
             try:
                 await interaction.response.send_message(
                     embed=Embed(
@@ -318,7 +309,7 @@ class Tickets(commands.Cog):
             await interaction.channel.delete()
             
         except Exception as e:
-            print(f"❌ Ошибка при закрытии тикета: {e}")
+            log.error(f"Ошибка при закрытии тикета: {e}")
             try:
                 await interaction.response.send_message(
                     embed=Embed(
@@ -399,15 +390,8 @@ class Tickets(commands.Cog):
                 message = await channel.send(embed=embed, view=TicketButton())
                 
             # Сохраняем ID канала и сообщения
-            await self.db.execute(
-                """
-                INSERT OR REPLACE INTO settings (category, key, value)
-                VALUES 
-                    ('tickets', 'panel_channel', ?),
-                    ('tickets', 'panel_message', ?)
-                """,
-                str(channel.id), str(message.id)
-            )
+            await self.settings.set(interaction.guild_id, 'tickets', 'panel_channel', channel.id)
+            await self.settings.set(interaction.guild_id, 'tickets', 'panel_message', message.id)
             
             await interaction.response.send_message(
                 embed=Embed(
@@ -419,7 +403,7 @@ class Tickets(commands.Cog):
             )
             
         except Exception as e:
-            print(f"❌ Ошибка при создании панели тикетов: {e}")
+            log.error(f"Ошибка при создании панели тикетов: {e}")
             try:
                 await interaction.response.send_message(
                     embed=Embed(
@@ -436,31 +420,13 @@ class Tickets(commands.Cog):
         try:
             # Сохраняем настройки
             if tickets_channel:
-                await self.db.execute(
-                    """
-                    INSERT OR REPLACE INTO settings (category, key, value)
-                    VALUES ('tickets', 'panel_channel', ?)
-                    """,
-                    tickets_channel
-                )
+                await self.settings.set(interaction.guild_id, 'tickets', 'panel_channel', tickets_channel)
                 
             if category:
-                await self.db.execute(
-                    """
-                    INSERT OR REPLACE INTO settings (category, key, value)
-                    VALUES ('tickets', 'category', ?)
-                    """,
-                    category
-                )
+                await self.settings.set(interaction.guild_id, 'tickets', 'category', category)
                 
             if mod_role:
-                await self.db.execute(
-                    """
-                    INSERT OR REPLACE INTO settings (category, key, value)
-                    VALUES ('tickets', 'mod_role', ?)
-                    """,
-                    mod_role
-                )
+                await self.settings.set(interaction.guild_id, 'tickets', 'mod_role', mod_role)
                 
             # Обновляем панель
             await self.setup_tickets_view()
@@ -475,7 +441,7 @@ class Tickets(commands.Cog):
             )
             
         except Exception as e:
-            print(f"❌ Ошибка при настройке тикетов: {e}")
+            log.error(f"Ошибка при настройке тикетов: {e}")
             try:
                 await interaction.response.send_message(
                     embed=Embed(
@@ -1,4 +1,5 @@
 import discord
+import logging
 from discord.ext import commands
 import asyncio
 import json
@@ -7,6 +8,8 @@ from Niludetsu.utils.embed import Embed
 from Niludetsu.utils.constants import Emojis
 from Niludetsu.database.db import Database
 
+log = logging.getLogger(__name__)
+
 class Words(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -40,7 +43,7 @@ class Words(commands.Cog):
         try:
             forum = self.bot.get_channel(self.forum_channel_id)
             if not forum:
-                print(f"❌ Форум-канал не найден: {self.forum_channel_id}")
+                log.error(f"Форум-канал не найден: {self.forum_channel_id}")
                 return
 
             # Пытаемся получить существующую ветку
@@ -79,10 +82,10 @@ class Words(commands.Cog):
                 str(thread.thread.id)
             )
             
-            print(f"✅ Создана новая ветка для игры в слова: {thread.thread.id}")
+            log.info(f"Создана новая ветка для игры в слова: {thread.thread.id}")
 
         except Exception as e:
-            print(f"❌ Ошибка при проверке/создании ветки для игры в слова: {e}")
+            log.error(f"Ошибка при проверке/создании ветки для игры в слова: {e}")
 
     def is_valid_word(self, word: str) -> bool:
         """Проверка валидности слова"""
@@ -98,7 +101,7 @@ class Words(commands.Cog):
             )
             return result['last_value'] if result and result['last_value'] else ""
         except Exception as e:
-            print(f"❌ Ошибка при получении последнего слова: {e}")
+            log.error(f"Ошибка при получении последнего слова: {e}")
             return ""
 
     async def get_used_words(self, channel_id: int) -> set:
@@ -112,11 +115,11 @@ class Words(commands.Cog):
                 try:
                     return set(json.loads(result['used_values']))
                 except json.JSONDecodeError:
-                    print("❌ Ошибка при декодировании JSON")
+                    log.error("Ошибка при декодировании JSON")
                     return set()
             return set()
         except Exception as e:
-            print(f"❌ Ошибка при получении использованных слов: {e}")
+            log.error(f"Ошибка при получении использованных слов: {e}")
             return set()
 
     async def save_word(self, channel_id: int, word: str):
@@ -144,7 +147,7 @@ class Words(commands.Cog):
             )
 
         except Exception as e:
-            print(f"❌ Ошибка при сохранении слова: {e}")
+            log.error(f"Ошибка при сохранении слова: {e}")
 
     async def update_words_embed(self, channel_id: int):
         """Обновление эмбеда с текущей статистикой игры"""
@@ -172,7 +175,7 @@ class Words(commands.Cog):
                             await message.edit(embed=new_embed)
                             return
         except Exception as e:
-            print(f"❌ Ошибка при обновлении эмбеда: {e}")
+            log.error(f"Ошибка при обновлении эмбеда: {e}")
 
     async def is_word_exists(self, word: str) -> bool:
         """Проверка существования слова в словаре"""
@@ -183,7 +186,7 @@ class Words(commands.Cog):
             )
             return bool(result)
         except Exception as e:
-            print(f"❌ Ошибка при проверке слова: {e}")
+            log.error(f"Ошибка при проверке слова: {e}")
             return True  # В случае ошибки разрешаем слово
 
     @commands.Cog.listener()
@@ -222,7 +225,7 @@ class Words(commands.Cog):
             await self.save_word(message.channel.id, word)
             
         except Exception as e:
-            print(f"❌ Ошибка в событии on_message: {e}")
+            log.error(f"Ошибка в событии on_message: {e}")
 
 async def setup(bot):
     await bot.add_cog(Words(bot)) 
\ No newline at end of file
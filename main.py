@@ -1,23 +1,34 @@
 # --- Импорт библиотек ---
-import time, os, discord, yaml, asyncio, traceback, discord
+import time, os, discord, yaml, asyncio, traceback, discord, logging
 from dotenv import load_dotenv
 from discord.ext import commands
-from typing import Union
+from typing import Union, Optional
 # --- Импорты из Niludetsu ---
-from Niludetsu import CogLoader, BotState, CommandSync, Embed, Database, LevelSystem
-load_dotenv()
-token = os.getenv("MAIN_TOKEN")
+from Niludetsu import CogLoader, BotState, CommandSync, Embed, Database, LevelSystem, Settings, LogConfig
+from Niludetsu.moderation import cooldowns
+from Niludetsu.core import LoggingState
+from Niludetsu.analytics import MessageRollups
+from Niludetsu.utils import ImageFetcher
+from Niludetsu.metrics import metrics
 
-# --- Discord Bot setup ---
-intents = discord.Intents.all()
-bot = commands.Bot(command_prefix="!", intents=intents)
-print("✅ Discord интенты настроены")
+log = logging.getLogger(__name__)
+
+# Создаются в main(): модуль импортируется и в процессах пула графиков, где бот не нужен
+bot: Optional[commands.Bot] = None
+config: dict = {}
+command_sync: Optional[CommandSync] = None
+server_checker = None
+level_system = None
 
 # --- Загрузка конфигурации ---
 async def load_config():
     try:
         db = Database()
-        config = await db.fetch_all("SELECT category, key, value FROM settings")
+        try:
+            config = await db.fetch_all("SELECT category, key, value FROM settings")
+        finally:
+            # Пул привязан к временному циклу asyncio.run, закрываем его
+            await db.close()
         config_dict = {}
         for row in config:
             if row['category'] not in config_dict:
@@ -25,25 +36,9 @@ async def load_config():
             config_dict[row['category']][row['key']] = row['value']
         return config_dict
     except Exception as e:
-        print(f"❌ Ошибка при загрузке конфигурации из базы данных: {e}")
+        log.error(f"Ошибка при загрузке конфигурации из базы данных: {e}")
         raise
 
-try:
-    config = asyncio.run(load_config())
-    print("✅ Конфигурация успешно загружена из базы данных")
-except Exception as e:
-    print(f"❌ Ошибка при загрузке конфигурации из базы данных: {e}")
-    raise
-
-# Инициализируем системные компоненты
-try:
-    command_sync = CommandSync(bot)
-    server_checker = None
-    level_system = None
-except Exception as e:
-    print(f"❌ Ошибка при инициализации системных компонентов: {e}")
-    raise
-
 # --- Загрузка когов ---
 async def load_cogs():
     loaded_count = 0
@@ -60,12 +55,40 @@ async def load_cogs():
                         loaded_count += 1
                     except Exception as e:
                         error_msg = str(e)
-                        print(f"❌ Ошибка при загрузке кога {cog_path}: {error_msg}")
-                        traceback.print_exc()
+                        log.exception(f"Ошибка при загрузке кога {cog_path}: {error_msg}")
                         CogLoader.add_loaded_cog(cog_path, success=False, error=error_msg)
                         error_count += 1
                         
-    print(f"📊 Загрузка когов завершена. Успешно: {loaded_count}, Ошибок: {error_count}")
+    log.info(f"Загрузка когов завершена. Успешно: {loaded_count}, Ошибок: {error_count}")
+
+# --- Метрики команд ---
+COMMANDS = metrics.counter("commands", "Выполненные команды", ("command", "status"))
+COMMAND_ERRORS = metrics.counter("command_errors", "Ошибки команд по типу", ("command", "error"))
+COMMAND_SECONDS = metrics.histogram("command_seconds", "Время от вызова команды до ее завершения", ("command",))
+
+def get_command_name(ctx_or_interaction: Union[commands.Context, discord.Interaction]) -> str:
+    """Название команды в виде /группа команда или !команда"""
+    if isinstance(ctx_or_interaction, discord.Interaction):
+        if ctx_or_interaction.command:
+            if hasattr(ctx_or_interaction.command, 'parent') and ctx_or_interaction.command.parent:
+                return f"/{ctx_or_interaction.command.parent.name} {ctx_or_interaction.command.name}"
+            return f"/{ctx_or_interaction.command.name}"
+        return "/Неизвестно"
+    if ctx_or_interaction.command:
+        return f"{ctx_or_interaction.prefix}{ctx_or_interaction.command.qualified_name}"
+    return f"{ctx_or_interaction.prefix}Неизвестно"
+
+def record_command(ctx_or_interaction: Union[commands.Context, discord.Interaction], error: Optional[Exception] = None):
+    """Учет выполнения команды в метриках"""
+    command_name = get_command_name(ctx_or_interaction)
+    if isinstance(ctx_or_interaction, discord.Interaction):
+        created_at = ctx_or_interaction.created_at
+    else:
+        created_at = ctx_or_interaction.message.created_at
+    COMMANDS.inc(command=command_name, status="error" if error else "ok")
+    if error:
+        COMMAND_ERRORS.inc(command=command_name, error=type(getattr(error, 'original', error)).__name__)
+    COMMAND_SECONDS.observe((discord.utils.utcnow() - created_at).total_seconds(), command=command_name)
 
 # --- Обработчик ошибок ---
 async def log_command_error(ctx_or_interaction: Union[commands.Context, discord.Interaction], error: commands.CommandError):
@@ -74,26 +97,16 @@ async def log_command_error(ctx_or_interaction: Union[commands.Context, discord.
         log_channel = bot.get_channel(int(config['logging']['main_channel']))
         if log_channel:
             # Определяем тип контекста и получаем нужные данные
+            command_name = get_command_name(ctx_or_interaction)
             if isinstance(ctx_or_interaction, discord.Interaction):
                 user = ctx_or_interaction.user
                 channel = ctx_or_interaction.channel
-                if ctx_or_interaction.command:
-                    if hasattr(ctx_or_interaction.command, 'parent') and ctx_or_interaction.command.parent:
-                        command_name = f"/{ctx_or_interaction.command.parent.name} {ctx_or_interaction.command.name}"
-                    else:
-                        command_name = f"/{ctx_or_interaction.command.name}"
-                else:
-                    command_name = "/Неизвестно"
             else:
                 user = ctx_or_interaction.author
                 channel = ctx_or_interaction.channel
-                if ctx_or_interaction.command:
-                    command_name = f"{ctx_or_interaction.prefix}{ctx_or_interaction.command.qualified_name}"
-                else:
-                    command_name = f"{ctx_or_interaction.prefix}Неизвестно"
 
             error_text = f"{str(error.__class__.__name__)}: {str(error)}"
-            print(f"❌ Ошибка в команде {command_name}: {error_text}")
+            log.error(f"Ошибка в команде {command_name}: {error_text}")
 
             error_embed = Embed.error(
                 description=f"```py\n{error_text}\n```",
@@ -130,18 +143,23 @@ async def log_command_error(ctx_or_interaction: Union[commands.Context, discord.
             await log_channel.send(f"<@{owner_id}>", embed=error_embed)
             
     except Exception as e:
-        print(f"❌ Ошибка при логировании: {e}")
-        traceback.print_exc()
+        log.exception(f"Ошибка при логировании: {e}")
 
-@bot.event
 async def on_command_error(ctx: commands.Context, error: commands.CommandError):
     if isinstance(error, commands.CommandNotFound):
         return  # Игнорируем ошибку отсутствующей команды
+    record_command(ctx, error)
     await log_command_error(ctx, error)
 
-@bot.tree.error
+async def on_command_completion(ctx: commands.Context):
+    record_command(ctx)
+
+async def on_app_command_completion(interaction: discord.Interaction, command: Union[discord.app_commands.Command, discord.app_commands.ContextMenu]):
+    record_command(interaction)
+
 async def on_app_command_error(interaction: discord.Interaction, error: commands.CommandError):
     """Обработчик ошибок slash-команд"""
+    record_command(interaction, error)
     try:
         # Отправляем сообщение пользователю
         error_message = "Произошла ошибка при выполнении команды!"
@@ -161,62 +179,127 @@ async def on_app_command_error(interaction: discord.Interaction, error: commands
         await log_command_error(interaction, error)
         
     except Exception as e:
-        print(f"❌ Ошибка при обработке ошибки: {e}")
-        traceback.print_exc()
+        log.exception(f"Ошибка при обработке ошибки: {e}")
 
 # --- Основные события ---
-@bot.event
 async def setup_hook():
     try:
         global server_checker, level_system
         BotState.reset()
         db = Database()
         await db.init()
+        await db.users.load()
+        await Settings().load()
+        await LogConfig.load()
+        await cooldowns.load()
+        cooldowns.start()
         bot.db = db
         await load_cogs()
         level_system = LevelSystem(bot)
         
     except Exception as e:
-        print(f"❌ Критическая ошибка в setup_hook: {e}")
-        traceback.print_exc()
+        log.exception(f"Критическая ошибка в setup_hook: {e}")
         raise
 
-@bot.event
 async def on_ready():
     try:
-        print(f"✅ Бот {bot.user} успешно запущен!")
+        log.info(f"Бот {bot.user} успешно запущен!")
         await bot.change_presence(
             activity=discord.Activity(
                 type=discord.ActivityType.listening,
                 name="Создаём вайб на Discord!"
             )
         )
-        print("🔄 Синхронизация команд...")
+        log.info("Синхронизация команд...")
         await command_sync.sync_commands()
-        print("✅ Команды успешно синхронизированы")
+        log.info("Команды успешно синхронизированы")
         CogLoader.print_loaded_cogs()
     except Exception as e:
-        print(f"❌ Ошибка в on_ready: {e}")
-        traceback.print_exc()
+        log.exception(f"Ошибка в on_ready: {e}")
 
-@bot.event
 async def on_message(message):
     try:
         if level_system:
             await level_system.process_message(message)
         await bot.process_commands(message)
     except Exception as e:
-        traceback.print_exc()
+        log.exception("Ошибка при обработке сообщения")
 
-@bot.event
 async def on_error(event, *args, **kwargs):
     """Глобальный обработчик ошибок"""
-    print(f"❌ Ошибка в событии {event}: {traceback.format_exc()}")
+    log.exception(f"Ошибка в событии {event}")
+
+# --- Остановка ---
+async def shutdown_services():
+    """Дописывает накопленные данные и закрывает общие сервисы
+
+    Порядок важен: логи, сводки и кулдауны пишутся в базу через очередь
+    записи, поэтому база закрывается последней.
+    """
+    steps = (
+        ("логирование", LoggingState.close),
+        ("сводки сообщений", MessageRollups.get().flush),
+        ("кулдауны", cooldowns.close),
+        ("загрузка изображений", ImageFetcher.get().close),
+        ("база данных", Database().close),
+    )
+    for name, close in steps:
+        try:
+            await close()
+        except Exception as e:
+            log.exception(f"Ошибка при остановке ({name}): {e}")
+
+class NiludetsuBot(commands.Bot):
+    """Бот, который при остановке сохраняет данные до закрытия соединения"""
+
+    async def close(self):
+        # Сначала выгружаем коги, чтобы их фоновые задачи не писали в закрытую базу
+        for extension in tuple(self.extensions):
+            try:
+                await self.unload_extension(extension)
+            except Exception as e:
+                log.error(f"Ошибка при выгрузке {extension}: {e}")
+        await shutdown_services()
+        await super().close()
+
+# --- Запуск ---
+def create_bot() -> commands.Bot:
+    """Создает бота и подключает обработчики событий"""
+    new_bot = NiludetsuBot(command_prefix="!", intents=discord.Intents.all())
+    log.info("Discord интенты настроены")
+    for handler in (setup_hook, on_ready, on_message, on_error,
+                    on_command_error, on_command_completion, on_app_command_completion):
+        new_bot.event(handler)
+    new_bot.tree.error(on_app_command_error)
+    return new_bot
+
+def main():
+    global bot, config, command_sync
+    LogConfig.setup()
+    load_dotenv()
+    token = os.getenv("MAIN_TOKEN")
+
+    try:
+        config = asyncio.run(load_config())
+        log.info("Конфигурация успешно загружена из базы данных")
+    except Exception as e:
+        log.error(f"Ошибка при загрузке конфигурации из базы данных: {e}")
+        raise
+
+    # Инициализируем системные компоненты
+    try:
+        bot = create_bot()
+        command_sync = CommandSync(bot)
+    except Exception as e:
+        log.error(f"Ошибка при инициализации системных компонентов: {e}")
+        raise
+
+    log.info("Запуск бота...")
+    # Вывод discord.py идет через общую очередь логирования
+    bot.run(token, log_handler=None)
 
 if __name__ == "__main__":
     try:
-        print("🔄 Запуск бота...")
-        bot.run(token)
+        main()
     except Exception as e:
-        print(f"❌ Критическая ошибка при запуске бота: {e}")
-        raise
\ No newline at end of file
+        log.error(f"Критическая ошибка при запуске бота: {e}")